@@ -21,4 +21,5 @@ setup(name='windpowerlib',
       install_requires=['pandas >= 0.19.1',
                         'requests'],
       extras_require={
-          'dev': ['pytest', 'jupyter', 'sphinx_rtd_theme', 'nbformat']})
+          'dev': ['pytest', 'jupyter', 'sphinx_rtd_theme', 'nbformat'],
+          'numba': ['numba']})
@@ -0,0 +1,88 @@
+import pandas as pd
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+import windpowerlib.batch_modelchain as batch_mc
+import windpowerlib.modelchain as mc
+import windpowerlib.wind_turbine as wt
+
+
+class TestBatchModelChain:
+
+    @classmethod
+    def setup_class(self):
+        self.weather_df = pd.DataFrame(
+            [[267.0, 267.0, 101125.0, 5.0, 4.0, 0.15],
+             [268.0, 268.5, 101000.0, 9.0, 7.0, 0.15],
+             [269.0, 268.0, 101200.0, 14.0, 11.5, 0.15]],
+            columns=[np.array(['temperature', 'temperature', 'pressure',
+                               'wind_speed', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 10, 0, 80, 10, 0])])
+        self.wind_turbines = []
+        for turbine_type, hub_heights in [('DUMMY 3', [100, 80, 120]),
+                                          ('DUMMY 4', [80, 90])]:
+            power_curve, nominal_power = wt.get_turbine_data_from_file(
+                turbine_type, 'example/data/example_power_curves.csv')
+            power_coefficient_curve, _ = wt.get_turbine_data_from_file(
+                'DUMMY 1', 'example/data/example_power_coefficient_curves.csv')
+            self.wind_turbines.extend(
+                wt.WindTurbine(
+                    hub_height=hub_height, rotor_diameter=70,
+                    name='{} {}'.format(turbine_type, hub_height),
+                    power_curve=power_curve, nominal_power=nominal_power,
+                    power_coefficient_curve=power_coefficient_curve)
+                for hub_height in hub_heights)
+
+    @pytest.mark.parametrize('parameters', [
+        {},
+        {'wind_speed_model': 'hellman', 'hellman_exp': 0.2},
+        {'density_correction': True, 'density_model': 'ideal_gas'},
+        {'power_output_model': 'power_coefficient_curve'},
+        {'wind_speed_model': 'interpolation_extrapolation',
+         'precision': 'float32'}])
+    def test_run_model(self, parameters):
+        test_batch_mc = batch_mc.BatchModelChain(self.wind_turbines,
+                                                 **parameters)
+        power_output = test_batch_mc.run_model(self.weather_df).power_output
+        assert list(power_output.columns) == [
+            'DUMMY 3 100', 'DUMMY 3 80', 'DUMMY 3 120', 'DUMMY 4 80',
+            'DUMMY 4 90']
+        for wind_turbine in self.wind_turbines:
+            assert_allclose(
+                power_output[wind_turbine.name],
+                mc.ModelChain(wind_turbine, **parameters).run_model(
+                    self.weather_df).power_output, rtol=1e-5)
+
+    def test_mixed_model_chains(self):
+        # Model chains with different parameters are calculated in groups
+        model_chains = [
+            mc.ModelChain(self.wind_turbines[0]),
+            mc.ModelChain(self.wind_turbines[1], density_correction=True),
+            mc.ModelChain(self.wind_turbines[2],
+                          power_output_model='power_coefficient_curve'),
+            mc.ModelChain(self.wind_turbines[3], wind_speed_model='hellman'),
+            self.wind_turbines[4]]
+        power_output = batch_mc.BatchModelChain(
+            model_chains, wind_speed_model='hellman').run_model(
+                self.weather_df).power_output
+        model_chains[4] = mc.ModelChain(self.wind_turbines[4],
+                                        wind_speed_model='hellman')
+        for model_chain in model_chains:
+            assert_allclose(
+                power_output[model_chain.power_plant.name],
+                model_chain.run_model(self.weather_df).power_output)
+
+    def test_error_raising(self):
+        with pytest.raises(ValueError):
+            batch_mc.BatchModelChain(
+                self.wind_turbines[:2] + self.wind_turbines[:1]).run_model(
+                    self.weather_df)
+        wind_turbine = wt.WindTurbine(
+            hub_height=100, name='turbine', nominal_power=2e6,
+            power_coefficient_curve=pd.DataFrame(
+                {'wind_speed': [3.0, 12.0], 'value': [0.0, 0.4]}))
+        with pytest.raises(TypeError):
+            batch_mc.BatchModelChain([wind_turbine]).run_model(
+                self.weather_df)
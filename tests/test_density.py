@@ -61,3 +61,13 @@ class TestDensity:
             parameters['temperature_hub_height'])
         assert_allclose(ideal_gas(**parameters), rho_exp)
         assert isinstance(ideal_gas(**parameters), np.ndarray)
+
+    def test_out(self):
+        parameters = {'pressure': pd.Series(data=[101125, 101000]),
+                      'pressure_height': 0,
+                      'hub_height': 100,
+                      'temperature_hub_height': pd.Series(data=[267, 268])}
+        for function in [barometric, ideal_gas]:
+            out = np.empty(2)
+            assert function(out=out, **parameters) is out
+            assert_allclose(out, function(**parameters))
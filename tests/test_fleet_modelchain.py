@@ -0,0 +1,120 @@
+import pandas as pd
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+import windpowerlib.fleet_modelchain as fleet_mc
+import windpowerlib.turbine_cluster_modelchain as tc_mc
+import windpowerlib.wind_farm as wf
+import windpowerlib.wind_turbine as wt
+
+
+class TestFleetModelChain:
+
+    @classmethod
+    def setup_class(self):
+        self.weather_df = pd.DataFrame(
+            [[267.0, 267.0, 101125.0, 5.0, 4.0, 0.15],
+             [268.0, 268.5, 101000.0, 9.0, 7.0, 0.15],
+             [269.0, 268.0, 101200.0, 14.0, 11.5, 0.15]],
+            columns=[np.array(['temperature', 'temperature', 'pressure',
+                               'wind_speed', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 10, 0, 80, 10, 0])])
+        weather_df_2 = self.weather_df.copy()
+        weather_df_2['wind_speed'] *= 1.2
+        weather_df_2['roughness_length'] = 0.05
+        self.weather = {'a': self.weather_df, 'b': weather_df_2}
+        self.wind_turbines = {}
+        for turbine_type, hub_height in [('DUMMY 3', 100), ('DUMMY 4', 90)]:
+            power_curve, nominal_power = wt.get_turbine_data_from_file(
+                turbine_type, 'example/data/example_power_curves.csv')
+            self.wind_turbines[turbine_type] = wt.WindTurbine(
+                hub_height=hub_height, name=turbine_type,
+                power_curve=power_curve, nominal_power=nominal_power)
+        self.fleet = pd.DataFrame(
+            [['farm 1', 'DUMMY 3', 3, 100, 0.9, 'a'],
+             ['farm 2', 'DUMMY 3', 3, 100, 0.9, 'b'],
+             ['farm 2', 'DUMMY 4', 2, 80, 0.9, 'b'],
+             ['farm 3', 'DUMMY 4', 5, 90, 0.8, 'a'],
+             ['farm 4', 'DUMMY 3', 3, 100, 0.9, 'a'],
+             ['farm 5', 'DUMMY 3', 3, 100, 0.9, 'b']],
+            columns=['wind_farm', 'turbine_type', 'number_of_turbines',
+                     'hub_height', 'efficiency', 'weather_id'])
+
+    def power_output_per_wind_farm(self, weather, **parameters):
+        power_output = {}
+        for name, rows in self.fleet.groupby('wind_farm', sort=False):
+            wind_farm = wf.WindFarm(name=name, wind_turbine_fleet=[
+                {'wind_turbine': wt.WindTurbine(
+                    hub_height=row.hub_height, name=row.turbine_type,
+                    power_curve=self.wind_turbines[
+                        row.turbine_type].power_curve,
+                    nominal_power=self.wind_turbines[
+                        row.turbine_type].nominal_power),
+                 'number_of_turbines': row.number_of_turbines}
+                for row in rows.itertuples()],
+                efficiency=(None if np.isnan(rows['efficiency'].iloc[0])
+                            else rows['efficiency'].iloc[0]))
+            power_output[name] = tc_mc.TurbineClusterModelChain(
+                wind_farm, **parameters).run_model(
+                    weather[rows['weather_id'].iloc[0]]).power_output
+        return pd.DataFrame(power_output)
+
+    @pytest.mark.parametrize('parameters', [
+        {'wake_losses_model': None},
+        {'wake_losses_model': 'dena_mean', 'hellman_exp': 0.2,
+         'wind_speed_model': 'hellman'},
+        {'wake_losses_model': 'constant_efficiency', 'smoothing': True},
+        {'wake_losses_model': None, 'density_correction': True},
+        {'wake_losses_model': None, 'hub_height_model': 'turbine_hub_heights'},
+        {'wake_losses_model': 'dena_mean', 'smoothing': True,
+         'hub_height_model': 'turbine_hub_heights'},
+        {'wake_losses_model': 'constant_efficiency',
+         'density_correction': True,
+         'hub_height_model': 'turbine_hub_heights'}])
+    def test_run_model(self, parameters):
+        test_fleet_mc = fleet_mc.FleetModelChain(
+            self.fleet, self.wind_turbines, **parameters)
+        power_output = test_fleet_mc.run_model(self.weather).power_output
+        assert list(power_output.columns) == ['farm 1', 'farm 2', 'farm 3',
+                                              'farm 4', 'farm 5']
+        assert_allclose(power_output,
+                        self.power_output_per_wind_farm(self.weather,
+                                                        **parameters))
+        # Farms 1 and 4 share the power curve, farm 5 only differs in the
+        # weather data
+        assert len(test_fleet_mc.wind_farms) == 3
+        assert_allclose(power_output['farm 1'], power_output['farm 4'])
+
+    def test_run_model_errors(self):
+        fleet = self.fleet.drop(columns='weather_id')
+        power_output = fleet_mc.FleetModelChain(
+            fleet, self.wind_turbines, wake_losses_model=None).run_model(
+                self.weather_df).power_output
+        assert power_output.shape == (3, 5)
+        with pytest.raises(ValueError):
+            fleet_mc.FleetModelChain(fleet, self.wind_turbines).run_model(
+                self.weather)
+        with pytest.raises(ValueError):
+            fleet_mc.FleetModelChain(self.fleet, self.wind_turbines).run_model(
+                {'a': self.weather_df})
+
+    def test_unsupported_parameters(self):
+        # Raise ValueError due to `turbulence_intensity_grid`
+        with pytest.raises(ValueError):
+            fleet_mc.FleetModelChain(self.fleet, self.wind_turbines,
+                                     turbulence_intensity_grid=[0.1, 0.2])
+        # Raise ValueError due to invalid `hub_height_model`
+        with pytest.raises(ValueError):
+            fleet_mc.FleetModelChain(
+                self.fleet, self.wind_turbines, wake_losses_model=None,
+                hub_height_model='misspelling').run_model(self.weather)
+        # Raise ValueError due to 'turbine_hub_heights' with power
+        # coefficient curves
+        with pytest.raises(ValueError):
+            fleet_mc.FleetModelChain(
+                self.fleet, self.wind_turbines, wake_losses_model=None,
+                power_output_model='power_coefficient_curve',
+                hub_height_model='turbine_hub_heights').run_model(
+                    self.weather)
@@ -0,0 +1,178 @@
+import gc
+import pandas as pd
+import numpy as np
+from numpy.testing import assert_allclose
+from pandas.util.testing import assert_series_equal
+
+from windpowerlib import hub_height_cache
+import windpowerlib.modelchain as mc
+import windpowerlib.wind_turbine as wt
+
+
+class TestHubHeightCache:
+
+    @classmethod
+    def setup_class(self):
+        self.weather_df = pd.DataFrame(
+            [[267.0, 101125.0, 5.0, 0.15], [268.0, 101000.0, 9.0, 0.15]],
+            columns=[np.array(['temperature', 'pressure', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 0, 10, 0])])
+        power_curve, nominal_power = wt.get_turbine_data_from_file(
+            'DUMMY 3', 'example/data/example_power_curves.csv')
+        self.test_turbine = wt.WindTurbine(
+            hub_height=100, name='DUMMY 3', power_curve=power_curve,
+            nominal_power=nominal_power)
+
+    def test_lru(self):
+        cache = hub_height_cache.HubHeightCache(maxsize=2)
+        weather_df = self.weather_df.copy()
+        cache.set(weather_df, 'a', 1)
+        cache.set(weather_df, 'b', 2)
+        assert cache.get(weather_df, 'a') == 1
+        cache.set(weather_df, 'c', 3)
+        # 'b' is the least recently used entry
+        assert cache.get(weather_df, 'b') is None
+        assert cache.get(weather_df, 'a') == 1
+        # Results are stored for the weather data object
+        assert cache.get(weather_df.copy(), 'a') is None
+        assert cache.get(cache.fingerprint(weather_df * 2), 'a') is None
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (2, 3)
+        cache.invalidate(weather_df)
+        assert cache.get(weather_df, 'a') is None
+        assert len(cache) == 0
+        cache.set(weather_df, 'a', 1)
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_fingerprint(self, monkeypatch):
+        fingerprint = hub_height_cache.HubHeightCache.fingerprint
+        weather_df = self.weather_df.copy()
+        weather_df_fingerprint = fingerprint(weather_df)
+        assert fingerprint(weather_df) == weather_df_fingerprint
+        # Copies have other fingerprints
+        assert fingerprint(weather_df.copy()) != weather_df_fingerprint
+        # Values modified in place are not detected
+        weather_df.iloc[1, 2] = 8.0
+        assert fingerprint(weather_df) == weather_df_fingerprint
+        # Assigned columns, index and columns are detected
+        weather_df['wind_speed', 10] = [5.0, 9.0]
+        assert fingerprint(weather_df) != weather_df_fingerprint
+        weather_df_fingerprint = fingerprint(weather_df)
+        weather_df.index = [5, 6]
+        assert fingerprint(weather_df) != weather_df_fingerprint
+        weather_df_fingerprint = fingerprint(weather_df)
+        weather_df.columns = weather_df.columns.set_levels(
+            [2, 0, 80, 0], level=1, verify_integrity=False)
+        assert fingerprint(weather_df) != weather_df_fingerprint
+        # The values are not read for a fingerprint
+        cache = hub_height_cache.HubHeightCache()
+        cache.set(weather_df, 'a', 1)
+
+        def values(weather_df):
+            raise AssertionError('values of the weather data are read')
+
+        monkeypatch.setattr(pd.DataFrame, 'values', property(values))
+        assert cache.get(weather_df, 'a') == 1
+
+    def test_garbage_collected(self):
+        cache = hub_height_cache.HubHeightCache()
+        weather_df = self.weather_df.copy()
+        cache.set(weather_df, 'a', 1)
+        cache.set(weather_df, 'b', 2)
+        cache.set(self.weather_df, 'a', 3)
+        assert len(cache) == 3
+        del weather_df
+        gc.collect()
+        assert len(cache) == 1
+        assert cache.get(self.weather_df, 'a') == 3
+
+    def test_modelchain(self):
+        cache = hub_height_cache.HubHeightCache()
+        for parameters in [{'density_correction': True},
+                           {'density_model': 'ideal_gas',
+                            'power_output_model': 'power_coefficient_curve'},
+                           {'wind_speed_model': 'hellman'}]:
+            test_turbine = wt.WindTurbine(
+                hub_height=100, name='DUMMY 1', rotor_diameter=70,
+                power_curve=self.test_turbine.power_curve,
+                power_coefficient_curve=wt.get_turbine_data_from_file(
+                    'DUMMY 1',
+                    'example/data/example_power_coefficient_curves.csv')[0],
+                nominal_power=self.test_turbine.nominal_power)
+            power_output_exp = mc.ModelChain(
+                test_turbine, **parameters).run_model(
+                    self.weather_df).power_output
+            test_mc = mc.ModelChain(test_turbine, hub_height_cache=cache,
+                                    **parameters)
+            assert_series_equal(
+                test_mc.run_model(self.weather_df).power_output,
+                power_output_exp)
+            # Second run and other model chains take the results from the
+            # cache
+            hits = cache.hits
+            assert_series_equal(
+                test_mc.run_model(self.weather_df).power_output,
+                power_output_exp)
+            assert cache.hits > hits
+            assert_series_equal(
+                mc.ModelChain(test_turbine, hub_height_cache=cache,
+                              **parameters).run_model(
+                    self.weather_df).power_output, power_output_exp)
+        # Temperature at hub height is calculated once for the density
+        cache.clear()
+        test_mc = mc.ModelChain(self.test_turbine, hub_height_cache=cache)
+        test_mc.temperature_hub(self.weather_df)
+        misses = cache.misses
+        test_mc.density_hub(self.weather_df)
+        assert cache.misses == misses + 1
+        # Other parameters or hub heights are not taken from the cache
+        misses = cache.misses
+        temperature_hub = test_mc.temperature_hub_heights(self.weather_df,
+                                                          [80, 100])
+        assert_allclose(temperature_hub[:, 1],
+                        test_mc.temperature_hub(self.weather_df))
+        assert test_mc.temperature_hub_heights(
+            self.weather_df, [80.0, 100.0]) is temperature_hub
+        test_mc.wind_speed_model = 'hellman'
+        test_mc.wind_speed_hub(self.weather_df)
+        assert cache.misses == misses + 2
+        # Weather data modified in place is calculated again after it is
+        # invalidated
+        weather_df = self.weather_df.copy()
+        wind_speed_hub = test_mc.wind_speed_hub(weather_df).copy()
+        weather_df.iloc[0, 2] = 7.0
+        cache.invalidate(weather_df)
+        assert test_mc.wind_speed_hub(weather_df)[0] > wind_speed_hub[0]
+        # Weather data converted to single precision in each run is taken
+        # from the cache
+        test_mc = mc.ModelChain(self.test_turbine, hub_height_cache=cache,
+                                precision='float32')
+        test_mc.run_model(self.weather_df)
+        hits, misses = cache.hits, cache.misses
+        power_output = test_mc.run_model(self.weather_df).power_output
+        assert (cache.hits, cache.misses) == (hits + 1, misses)
+        assert power_output.dtype == np.float32
+
+    def test_fingerprint_once(self, monkeypatch):
+        # The fingerprint is calculated once per run for wind speed and
+        # density at hub height
+        calls = []
+        fingerprint = hub_height_cache.HubHeightCache.fingerprint
+
+        def counting_fingerprint(weather_df):
+            calls.append(weather_df)
+            return fingerprint(weather_df)
+
+        monkeypatch.setattr(hub_height_cache.HubHeightCache, 'fingerprint',
+                            staticmethod(counting_fingerprint))
+        cache = hub_height_cache.HubHeightCache()
+        test_mc = mc.ModelChain(self.test_turbine, hub_height_cache=cache,
+                                density_correction=True)
+        test_mc.run_model(self.weather_df)
+        assert len(calls) == 1
+        hits = cache.hits
+        test_mc.run_model(self.weather_df)
+        assert len(calls) == 2
+        assert cache.hits == hits + 2
@@ -1,10 +1,12 @@
 import pandas as pd
 import numpy as np
 import pytest
+from numpy.testing import assert_allclose
 from pandas.util.testing import assert_series_equal
 
 import windpowerlib.wind_turbine as wt
 import windpowerlib.modelchain as mc
+from windpowerlib import tools, power_output
 
 
 class TestModelChain:
@@ -272,3 +274,273 @@ class TestModelChain:
             test_mc = mc.ModelChain(wt.WindTurbine(**test_turbine),
                                     **test_modelchain)
             test_mc.run_model(weather_df)
+
+    def test_precision(self):
+        power_curve = pd.DataFrame(
+            data={'wind_speed': np.arange(0.0, 26.0, 0.5),
+                  'value': np.clip((np.arange(0.0, 26.0, 0.5) - 3) ** 3 *
+                                   1000, 0, 2e6)})
+        test_turbine = wt.WindTurbine(hub_height=100, name='test_turbine',
+                                      power_curve=power_curve,
+                                      nominal_power=2e6)
+        weather_df = pd.DataFrame(
+            np.array([[267.0, 101125.0, 5.0, 0.15],
+                      [268.0, 101000.0, 8.5, 0.15],
+                      [266.0, 100800.0, 11.0, 0.15]]),
+            index=[0, 1, 2],
+            columns=[np.array(['temperature', 'pressure', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 0, 10, 0])])
+        for parameters in [{}, {'density_correction': True},
+                           {'wind_speed_model': 'hellman'}]:
+            power_output_exp = mc.ModelChain(
+                test_turbine, **parameters).run_model(weather_df).power_output
+            power_output = mc.ModelChain(
+                test_turbine, precision='float32',
+                **parameters).run_model(weather_df).power_output
+            assert power_output.dtype == np.float32
+            assert_series_equal(power_output, power_output_exp,
+                                check_dtype=False, check_less_precise=True)
+
+        # Raise ValueError due to invalid precision
+        with pytest.raises(ValueError):
+            mc.ModelChain(test_turbine, precision='float16').run_model(
+                weather_df)
+
+    def test_density_lookup_table(self):
+        power_curve = pd.DataFrame(
+            data={'wind_speed': np.arange(0.0, 26.0, 0.5),
+                  'value': np.clip((np.arange(0.0, 26.0, 0.5) - 3) ** 3 *
+                                   1000, 0, 2e6)})
+        test_turbine = wt.WindTurbine(hub_height=100, name='test_turbine',
+                                      power_curve=power_curve,
+                                      nominal_power=2e6)
+        weather_df = pd.DataFrame(
+            np.array([[267.0, 101125.0, 5.0, 0.15],
+                      [268.0, 101000.0, 8.5, 0.15],
+                      [266.0, 100800.0, 11.0, 0.15]]),
+            index=[0, 1, 2],
+            columns=[np.array(['temperature', 'pressure', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 0, 10, 0])])
+        test_mc = mc.ModelChain(test_turbine, density_correction=True,
+                                density_grid=np.arange(1.0, 1.355, 0.01))
+        power_output = test_mc.run_model(weather_df).power_output
+        lookup_table = test_mc.density_lookup_table(power_curve)
+        # The table is calculated once for the power curve
+        test_mc.run_model(weather_df)
+        assert test_mc.density_lookup_table(power_curve) is lookup_table
+        assert_series_equal(test_mc.power_output, power_output)
+        assert_series_equal(power_output, mc.ModelChain(
+            test_turbine, density_correction=True).run_model(
+                weather_df).power_output, check_less_precise=True)
+        # A new density grid or power curve results in a new table
+        test_mc.density_grid = np.arange(1.0, 1.355, 0.05)
+        assert test_mc.density_lookup_table(power_curve) is not lookup_table
+        assert test_mc.density_lookup_table(
+            power_curve.copy()) is not lookup_table
+        test_mc.density_grid = None
+        assert test_mc.density_lookup_table(power_curve) is None
+
+    def test_workspace(self):
+        power_curve = pd.DataFrame(
+            data={'wind_speed': np.arange(0.0, 26.0, 0.5),
+                  'value': np.clip((np.arange(0.0, 26.0, 0.5) - 3) ** 3 *
+                                   1000, 0, 2e6)})
+        test_turbine = wt.WindTurbine(hub_height=100, name='test_turbine',
+                                      power_curve=power_curve,
+                                      nominal_power=2e6)
+        weather_df = pd.DataFrame(
+            np.array([[267.0, 101125.0, 5.0, 0.15],
+                      [268.0, 101000.0, 8.5, 0.15],
+                      [266.0, 100800.0, 11.0, 0.15]]),
+            index=[0, 1, 2],
+            columns=[np.array(['temperature', 'pressure', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 0, 10, 0])])
+        workspace = tools.Workspace()
+        for parameters in [{'density_correction': True},
+                           {'density_model': 'ideal_gas',
+                            'density_correction': True},
+                           {'wind_speed_model': 'hellman'}]:
+            power_output_exp = mc.ModelChain(
+                test_turbine, **parameters).run_model(weather_df).power_output
+            test_mc = mc.ModelChain(test_turbine, workspace=workspace,
+                                    **parameters)
+            assert_series_equal(test_mc.run_model(weather_df).power_output,
+                                power_output_exp)
+            # Arrays of the workspace are reused in the next run
+            allocations = workspace.allocations
+            assert_series_equal(test_mc.run_model(weather_df).power_output,
+                                power_output_exp)
+            assert workspace.allocations == allocations
+        assert set(workspace.arrays) == {'temperature_hub', 'density_hub',
+                                         'wind_speed_hub'}
+
+    def test_backend(self):
+        pytest.importorskip('numba')
+        power_curve = pd.DataFrame(
+            data={'wind_speed': np.arange(0.0, 26.0, 0.5),
+                  'value': np.clip((np.arange(0.0, 26.0, 0.5) - 3) ** 3 *
+                                   1000, 0, 2e6)})
+        test_turbine = wt.WindTurbine(hub_height=100, name='test_turbine',
+                                      power_curve=power_curve,
+                                      nominal_power=2e6)
+        weather_df = pd.DataFrame(
+            np.array([[267.0, 101125.0, 5.0, 0.15],
+                      [268.0, 101000.0, 8.5, 0.15],
+                      [266.0, 100800.0, 11.0, 0.15]]),
+            index=[0, 1, 2],
+            columns=[np.array(['temperature', 'pressure', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 0, 10, 0])])
+        for parameters in [{}, {'density_correction': True},
+                           {'wind_speed_model': 'hellman',
+                            'density_model': 'ideal_gas',
+                            'density_correction': True},
+                           {'workspace': tools.Workspace(),
+                            'density_correction': True}]:
+            power_output_exp = mc.ModelChain(
+                test_turbine, **parameters).run_model(weather_df).power_output
+            power_output = mc.ModelChain(
+                test_turbine, backend='numba',
+                **parameters).run_model(weather_df).power_output
+            assert_series_equal(power_output, power_output_exp)
+
+        # Raise ValueError due to invalid backend
+        with pytest.raises(ValueError):
+            mc.ModelChain(test_turbine, backend='fortran').run_model(
+                weather_df)
+
+    def test_hub_heights(self):
+        weather_df = pd.DataFrame(
+            np.array([[267.0, 268.0, 101125.0, 1.2, 1.1, 5.0, 7.0, 0.15],
+                      [268.0, 267.5, 101000.0, 1.21, 1.15, 8.5, 9.0, 0.15],
+                      [266.0, 266.0, 100800.0, 1.22, 1.1, 11.0, 10.5, 0.1]]),
+            index=[0, 1, 2],
+            columns=[np.array(['temperature', 'temperature', 'pressure',
+                               'density', 'density', 'wind_speed',
+                               'wind_speed', 'roughness_length']),
+                     np.array([2, 80, 0, 10, 80, 10, 80, 0])])
+        hub_heights = [60, 80, 100, 160]
+        for parameters in [
+                {}, {'wind_speed_model': 'hellman',
+                     'density_model': 'ideal_gas'},
+                {'wind_speed_model': 'interpolation_extrapolation',
+                 'temperature_model': 'interpolation_extrapolation',
+                 'density_model': 'interpolation_extrapolation'},
+                {'wind_speed_model': 'log_interpolation_extrapolation'}]:
+            test_mc = mc.ModelChain(wt.WindTurbine(
+                hub_height=100, name='test_turbine', nominal_power=2e6,
+                power_curve=pd.DataFrame({'wind_speed': [3.0, 12.0],
+                                          'value': [0.0, 2e6]})),
+                **parameters)
+            wind_speed_hub = test_mc.wind_speed_hub_heights(weather_df,
+                                                            hub_heights)
+            density_hub = test_mc.density_hub_heights(weather_df,
+                                                      hub_heights)
+            assert wind_speed_hub.shape == density_hub.shape == (3, 4)
+            for column, hub_height in enumerate(hub_heights):
+                test_mc.power_plant.hub_height = hub_height
+                assert_allclose(wind_speed_hub[:, column],
+                                test_mc.wind_speed_hub(weather_df))
+                assert_allclose(density_hub[:, column],
+                                test_mc.density_hub(weather_df))
+
+    def test_append(self):
+        weather_df = pd.DataFrame(
+            np.array([[267.0, 101125.0, 5.0, 7.0, 0.15],
+                      [268.0, 101000.0, 8.5, 9.0, 0.15],
+                      [266.0, 100800.0, 11.0, 10.5, 0.1],
+                      [265.0, 100900.0, 14.0, 15.5, 0.1],
+                      [266.5, 101200.0, 2.0, 3.5, 0.15]]),
+            index=pd.date_range('1/1/2012', periods=5, freq='10min'),
+            columns=[np.array(['temperature', 'pressure', 'wind_speed',
+                               'wind_speed', 'roughness_length']),
+                     np.array([2, 0, 10, 80, 0])])
+        power_curve = pd.DataFrame({'wind_speed': [3.0, 12.0, 25.0],
+                                    'value': [0.0, 2e6, 2e6]})
+        for parameters in [{}, {'density_correction': True},
+                           {'wind_speed_model': 'interpolation_extrapolation',
+                            'precision': 'float32'}]:
+            test_mc = mc.ModelChain(wt.WindTurbine(
+                hub_height=100, name='test_turbine', nominal_power=2e6,
+                power_curve=power_curve), buffer_size=3, **parameters)
+            power_output_exp = test_mc.run_model(weather_df).power_output
+            # Only the new time steps are calculated
+            for start, end in [(0, 2), (2, 3), (3, 5)]:
+                assert_series_equal(
+                    test_mc.append(weather_df.iloc[start:end]).power_output,
+                    power_output_exp.iloc[start:end])
+            # The buffer keeps the latest time steps
+            assert_series_equal(test_mc.power_output_buffer.to_series(),
+                                power_output_exp.iloc[2:], check_freq=False)
+        # Heights are selected again for other columns
+        test_mc.append(weather_df.iloc[:, [0, 1, 3, 2, 4]])
+        assert_allclose(test_mc.power_output, power_output_exp)
+
+    def test_threads(self, monkeypatch):
+        np.random.seed(2)
+        weather_df = pd.DataFrame(
+            np.column_stack([np.random.uniform(265, 275, (1001, 2)),
+                             np.random.uniform(99000, 102000, 1001),
+                             np.random.uniform(0, 25, (1001, 2)),
+                             np.random.uniform(0.01, 0.5, 1001)]),
+            index=pd.date_range('1/1/2012', periods=1001, freq='10min'),
+            columns=[np.array(['temperature', 'temperature', 'pressure',
+                               'wind_speed', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 80, 0, 10, 80, 0])])
+        test_turbine = wt.WindTurbine(
+            hub_height=100, name='test_turbine', nominal_power=2e6,
+            power_curve=pd.DataFrame({'wind_speed': [3.0, 12.0, 25.0],
+                                      'value': [0.0, 2e6, 2e6]}))
+        for parameters in [{}, {'density_correction': True,
+                                'density_model': 'ideal_gas'},
+                           {'wind_speed_model': 'hellman',
+                            'precision': 'float32'},
+                           {'workspace': tools.Workspace()}]:
+            power_output_exp = mc.ModelChain(
+                test_turbine, **parameters).run_model(
+                    weather_df).power_output
+            for threads in [2, 3]:
+                assert_series_equal(
+                    mc.ModelChain(test_turbine, threads=threads,
+                                  **parameters).run_model(
+                        weather_df).power_output, power_output_exp)
+        # Workspace is not used by the threads
+        workspace = tools.Workspace()
+        mc.ModelChain(test_turbine, threads=2, workspace=workspace,
+                      wind_speed_model='hellman').run_model(weather_df)
+        assert workspace.allocations == 0
+        # Time series shorter than the number of threads
+        assert_series_equal(
+            mc.ModelChain(test_turbine, threads=4).run_model(
+                weather_df.iloc[:2]).power_output,
+            mc.ModelChain(test_turbine).run_model(
+                weather_df.iloc[:2]).power_output)
+        # Density lookup table is built once before the threads start and
+        # the lookup tables of the model are not changed by the threads
+        calls = []
+        lookup_table = power_output.density_correction_lookup_table
+
+        def counted_lookup_table(*args):
+            calls.append(args)
+            return lookup_table(*args)
+
+        monkeypatch.setattr(power_output, 'density_correction_lookup_table',
+                            counted_lookup_table)
+        test_mc = mc.ModelChain(test_turbine, threads=3,
+                                density_correction=True,
+                                density_grid=np.arange(1.0, 1.4, 0.01))
+        test_mc.run_model(weather_df)
+        assert len(calls) == 1
+        lookup_tables = dict(test_mc._density_lookup_tables)
+        test_mc.run_model(weather_df)
+        assert len(calls) == 1
+        assert test_mc._density_lookup_tables == lookup_tables
+        assert_series_equal(
+            test_mc.power_output,
+            mc.ModelChain(test_turbine, density_correction=True,
+                          density_grid=np.arange(1.0, 1.4, 0.01)).run_model(
+                weather_df).power_output)
@@ -0,0 +1,121 @@
+import pandas as pd
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from pandas.util.testing import assert_series_equal
+
+from windpowerlib import (wind_speed, temperature, density, power_output,
+                          power_curves, numba_kernels)
+from windpowerlib.tools import CompiledCurve
+
+pytest.importorskip('numba')
+
+
+class TestNumbaKernels:
+
+    @classmethod
+    def setup_class(self):
+        self.wind_speed = pd.Series(data=[2.0, 5.5, 7.0, 12.3, 15.0, np.nan,
+                                          30.0])
+        self.roughness_length = pd.Series(data=[0.15, 0.1, 0.3, 0.15, 0.05,
+                                                0.15, 0.15])
+        self.pressure = pd.Series(data=[101125.0, 101000.0, 100800.0,
+                                        100500.0, 101300.0, 100100.0,
+                                        101000.0])
+        self.temperature = pd.Series(data=[267.0, 268.0, 275.0, 290.0, 281.0,
+                                           270.0, 265.0])
+        self.density = pd.Series(data=[1.3, 1.3, 1.2, 1.1, 1.25, 1.22, 1.3])
+        self.curve_wind_speeds = np.array([0.0, 4.0, 5.0, 6.0, 7.0, 8.0, 12.0,
+                                           25.0])
+        self.power_curve_values = np.array([0.0, 0.0, 200.0, 400.0, 600.0,
+                                            800.0, 1500.0, 1500.0])
+        self.power_coefficients = np.array([0.0, 0.3, 0.4, 0.5, 0.4, 0.3,
+                                            0.2, 0.1])
+
+    def test_hub_height_kernels(self):
+        for obstacle_height in [0, 12]:
+            assert_series_equal(
+                numba_kernels.logarithmic_profile(
+                    self.wind_speed, 10, 100, self.roughness_length,
+                    obstacle_height),
+                wind_speed.logarithmic_profile(
+                    self.wind_speed, 10, 100, self.roughness_length,
+                    obstacle_height))
+        for roughness_length, hellman_exponent in [
+                (self.roughness_length, None), (None, None),
+                (self.roughness_length, 0.2)]:
+            assert_series_equal(
+                numba_kernels.hellman(self.wind_speed, 10, 100,
+                                      roughness_length, hellman_exponent),
+                wind_speed.hellman(self.wind_speed, 10, 100,
+                                   roughness_length, hellman_exponent))
+        assert_series_equal(
+            numba_kernels.linear_gradient(self.temperature, 2, 100),
+            temperature.linear_gradient(self.temperature, 2, 100))
+        for function in ['barometric', 'ideal_gas']:
+            assert_series_equal(
+                getattr(numba_kernels, function)(
+                    self.pressure, 0, 100, self.temperature),
+                getattr(density, function)(
+                    self.pressure, 0, 100, self.temperature))
+        # Arrays are returned for arrays, `out` if given
+        out = np.empty(len(self.wind_speed))
+        assert numba_kernels.logarithmic_profile(
+            self.wind_speed.values, 10, 100, 0.15, out=out) is out
+        assert_allclose(out, wind_speed.logarithmic_profile(
+            self.wind_speed.values, 10, 100, 0.15))
+        with pytest.raises(ValueError):
+            numba_kernels.logarithmic_profile(self.wind_speed, 10, 100, 0.15,
+                                              obstacle_height=20)
+
+    def test_power_curve(self):
+        compiled_curve = CompiledCurve(self.curve_wind_speeds,
+                                       self.power_curve_values)
+        for parameters in [{}, {'compiled_curve': compiled_curve},
+                           {'density': self.density,
+                            'density_correction': True},
+                           {'density': self.density,
+                            'density_correction': True,
+                            'density_grid': np.arange(1.0, 1.4, 0.05)}]:
+            assert_series_equal(
+                numba_kernels.power_curve(
+                    self.wind_speed, self.curve_wind_speeds,
+                    self.power_curve_values, **parameters),
+                power_output.power_curve(
+                    self.wind_speed, self.curve_wind_speeds,
+                    self.power_curve_values, **parameters))
+        with pytest.raises(TypeError):
+            numba_kernels.power_curve(
+                self.wind_speed, self.curve_wind_speeds,
+                self.power_curve_values, density_correction='wrong_type')
+
+    def test_power_coefficient_curve(self):
+        for compiled_curve in [None, CompiledCurve(self.curve_wind_speeds,
+                                                   self.power_coefficients)]:
+            assert_series_equal(
+                numba_kernels.power_coefficient_curve(
+                    self.wind_speed, self.curve_wind_speeds,
+                    self.power_coefficients, 80, self.density,
+                    compiled_curve=compiled_curve),
+                power_output.power_coefficient_curve(
+                    self.wind_speed, self.curve_wind_speeds,
+                    self.power_coefficients, 80, self.density))
+
+    def test_smooth_power_curve(self):
+        for method in ['turbulence_intensity', 'Staffell_Pfenninger']:
+            smoothed_power_curve = power_curves.smooth_power_curve(
+                pd.Series(self.curve_wind_speeds),
+                pd.Series(self.power_curve_values),
+                standard_deviation_method=method, turbulence_intensity=0.15,
+                backend='numba')
+            smoothed_power_curve_exp = power_curves.smooth_power_curve(
+                pd.Series(self.curve_wind_speeds),
+                pd.Series(self.power_curve_values),
+                standard_deviation_method=method, turbulence_intensity=0.15)
+            assert_allclose(smoothed_power_curve.values,
+                            smoothed_power_curve_exp.values, atol=1e-9)
+        with pytest.raises(ValueError):
+            power_curves.smooth_power_curve(
+                pd.Series(self.curve_wind_speeds),
+                pd.Series(self.power_curve_values),
+                turbulence_intensity=0.15, backend='fortran')
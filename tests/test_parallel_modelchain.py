@@ -0,0 +1,78 @@
+import pandas as pd
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+import windpowerlib.modelchain as mc
+import windpowerlib.parallel_modelchain as parallel_mc
+import windpowerlib.turbine_cluster_modelchain as tc_mc
+import windpowerlib.wind_farm as wf
+import windpowerlib.wind_turbine as wt
+from windpowerlib import tools
+
+
+class TestParallelModelChain:
+
+    @classmethod
+    def setup_class(self):
+        self.weather_df = pd.DataFrame(
+            [[267.0, 267.0, 101125.0, 5.0, 4.0, 0.15],
+             [268.0, 268.5, 101000.0, 9.0, 7.0, 0.15],
+             [269.0, 268.0, 101200.0, 14.0, 11.5, 0.15]],
+            index=pd.date_range('1/1/2012', periods=3, freq='H'),
+            columns=[np.array(['temperature', 'temperature', 'pressure',
+                               'wind_speed', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 10, 0, 80, 10, 0])])
+        self.wind_turbines = []
+        for turbine_type, hub_height in [('DUMMY 3', 100), ('DUMMY 4', 80),
+                                         ('DUMMY 3', 120)]:
+            power_curve, nominal_power = wt.get_turbine_data_from_file(
+                turbine_type, 'example/data/example_power_curves.csv')
+            self.wind_turbines.append(wt.WindTurbine(
+                hub_height=hub_height,
+                name='{} {}'.format(turbine_type, hub_height),
+                power_curve=power_curve, nominal_power=nominal_power))
+
+    def model_chains(self):
+        return [
+            mc.ModelChain(self.wind_turbines[0]),
+            mc.ModelChain(self.wind_turbines[1], density_correction=True,
+                          workspace=tools.Workspace()),
+            mc.ModelChain(self.wind_turbines[2], wind_speed_model='hellman',
+                          precision='float32'),
+            tc_mc.TurbineClusterModelChain(wf.WindFarm(
+                name='farm', wind_turbine_fleet=[
+                    {'wind_turbine': self.wind_turbines[0],
+                     'number_of_turbines': 3},
+                    {'wind_turbine': self.wind_turbines[1],
+                     'number_of_turbines': 2}]), smoothing=True)]
+
+    @pytest.mark.parametrize('workers, chunksize', [(2, 1), (2, 3), (1, 2)])
+    def test_run_model(self, workers, chunksize):
+        model_chains = self.model_chains()
+        power_output = parallel_mc.ParallelModelChain(
+            model_chains, workers=workers, chunksize=chunksize).run_model(
+                self.weather_df).power_output
+        assert list(power_output.columns) == [
+            'DUMMY 3 100', 'DUMMY 4 80', 'DUMMY 3 120', 'farm']
+        assert power_output.index.equals(self.weather_df.index)
+        for model_chain in model_chains:
+            assert_allclose(
+                power_output[model_chain.power_plant.name],
+                model_chain.run_model(self.weather_df).power_output,
+                rtol=1e-6)
+
+    def test_error_raising(self):
+        with pytest.raises(ValueError):
+            parallel_mc.ParallelModelChain(
+                self.model_chains()[:1] * 2).run_model(self.weather_df)
+        # Errors of the worker processes are raised
+        wind_turbine = wt.WindTurbine(
+            hub_height=100, name='turbine', nominal_power=2e6,
+            power_coefficient_curve=pd.DataFrame(
+                {'wind_speed': [3.0, 12.0], 'value': [0.0, 0.4]}))
+        with pytest.raises(TypeError):
+            parallel_mc.ParallelModelChain(
+                [mc.ModelChain(wind_turbine)], workers=1).run_model(
+                    self.weather_df)
@@ -0,0 +1,152 @@
+import pandas as pd
+import numpy as np
+import pytest
+from pandas.util.testing import assert_series_equal, assert_frame_equal
+
+from windpowerlib import power_curve_cache
+import windpowerlib.wind_farm as wf
+import windpowerlib.wind_turbine as wt
+import windpowerlib.wind_turbine_cluster as wtc
+import windpowerlib.turbine_cluster_modelchain as tc_mc
+
+
+class TestPowerCurveCache:
+
+    @classmethod
+    def setup_class(self):
+        self.weather_df = pd.DataFrame(
+            [[267.0, 101125.0, 5.0, 0.15], [268.0, 101000.0, 9.0, 0.15]],
+            columns=[np.array(['temperature', 'pressure', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 0, 10, 0])])
+        power_curve, nominal_power = wt.get_turbine_data_from_file(
+            'DUMMY 3', 'example/data/example_power_curves.csv')
+        self.test_turbine = wt.WindTurbine(
+            hub_height=100, name='DUMMY 3', power_curve=power_curve,
+            nominal_power=nominal_power)
+        power_curve, nominal_power = wt.get_turbine_data_from_file(
+            'DUMMY 4', 'example/data/example_power_curves.csv')
+        self.test_turbine_2 = wt.WindTurbine(
+            hub_height=90, name='DUMMY 4', power_curve=power_curve,
+            nominal_power=nominal_power)
+
+    def test_lru(self):
+        cache = power_curve_cache.PowerCurveCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        assert cache.get('a') == 1
+        cache.set('c', 3)
+        # 'b' is the least recently used entry
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert len(cache) == 2
+        assert (cache.hits, cache.disk_hits, cache.misses) == (2, 0, 1)
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.quantize(None) is None
+        assert cache.quantize(0.0012345) == 0.00123
+
+    def test_disk(self, tmpdir):
+        cache = power_curve_cache.PowerCurveCache(directory=str(tmpdir))
+        power_curves = {
+            'power_curve': pd.DataFrame({'wind_speed': [1.0, 2.0],
+                                         'value': [2.0, 3.0]}),
+            'wind_farm_power_curves': [
+                pd.DataFrame({'wind_speed': [1.0], 'value': [2.0]}),
+                pd.DataFrame({'wind_speed': [0.5, 1.5], 'value': [0.0, 1.0]})],
+            'turbulence_intensity_lookup_table': pd.DataFrame(
+                [[1.0, 2.0], [3.0, 4.0]],
+                index=pd.Index([0.0, 0.05], name='wind_speed'),
+                columns=pd.Index([0.1, 0.2], name='turbulence_intensity'))}
+        cache.set('a', power_curves)
+        cache.set('b', {'power_curve': power_curves['power_curve'],
+                        'wind_farm_power_curves': None})
+        cache_2 = power_curve_cache.PowerCurveCache(directory=str(tmpdir))
+        cached_power_curves = cache_2.get('a')
+        assert sorted(cached_power_curves) == sorted(power_curves)
+        assert_frame_equal(cached_power_curves['power_curve'],
+                           power_curves['power_curve'])
+        for power_curve, power_curve_exp in zip(
+                cached_power_curves['wind_farm_power_curves'],
+                power_curves['wind_farm_power_curves']):
+            assert_frame_equal(power_curve, power_curve_exp)
+        assert_frame_equal(
+            cached_power_curves['turbulence_intensity_lookup_table'],
+            power_curves['turbulence_intensity_lookup_table'])
+        assert cache_2.get('b')['wind_farm_power_curves'] is None
+        assert cache_2.get('a') is not None
+        assert (cache_2.hits, cache_2.disk_hits, cache_2.misses) == (1, 2, 0)
+        # Power curves are stored as arrays, which are read without pickle
+        with np.load(str(tmpdir.join('{}.npz'.format('a'))),
+                     allow_pickle=False) as arrays:
+            assert 'power_curve.values' in arrays
+        # Only DataFrames, lists of DataFrames and None are stored on disk
+        with pytest.raises(TypeError):
+            cache.set('c', {'power_curve': object()})
+        cache_2.clear(disk=True)
+        assert power_curve_cache.PowerCurveCache(
+            directory=str(tmpdir)).get('a') is None
+
+    def test_key(self):
+        cache = power_curve_cache.PowerCurveCache()
+        test_farm = wf.WindFarm(name='farm', wind_turbine_fleet=[
+            {'wind_turbine': self.test_turbine, 'number_of_turbines': 3}])
+        test_farm_2 = wf.WindFarm(name='farm 2', wind_turbine_fleet=[
+            {'wind_turbine': self.test_turbine, 'number_of_turbines': 3}])
+        test_farm_3 = wf.WindFarm(name='farm', wind_turbine_fleet=[
+            {'wind_turbine': self.test_turbine, 'number_of_turbines': 4}])
+        # Farms with the same fleet share the key
+        assert cache.key(test_farm, smoothing=True) == cache.key(
+            test_farm_2, smoothing=True)
+        assert cache.key(test_farm, smoothing=True) != cache.key(
+            test_farm_3, smoothing=True)
+        assert cache.key(test_farm, smoothing=True) != cache.key(
+            test_farm, smoothing=False)
+        test_farm_2.efficiency = 0.9
+        assert cache.key(test_farm) != cache.key(test_farm_2)
+
+    def test_turbine_cluster_modelchain(self):
+        cache = power_curve_cache.PowerCurveCache()
+        parameters = {'wake_losses_model': 'constant_efficiency',
+                      'smoothing': True, 'power_curve_cache': cache}
+        test_cluster = wtc.WindTurbineCluster(name='cluster', wind_farms=[
+            wf.WindFarm(name='farm', efficiency=0.9, wind_turbine_fleet=[
+                {'wind_turbine': self.test_turbine,
+                 'number_of_turbines': 3}]),
+            wf.WindFarm(name='farm 2', efficiency=0.9, wind_turbine_fleet=[
+                {'wind_turbine': self.test_turbine_2,
+                 'number_of_turbines': 2}])])
+        test_tc_mc = tc_mc.TurbineClusterModelChain(
+            power_plant=test_cluster, **parameters)
+        test_tc_mc.run_model(self.weather_df)
+        assert (cache.hits, cache.misses) == (0, 1)
+        power_output_exp = test_tc_mc.power_output
+        # Nearly identical weather data results in a cache hit
+        weather_df = self.weather_df.copy()
+        weather_df['roughness_length'] = 0.1501
+        test_cluster_2 = wtc.WindTurbineCluster(name='cluster', wind_farms=[
+            wf.WindFarm(name='farm', efficiency=0.9, wind_turbine_fleet=[
+                {'wind_turbine': self.test_turbine,
+                 'number_of_turbines': 3}]),
+            wf.WindFarm(name='farm 2', efficiency=0.9, wind_turbine_fleet=[
+                {'wind_turbine': self.test_turbine_2,
+                 'number_of_turbines': 2}])])
+        test_tc_mc = tc_mc.TurbineClusterModelChain(
+            power_plant=test_cluster_2, **parameters)
+        test_tc_mc.run_model(weather_df)
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert test_cluster_2.power_curve is test_cluster.power_curve
+        assert test_cluster_2.hub_height == test_cluster.hub_height
+        for wind_farm, wind_farm_exp in zip(test_cluster_2.wind_farms,
+                                            test_cluster.wind_farms):
+            assert_frame_equal(wind_farm.power_curve,
+                               wind_farm_exp.power_curve)
+        test_tc_mc.run_model(self.weather_df)
+        assert (cache.hits, cache.misses) == (2, 1)
+        assert_series_equal(test_tc_mc.power_output, power_output_exp)
+        # Changed smoothing parameters
+        parameters['block_width'] = 0.25
+        test_tc_mc = tc_mc.TurbineClusterModelChain(
+            power_plant=test_cluster_2, **parameters)
+        test_tc_mc.run_model(weather_df)
+        assert (cache.hits, cache.misses) == (2, 2)
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import pytest
 from pandas.util.testing import assert_frame_equal
+from numpy.testing import assert_allclose
 
 from windpowerlib.power_curves import (smooth_power_curve,
                                        wake_losses_to_power_curve)
@@ -56,6 +57,45 @@ class TestPowerCurves:
             parameters['standard_deviation_method'] = 'misspelled'
             smooth_power_curve(**parameters)
 
+    def test_smooth_power_curve_truncate(self):
+        parameters = {'power_curve_wind_speeds': np.arange(0.0, 26.0, 1.0),
+                      'power_curve_values': np.clip(
+                          (np.arange(0.0, 26.0, 1.0) - 3) ** 3 * 1000, 0,
+                          2e6),
+                      'turbulence_intensity': 0.15}
+        smoothed_curve = smooth_power_curve(**parameters)
+        assert list(smoothed_curve.columns) == ['wind_speed', 'value']
+        assert smoothed_curve['wind_speed'].iloc[-1] == 40.0
+        # Truncation beyond the wind speed range does not change the result
+        assert_frame_equal(smooth_power_curve(truncate=100, **parameters),
+                           smoothed_curve)
+        # Truncation at four standard deviations leads to small deviations
+        smoothed_curve_truncated = smooth_power_curve(truncate=4,
+                                                      **parameters)
+        assert_allclose(smoothed_curve_truncated['value'],
+                        smoothed_curve['value'], rtol=0,
+                        atol=1e-4 * smoothed_curve['value'].max())
+        assert not smoothed_curve_truncated.equals(smoothed_curve)
+        # Sum over the offsets within the truncated Gauss distribution of each
+        # wind speed
+        wind_speeds = smoothed_curve['wind_speed'].values
+        values = np.interp(wind_speeds, parameters['power_curve_wind_speeds'],
+                           parameters['power_curve_values'], right=0)
+        standard_deviations = wind_speeds * 0.15
+        values_exp = []
+        for wind_speed, standard_deviation in zip(wind_speeds,
+                                                  standard_deviations):
+            offsets = np.arange(-15.0, 15.5, 0.5)
+            offsets = offsets[np.abs(offsets) <= 2 * standard_deviation]
+            values_exp.append(sum(
+                0.5 * np.exp(-0.5 * (offset / standard_deviation) ** 2) /
+                (standard_deviation * np.sqrt(2 * np.pi)) *
+                np.interp(wind_speed + offset, wind_speeds, values, left=0,
+                          right=0)
+                for offset in offsets) if standard_deviation else 0.0)
+        assert_allclose(smooth_power_curve(truncate=2, **parameters)['value'],
+                        values_exp, rtol=1e-12, atol=1e-6)
+
     def test_wake_losses_to_power_curve(self):
         test_curve = wt.WindTurbine(**self.test_turbine).power_curve
         parameters = {'power_curve_wind_speeds': test_curve['wind_speed'],
@@ -92,6 +132,38 @@ class TestPowerCurves:
         assert_frame_equal(wake_losses_to_power_curve(**parameters),
                            power_curve_exp)
 
+    def test_wake_losses_to_power_curve_efficiency_curve(self):
+        # Efficiency curve with a duplicate wind speed starting above the
+        # first power curve wind speed
+        efficiency_curve = pd.DataFrame(
+            {'wind_speed': [2.0, 4.0, 4.0, 10.0],
+             'efficiency': [1.0, 0.8, 0.8, 0.9]})
+        power_curve = wake_losses_to_power_curve(
+            np.array([0.0, 3.0, 6.0, 12.0]),
+            np.array([0.0, 100.0, 400.0, 1000.0]), efficiency_curve)
+        power_curve_exp = pd.DataFrame(
+            {'wind_speed': [3.0, 6.0, 12.0],
+             'value': [90.0, 400.0 * (0.8 + 0.1 / 3), 900.0]},
+            columns=['wind_speed', 'value'])
+        assert_frame_equal(power_curve, power_curve_exp)
+
+    def test_wake_losses_to_power_curve_unsorted_curves(self):
+        # Unsorted power and efficiency curves with different wind speeds
+        # are sorted and the efficiency is interpolated to the power curve
+        # wind speeds; power curve wind speeds below the efficiency curve are
+        # dropped and the last efficiency is kept above it
+        efficiency_curve = pd.DataFrame(
+            {'wind_speed': [10.0, 2.0, 5.0],
+             'efficiency': [0.9, 1.0, 0.8]})
+        power_curve = wake_losses_to_power_curve(
+            np.array([6.0, 0.0, 12.0, 3.0]),
+            np.array([400.0, 0.0, 1000.0, 100.0]), efficiency_curve)
+        power_curve_exp = pd.DataFrame(
+            {'wind_speed': [3.0, 6.0, 12.0],
+             'value': [100.0 * (1.0 - 0.2 / 3), 400.0 * 0.82, 900.0]},
+            columns=['wind_speed', 'value'])
+        assert_frame_equal(power_curve, power_curve_exp)
+
         # # Raise TypeError if efficiency is not DataFrame
         # with pytest.raises(TypeError):
         #     parameters['wind_farm_efficiency'] = pd.Series([1, 2, 3])
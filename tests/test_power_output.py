@@ -2,11 +2,18 @@ import pandas as pd
 import numpy as np
 import pytest
 from numpy.testing import assert_allclose
-from pandas.util.testing import assert_series_equal
+from pandas.util.testing import assert_series_equal, assert_frame_equal
 
 from windpowerlib.power_output import (power_coefficient_curve,
                                        power_curve,
-                                       power_curve_density_correction)
+                                       power_curve_density_correction,
+                                       power_curve_matrix,
+                                       density_correction_lookup_table,
+                                       power_curve_density_correction_lookup,
+                                       density_correction_lookup_error,
+                                       power_curve_catalog)
+from windpowerlib.tools import CompiledCurve, CurveGrid
+from windpowerlib import power_output, tools
 
 
 class TestPowerOutput:
@@ -175,3 +182,237 @@ class TestPowerOutput:
         with pytest.raises(TypeError):
             parameters['density'] = None
             power_curve_density_correction(**parameters)
+
+    @pytest.mark.parametrize('rows_per_chunk', [10000, 7])
+    def test_power_curve_density_correction_time_series(self, monkeypatch,
+                                                        rows_per_chunk):
+        # Compare vectorized calculation with time step wise calculation, in
+        # one chunk and in chunks of time steps
+        monkeypatch.setattr('windpowerlib.power_output._ROWS_PER_CHUNK',
+                            rows_per_chunk)
+        power_curve_wind_speeds = np.arange(0.0, 26.0, 0.5)
+        power_curve_values = np.clip(
+            (power_curve_wind_speeds - 3) ** 3 * 1000, 0, 2e6)
+        wind_speed = np.linspace(-1.0, 30.0, 200)
+        density = np.linspace(1.0, 1.35, 200)
+        power_output_exp = np.array([np.interp(
+            wind_speed[i], power_curve_wind_speeds * (1.225 / density[i]) ** (
+                np.interp(power_curve_wind_speeds, [7.5, 12.5], [1/3, 2/3])),
+            power_curve_values, left=0, right=0) for i in range(200)])
+        assert_allclose(power_curve_density_correction(
+            wind_speed, power_curve_wind_speeds, power_curve_values, density),
+            power_output_exp)
+
+    def test_power_curve_density_correction_duplicate_wind_speed(self):
+        # Power curve with equal last wind speeds (cut-out) is evaluated like
+        # numpy.interp
+        power_curve_wind_speeds = np.array([0.0, 5.0, 10.0, 25.0, 25.0])
+        power_curve_values = np.array([0.0, 1e5, 1e6, 2e6, 1.5e6])
+        density = np.array([1.225, 1.225, 1.225, 1.1])
+        wind_speed = np.array([25.0, 24.0, 25.1,
+                               25.0 * (1.225 / 1.1) ** (2 / 3)])
+        power_output_exp = np.array([np.interp(
+            wind_speed[i], power_curve_wind_speeds * (1.225 / density[i]) ** (
+                np.interp(power_curve_wind_speeds, [7.5, 12.5], [1/3, 2/3])),
+            power_curve_values, left=0, right=0) for i in range(4)])
+        power_output = power_curve_density_correction(
+            wind_speed, power_curve_wind_speeds, power_curve_values, density)
+        assert not np.isnan(power_output).any()
+        assert_allclose(power_output, power_output_exp)
+        assert power_output[0] == 1.5e6
+
+    def test_power_curve_density_correction_lookup(self):
+        power_curve_wind_speeds = np.arange(0.0, 26.0, 0.5)
+        power_curve_values = np.clip(
+            (power_curve_wind_speeds - 3) ** 3 * 1000, 0, 2e6)
+        density_grid = np.arange(1.0, 1.355, 0.01)
+        lookup_table = density_correction_lookup_table(
+            power_curve_wind_speeds, power_curve_values, density_grid)
+        assert_allclose(lookup_table.columns, density_grid)
+        assert_allclose(np.diff(lookup_table.index), 0.05)
+
+        # Compare lookup with exact density correction below cut-out
+        wind_speed = pd.Series(np.linspace(0.0, 20.0, 100))
+        density = pd.Series(np.linspace(1.05, 1.3, 100))
+        power_output_exp = power_curve_density_correction(
+            wind_speed, power_curve_wind_speeds, power_curve_values, density)
+        power_output = power_curve_density_correction_lookup(
+            wind_speed, lookup_table, density)
+        assert_allclose(power_output, power_output_exp, rtol=0, atol=5e3)
+        assert isinstance(power_output, pd.Series)
+
+        # At wind speeds and densities of the table the exact density
+        # corrected power output is looked up, in between the neighbouring
+        # values are interpolated linearly
+        wind_speed = lookup_table.index.values[[60, 160, 250]]
+        for column in [3, 20]:
+            density = np.full(3, density_grid[column])
+            assert_allclose(
+                power_curve_density_correction_lookup(
+                    wind_speed, lookup_table, density),
+                power_curve_density_correction(
+                    wind_speed, power_curve_wind_speeds, power_curve_values,
+                    density), rtol=1e-12)
+            assert_allclose(
+                power_curve_density_correction_lookup(
+                    wind_speed + 0.02, lookup_table, density),
+                np.interp(wind_speed + 0.02, lookup_table.index,
+                          lookup_table.iloc[:, column]), rtol=1e-12)
+            assert_allclose(
+                power_curve_density_correction_lookup(
+                    wind_speed, lookup_table, density + 0.0025),
+                0.75 * lookup_table.iloc[[60, 160, 250], column].values +
+                0.25 * lookup_table.iloc[[60, 160, 250], column + 1].values,
+                rtol=1e-12)
+        wind_speed = pd.Series(np.linspace(0.0, 20.0, 100))
+        density = pd.Series(np.linspace(1.05, 1.3, 100))
+        assert_series_equal(power_curve(
+            wind_speed, power_curve_wind_speeds, power_curve_values,
+            density=density, density_correction=True,
+            density_grid=density_grid), power_output)
+
+        # Error report
+        error = density_correction_lookup_error(
+            power_curve_wind_speeds, power_curve_values, density_grid,
+            wind_speed=wind_speed, density=density)
+        assert error['max_absolute_error'] < 5e3
+        assert error['max_relative_error'] == pytest.approx(
+            error['max_absolute_error'] / 2e6)
+        error = density_correction_lookup_error(
+            power_curve_wind_speeds, power_curve_values, density_grid)
+        assert error['mean_absolute_error'] < error['max_absolute_error']
+
+        # Raise ValueError due to density grid not equally spaced
+        with pytest.raises(ValueError):
+            density_correction_lookup_table(
+                power_curve_wind_speeds, power_curve_values, [1.0, 1.1, 1.3])
+
+    def test_power_curve_matrix(self):
+        power_curve_wind_speeds = [np.arange(0.0, 26.0, 0.5),
+                                   np.array([3.0, 4.2, 7.0, 13.0, 20.0]),
+                                   np.array([2.5, 10.0])]
+        power_curve_values = [np.clip((power_curve_wind_speeds[0] - 3) ** 3,
+                                      0, 3000),
+                              np.array([10.0, 100.0, 900.0, 2000.0, 2000.0]),
+                              np.array([0.0, 500.0])]
+        # Short and long wind speed time series including wind speeds of the
+        # power curves and wind speeds outside of the power curves
+        for wind_speed in [np.array([-1.0, 3.0, 20.0, 25.5, 30.0]),
+                           np.append(np.linspace(-1.0, 30.0, 300),
+                                     [2.5, 3.0, 10.0, 20.0, 25.5])]:
+            power_output_exp = np.array([
+                np.interp(wind_speed, curve_wind_speeds, curve_values,
+                          left=0, right=0)
+                for curve_wind_speeds, curve_values in zip(
+                    power_curve_wind_speeds, power_curve_values)])
+            assert_allclose(power_curve_matrix(
+                wind_speed, power_curve_wind_speeds, power_curve_values),
+                power_output_exp)
+            # One wind speed time series for each power curve
+            assert_allclose(power_curve_matrix(
+                np.array([wind_speed, wind_speed[::-1], wind_speed]),
+                power_curve_wind_speeds, power_curve_values)[1],
+                power_output_exp[1][::-1])
+
+    def test_out(self):
+        wind_speed = pd.Series(data=[2.0, 5.5, 7.0, 15.0])
+        density = pd.Series(data=[1.3, 1.3, 1.2, 1.1])
+        curve_wind_speeds = np.array([4.0, 5.0, 6.0, 7.0, 8.0])
+        power_curve_values = np.array([0.0, 200.0, 400.0, 600.0, 800.0])
+        compiled_curve = CompiledCurve(curve_wind_speeds, power_curve_values)
+        for parameters in [{}, {'compiled_curve': compiled_curve},
+                           {'density': density, 'density_correction': True},
+                           {'density': density, 'density_correction': True,
+                            'density_grid': np.arange(1.0, 1.4, 0.05)}]:
+            out = np.empty(4)
+            assert power_curve(wind_speed, curve_wind_speeds,
+                               power_curve_values, out=out,
+                               **parameters) is out
+            assert_allclose(out, power_curve(
+                wind_speed, curve_wind_speeds, power_curve_values,
+                **parameters))
+        power_coefficients = np.array([0.3, 0.4, 0.5, 0.4, 0.3])
+        for compiled_curve in [None, CompiledCurve(curve_wind_speeds,
+                                                   power_coefficients)]:
+            out = np.empty(4)
+            assert power_coefficient_curve(
+                wind_speed, curve_wind_speeds, power_coefficients, 80,
+                density, compiled_curve=compiled_curve, out=out) is out
+            assert_allclose(out, power_coefficient_curve(
+                wind_speed, curve_wind_speeds, power_coefficients, 80,
+                density))
+
+    def test_float32(self, monkeypatch):
+        # Single precision wind speeds are calculated in single precision,
+        # also in the interpolation kernels
+        wind_speed = np.array([2.0, 5.5, 7.0, 15.0, 7.9], dtype=np.float32)
+        density = np.array([1.3, 1.3, 1.2, 1.1, 1.225], dtype=np.float32)
+        curve_wind_speeds = np.array([4.0, 5.0, 6.0, 7.5, 8.0])
+        power_curve_values = np.array([0.0, 200.0, 400.0, 600.0, 800.0])
+        power_coefficients = np.array([0.3, 0.4, 0.5, 0.4, 0.3])
+        parameters_list = [
+            {}, {'compiled_curve': CompiledCurve(curve_wind_speeds,
+                                                 power_curve_values)},
+            {'density': density, 'density_correction': True},
+            {'density': density, 'density_correction': True,
+             'density_grid': np.arange(1.0, 1.4, 0.05)}]
+        power_output_exp = [
+            power_curve(wind_speed.astype(float), curve_wind_speeds,
+                        power_curve_values, **parameters)
+            for parameters in parameters_list]
+        power_coefficient_output_exp = power_coefficient_curve(
+            wind_speed.astype(float), curve_wind_speeds, power_coefficients,
+            80, density.astype(float))
+        dtypes = {}
+
+        def record_dtypes(name, function, number_of_arguments):
+            # Records the dtypes of the time series arguments and the result
+            def wrapper(*args):
+                result = function(*args)
+                dtypes.setdefault(name, set()).update(
+                    np.asarray(value).dtype for value in
+                    args[:number_of_arguments] + (result,))
+                return result
+            return wrapper
+
+        for module, name, number_of_arguments in [
+                (power_output, '_interpolate_rows', 3),
+                (power_output, '_bilinear_lookup', 5),
+                (tools, '_interp', 1)]:
+            monkeypatch.setattr(module, name, record_dtypes(
+                name, getattr(module, name), number_of_arguments))
+        for parameters, expected in zip(parameters_list, power_output_exp):
+            result = power_curve(wind_speed, curve_wind_speeds,
+                                 power_curve_values, **parameters)
+            assert result.dtype == np.float32
+            assert_allclose(result, expected, rtol=1e-5)
+        result = power_coefficient_curve(
+            wind_speed, curve_wind_speeds, power_coefficients, 80, density)
+        assert result.dtype == np.float32
+        assert_allclose(result, power_coefficient_output_exp, rtol=1e-5)
+        assert dtypes == {'_interpolate_rows': {np.dtype(np.float32)},
+                          '_bilinear_lookup': {np.dtype(np.float32)},
+                          '_interp': {np.dtype(np.float32)}}
+
+    def test_power_curve_catalog(self):
+        wind_speed = pd.Series([np.nan, 2.0, 5.5, 13.0, 27.0],
+                               index=[10, 11, 12, 13, 14])
+        power_curves = {
+            'a': pd.DataFrame({'wind_speed': [3.0, 5.0, 12.0, 25.0],
+                               'value': [0.0, 100.0, 2000.0, 2000.0]}),
+            'b': pd.DataFrame({'wind_speed': [2.5, 6.0, 10.0, 20.0],
+                               'value': [0.0, 400.0, 900.0, 900.0]})}
+        power_output_exp = pd.DataFrame(
+            {name: power_curve(wind_speed, curve['wind_speed'],
+                               curve['value'])
+             for name, curve in power_curves.items()},
+            index=wind_speed.index)
+        assert_frame_equal(power_curve_catalog(wind_speed, power_curves),
+                           power_output_exp)
+        # Reuse of the common grid of wind speeds
+        curve_grid = CurveGrid(
+            [curve['wind_speed'] for curve in power_curves.values()],
+            [curve['value'] for curve in power_curves.values()],
+            names=list(power_curves.keys()))
+        assert_frame_equal(power_curve_catalog(wind_speed, curve_grid),
+                           power_output_exp)
@@ -0,0 +1,107 @@
+import os
+import pandas as pd
+import numpy as np
+import pytest
+from pandas.util.testing import assert_frame_equal, assert_series_equal
+
+from windpowerlib import streaming
+import windpowerlib.batch_modelchain as batch_mc
+import windpowerlib.modelchain as mc
+import windpowerlib.turbine_cluster_modelchain as tc_mc
+import windpowerlib.wind_farm as wf
+import windpowerlib.wind_turbine as wt
+
+
+class TestStreaming:
+
+    @classmethod
+    def setup_class(self):
+        np.random.seed(0)
+        index = pd.date_range('1/1/2012', periods=50, freq='10min',
+                              tz='Europe/Berlin')
+        self.weather_df = pd.DataFrame(
+            np.column_stack([
+                np.random.uniform(265, 275, (50, 2)),
+                np.random.uniform(99000, 102000, 50),
+                np.random.uniform(0, 20, (50, 2)),
+                np.full(50, 0.15)]),
+            index=index,
+            columns=[np.array(['temperature', 'temperature', 'pressure',
+                               'wind_speed', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 10, 0, 10, 80, 0])])
+        power_curve, nominal_power = wt.get_turbine_data_from_file(
+            'DUMMY 3', 'example/data/example_power_curves.csv')
+        self.test_turbine = wt.WindTurbine(
+            hub_height=100, name='DUMMY 3', power_curve=power_curve,
+            nominal_power=nominal_power)
+
+    def chunks(self, chunksize=16):
+        return (self.weather_df.iloc[start:start + chunksize]
+                for start in range(0, len(self.weather_df), chunksize))
+
+    @pytest.mark.parametrize('parameters', [
+        {},
+        {'wind_speed_model': 'hellman', 'density_correction': True},
+        {'wind_speed_model': 'interpolation_extrapolation',
+         'density_model': 'ideal_gas', 'precision': 'float32'}])
+    def test_modelchain(self, parameters):
+        power_output_exp = mc.ModelChain(
+            self.test_turbine, **parameters).run_model(
+                self.weather_df).power_output
+        test_mc = mc.ModelChain(self.test_turbine, **parameters)
+        power_output = list(streaming.run_model_chunks(test_mc,
+                                                       self.chunks()))
+        assert [len(chunk) for chunk in power_output] == [16, 16, 16, 2]
+        # Only the last chunk is kept by the model chain
+        assert test_mc.power_output is power_output[-1]
+        assert_series_equal(pd.concat(power_output), power_output_exp)
+
+    def test_other_modelchains(self):
+        wind_farm = wf.WindFarm(
+            name='wind farm', wind_turbine_fleet=[
+                {'wind_turbine': self.test_turbine, 'number_of_turbines': 3}])
+        power_output_exp = tc_mc.TurbineClusterModelChain(
+            wind_farm, smoothing=True).run_model(self.weather_df).power_output
+        assert_series_equal(
+            pd.concat(streaming.run_model_chunks(
+                tc_mc.TurbineClusterModelChain(wind_farm, smoothing=True),
+                self.chunks())), power_output_exp)
+        power_output_exp = batch_mc.BatchModelChain(
+            [self.test_turbine]).run_model(self.weather_df).power_output
+        assert_frame_equal(
+            pd.concat(streaming.run_model_chunks(
+                batch_mc.BatchModelChain([self.test_turbine]),
+                self.chunks())), power_output_exp)
+
+    def test_sinks(self, tmpdir):
+        csv_filename = os.path.join(str(tmpdir), 'power_output.csv')
+        binary_filename = os.path.join(str(tmpdir), 'power_output.npy')
+        with streaming.CSVSink(csv_filename) as csv_sink, \
+                streaming.BinarySink(binary_filename) as binary_sink:
+            power_output = pd.concat(streaming.run_model_chunks(
+                mc.ModelChain(self.test_turbine), self.chunks(),
+                sinks=[csv_sink, binary_sink]))
+        power_output_exp = power_output.to_frame()
+        power_output_exp.index = power_output_exp.index.tz_convert(
+            'UTC').tz_localize(None)
+        assert_frame_equal(streaming.BinarySink.read(binary_filename),
+                           power_output_exp, check_names=False,
+                           check_freq=False)
+        csv_power_output = pd.read_csv(csv_filename, index_col=0,
+                                       parse_dates=True)
+        csv_power_output.index = csv_power_output.index.tz_convert('UTC')
+        assert_series_equal(
+            csv_power_output['feedin_power_plant'],
+            power_output.tz_convert('UTC'), check_names=False,
+            check_freq=False)
+
+    def test_read_weather_csv(self, tmpdir):
+        filename = os.path.join(str(tmpdir), 'weather.csv')
+        self.weather_df.to_csv(filename)
+        weather_chunks = list(streaming.read_weather_csv(filename,
+                                                         chunksize=20))
+        assert [len(chunk) for chunk in weather_chunks] == [20, 20, 10]
+        assert_frame_equal(
+            pd.concat(weather_chunks).reset_index(drop=True),
+            self.weather_df.reset_index(drop=True))
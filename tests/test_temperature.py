@@ -22,3 +22,10 @@ class TestTemperature:
         parameters['temperature'] = np.array(parameters['temperature'])
         assert_array_equal(linear_gradient(**parameters), temp_hub_exp)
         assert isinstance(linear_gradient(**parameters), np.ndarray)
+
+    def test_linear_gradient_out(self):
+        out = np.empty(2)
+        temp_hub = linear_gradient(pd.Series(data=[267, 268]), 2, 100,
+                                   out=out)
+        assert temp_hub is out
+        assert_array_equal(out, np.array([266.363, 267.36300]))
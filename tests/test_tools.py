@@ -1,8 +1,12 @@
 import pandas as pd
+import numpy as np
+from numpy.testing import assert_allclose
 from pandas.util.testing import assert_series_equal
 
 from windpowerlib.tools import (linear_interpolation_extrapolation,
-                                logarithmic_interpolation_extrapolation)
+                                logarithmic_interpolation_extrapolation,
+                                CompiledCurve, CurveGrid, Workspace,
+                                WeatherData, RingBuffer)
 
 
 class TestTools:
@@ -75,3 +79,160 @@ class TestTools:
         parameters['target_height'] = 5
         assert_series_equal(logarithmic_interpolation_extrapolation(
             df, **parameters), exp_output)
+
+    def test_compiled_curve(self):
+        curve_wind_speeds = np.array([0.0, 3.0, 3.5, 5.0, 12.0, 25.0])
+        curve_values = np.array([0.0, 0.0, 50.0, 300.0, 2000.0, 2000.0])
+        wind_speed = np.array([-1.0, 0.0, 3.25, 4.0, 11.9, 25.0, 25.1,
+                               np.nan])
+        compiled_curve = CompiledCurve(curve_wind_speeds, curve_values)
+        assert compiled_curve.wind_speed_step == 0.5
+        assert_allclose(compiled_curve.interp(wind_speed), np.interp(
+            wind_speed, curve_wind_speeds, curve_values, left=0, right=0))
+
+        # The first and last wind speed of the curve are part of the table,
+        # so that the cut-out wind speed is not affected by rounding errors
+        # of the step
+        cut_out_curve_wind_speeds = np.round(np.arange(3.0, 25.05, 0.1), 1)
+        cut_out_curve_values = np.minimum(
+            (cut_out_curve_wind_speeds - 3.0) ** 3 * 1000, 2e6)
+        cut_out_compiled_curve = CompiledCurve(cut_out_curve_wind_speeds,
+                                               cut_out_curve_values)
+        assert cut_out_compiled_curve.wind_speeds[0] == 3.0
+        assert cut_out_compiled_curve.wind_speeds[-1] == 25.0
+        cut_out_wind_speed = np.array([3.0, 24.9, 25.0, 25.0 + 1e-12])
+        assert_allclose(
+            cut_out_compiled_curve.interp(cut_out_wind_speed),
+            np.interp(cut_out_wind_speed, cut_out_curve_wind_speeds,
+                      cut_out_curve_values, left=0, right=0), rtol=1e-12)
+        assert cut_out_compiled_curve.interp(cut_out_wind_speed)[2] == 2e6
+
+        # Curve without equally spaced table is interpolated directly
+        curve_wind_speeds[1] = np.pi
+        compiled_curve = CompiledCurve(curve_wind_speeds, curve_values)
+        assert compiled_curve.wind_speed_step is None
+        assert_allclose(compiled_curve.interp(wind_speed), np.interp(
+            wind_speed, curve_wind_speeds, curve_values, left=0, right=0))
+
+        # Curve values are stored in out
+        out = np.empty(len(wind_speed))
+        assert compiled_curve.interp(wind_speed, out=out) is out
+        assert_allclose(out, np.interp(
+            wind_speed, curve_wind_speeds, curve_values, left=0, right=0))
+
+    def test_workspace(self):
+        workspace = Workspace()
+        array = workspace.get('wind_speed_hub', 3)
+        assert array.shape == (3,) and array.dtype == np.float64
+        assert workspace.get('wind_speed_hub', 3) is array
+        assert workspace.get('density_hub', 3) is not array
+        assert workspace.allocations == 2
+        # New array for changed shape or data type
+        assert workspace.get('wind_speed_hub', 4).shape == (4,)
+        assert (workspace.get('wind_speed_hub', 4, np.float32).dtype ==
+                np.float32)
+        assert workspace.allocations == 4
+        assert workspace.nbytes == 16 + 24
+        workspace.clear()
+        assert workspace.nbytes == 0
+
+    def test_curve_grid(self):
+        wind_speed = np.array([np.nan, -1.0, 0.0, 2.4, 3.0, 3.5, 7.25, 11.0,
+                               24.9, 25.0, 25.5, 30.0])
+        # Regular and irregular power curves
+        for curves_wind_speeds in [
+                [[0.0, 3.0, 6.0, 12.0, 25.0], [3.0, 4.5, 12.0]],
+                [[0.0, 3.0, 6.5, 12.0, 25.0], [3.1, 4.7, 11.3]]]:
+            curves_values = [[0.0, 50.0, 400.0, 1000.0, 1000.0],
+                             [0.0, 100.0, 2000.0]]
+            curve_grid = CurveGrid(curves_wind_speeds, curves_values,
+                                   names=['a', 'b'])
+            assert curve_grid.names == ['a', 'b']
+            values = curve_grid.interp(wind_speed)
+            assert values.shape == (2, len(wind_speed))
+            for curve_wind_speeds, curve_values, curve_power in zip(
+                    curves_wind_speeds, curves_values, values):
+                assert_allclose(curve_power, np.interp(
+                    wind_speed, curve_wind_speeds, curve_values, left=0,
+                    right=0), atol=1e-9)
+            # Brackets can be reused
+            brackets = curve_grid.brackets(wind_speed)
+            assert_allclose(curve_grid.interp(brackets=brackets), values)
+            # One power curve for each column of a wind speed matrix
+            assert_allclose(curve_grid.interp_columns(
+                [1, 0, 1], np.column_stack([wind_speed] * 3)),
+                values[[1, 0, 1]].T)
+
+    def test_ring_buffer(self):
+        index = pd.date_range('1/1/2012', periods=7, freq='H',
+                              tz='Europe/Berlin')
+        series = pd.Series(np.arange(7.0), index=index, name='power_output')
+        ring_buffer = RingBuffer(4)
+        assert len(ring_buffer) == 0
+        assert ring_buffer.to_series().empty
+        ring_buffer.append(series.iloc[:3])
+        assert_series_equal(ring_buffer.to_series(), series.iloc[:3],
+                            check_freq=False)
+        # Oldest time steps are overwritten
+        ring_buffer.append(series.iloc[3:5])
+        ring_buffer.append(series.iloc[5:6])
+        assert len(ring_buffer) == 4
+        assert_series_equal(ring_buffer.to_series(), series.iloc[2:6],
+                            check_freq=False)
+        # Only the last time steps of long series are kept
+        ring_buffer.append(series)
+        assert_series_equal(ring_buffer.to_series(), series.iloc[3:],
+                            check_freq=False)
+        ring_buffer.clear()
+        assert len(ring_buffer) == 0
+
+    def test_weather_data(self):
+        weather_df = pd.DataFrame(
+            [[2.0, 4.0, 5.0, 3.9, 267.0], [2.0, 5.0, 8.0, 5.2, 268.0],
+             [3.0, 6.0, 10.0, 6.1, 269.0]],
+            columns=[np.array(['wind_speed'] * 4 + ['temperature']),
+                     np.array([10, 80, 200, 80, 2])])
+        weather = WeatherData(weather_df)
+        assert WeatherData.wrap(weather) is weather
+        assert 'wind_speed' in weather and 'pressure' not in weather
+        assert_allclose(weather.heights('wind_speed'), [10, 80, 80, 200])
+        assert weather.has_height('wind_speed', 80.0)
+        assert not weather.has_height('wind_speed', 100)
+        # Columns are views, which are selected once, and the first column
+        # is used for equal heights
+        column = weather.column('wind_speed', 80)
+        assert weather.column('wind_speed', 80) is column
+        assert_series_equal(column, weather_df['wind_speed'].iloc[:, 1])
+        # Closest heights are ordered like sorted distances of the heights
+        # in column order
+        heights = weather_df['wind_speed'].columns.values
+        for height in [0, 10, 45, 60, 80, 139.9, 140, 150, 500]:
+            assert_allclose(
+                weather.closest_heights('wind_speed', height),
+                heights[np.argsort(np.abs(heights - height),
+                                   kind='stable')][:2])
+            assert (weather.closest_columns('wind_speed', [height])[0] ==
+                    np.argmin(np.abs(heights - height)))
+            assert weather.closest_column('wind_speed', height)[1] is (
+                weather._column(
+                    'wind_speed', np.argmin(np.abs(heights - height))))
+        # Inter- and extrapolation is the same as with the DataFrame
+        df = weather_df['wind_speed'].iloc[:, :3]
+        weather = WeatherData(weather_df.iloc[:, [0, 1, 2, 4]])
+        for height in [5, 80, 90, 140, 240]:
+            assert_series_equal(
+                weather.linear_interpolation_extrapolation('wind_speed',
+                                                           height),
+                linear_interpolation_extrapolation(df, height))
+            assert_series_equal(
+                weather.logarithmic_interpolation_extrapolation('wind_speed',
+                                                                height),
+                logarithmic_interpolation_extrapolation(df, height))
+        # Heights and selections are reused for the same columns
+        new_weather = weather.with_data(weather_df.iloc[1:, [0, 1, 2, 4]])
+        assert new_weather._variables is weather._variables
+        assert_series_equal(
+            new_weather.linear_interpolation_extrapolation('wind_speed', 90),
+            linear_interpolation_extrapolation(df.iloc[1:], 90))
+        assert weather.with_data(weather_df)._variables is not (
+            weather._variables)
@@ -1,5 +1,7 @@
 import pandas as pd
 import numpy as np
+import pytest
+from numpy.testing import assert_allclose
 from pandas.util.testing import assert_series_equal
 
 import windpowerlib.wind_farm as wf
@@ -186,3 +188,184 @@ class TestTurbineClusterModelChain:
             power_plant=test_cluster, **parameters)
         test_tc_mc.run_model(self.weather_df)
         assert_series_equal(test_tc_mc.power_output, power_output_exp)
+
+
+class TestTurbulenceIntensityGrid:
+
+    @classmethod
+    def setup_class(self):
+        self.weather_df = pd.DataFrame(
+            [[267.0, 101125.0, 5.0, 0.15], [268.0, 101000.0, 9.0, 0.15]],
+            columns=[np.array(['temperature', 'pressure', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 0, 10, 0])])
+
+    def test_turbulence_intensity_grid(self):
+        power_curve, nominal_power = wt.get_turbine_data_from_file(
+            'DUMMY 3', 'example/data/example_power_curves.csv')
+        turbine = wt.WindTurbine(hub_height=100, name='DUMMY 3',
+                                 power_curve=power_curve,
+                                 nominal_power=nominal_power)
+        weather_df = self.weather_df.copy()
+        weather_df[('turbulence_intensity', 100)] = [0.1, 0.2]
+        parameters = {'wake_losses_model': None, 'smoothing': True}
+        # Precalculated power curves reproduce the smoothing with the
+        # turbulence intensity of each time step
+        test_farm = wf.WindFarm(name='test farm', wind_turbine_fleet=[
+            {'wind_turbine': turbine, 'number_of_turbines': 3}])
+        test_tc_mc = tc_mc.TurbineClusterModelChain(
+            power_plant=test_farm,
+            turbulence_intensity_grid=np.arange(0.05, 0.26, 0.05),
+            **parameters)
+        test_tc_mc.run_model(weather_df)
+        assert list(test_tc_mc.turbulence_intensity_lookup_table.columns) == \
+            list(np.arange(0.05, 0.26, 0.05))
+        for time_step, turbulence_intensity in enumerate([0.1, 0.2]):
+            weather_time_step = weather_df.copy()
+            weather_time_step['turbulence_intensity'] = turbulence_intensity
+            test_tc_mc_exp = tc_mc.TurbineClusterModelChain(
+                power_plant=test_farm, **parameters)
+            test_tc_mc_exp.run_model(weather_time_step)
+            assert (abs(test_tc_mc.power_output[time_step] -
+                        test_tc_mc_exp.power_output[time_step]) <
+                    1e-3 * nominal_power)
+        # Mean turbulence intensity without turbulence intensity in weather
+        test_tc_mc.run_model(self.weather_df)
+        assert test_tc_mc.turbulence_intensity_lookup_table is None
+        # Density correction is not supported
+        test_tc_mc = tc_mc.TurbineClusterModelChain(
+            power_plant=test_farm, density_correction=True,
+            turbulence_intensity_grid=np.arange(0.05, 0.26, 0.05),
+            **parameters)
+        with pytest.raises(ValueError):
+            test_tc_mc.run_model(weather_df)
+
+
+class TestTurbineHubHeights:
+
+    @classmethod
+    def setup_class(self):
+        self.weather_df = pd.DataFrame(
+            [[267.0, 101125.0, 5.0, 0.15], [268.0, 101000.0, 9.0, 0.15],
+             [266.0, 100800.0, 13.0, 0.15]],
+            columns=[np.array(['temperature', 'pressure', 'wind_speed',
+                               'roughness_length']),
+                     np.array([2, 0, 10, 0])])
+        self.wind_turbines = []
+        for turbine_type, hub_height in [('DUMMY 3', 80), ('DUMMY 4', 160),
+                                         ('DUMMY 3', 160)]:
+            power_curve, nominal_power = wt.get_turbine_data_from_file(
+                turbine_type, 'example/data/example_power_curves.csv')
+            self.wind_turbines.append(wt.WindTurbine(
+                hub_height=hub_height, name=turbine_type,
+                power_curve=power_curve, nominal_power=nominal_power))
+
+    @pytest.mark.parametrize('parameters', [
+        {'wake_losses_model': None},
+        {'wake_losses_model': 'dena_mean', 'density_correction': True},
+        {'wake_losses_model': 'constant_efficiency', 'smoothing': True,
+         'smoothing_order': 'turbine_power_curves'}])
+    def test_turbine_hub_heights(self, parameters):
+        wind_turbine_fleet = [
+            {'wind_turbine': wind_turbine, 'number_of_turbines': number}
+            for wind_turbine, number in zip(self.wind_turbines, [3, 2, 4])]
+        test_cluster = wtc.WindTurbineCluster(name='cluster', wind_farms=[
+            wf.WindFarm(name='farm', efficiency=0.9,
+                        wind_turbine_fleet=wind_turbine_fleet[:2]),
+            wf.WindFarm(name='farm 2', efficiency=0.8,
+                        wind_turbine_fleet=wind_turbine_fleet[2:])])
+        test_tc_mc = tc_mc.TurbineClusterModelChain(
+            power_plant=test_cluster, hub_height_model='turbine_hub_heights',
+            **parameters)
+        test_tc_mc.run_model(self.weather_df)
+        # Sum of the power output of each wind turbine type at its own hub
+        # height
+        power_output_exp = sum(
+            tc_mc.TurbineClusterModelChain(
+                power_plant=wf.WindFarm(
+                    name=wind_farm.name, efficiency=wind_farm.efficiency,
+                    wind_turbine_fleet=[wind_dict]),
+                **parameters).run_model(self.weather_df).power_output
+            for wind_farm in test_cluster.wind_farms
+            for wind_dict in wind_farm.wind_turbine_fleet)
+        assert_allclose(test_tc_mc.power_output, power_output_exp)
+        # Aggregated power curve at the mean hub height is still assigned
+        assert test_tc_mc.power_plant.power_curve is not None
+        # The wind farms of the wind turbine types are reused in the next run
+        # and set up again if a wind turbine fleet changes
+        turbine_type_farms = test_tc_mc._turbine_type_farms()
+        test_tc_mc.run_model(self.weather_df)
+        assert test_tc_mc._turbine_type_farms() is turbine_type_farms
+        assert_allclose(test_tc_mc.power_output, power_output_exp)
+        test_cluster.wind_farms[1].wind_turbine_fleet[0][
+            'number_of_turbines'] = 5
+        test_tc_mc.run_model(self.weather_df)
+        assert test_tc_mc._turbine_type_farms() is not turbine_type_farms
+
+    def test_turbine_hub_heights_single_hub_height(self):
+        # Same result as the mean hub height for equal hub heights
+        test_farm = wf.WindFarm(name='farm', wind_turbine_fleet=[
+            {'wind_turbine': self.wind_turbines[1], 'number_of_turbines': 2},
+            {'wind_turbine': self.wind_turbines[2], 'number_of_turbines': 3}])
+        power_output = tc_mc.TurbineClusterModelChain(
+            power_plant=test_farm, wake_losses_model=None,
+            hub_height_model='turbine_hub_heights').run_model(
+                self.weather_df).power_output
+        power_output_exp = tc_mc.TurbineClusterModelChain(
+            power_plant=test_farm, wake_losses_model=None).run_model(
+                self.weather_df).power_output
+        assert_allclose(power_output, power_output_exp)
+        with pytest.raises(ValueError):
+            tc_mc.TurbineClusterModelChain(
+                power_plant=test_farm, wake_losses_model=None,
+                hub_height_model='turbine_hub_heights',
+                power_output_model='power_coefficient_curve').run_model(
+                    self.weather_df)
+        with pytest.raises(ValueError):
+            tc_mc.TurbineClusterModelChain(
+                power_plant=test_farm, hub_height_model='median').run_model(
+                    self.weather_df)
+
+    def test_append(self):
+        test_farm = wf.WindFarm(name='farm', wind_turbine_fleet=[
+            {'wind_turbine': self.wind_turbines[0], 'number_of_turbines': 2},
+            {'wind_turbine': self.wind_turbines[1], 'number_of_turbines': 3}])
+        for parameters in [{'smoothing': True},
+                           {'hub_height_model': 'turbine_hub_heights'}]:
+            test_tc_mc = tc_mc.TurbineClusterModelChain(
+                power_plant=test_farm, buffer_size=2, **parameters)
+            power_output_exp = test_tc_mc.run_model(
+                self.weather_df).power_output
+            power_curve = test_farm.power_curve
+            for start in range(3):
+                assert_series_equal(
+                    test_tc_mc.append(
+                        self.weather_df.iloc[start:start + 1]).power_output,
+                    power_output_exp.iloc[start:start + 1])
+            # Power curve of the previous run is reused
+            assert test_farm.power_curve is power_curve
+            assert_series_equal(test_tc_mc.power_output_buffer.to_series(),
+                                power_output_exp.iloc[1:])
+        # Power curve is assigned with the first time steps
+        test_tc_mc = tc_mc.TurbineClusterModelChain(power_plant=test_farm)
+        assert_series_equal(
+            test_tc_mc.append(self.weather_df).power_output,
+            tc_mc.TurbineClusterModelChain(power_plant=test_farm).run_model(
+                self.weather_df).power_output)
+
+    def test_threads(self):
+        test_farm = wf.WindFarm(name='farm', wind_turbine_fleet=[
+            {'wind_turbine': self.wind_turbines[0], 'number_of_turbines': 2},
+            {'wind_turbine': self.wind_turbines[1], 'number_of_turbines': 3}])
+        for parameters in [{'smoothing': True},
+                           {'hub_height_model': 'turbine_hub_heights'},
+                           {'hub_height_model': 'turbine_hub_heights',
+                            'density_correction': True,
+                            'density_grid': np.arange(1.0, 1.4, 0.01)}]:
+            assert_series_equal(
+                tc_mc.TurbineClusterModelChain(
+                    power_plant=test_farm, threads=2, **parameters).run_model(
+                        self.weather_df).power_output,
+                tc_mc.TurbineClusterModelChain(
+                    power_plant=test_farm, **parameters).run_model(
+                        self.weather_df).power_output)
@@ -0,0 +1,85 @@
+import pandas as pd
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from pandas.util.testing import assert_frame_equal
+
+from windpowerlib import weather_cube
+import windpowerlib.modelchain as mc
+import windpowerlib.wind_turbine as wt
+
+
+class TestWeatherCube:
+
+    @classmethod
+    def setup_class(self):
+        np.random.seed(1)
+        index = pd.date_range('1/1/2012', periods=24, freq='H')
+        columns = [np.array(['temperature', 'temperature', 'pressure',
+                             'density', 'density', 'wind_speed',
+                             'wind_speed', 'roughness_length']),
+                   np.array([2, 80, 0, 10, 80, 10, 80, 0])]
+        # Roughness length differs between locations and time steps
+        self.weather_dfs = {
+            'cell {}'.format(cell): pd.DataFrame(
+                np.column_stack([
+                    np.random.uniform(265, 275, (24, 2)),
+                    np.random.uniform(99000, 102000, 24),
+                    np.random.uniform(1.1, 1.3, (24, 2)),
+                    np.random.uniform(0, 20, (24, 2)),
+                    np.random.uniform(0.01, 0.5, 24)]),
+                index=index, columns=columns)
+            for cell in range(5)}
+        self.cube = weather_cube.WeatherCube.from_dataframes(
+            self.weather_dfs)
+        power_curve, nominal_power = wt.get_turbine_data_from_file(
+            'DUMMY 3', 'example/data/example_power_curves.csv')
+        power_coefficient_curve, _ = wt.get_turbine_data_from_file(
+            'DUMMY 1', 'example/data/example_power_coefficient_curves.csv')
+        self.test_turbine = wt.WindTurbine(
+            hub_height=100, rotor_diameter=70, name='DUMMY 3',
+            power_curve=power_curve, nominal_power=nominal_power,
+            power_coefficient_curve=power_coefficient_curve)
+
+    def test_weather_cube(self):
+        assert self.cube.shape == (24, 5, 8)
+        assert list(self.cube.locations) == list(self.weather_dfs)
+        for location, weather_df in self.weather_dfs.items():
+            assert_frame_equal(self.cube.location(location), weather_df)
+        # Flattened weather data shares the memory of the cube
+        assert self.cube.weather_df is self.cube.weather_df
+        assert np.shares_memory(self.cube.weather_df.values, self.cube.data)
+        assert_allclose(
+            self.cube.weather_df['wind_speed'][80].values[1::5],
+            self.weather_dfs['cell 1']['wind_speed'][80])
+        with pytest.raises(ValueError):
+            weather_cube.WeatherCube(self.cube.data[0], self.cube.columns)
+        with pytest.raises(ValueError):
+            weather_cube.WeatherCube(self.cube.data, self.cube.columns,
+                                     locations=['cell 1'])
+        with pytest.raises(ValueError):
+            weather_cube.WeatherCube.from_dataframes({
+                'cell 1': self.weather_dfs['cell 1'],
+                'cell 2': self.weather_dfs['cell 2'].iloc[:, 1:]})
+
+    @pytest.mark.parametrize('parameters', [
+        {},
+        {'wind_speed_model': 'hellman', 'density_model': 'ideal_gas',
+         'density_correction': True},
+        {'wind_speed_model': 'interpolation_extrapolation',
+         'temperature_model': 'interpolation_extrapolation',
+         'density_model': 'interpolation_extrapolation',
+         'power_output_model': 'power_coefficient_curve'},
+        {'wind_speed_model': 'log_interpolation_extrapolation',
+         'precision': 'float32'}])
+    def test_run_model_cube(self, parameters):
+        power_output = mc.ModelChain(
+            self.test_turbine, **parameters).run_model_cube(
+                self.cube).power_output
+        assert power_output.shape == (24, 5)
+        assert list(power_output.columns) == list(self.weather_dfs)
+        for location, weather_df in self.weather_dfs.items():
+            assert_allclose(
+                power_output[location],
+                mc.ModelChain(self.test_turbine, **parameters).run_model(
+                    weather_df).power_output, rtol=1e-6)
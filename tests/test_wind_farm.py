@@ -0,0 +1,178 @@
+import copy
+import pickle
+import pandas as pd
+import numpy as np
+import pytest
+from pandas.util.testing import assert_frame_equal
+
+import windpowerlib.wind_farm as wf
+import windpowerlib.wind_turbine as wt
+
+
+class TestWindFarm:
+
+    @classmethod
+    def setup_class(self):
+        self.test_turbine = wt.WindTurbine(
+            hub_height=100, name='turbine', nominal_power=1000.0,
+            power_curve=pd.DataFrame({'wind_speed': [0.0, 4.0, 10.0, 25.0],
+                                      'value': [0.0, 100.0, 1000.0, 1000.0]}))
+        self.test_turbine_2 = wt.WindTurbine(
+            hub_height=80, name='turbine 2', nominal_power=500.0,
+            power_curve=pd.DataFrame({'wind_speed': [3.0, 7.0, 11.0],
+                                      'value': [0.0, 250.0, 500.0]}))
+
+    def test_assign_power_curve_unsorted(self):
+        # The power curves of the wind turbines are sorted before they are
+        # padded with zeros and aggregated
+        test_turbine = wt.WindTurbine(
+            hub_height=100, name='turbine', nominal_power=1000.0,
+            power_curve=pd.DataFrame({'wind_speed': [10.0, 0.0, 25.0, 4.0],
+                                      'value': [1000.0, 0.0, 1000.0, 100.0]}))
+        test_farm = wf.WindFarm(name='farm', wind_turbine_fleet=[
+            {'wind_turbine': test_turbine, 'number_of_turbines': 2}])
+        test_farm.assign_power_curve(wake_losses_model=None)
+        power_curve_exp = pd.DataFrame(
+            {'wind_speed': [0.0, 4.0, 10.0, 25.0, 25.5],
+             'value': [0.0, 200.0, 2000.0, 2000.0, 0.0]},
+            columns=['wind_speed', 'value'])
+        assert_frame_equal(test_farm.power_curve, power_curve_exp)
+
+    def test_assign_power_curve(self):
+        test_farm = wf.WindFarm(name='farm', wind_turbine_fleet=[
+            {'wind_turbine': self.test_turbine, 'number_of_turbines': 2},
+            {'wind_turbine': self.test_turbine_2, 'number_of_turbines': 3}])
+        test_farm.assign_power_curve(wake_losses_model=None)
+        # Power curves are padded with zeros, interpolated to the union of
+        # their wind speeds and summed up
+        wind_speeds = np.array([0.0, 3.0, 4.0, 7.0, 10.0, 11.0, 11.5, 25.0,
+                                25.5])
+        values = (2 * np.interp(wind_speeds, [0.0, 4.0, 10.0, 25.0, 25.5],
+                                [0.0, 100.0, 1000.0, 1000.0, 0.0]) +
+                  3 * np.interp(wind_speeds, [0.0, 3.0, 7.0, 11.0, 11.5],
+                                [0.0, 0.0, 250.0, 500.0, 0.0]))
+        power_curve_exp = pd.DataFrame(
+            {'wind_speed': wind_speeds, 'value': values},
+            columns=['wind_speed', 'value'])
+        assert_frame_equal(test_farm.power_curve, power_curve_exp)
+
+        # Constant efficiency
+        test_farm.efficiency = 0.9
+        with pytest.warns(FutureWarning):
+            test_farm.assign_power_curve(
+                wake_losses_model='constant_efficiency')
+        power_curve_exp['value'] *= 0.9
+        assert_frame_equal(test_farm.power_curve, power_curve_exp)
+
+        # Smoothing keeps the wind speeds sorted
+        test_farm.assign_power_curve(
+            wake_losses_model=None, smoothing=True, roughness_length=0.1,
+            smoothing_order='turbine_power_curves')
+        assert test_farm.power_curve['wind_speed'].is_monotonic_increasing
+        assert test_farm.power_curve['wind_speed'].is_unique
+
+    def test_turbine_power_output(self):
+        test_farm = wf.WindFarm(name='farm', wind_turbine_fleet=[
+            {'wind_turbine': self.test_turbine, 'number_of_turbines': 2},
+            {'wind_turbine': self.test_turbine_2, 'number_of_turbines': 3}])
+        wind_speed = pd.Series([2.0, 5.0, 9.0, 12.0])
+        power_output_exp = pd.DataFrame({
+            'turbine': 2 * np.interp(wind_speed, [0.0, 4.0, 10.0, 25.0],
+                                     [0.0, 100.0, 1000.0, 1000.0]),
+            'turbine 2': 3 * np.interp(wind_speed, [3.0, 7.0, 11.0],
+                                       [0.0, 250.0, 500.0], right=0)})
+        assert_frame_equal(test_farm.turbine_power_output(wind_speed),
+                           power_output_exp)
+        # The common grid of wind speeds is reused
+        assert test_farm.curve_grid is test_farm.curve_grid
+
+    def test_cached_values(self):
+        test_turbine = copy.copy(self.test_turbine)
+        fleet = [{'wind_turbine': test_turbine, 'number_of_turbines': 2},
+                 {'wind_turbine': self.test_turbine_2,
+                  'number_of_turbines': 3}]
+        test_farm = wf.WindFarm(name='farm', wind_turbine_fleet=fleet)
+        # The fleet is copied, changes are tracked in the fleet of the farm
+        assert test_farm.wind_turbine_fleet == fleet
+        assert test_farm.wind_turbine_fleet is not fleet
+        fleet = test_farm.wind_turbine_fleet
+        assert test_farm.nominal_power == 3500.0
+        assert test_farm.mean_hub_height().hub_height == pytest.approx(
+            np.exp((2000.0 * np.log(100) + 1500.0 * np.log(80)) / 3500.0))
+        test_farm.assign_power_curve(wake_losses_model=None)
+        power_curve = test_farm.power_curve
+        # Unchanged wind farm: the power curve is reused
+        test_farm.assign_power_curve(wake_losses_model=None)
+        assert test_farm.power_curve is power_curve
+        # Changed parameters, fleet entries and wind turbines are detected
+        test_farm.assign_power_curve(wake_losses_model=None, smoothing=True,
+                                     roughness_length=0.1)
+        assert test_farm.power_curve is not power_curve
+        power_curve = test_farm.power_curve
+        fleet[1]['number_of_turbines'] = 1
+        test_farm.assign_power_curve(wake_losses_model=None, smoothing=True,
+                                     roughness_length=0.1)
+        assert test_farm.power_curve is not power_curve
+        assert test_farm.nominal_power == 2500.0
+        test_turbine.hub_height = 120
+        test_turbine.nominal_power = 1500.0
+        assert test_farm.nominal_power == 3500.0
+        assert test_farm.mean_hub_height().hub_height == pytest.approx(
+            np.exp((3000.0 * np.log(120) + 500.0 * np.log(80)) / 3500.0))
+        fleet.pop()
+        assert test_farm.nominal_power == 3000.0
+        # A set nominal power is kept
+        test_farm.nominal_power = 100.0
+        assert test_farm.nominal_power == 100.0
+        assert test_farm.get_installed_power() == 3000.0
+
+    def test_change_tracking(self):
+        test_turbine = copy.copy(self.test_turbine)
+        test_farm = wf.WindFarm(name='farm', efficiency=0.9,
+                                wind_turbine_fleet=[
+                                    {'wind_turbine': test_turbine,
+                                     'number_of_turbines': 2}])
+        test_farm.mean_hub_height()
+        test_farm.assign_power_curve(wake_losses_model='constant_efficiency')
+        power_curve = test_farm.power_curve
+        # Cached values are returned without going through the fleet
+        list.__setitem__(test_farm.wind_turbine_fleet, 0, None)
+        assert test_farm.nominal_power == 2000.0
+        assert test_farm.mean_hub_height().hub_height == pytest.approx(100.0)
+        test_farm.assign_power_curve(wake_losses_model='constant_efficiency')
+        assert test_farm.power_curve is power_curve
+        # Modifications of the fleet, its entries, the wind turbines and the
+        # efficiency invalidate the cached values
+        test_farm.wind_turbine_fleet = [{'wind_turbine': test_turbine,
+                                         'number_of_turbines': 2}]
+        test_farm.wind_turbine_fleet.append({
+            'wind_turbine': self.test_turbine_2, 'number_of_turbines': 2})
+        assert test_farm.nominal_power == 3000.0
+        test_farm.wind_turbine_fleet[1].update(number_of_turbines=4)
+        assert test_farm.nominal_power == 4000.0
+        test_turbine.nominal_power = 2000.0
+        assert test_farm.nominal_power == 6000.0
+        del test_farm.wind_turbine_fleet[1]
+        assert test_farm.mean_hub_height().hub_height == pytest.approx(100.0)
+        test_farm.assign_power_curve(wake_losses_model='constant_efficiency')
+        power_curve = test_farm.power_curve
+        test_farm.efficiency = 0.8
+        test_farm.assign_power_curve(wake_losses_model='constant_efficiency')
+        assert test_farm.power_curve is not power_curve
+        # Wind turbines in several wind farms invalidate all of them
+        test_farm_2 = wf.WindFarm(
+            name='farm 2', wind_turbine_fleet=test_farm.wind_turbine_fleet)
+        assert test_farm_2.nominal_power == 4000.0
+        test_turbine.nominal_power = 1000.0
+        assert test_farm.nominal_power == test_farm_2.nominal_power == 2000.0
+        # Copies track their own changes
+        for test_farm_copy in [copy.deepcopy(test_farm),
+                               pickle.loads(pickle.dumps(test_farm))]:
+            test_farm_copy.wind_turbine_fleet[0]['wind_turbine'].hub_height = (
+                50)
+            test_farm_copy.wind_turbine_fleet[0]['number_of_turbines'] = 3
+            assert test_farm_copy.nominal_power == 3000.0
+            assert test_farm_copy.mean_hub_height().hub_height == (
+                pytest.approx(50.0))
+        assert test_farm.nominal_power == 2000.0
+        assert test_farm.mean_hub_height().hub_height == pytest.approx(100.0)
@@ -99,3 +99,25 @@ class TestWindSpeed:
         parameters['roughness_length'] = 0.15
         parameters['hellman_exponent'] = 0.2
         assert_series_equal(hellman(**parameters), v_wind_hub_exp)
+
+    def test_out(self):
+        parameters = {'wind_speed': pd.Series(data=[5.0, 6.5]),
+                      'wind_speed_height': 10,
+                      'hub_height': 100,
+                      'roughness_length': pd.Series(data=[0.15, 0.15])}
+        for obstacle_height in [0, 12]:
+            out = np.empty(2)
+            assert logarithmic_profile(
+                obstacle_height=obstacle_height, out=out,
+                **parameters) is out
+            assert_allclose(out, logarithmic_profile(
+                obstacle_height=obstacle_height, **parameters))
+        for hellman_exponent in [None, 0.2]:
+            out = np.empty(2)
+            assert hellman(hellman_exponent=hellman_exponent, out=out,
+                           **parameters) is out
+            assert_allclose(out, hellman(hellman_exponent=hellman_exponent,
+                                         **parameters))
+        out = np.empty(2)
+        assert_allclose(hellman(parameters['wind_speed'], 10, 100, out=out),
+                        hellman(parameters['wind_speed'], 10, 100))
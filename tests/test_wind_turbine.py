@@ -1,8 +1,16 @@
 import pytest
 import os
+import copy
+import pickle
+import weakref
+import warnings
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
 
 from windpowerlib.wind_turbine import (get_turbine_data_from_file, WindTurbine,
-                                       get_turbine_types)
+                                       ExtensibleWindTurbine,
+                                       get_turbine_types, TurbineType,
+                                       TurbineTypeRegistry)
 
 
 class TestWindTurbine:
@@ -31,6 +39,19 @@ class TestWindTurbine:
         with pytest.raises(KeyError):
             WindTurbine(**self.test_turbine_data)
 
+    def test_missing_parameters(self):
+        power_curve = pd.DataFrame({'wind_speed': [0.0, 10.0],
+                                    'value': [0.0, 1000.0]})
+        # Raise ValueError due to missing `name` and `turbine_type`
+        with pytest.raises(ValueError):
+            WindTurbine(hub_height=100, power_curve=power_curve)
+        # Raise ValueError due to missing `hub_height`
+        with pytest.raises(ValueError):
+            WindTurbine(name='turbine', power_curve=power_curve)
+        with pytest.raises(ValueError):
+            WindTurbine(turbine_type=TurbineType(
+                'custom', power_curve=power_curve))
+
     def test_get_turbine_data_from_file(self):
         # Raise FileNotFoundError due to missing
         with pytest.raises(FileNotFoundError):
@@ -40,3 +61,107 @@ class TestWindTurbine:
     def test_get_turbine_types(self):
         get_turbine_types(print_out=True, filter_=True)
         get_turbine_types(print_out=False, filter_=False)
+
+    def test_compiled_power_curve(self):
+        source = os.path.join(os.path.dirname(__file__), '../example/data',
+                              'example_power_curves.csv')
+        test_turbine = WindTurbine(name='DUMMY 3', hub_height=100,
+                                   fetch_curve='power_curve',
+                                   data_source=source)
+        compiled_curve = test_turbine.compiled_power_curve
+        assert compiled_curve.wind_speed_step == 0.5
+        # Compiled power curve is reused until the power curve is replaced
+        assert test_turbine.compiled_power_curve is compiled_curve
+        test_turbine.power_curve = test_turbine.power_curve.copy()
+        assert test_turbine.compiled_power_curve is not compiled_curve
+        assert test_turbine.compiled_power_coefficient_curve is None
+
+
+class TestTurbineTypeRegistry:
+
+    @classmethod
+    def setup_class(cls):
+        cls.source = os.path.join(os.path.dirname(__file__), '../example',
+                                  'data', 'example_power_curves.csv')
+
+    def test_wind_turbine(self):
+        registry = TurbineTypeRegistry(data_source=self.source)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', FutureWarning)
+            turbine_1 = registry.wind_turbine('DUMMY 3', hub_height=100)
+            turbine_2 = registry.wind_turbine('DUMMY 3', hub_height=120,
+                                              coordinates=[52.0, 13.0])
+        # Same data as a wind turbine fetching the turbine data
+        with pytest.warns(FutureWarning):
+            fetched_turbine = WindTurbine(name='DUMMY 3', hub_height=100,
+                                          fetch_curve='power_curve',
+                                          data_source=self.source)
+        assert turbine_1.name == fetched_turbine.name
+        assert turbine_1.nominal_power == fetched_turbine.nominal_power
+        assert_frame_equal(turbine_1.power_curve,
+                           fetched_turbine.power_curve.reset_index(drop=True),
+                           check_dtype=False)
+        # Wind turbines share the interned turbine type
+        assert turbine_1.turbine_type is turbine_2.turbine_type
+        assert turbine_1.power_curve is turbine_2.power_curve
+        assert (turbine_1.compiled_power_curve is
+                turbine_2.compiled_power_curve)
+        assert turbine_2.hub_height == 120
+        assert turbine_2.coordinates == [52.0, 13.0]
+        assert len(registry) == 1 and 'DUMMY 3' in registry
+        # Copies keep the shared data
+        turbine_copy = copy.copy(turbine_1)
+        turbine_copy.hub_height = 80
+        assert turbine_1.hub_height == 100
+        assert turbine_copy.power_curve is turbine_1.power_curve
+
+    def test_immutable_turbine_type(self):
+        registry = TurbineTypeRegistry(data_source=self.source)
+        turbine_type = registry.get('DUMMY 3')
+        with pytest.raises(AttributeError):
+            turbine_type.nominal_power = 1
+        with pytest.raises(ValueError):
+            turbine_type.power_curve['value'].values[0] = 1.0
+        turbine = registry.wind_turbine('DUMMY 3', hub_height=100)
+        # Wind turbines have no `__dict__` but can be weakly referenced,
+        # copied and pickled
+        with pytest.raises(AttributeError):
+            turbine.operator = 'operator'
+        assert not hasattr(turbine, '__dict__')
+        assert weakref.ref(turbine)() is turbine
+        turbine_copy = pickle.loads(pickle.dumps(turbine))
+        assert turbine_copy.hub_height == 100
+        assert turbine_copy.name == 'DUMMY 3'
+        # Further attributes can be set on extensible wind turbines and are
+        # kept by copies and pickles
+        turbine_2 = ExtensibleWindTurbine(turbine_type=turbine_type,
+                                          hub_height=100)
+        turbine_2.operator = 'operator'
+        assert copy.copy(turbine_2).operator == 'operator'
+        turbine_copy = pickle.loads(pickle.dumps(turbine_2))
+        assert turbine_copy.operator == 'operator'
+        assert turbine_copy.power_curve is not None
+        # Replaced power curve of a single wind turbine
+        turbine.power_curve = pd.DataFrame({'wind_speed': [0.0, 10.0],
+                                            'value': [0.0, 1.0]})
+        assert (turbine.compiled_power_curve is not
+                turbine_type.compiled_power_curve)
+
+    def test_register(self):
+        registry = TurbineTypeRegistry(data_source=self.source)
+        turbine_type = TurbineType(
+            'custom', nominal_power=2e6,
+            power_curve={'wind_speed': [3.0, 12.0], 'value': [0.0, 2e6]})
+        assert registry.register(turbine_type) is turbine_type
+        assert registry.get('custom') is turbine_type
+        with pytest.raises(ValueError):
+            registry.register(turbine_type)
+
+    def test_error_raising(self):
+        with pytest.raises(ValueError):
+            TurbineTypeRegistry(fetch_curve='misspelling')
+        with pytest.raises(FileNotFoundError):
+            TurbineTypeRegistry(data_source='not_existent').get('DUMMY 3')
+        with pytest.raises(SystemExit):
+            TurbineTypeRegistry(data_source=self.source).get(
+                'turbine_not_in_file')
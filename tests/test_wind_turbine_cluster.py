@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pandas.util.testing import assert_frame_equal
+
+import windpowerlib.wind_farm as wf
+import windpowerlib.wind_turbine as wt
+import windpowerlib.wind_turbine_cluster as wtc
+
+
+class TestWindTurbineCluster:
+
+    @classmethod
+    def setup_class(self):
+        self.test_turbine = wt.WindTurbine(
+            hub_height=100, name='turbine', nominal_power=1000.0,
+            power_curve=pd.DataFrame({'wind_speed': [0.0, 4.0, 10.0, 25.0],
+                                      'value': [0.0, 100.0, 1000.0, 1000.0]}))
+        self.test_turbine_2 = wt.WindTurbine(
+            hub_height=80, name='turbine 2', nominal_power=500.0,
+            power_curve=pd.DataFrame({'wind_speed': [3.0, 7.0, 11.0],
+                                      'value': [0.0, 250.0, 500.0]}))
+
+    def create_cluster(self, efficiencies):
+        return wtc.WindTurbineCluster(name='cluster', wind_farms=[
+            wf.WindFarm(name='farm {}'.format(number), efficiency=efficiency,
+                        wind_turbine_fleet=[
+                            {'wind_turbine': self.test_turbine,
+                             'number_of_turbines': number + 1},
+                            {'wind_turbine': self.test_turbine_2,
+                             'number_of_turbines': 2}])
+            for number, efficiency in enumerate(efficiencies)])
+
+    def test_assign_power_curve_executor(self):
+        parameters = {'wake_losses_model': 'constant_efficiency',
+                      'smoothing': True, 'roughness_length': 0.1}
+        efficiencies = [0.9, 0.8, 0.85, 0.95]
+        test_cluster = self.create_cluster(efficiencies)
+        test_cluster.assign_power_curve(**parameters)
+        # Same result with every executor
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for test_executor in ['thread', 'process', executor]:
+                test_cluster_2 = self.create_cluster(efficiencies)
+                test_cluster_2.assign_power_curve(
+                    executor=test_executor, max_workers=2, **parameters)
+                assert_frame_equal(test_cluster_2.power_curve,
+                                   test_cluster.power_curve)
+                for wind_farm, wind_farm_exp in zip(
+                        test_cluster_2.wind_farms, test_cluster.wind_farms):
+                    assert wind_farm.hub_height == wind_farm_exp.hub_height
+                    assert_frame_equal(wind_farm.power_curve,
+                                       wind_farm_exp.power_curve)
+
+    def test_assign_power_curve_executor_errors(self):
+        # Wind farms without efficiency fail
+        test_cluster = self.create_cluster([0.9, None, 0.8, None])
+        with pytest.raises(wtc.PowerCurveAssignmentError) as error:
+            test_cluster.assign_power_curve(
+                wake_losses_model='constant_efficiency', executor='thread')
+        assert [name for name, _ in error.value.errors] == ['farm 1',
+                                                            'farm 3']
+        with pytest.raises(ValueError):
+            test_cluster.assign_power_curve(executor='fork')
+
+    def test_assign_power_curve_executor_base_exception(self):
+        # Exceptions not derived from Exception, e.g. the SystemExit of
+        # get_turbine_data_from_file, are collected as well
+        class ExitingWindFarm(wf.WindFarm):
+            def assign_power_curve(self, **kwargs):
+                raise SystemExit('turbine not in file')
+
+        test_cluster = self.create_cluster([0.9])
+        test_cluster.wind_farms.append(ExitingWindFarm(
+            name='exiting farm', wind_turbine_fleet=[
+                {'wind_turbine': self.test_turbine,
+                 'number_of_turbines': 1}]))
+        with pytest.raises(wtc.PowerCurveAssignmentError) as error:
+            test_cluster.assign_power_curve(wake_losses_model=None,
+                                            executor='thread')
+        assert [name for name, _ in error.value.errors] == ['exiting farm']
+        assert isinstance(error.value.errors[0][1], SystemExit)
+
+    def test_assign_power_curve_executor_changed_farms(self):
+        class CountingExecutor(ThreadPoolExecutor):
+            submitted = []
+
+            def submit(self, fn, *args, **kwargs):
+                self.submitted.append(args[0].name)
+                return super().submit(fn, *args, **kwargs)
+
+        test_cluster = self.create_cluster([0.9, 0.8, 0.85])
+        parameters = {'wake_losses_model': None}
+        with CountingExecutor(max_workers=2) as executor:
+            test_cluster.assign_power_curve(executor=executor, **parameters)
+            assert executor.submitted == ['farm 0', 'farm 1', 'farm 2']
+            power_curve = test_cluster.power_curve
+            # Unchanged wind farms are not sent to the executor
+            del executor.submitted[:]
+            test_cluster.assign_power_curve(executor=executor, **parameters)
+            assert executor.submitted == []
+            assert test_cluster.power_curve is power_curve
+            test_cluster.wind_farms[2].wind_turbine_fleet[1][
+                'number_of_turbines'] = 3
+            test_cluster.assign_power_curve(executor=executor, **parameters)
+            assert executor.submitted == ['farm 2']
+        # Results of a process pool are cached in the original wind farms
+        test_cluster = self.create_cluster([0.9, 0.8])
+        test_cluster.assign_power_curve(executor='process', max_workers=2,
+                                        **parameters)
+        farm_power_curves = [wind_farm.power_curve
+                             for wind_farm in test_cluster.wind_farms]
+        test_cluster.assign_power_curve(executor='process', max_workers=2,
+                                        **parameters)
+        assert all(wind_farm.power_curve is power_curve for
+                   wind_farm, power_curve in zip(test_cluster.wind_farms,
+                                                 farm_power_curves))
+
+    def test_cached_values(self):
+        test_cluster = self.create_cluster([0.9, 0.8])
+        parameters = {'wake_losses_model': 'constant_efficiency'}
+        with pytest.warns(FutureWarning):
+            test_cluster.assign_power_curve(**parameters)
+        power_curve = test_cluster.power_curve
+        farm_power_curves = [wind_farm.power_curve
+                             for wind_farm in test_cluster.wind_farms]
+        assert test_cluster.nominal_power == 5000.0
+        # Unchanged wind farms are not recalculated
+        with pytest.warns(FutureWarning):
+            test_cluster.assign_power_curve(**parameters)
+        assert test_cluster.power_curve is power_curve
+        # Only the changed wind farm and the cluster are recalculated
+        test_cluster.wind_farms[1].wind_turbine_fleet[0][
+            'number_of_turbines'] = 4
+        with pytest.warns(FutureWarning):
+            test_cluster.assign_power_curve(**parameters)
+        assert test_cluster.wind_farms[0].power_curve is farm_power_curves[0]
+        assert (test_cluster.wind_farms[1].power_curve is not
+                farm_power_curves[1])
+        assert test_cluster.power_curve is not power_curve
+        assert test_cluster.nominal_power == 7000.0
+        # Same result as a new wind turbine cluster
+        test_cluster_exp = self.create_cluster([0.9, 0.8])
+        test_cluster_exp.wind_farms[1].wind_turbine_fleet[0][
+            'number_of_turbines'] = 4
+        with pytest.warns(FutureWarning):
+            test_cluster_exp.assign_power_curve(**parameters)
+        assert_frame_equal(test_cluster.power_curve,
+                           test_cluster_exp.power_curve)
+        assert (test_cluster.mean_hub_height().hub_height ==
+                test_cluster_exp.mean_hub_height().hub_height)
+
+    def test_change_tracking(self):
+        test_cluster = self.create_cluster([0.9, 0.8])
+        parameters = {'wake_losses_model': None}
+        test_cluster.assign_power_curve(**parameters)
+        test_cluster.mean_hub_height()
+        power_curve = test_cluster.power_curve
+        hub_height = test_cluster.hub_height
+        # Cached values are returned without going through the wind farms
+        wind_farms = list(test_cluster.wind_farms)
+        list.__setitem__(test_cluster.wind_farms, 0, None)
+        assert test_cluster.nominal_power == 5000.0
+        assert test_cluster.mean_hub_height().hub_height == hub_height
+        test_cluster.assign_power_curve(**parameters)
+        assert test_cluster.power_curve is power_curve
+        # Modifications of the wind farms and of their wind turbines
+        # invalidate the cached values
+        test_cluster.wind_farms = wind_farms
+        test_cluster.wind_farms[0].wind_turbine_fleet[1][
+            'number_of_turbines'] = 4
+        assert test_cluster.nominal_power == 6000.0
+        test_cluster.wind_farms.pop()
+        assert test_cluster.nominal_power == 3000.0
+        test_cluster.assign_power_curve(**parameters)
+        assert test_cluster.power_curve is not power_curve
+        power_curve = test_cluster.power_curve
+        test_turbine = wt.WindTurbine(
+            hub_height=100, name='turbine', nominal_power=2000.0,
+            power_curve=self.test_turbine.power_curve)
+        test_cluster.wind_farms[0].wind_turbine_fleet[0][
+            'wind_turbine'] = test_turbine
+        test_cluster.assign_power_curve(**parameters)
+        assert_frame_equal(test_cluster.power_curve, power_curve)
+        assert test_cluster.nominal_power == 4000.0
+        power_curve = test_cluster.power_curve
+        test_turbine.hub_height = 50
+        # The hub height of the cluster is calculated from the hub heights of
+        # the wind farms
+        test_cluster.wind_farms[0].mean_hub_height()
+        assert test_cluster.mean_hub_height().hub_height == pytest.approx(
+            np.exp((2000.0 * np.log(50) + 2000.0 * np.log(80)) / 4000.0))
+        test_turbine.power_curve = self.test_turbine_2.power_curve
+        test_cluster.assign_power_curve(**parameters)
+        assert test_cluster.power_curve is not power_curve
@@ -2,9 +2,12 @@ __copyright__ = "Copyright oemof developer group"
 __license__ = "GPLv3"
 __version__ = '0.1.2dev'
 
-from windpowerlib.wind_turbine import WindTurbine
+from windpowerlib.wind_turbine import WindTurbine, TurbineTypeRegistry
 from windpowerlib.wind_farm import WindFarm
 from windpowerlib.wind_turbine_cluster import WindTurbineCluster
 from windpowerlib.modelchain import ModelChain
 from windpowerlib.turbine_cluster_modelchain import TurbineClusterModelChain
+from windpowerlib.fleet_modelchain import FleetModelChain
+from windpowerlib.batch_modelchain import BatchModelChain
+from windpowerlib.weather_cube import WeatherCube
 from windpowerlib.wind_turbine import get_turbine_types
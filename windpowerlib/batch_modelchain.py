@@ -0,0 +1,193 @@
+"""
+The ``batch_modelchain`` module contains a model chain for calculating the
+power output of many wind turbines with the same weather data.
+
+"""
+
+__copyright__ = "Copyright oemof developer group"
+__license__ = "GPLv3"
+
+import logging
+import numpy as np
+import pandas as pd
+from windpowerlib import power_output
+from windpowerlib.modelchain import ModelChain
+
+
+class BatchModelChain(object):
+    r"""
+    Model to determine the output of many wind turbines with the same weather
+    data.
+
+    The wind turbines are grouped by the parameters of their
+    :class:`~.modelchain.ModelChain` that wind speed, temperature and density
+    at hub height depend on. For each group these are calculated once for
+    each distinct hub height in a single pass (see
+    :py:func:`~.modelchain.ModelChain.wind_speed_hub_heights`), so that only
+    the power output is calculated for each wind turbine. The power curves of
+    all wind turbines of a group without density correction are evaluated
+    together (see :py:func:`~.power_output.power_curve_columns`).
+
+    Parameters
+    ----------
+    power_plants : list
+        :class:`~.wind_turbine.WindTurbine` objects, which are calculated
+        with a :class:`~.modelchain.ModelChain` with the parameters `kwargs`,
+        or :class:`~.modelchain.ModelChain` objects with their own
+        parameters. The names of the wind turbines must be unique.
+
+    Other Parameters
+    ----------------
+    kwargs :
+        Parameters of the :class:`~.modelchain.ModelChain` of the wind
+        turbines in `power_plants`, e.g. `wind_speed_model` or
+        `density_correction`.
+
+    Attributes
+    ----------
+    model_chains : list(:class:`~.modelchain.ModelChain`)
+        Model chain of each power plant of `power_plants`.
+    power_output : pandas.DataFrame
+        Electrical power output in W with time steps as index and the names of
+        the wind turbines as columns.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from windpowerlib import batch_modelchain, wind_turbine
+    >>> turbines = [wind_turbine.WindTurbine(
+    ...     hub_height=hub_height, name='turbine {}'.format(hub_height),
+    ...     nominal_power=2e6,
+    ...     power_curve=pd.DataFrame({'wind_speed': [3.0, 12.0, 25.0],
+    ...                               'value': [0.0, 2e6, 2e6]}))
+    ...     for hub_height in [80, 100]]
+    >>> weather_df = pd.DataFrame(
+    ...     [[7.5, 0.15], [30.0, 0.15]],
+    ...     columns=[['wind_speed', 'roughness_length'], [100, 0]])
+    >>> batch_mc = batch_modelchain.BatchModelChain(turbines)
+    >>> batch_mc.run_model(weather_df).power_output.round()
+       turbine 80  turbine 100
+    0    942804.0    1000000.0
+    1         0.0          0.0
+
+    """
+    def __init__(self, power_plants, **kwargs):
+        self.model_chains = [
+            power_plant if isinstance(power_plant, ModelChain)
+            else ModelChain(power_plant, **kwargs)
+            for power_plant in power_plants]
+        self.power_output = None
+
+    @staticmethod
+    def _hub_weather_parameters(model_chain):
+        r"""
+        Returns the parameters of `model_chain` wind speed, temperature and
+        density at hub height depend on.
+
+        """
+        return (model_chain.wind_speed_model, model_chain.temperature_model,
+                model_chain.density_model, model_chain.obstacle_height,
+                model_chain.hellman_exp, model_chain.precision)
+
+    def run_model(self, weather_df):
+        r"""
+        Runs the model for all wind turbines.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame
+            Weather data as described in
+            :py:func:`~.modelchain.ModelChain.run_model`, which is used for
+            all wind turbines.
+
+        Returns
+        -------
+        self
+
+        """
+        names = [model_chain.power_plant.name
+                 for model_chain in self.model_chains]
+        if len(set(names)) != len(names):
+            raise ValueError("The names of the wind turbines must be unique.")
+        groups = {}
+        for position, model_chain in enumerate(self.model_chains):
+            groups.setdefault(self._hub_weather_parameters(model_chain),
+                              []).append(position)
+        power_output_matrix = np.zeros(
+            (len(weather_df.index), len(self.model_chains)),
+            dtype=(np.float32 if all(
+                model_chain.precision == 'float32'
+                for model_chain in self.model_chains) else np.float64))
+        for positions in groups.values():
+            power_output_matrix[:, positions] = self._group_power_output(
+                weather_df, [self.model_chains[position]
+                             for position in positions])
+        logging.debug('{} wind turbines calculated in {} groups.'.format(
+            len(self.model_chains), len(groups)))
+        self.power_output = pd.DataFrame(
+            power_output_matrix, index=weather_df.index, columns=names)
+        return self
+
+    def _group_power_output(self, weather_df, model_chains):
+        r"""
+        Calculates the power output of wind turbines with the same parameters
+        for wind speed, temperature and density at hub height.
+
+        Returns
+        -------
+        numpy.array
+            Power output with one row for each time step and one column for
+            each model chain of `model_chains`.
+
+        """
+        model_chain = model_chains[0]
+        weather = model_chain._weather_data(weather_df)
+        hub_heights, hub_height_columns = np.unique(
+            [chain.power_plant.hub_height for chain in model_chains],
+            return_inverse=True)
+        wind_speed_hub = model_chain.wind_speed_hub_heights(weather,
+                                                            hub_heights)
+        power_curve_positions = [
+            position for position, chain in enumerate(model_chains)
+            if chain.power_output_model == 'power_curve' and
+            chain.density_correction is False]
+        other_positions = sorted(set(range(len(model_chains))) -
+                                 set(power_curve_positions))
+        group_power_output = np.empty((len(weather.index),
+                                       len(model_chains)),
+                                      dtype=wind_speed_hub.dtype)
+        if power_curve_positions:
+            # Wind turbines with the same power curve and hub height share
+            # one column
+            unique_power_curves = []
+            curve_indices = {}
+            pairs = []
+            for position in power_curve_positions:
+                power_curve = model_chains[position].power_plant.power_curve
+                if power_curve is None:
+                    raise TypeError(
+                        "Power curve values of " +
+                        model_chains[position].power_plant.name +
+                        " are missing.")
+                if id(power_curve) not in curve_indices:
+                    curve_indices[id(power_curve)] = len(unique_power_curves)
+                    unique_power_curves.append(power_curve)
+                pairs.append((curve_indices[id(power_curve)],
+                              hub_height_columns[position]))
+            pairs, pair_columns = np.unique(pairs, axis=0,
+                                            return_inverse=True)
+            group_power_output[:, power_curve_positions] = (
+                power_output.power_curve_columns(
+                    wind_speed_hub,
+                    [unique_power_curves[curve_index]
+                     for curve_index in pairs[:, 0]],
+                    pairs[:, 1])[:, pair_columns.ravel()])
+        if other_positions:
+            density_hub = model_chain.density_hub_heights(weather,
+                                                          hub_heights)
+            for position in other_positions:
+                column = hub_height_columns[position]
+                group_power_output[:, position] = model_chains[
+                    position].calculate_power_output(wind_speed_hub[:, column],
+                                                     density_hub[:, column])
+        return group_power_output
@@ -7,8 +7,11 @@ temperature at hub height of a wind turbine.
 __copyright__ = "Copyright oemof developer group"
 __license__ = "GPLv3"
 
+import numpy as np
 
-def barometric(pressure, pressure_height, hub_height, temperature_hub_height):
+
+def barometric(pressure, pressure_height, hub_height, temperature_hub_height,
+               out=None):
     r"""
     Calculates the density of air at hub height using the barometric height
     equation.
@@ -26,13 +29,16 @@ def barometric(pressure, pressure_height, hub_height, temperature_hub_height):
         Hub height of wind turbine in m.
     temperature_hub_height : pandas.Series or numpy.array
         Air temperature at hub height in K.
+    out : None or numpy.array
+        Preallocated array with the shape of `pressure` in which the result is
+        stored, e.g. a buffer of a :class:`~.tools.Workspace`. Default: None.
 
     Returns
     -------
     pandas.Series or numpy.array
         Density of air at hub height in kg/m³.
         Returns a pandas.Series if one of the input parameters is a
-        pandas.Series.
+        pandas.Series. If `out` is given, `out` is returned.
 
     Notes
     -----
@@ -63,11 +69,18 @@ def barometric(pressure, pressure_height, hub_height, temperature_hub_height):
         http://www.dwd.de/DE/service/lexikon/begriffe/D/Druckgradient_pdf.pdf?__blob=publicationFile&v=4
 
     """
+    if out is not None:
+        np.divide(np.asarray(pressure), 100, out=out)
+        out -= (hub_height - pressure_height) * 1 / 8
+        out *= 1.225 * 288.15 * 100 / 101330
+        out /= np.asarray(temperature_hub_height)
+        return out
     return ((pressure / 100 - (hub_height - pressure_height) * 1 / 8) * 1.225 *
             288.15 * 100 / (101330 * temperature_hub_height))
 
 
-def ideal_gas(pressure, pressure_height, hub_height, temperature_hub_height):
+def ideal_gas(pressure, pressure_height, hub_height, temperature_hub_height,
+              out=None):
     r"""
     Calculates the density of air at hub height using the ideal gas equation.
 
@@ -84,13 +97,16 @@ def ideal_gas(pressure, pressure_height, hub_height, temperature_hub_height):
         Hub height of wind turbine in m.
     temperature_hub_height : pandas.Series or numpy.array
         Air temperature at hub height in K.
+    out : None or numpy.array
+        Preallocated array with the shape of `pressure` in which the result is
+        stored, e.g. a buffer of a :class:`~.tools.Workspace`. Default: None.
 
     Returns
     -------
     pandas.Series or numpy.array
         Density of air at hub height in kg/m³.
         Returns a pandas.Series if one of the input parameters is a
-        pandas.Series.
+        pandas.Series. If `out` is given, `out` is returned.
 
     Notes
     -----
@@ -126,5 +142,11 @@ def ideal_gas(pressure, pressure_height, hub_height, temperature_hub_height):
             http://www.dwd.de/DE/service/lexikon/begriffe/D/Druckgradient_pdf.pdf?__blob=publicationFile&v=4
 
     """
+    if out is not None:
+        np.divide(np.asarray(pressure), 100, out=out)
+        out -= (hub_height - pressure_height) * 1 / 8
+        out *= 100 / 287.058
+        out /= np.asarray(temperature_hub_height)
+        return out
     return ((pressure / 100 - (hub_height - pressure_height) * 1 / 8) * 100 /
             (287.058 * temperature_hub_height))
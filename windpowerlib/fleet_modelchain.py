@@ -0,0 +1,319 @@
+"""
+The ``fleet_modelchain`` module contains a model chain for calculating the
+power output of a large number of wind farms, e.g. all wind farms of a country,
+which are described in a table.
+
+"""
+
+__copyright__ = "Copyright oemof developer group"
+__license__ = "GPLv3"
+
+import copy
+import logging
+import numpy as np
+import pandas as pd
+from windpowerlib import wake_losses, power_output, tools
+from windpowerlib.wind_farm import WindFarm
+from windpowerlib.turbine_cluster_modelchain import TurbineClusterModelChain
+
+
+class FleetModelChain(object):
+    r"""
+    Model to determine the output of many wind farms at once.
+
+    Wind farms with the same wind turbines, hub heights, numbers of turbines
+    and efficiency share one aggregated power curve, wind farms at the same
+    weather data point and hub height share the calculation of wind speed
+    (and density) at hub height and the power curves of all wind farms of a
+    hub height are evaluated together (see :class:`~.tools.CurveGrid`). The
+    calculations of each wind farm are the same as in
+    :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain`.
+
+    Parameters
+    ----------
+    fleet : pandas.DataFrame
+        Wind farms with one row for each wind turbine type of a wind farm.
+        The columns 'wind_farm' (name of the wind farm), 'turbine_type' (key of
+        `wind_turbines`) and 'number_of_turbines' are required. Optional
+        columns are 'hub_height' (hub height in m if it differs from the hub
+        height of the wind turbine in `wind_turbines`), 'efficiency' (constant
+        efficiency of the wind farm, NaN for none) and 'weather_id' (key of the
+        weather data of the wind farm if different weather data points are
+        passed to :py:func:`~.run_model`).
+    wind_turbines : dict
+        :class:`~.wind_turbine.WindTurbine` objects with the turbine types of
+        `fleet` as keys.
+
+    Other Parameters
+    ----------------
+    kwargs :
+        Parameters of
+        :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain`, e.g.
+        `wake_losses_model`, `smoothing`, `wind_speed_model` or
+        `hub_height_model`, which are used for all wind farms.
+        `turbulence_intensity_grid` is not supported and raises a
+        ValueError.
+
+    Attributes
+    ----------
+    fleet : pandas.DataFrame
+        Wind farms with one row for each wind turbine type of a wind farm.
+    wind_turbines : dict
+        :class:`~.wind_turbine.WindTurbine` objects with the turbine types of
+        `fleet` as keys.
+    model_chain_parameters : dict
+        Parameters of the
+        :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain` objects.
+    wind_farms : list(:class:`~.wind_farm.WindFarm`)
+        One wind farm for each distinct composition of wind turbines in
+        `fleet`, set up in :py:func:`~.run_model`.
+    power_output : pandas.DataFrame
+        Electrical power output in W with time steps as index and the names of
+        the wind farms as columns.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from windpowerlib import fleet_modelchain, wind_turbine
+    >>> turbine = wind_turbine.WindTurbine(
+    ...     hub_height=100, name='turbine', nominal_power=2e6,
+    ...     power_curve=pd.DataFrame({'wind_speed': [3.0, 12.0, 25.0],
+    ...                               'value': [0.0, 2e6, 2e6]}))
+    >>> fleet = pd.DataFrame({'wind_farm': ['farm 1', 'farm 2'],
+    ...                       'turbine_type': ['turbine', 'turbine'],
+    ...                       'number_of_turbines': [2, 5]})
+    >>> weather_df = pd.DataFrame(
+    ...     [[7.5, 0.15], [30.0, 0.15]],
+    ...     columns=[['wind_speed', 'roughness_length'], [100, 0]])
+    >>> fleet_mc = fleet_modelchain.FleetModelChain(
+    ...     fleet, {'turbine': turbine}, wake_losses_model=None)
+    >>> fleet_mc.run_model(weather_df).power_output
+          farm 1     farm 2
+    0  2000000.0  5000000.0
+    1        0.0        0.0
+
+    """
+    def __init__(self, fleet, wind_turbines, **kwargs):
+        if kwargs.get('turbulence_intensity_grid') is not None:
+            raise ValueError("`turbulence_intensity_grid` is not supported "
+                             "by the FleetModelChain.")
+        self.fleet = fleet
+        self.wind_turbines = wind_turbines
+        self.model_chain_parameters = kwargs
+
+        self.wind_farms = None
+        self.power_output = None
+        self._model_chains = None
+        self._farm_indices = None
+
+    def _assign_wind_farms(self):
+        r"""
+        Sets up one wind farm and model chain for each distinct composition of
+        wind turbines in :py:attr:`~fleet`.
+
+        Returns
+        -------
+        list
+            Names of the wind farms of :py:attr:`~fleet` in the order of their
+            first appearance.
+
+        """
+        # Wind turbines of each wind farm
+        compositions = {}
+        efficiencies = {}
+        has_hub_height = 'hub_height' in self.fleet.columns
+        has_efficiency = 'efficiency' in self.fleet.columns
+        for row in self.fleet.itertuples(index=False):
+            hub_height = (row.hub_height if has_hub_height else
+                          self.wind_turbines[row.turbine_type].hub_height)
+            compositions.setdefault(row.wind_farm, []).append(
+                (row.turbine_type, float(hub_height),
+                 row.number_of_turbines))
+            if has_efficiency and not pd.isnull(row.efficiency):
+                efficiencies[row.wind_farm] = float(row.efficiency)
+        # Wind turbines with other hub heights than in `wind_turbines` are
+        # copies sharing the power curves
+        wind_turbines = {}
+        unique_farms = {}
+        self.wind_farms = []
+        self._farm_indices = np.empty(len(compositions), dtype=np.intp)
+        for position, (name, composition) in enumerate(compositions.items()):
+            key = (tuple(composition), efficiencies.get(name))
+            if key not in unique_farms:
+                wind_turbine_fleet = []
+                for turbine_type, hub_height, number in composition:
+                    if (turbine_type, hub_height) not in wind_turbines:
+                        wind_turbine = self.wind_turbines[turbine_type]
+                        if wind_turbine.hub_height != hub_height:
+                            wind_turbine = copy.copy(wind_turbine)
+                            wind_turbine.hub_height = hub_height
+                        wind_turbines[(turbine_type, hub_height)] = (
+                            wind_turbine)
+                    wind_turbine_fleet.append(
+                        {'wind_turbine': wind_turbines[(turbine_type,
+                                                        hub_height)],
+                         'number_of_turbines': number})
+                unique_farms[key] = len(self.wind_farms)
+                self.wind_farms.append(WindFarm(
+                    name=name, wind_turbine_fleet=wind_turbine_fleet,
+                    efficiency=efficiencies.get(name)).mean_hub_height())
+            self._farm_indices[position] = unique_farms[key]
+        self._model_chains = [
+            TurbineClusterModelChain(wind_farm, **self.model_chain_parameters)
+            for wind_farm in self.wind_farms]
+        logging.debug('{} wind farms with {} distinct compositions.'.format(
+            len(compositions), len(self.wind_farms)))
+        return list(compositions.keys())
+
+    def run_model(self, weather):
+        r"""
+        Runs the model for all wind farms.
+
+        Parameters
+        ----------
+        weather : pandas.DataFrame or dict
+            Weather data as described in
+            :py:func:`~.turbine_cluster_modelchain.TurbineClusterModelChain.run_model`
+            for all wind farms or a dictionary of such DataFrames with the
+            values of the 'weather_id' column of :py:attr:`~fleet` as keys.
+            All DataFrames must have the same index.
+
+        Returns
+        -------
+        self
+
+        """
+        farm_names = self._assign_wind_farms()
+        if isinstance(weather, pd.DataFrame):
+            weather = {None: weather}
+            weather_ids = np.full(len(farm_names), None, dtype=object)
+        else:
+            if 'weather_id' not in self.fleet.columns:
+                raise ValueError("`fleet` needs a 'weather_id' column if "
+                                 "`weather` is a dictionary.")
+            weather_ids = self.fleet.groupby(
+                'wind_farm', sort=False)['weather_id'].first().reindex(
+                    farm_names).values
+        index = next(iter(weather.values())).index
+        model_chain = (self._model_chains[0] if self._model_chains else
+                       TurbineClusterModelChain(
+                           None, **self.model_chain_parameters))
+        power_output_matrix = np.zeros(
+            (len(index), len(farm_names)),
+            dtype=(np.float32 if model_chain.precision == 'float32' else
+                   np.float64))
+        assigned_power_curves = False
+        for weather_id in pd.unique(weather_ids):
+            if weather_id not in weather:
+                raise ValueError("No weather data for weather_id "
+                                 "'{}'.".format(weather_id))
+            weather_df = weather[weather_id]
+            if not weather_df.index.equals(index):
+                raise ValueError("All weather data must have the same "
+                                 "index.")
+            positions = np.flatnonzero(weather_ids == weather_id)
+            farm_indices = self._farm_indices[positions]
+            unique_indices = np.unique(farm_indices)
+            weather_df = model_chain.apply_precision(weather_df)
+            # Smoothed power curves depend on the weather data
+            if model_chain.smoothing or not assigned_power_curves:
+                for farm_index in (unique_indices if model_chain.smoothing
+                                   else range(len(self.wind_farms))):
+                    self._model_chains[farm_index].assign_power_curve(
+                        weather_df)
+                assigned_power_curves = True
+            farm_power_output = self._wind_farm_power_output(
+                weather_df, unique_indices)
+            power_output_matrix[:, positions] = farm_power_output[
+                :, np.searchsorted(unique_indices, farm_indices)]
+        self.power_output = pd.DataFrame(power_output_matrix, index=index,
+                                         columns=farm_names)
+        return self
+
+    def _wind_farm_power_output(self, weather_df, farm_indices):
+        r"""
+        Calculates the power output of the wind farms `farm_indices` of
+        :py:attr:`~wind_farms` for one weather data point.
+
+        Wind speed (and density) is calculated once for each hub height and
+        the power curves of all wind farms are evaluated together. With
+        'turbine_hub_heights' as `hub_height_model` the power curve of each
+        wind turbine type of a wind farm is evaluated at its own hub height
+        (see :py:func:`~.turbine_cluster_modelchain.TurbineClusterModelChain.turbine_hub_heights_power_output`).
+
+        Returns
+        -------
+        numpy.array
+            Power output with one row for each time step and one column for
+            each wind farm of `farm_indices`.
+
+        """
+        model_chains = [self._model_chains[farm_index]
+                        for farm_index in farm_indices]
+        model_chain = model_chains[0]
+        weather = tools.WeatherData(weather_df)
+        batched = (model_chain.power_output_model == 'power_curve' and
+                   model_chain.density_correction is False)
+        if model_chain.hub_height_model == 'turbine_hub_heights':
+            if not batched:
+                return np.column_stack([
+                    chain.turbine_hub_heights_power_output(weather).values
+                    for chain in model_chains])
+            # Power curve and hub height of each wind turbine type
+            wind_farms = [chain._turbine_type_farms()
+                          for chain in model_chains]
+        elif model_chain.hub_height_model == 'mean_hub_height':
+            wind_farms = [[chain.power_plant] for chain in model_chains]
+        else:
+            raise ValueError("'{0}' is an invalid value. ".format(
+                model_chain.hub_height_model) + "`hub_height_model` must be "
+                "'mean_hub_height' or 'turbine_hub_heights'.")
+        if not batched:
+            hub_heights, hub_height_columns = np.unique(
+                [chain.power_plant.hub_height for chain in model_chains],
+                return_inverse=True)
+            wind_speed_hub = self._reduced_wind_speed(
+                model_chain, model_chain.wind_speed_hub_heights(
+                    weather, hub_heights))
+            density_hub = model_chain.density_hub_heights(weather,
+                                                          hub_heights)
+            return np.column_stack([
+                chain.calculate_power_output(
+                    wind_speed_hub[:, hub_height_index],
+                    density_hub[:, hub_height_index])
+                for chain, hub_height_index in zip(model_chains,
+                                                   hub_height_columns)])
+        # All power curves are evaluated together, the intervals of the wind
+        # speeds are only determined once for each hub height
+        farm_power_curves = [wind_farm.power_curve
+                             for chain_farms in wind_farms
+                             for wind_farm in chain_farms]
+        hub_heights, hub_height_columns = np.unique(
+            [wind_farm.hub_height for chain_farms in wind_farms
+             for wind_farm in chain_farms], return_inverse=True)
+        wind_speed_hub = self._reduced_wind_speed(
+            model_chain, model_chain.wind_speed_hub_heights(weather,
+                                                            hub_heights))
+        farm_power_output = power_output.power_curve_columns(
+            wind_speed_hub, farm_power_curves, hub_height_columns)
+        if len(farm_power_curves) == len(model_chains):
+            return farm_power_output
+        # Sum of the wind turbine types of each wind farm
+        return np.add.reduceat(
+            farm_power_output, np.cumsum(
+                [0] + [len(chain_farms) for chain_farms in wind_farms[:-1]]),
+            axis=1)
+
+    @staticmethod
+    def _reduced_wind_speed(model_chain, wind_speed_hub):
+        r"""
+        Reduces the wind speed at hub height with the wind efficiency curve
+        of the `wake_losses_model` of `model_chain`, if it is one.
+
+        """
+        if (model_chain.wake_losses_model not in [
+                'power_efficiency_curve', 'constant_efficiency', None]):
+            wind_speed_hub = wake_losses.reduce_wind_speed(
+                wind_speed_hub,
+                wind_efficiency_curve_name=model_chain.wake_losses_model)
+        return wind_speed_hub
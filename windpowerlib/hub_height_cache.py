@@ -0,0 +1,250 @@
+"""
+The ``hub_height_cache`` module contains a cache for wind speed, temperature
+and density at hub height, which can be shared by
+:class:`~.modelchain.ModelChain` objects.
+
+"""
+
+__copyright__ = "Copyright oemof developer group"
+__license__ = "GPLv3"
+
+import weakref
+from collections import OrderedDict
+import numpy as np
+
+
+class HubHeightCache(object):
+    r"""
+    Bounded cache of wind speed, temperature and density at hub height.
+
+    The results of :py:func:`~.modelchain.ModelChain.wind_speed_hub`,
+    :py:func:`~.modelchain.ModelChain.temperature_hub` and
+    :py:func:`~.modelchain.ModelChain.density_hub` (and of the methods for
+    several hub heights) only depend on the weather data, the hub height and
+    a few parameters of the model chain. A cache stores them with a
+    fingerprint of the weather data (see :py:func:`~.fingerprint`) and a key
+    made of the hub height and these parameters, so that repeated calls with
+    the same weather data, e.g. of
+    :py:func:`~.modelchain.ModelChain.density_hub` calling
+    :py:func:`~.modelchain.ModelChain.temperature_hub`, are calculated once.
+    If the cache is full, the least recently used results are discarded.
+
+    The fingerprint identifies the weather data object and the arrays
+    holding its values, so finding a result takes the same time for any
+    length of the weather data. Replacing the index or assigning columns
+    gives new results and copies of the weather data do not share their
+    results. Values that are modified in place are not detected; call
+    :py:func:`~.invalidate` after modifying weather data in place. The
+    results of weather data that is garbage collected are removed. Cached
+    results are shared and must not be modified.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of cached time series. Default: 128.
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximum number of cached time series.
+    hits : int
+        Number of results found in the cache.
+    misses : int
+        Number of results that were not in the cache.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from windpowerlib import hub_height_cache
+    >>> cache = hub_height_cache.HubHeightCache(maxsize=2)
+    >>> weather_df = pd.DataFrame({'wind_speed': [5.0, 6.0]})
+    >>> cache.get(weather_df, ('wind_speed', 100.0)) is None
+    True
+    >>> cache.set(weather_df, ('wind_speed', 100.0), 'result')
+    >>> cache.get(weather_df, ('wind_speed', 100.0))
+    'result'
+    >>> cache.get(weather_df.copy(), ('wind_speed', 100.0)) is None
+    True
+    >>> cache.hits, cache.misses
+    (1, 2)
+
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        # weak references to the weather data of the fingerprints
+        self._weather_dfs = {}
+
+    def __len__(self):
+        return len(self._results)
+
+    @staticmethod
+    def fingerprint(weather_df):
+        r"""
+        Returns a fingerprint of the weather data.
+
+        The fingerprint consists of the identities of the weather data, its
+        index and columns, its shape and the memory addresses of the arrays
+        holding its values. It does not read the values and therefore takes
+        the same time for any length of the weather data. It changes if the
+        index is replaced or columns are assigned, but not if values are
+        modified in place, and it differs for copies of the weather data.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame
+            Weather data.
+
+        Returns
+        -------
+        tuple
+            Fingerprint of `weather_df`.
+
+        """
+        manager = getattr(weather_df, '_mgr', None)
+        if manager is None:
+            # pandas < 1.1
+            manager = weather_df._data
+        blocks = tuple(
+            (block.values.__array_interface__['data'][0]
+             if isinstance(block.values, np.ndarray) else id(block.values),
+             block.mgr_locs.as_array.tobytes())
+            for block in manager.blocks)
+        return (id(weather_df), blocks, id(weather_df.index),
+                id(weather_df.columns), weather_df.shape)
+
+    def weather_key(self, weather_df):
+        r"""
+        Returns the fingerprint of the weather data and registers it, so that
+        its results are removed when it is garbage collected.
+
+        The fingerprint can be passed to :py:func:`~.get`, :py:func:`~.set`
+        and :py:func:`~.invalidate` instead of the weather data, e.g. to
+        calculate it once for repeated calls.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame
+            Weather data.
+
+        Returns
+        -------
+        tuple
+            Fingerprint of `weather_df` (see :py:func:`~.fingerprint`).
+
+        """
+        weather_key = self.fingerprint(weather_df)
+        reference = self._weather_dfs.get(weather_key)
+        if reference is None or reference() is not weather_df:
+            # results of garbage collected weather data with the same
+            # identity must not be found
+            self.invalidate(weather_key)
+            try:
+                self._weather_dfs[weather_key] = weakref.ref(
+                    weather_df, self._remove_callback(weather_key))
+            except TypeError:
+                pass
+        return weather_key
+
+    def _remove_callback(self, weather_key):
+        r"""
+        Returns the callback removing the results of `weather_key` when its
+        weather data is garbage collected.
+
+        """
+        cache = weakref.ref(self)
+
+        def remove(reference):
+            self = cache()
+            if (self is not None and
+                    self._weather_dfs.get(weather_key) is reference):
+                self.invalidate(weather_key)
+
+        return remove
+
+    def _weather_key(self, weather_df):
+        r"""
+        Returns the fingerprint of `weather_df`, which may already be a
+        fingerprint.
+
+        """
+        if isinstance(weather_df, tuple):
+            return weather_df
+        return self.weather_key(weather_df)
+
+    def get(self, weather_df, key):
+        r"""
+        Returns the result stored for `weather_df` with `key`.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame or tuple
+            Weather data the result was calculated with or its fingerprint
+            (see :py:func:`~.fingerprint`).
+        key : tuple
+            Key of the result, e.g. the variable, the hub height and the
+            parameters of the model chain.
+
+        Returns
+        -------
+        pandas.Series or numpy.array or None
+            Stored result. None if the result is not in the cache.
+
+        """
+        full_key = (self._weather_key(weather_df), key)
+        if full_key in self._results:
+            self._results.move_to_end(full_key)
+            self.hits += 1
+            return self._results[full_key]
+        self.misses += 1
+        return None
+
+    def set(self, weather_df, key, result):
+        r"""
+        Stores `result` for `weather_df` with `key`.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame or tuple
+            Weather data the result was calculated with or its fingerprint
+            (see :py:func:`~.fingerprint`).
+        key : tuple
+            Key of the result, e.g. the variable, the hub height and the
+            parameters of the model chain.
+        result : pandas.Series or numpy.array
+            Result to store.
+
+        """
+        full_key = (self._weather_key(weather_df), key)
+        self._results[full_key] = result
+        self._results.move_to_end(full_key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def invalidate(self, weather_df):
+        r"""
+        Removes all results of `weather_df`, e.g. to free memory or after
+        modifying its values in place.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame or tuple
+            Weather data whose results are removed or its fingerprint (see
+            :py:func:`~.fingerprint`).
+
+        """
+        weather_key = self._weather_key(weather_df)
+        for key in [key for key in self._results if key[0] == weather_key]:
+            del self._results[key]
+        self._weather_dfs.pop(weather_key, None)
+
+    def clear(self):
+        r"""
+        Removes all results.
+
+        """
+        self._results.clear()
+        self._weather_dfs.clear()
@@ -8,9 +8,13 @@ and demonstrates standard ways to use the library.
 __copyright__ = "Copyright oemof developer group"
 __license__ = "GPLv3"
 
+import copy
 import logging
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
 from windpowerlib import (wind_speed, density, temperature, power_output,
-                          tools)
+                          tools, numba_kernels)
 
 
 class ModelChain(object):
@@ -48,6 +52,53 @@ class ModelChain(object):
         The Hellman exponent, which combines the increase in wind speed due to
         stability of atmospheric conditions and surface roughness into one
         constant. Default: None.
+    density_grid : None or array-like
+        Equally spaced densities in kg/m³ for which density corrected power
+        curves are precalculated if `density_correction` is True. The power
+        output is then looked up in these curves instead of correcting the
+        power curve for each time step. The curves are calculated once for
+        each power curve (see :py:func:`density_lookup_table`).
+        Default: None.
+    precision : string
+        Floating point precision of the calculations. Valid options are
+        'float64' and 'float32'. With 'float32' the weather data, the
+        values at hub height and the power output are kept in single
+        precision, which halves memory usage and bandwidth. See
+        :ref:`precision_label` for the calculations done in single precision
+        and the resulting deviations.
+        Default: 'float64'.
+    workspace : None or :class:`~.tools.Workspace`
+        If given, temperature, density and wind speed at hub height are
+        calculated in place in arrays of the workspace, which are reused in
+        every run of the model. The results of :func:`temperature_hub`,
+        :func:`density_hub` and :func:`wind_speed_hub` are then views on these
+        arrays and are overwritten by the next call. The power output is not
+        affected. Default: None.
+    backend : string
+        Implementation used for the time series calculations. Valid options
+        are 'numpy' and 'numba'. With 'numba' the compiled kernels of
+        :py:mod:`~.numba_kernels` are used, which requires numba to be
+        installed. Default: 'numpy'.
+    hub_height_cache : None or :class:`~.hub_height_cache.HubHeightCache`
+        If given, wind speed, temperature and density at hub height are
+        stored in the cache and taken from it if they were calculated before
+        with the same weather data DataFrame, hub height and parameters, e.g.
+        by another model chain sharing the cache. Not used together with
+        `workspace` and not used for the chunks of time steps if `threads` is
+        greater than one. Default: None.
+    buffer_size : int
+        Maximum number of time steps of the power output kept in
+        `power_output_buffer` by :func:`append`. Default: 1008 (one week of
+        10 minute time steps).
+    threads : int
+        Number of threads :func:`run_model` uses. With more than one thread
+        the time series are split into as many chunks of time steps, which
+        are calculated on a thread pool. This speeds up long time series, as
+        numpy releases the GIL in its array operations. Compiled power
+        curves and density lookup tables are prepared once before the chunks
+        are calculated. `workspace` and `hub_height_cache` are not used for
+        the chunks, as each chunk is a new part of the weather data.
+        Default: 1.
 
     Attributes
     ----------
@@ -81,8 +132,29 @@ class ModelChain(object):
     obstacle_height : float
         Height of obstacles in the surrounding area of the wind turbine in m.
         Set `obstacle_height` to zero for wide spread obstacles. Default: 0.
+    density_grid : None or array-like
+        Equally spaced densities in kg/m³ for which density corrected power
+        curves are precalculated if `density_correction` is True.
+        Default: None.
+    precision : string
+        Floating point precision of the calculations. Valid options are
+        'float64' and 'float32'. Default: 'float64'.
+    workspace : None or :class:`~.tools.Workspace`
+        Workspace for the calculation of temperature, density and wind speed
+        at hub height. Default: None.
+    backend : string
+        Implementation used for the time series calculations. Valid options
+        are 'numpy' and 'numba'. Default: 'numpy'.
+    hub_height_cache : None or :class:`~.hub_height_cache.HubHeightCache`
+        Cache of wind speed, temperature and density at hub height.
+        Default: None.
     power_output : pandas.Series
         Electrical power output of the wind turbine in W.
+    threads : int
+        Number of threads :func:`run_model` uses. Default: 1.
+    power_output_buffer : :class:`~.tools.RingBuffer`
+        Power output of the latest time steps calculated with
+        :func:`append`.
 
     Examples
     --------
@@ -109,7 +181,9 @@ class ModelChain(object):
                  power_output_model='power_curve',
                  density_correction=False,
                  obstacle_height=0,
-                 hellman_exp=None, **kwargs):
+                 hellman_exp=None, density_grid=None, precision='float64',
+                 workspace=None, backend='numpy', hub_height_cache=None,
+                 buffer_size=1008, threads=1, **kwargs):
 
         self.power_plant = power_plant
         self.obstacle_height = obstacle_height
@@ -119,7 +193,183 @@ class ModelChain(object):
         self.power_output_model = power_output_model
         self.density_correction = density_correction
         self.hellman_exp = hellman_exp
+        self.density_grid = density_grid
+        self.precision = precision
+        self.workspace = workspace
+        self.backend = backend
+        self.hub_height_cache = hub_height_cache
+        self.threads = threads
         self.power_output = None
+        self.power_output_buffer = tools.RingBuffer(buffer_size)
+        self._append_weather = None
+        self._density_lookup_tables = {}
+
+    def apply_precision(self, data):
+        r"""
+        Converts data to the floating point precision of the model.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame or pandas.Series or numpy.array
+            Data to convert, e.g. the weather data or the power output.
+
+        Returns
+        -------
+        pandas.DataFrame or pandas.Series or numpy.array
+            `data` converted to single precision if `precision` is 'float32'.
+            For 'float64' `data` is returned unchanged.
+
+        """
+        if self.precision == 'float64':
+            return data
+        elif self.precision == 'float32':
+            return data.astype(np.float32, copy=False)
+        else:
+            raise ValueError("'{0}' is an invalid value. ".format(
+                self.precision) + "`precision` must be 'float64' or "
+                "'float32'.")
+
+    def _module(self, module):
+        r"""
+        Returns the module with the functions used for the calculations.
+
+        Parameters
+        ----------
+        module : module
+            Module of the numpy implementation, e.g. :py:mod:`~.wind_speed`.
+
+        Returns
+        -------
+        module
+            `module` if `backend` is 'numpy' and :py:mod:`~.numba_kernels` if
+            `backend` is 'numba'.
+
+        """
+        if self.backend == 'numpy':
+            return module
+        elif self.backend == 'numba':
+            return numba_kernels
+        else:
+            raise ValueError("'{0}' is an invalid value. ".format(
+                self.backend) + "`backend` must be 'numpy' or 'numba'.")
+
+    def _workspace_array(self, name, weather):
+        r"""
+        Returns the workspace array `name` for a time series of `weather`.
+
+        None if no workspace is used.
+
+        """
+        if self.workspace is None:
+            return None
+        return self.workspace.get(
+            name, len(weather.index),
+            dtype=np.float32 if self.precision == 'float32' else np.float64)
+
+    def _workspace_series(self, data, weather):
+        r"""
+        Returns results calculated in a workspace array as pandas.Series.
+
+        """
+        if isinstance(data, np.ndarray) and self.workspace is not None:
+            return pd.Series(data, index=weather.index, copy=False)
+        return data
+
+    def density_lookup_table(self, power_curve):
+        r"""
+        Returns the density corrected power curves of `power_curve` for
+        :py:attr:`~density_grid`.
+
+        The table is calculated with
+        :py:func:`~.power_output.density_correction_lookup_table` once for
+        each power curve and density grid and reused as long as the power
+        curve is not replaced.
+
+        Parameters
+        ----------
+        power_curve : pandas.DataFrame
+            Power curve with 'wind_speed' and 'value' columns, e.g. the power
+            curve of :py:attr:`~power_plant`.
+
+        Returns
+        -------
+        pandas.DataFrame or None
+            Density corrected power curves. None if
+            :py:attr:`~density_grid` is None.
+
+        """
+        if self.density_grid is None:
+            return None
+        key = (id(power_curve),
+               tuple(np.asarray(self.density_grid, dtype=float).tolist()))
+        cached = self._density_lookup_tables.get(key)
+        if cached is None or cached[0] is not power_curve:
+            if len(self._density_lookup_tables) >= 16:
+                # Remove the oldest table
+                del self._density_lookup_tables[
+                    next(iter(self._density_lookup_tables))]
+            cached = (power_curve,
+                      power_output.density_correction_lookup_table(
+                          power_curve['wind_speed'], power_curve['value'],
+                          self.density_grid))
+            self._density_lookup_tables[key] = cached
+        return cached[1]
+
+    def _weather_data(self, weather_df):
+        r"""
+        Returns `weather_df` converted to the precision of the model as
+        :class:`~.tools.WeatherData`.
+
+        If :py:attr:`~hub_height_cache` is used, the fingerprint of the
+        weather data is calculated once before the conversion, so that the
+        results of weather data converted in each run are found in the
+        cache.
+
+        """
+        cache_key = None
+        if self.hub_height_cache is not None and self.workspace is None:
+            cache_key = self.hub_height_cache.weather_key(weather_df)
+        weather = tools.WeatherData(self.apply_precision(weather_df))
+        weather.cache_key = cache_key
+        return weather
+
+    def _cached_hub_data(self, weather, key, calculate, *args):
+        r"""
+        Returns the result of `calculate` for `weather`, which is taken from
+        :py:attr:`~hub_height_cache` if it was calculated before.
+
+        Parameters
+        ----------
+        weather : pandas.DataFrame or :class:`~.tools.WeatherData`
+            Weather data.
+        key : tuple
+            Variable ('wind_speed', 'temperature' or 'density') and hub
+            height(s) of the result. The parameters of the model chain the
+            variable depends on are added.
+        calculate : callable
+            Calculates the result from `weather` as
+            :class:`~.tools.WeatherData` and `args`.
+
+        """
+        weather = tools.WeatherData.wrap(weather)
+        if self.hub_height_cache is None or self.workspace is not None:
+            return calculate(weather, *args)
+        if weather.cache_key is None:
+            weather.cache_key = self.hub_height_cache.weather_key(
+                weather.weather_df)
+        if key[0] == 'wind_speed':
+            key += (self.wind_speed_model, self.obstacle_height,
+                    self.hellman_exp)
+        elif key[0] == 'density':
+            key += (self.density_model, self.temperature_model)
+        else:
+            key += (self.temperature_model,)
+        key += (self.precision, self.backend)
+        result = self.hub_height_cache.get(weather.cache_key, key)
+        if result is None:
+            result = calculate(weather, *args)
+            self.hub_height_cache.set(weather.cache_key, key, result)
+        return result
 
     def temperature_hub(self, weather_df):
         r"""
@@ -130,7 +380,7 @@ class ModelChain(object):
 
         Parameters
         ----------
-        weather_df : pandas.DataFrame
+        weather_df : pandas.DataFrame or :class:`~.tools.WeatherData`
             DataFrame with time series for temperature `temperature` in K.
             The columns of the DataFrame are a MultiIndex where the first level
             contains the variable name (e.g. temperature) and the second level
@@ -150,29 +400,39 @@ class ModelChain(object):
         temperature(s) closest to the hub height are used.
 
         """
-        if self.power_plant.hub_height in weather_df['temperature']:
-            temperature_hub = weather_df['temperature'][
-                self.power_plant.hub_height]
+        return self._cached_hub_data(
+            weather_df, ('temperature', self.power_plant.hub_height),
+            self._calculate_temperature_hub)
+
+    def _calculate_temperature_hub(self, weather):
+        r"""
+        Calculates the temperature of air at hub height without cache, see
+        :func:`temperature_hub`.
+
+        """
+        if weather.has_height('temperature', self.power_plant.hub_height):
+            temperature_hub = weather.column('temperature',
+                                             self.power_plant.hub_height)
         elif self.temperature_model == 'linear_gradient':
             logging.debug('Calculating temperature using temperature '
                           'gradient.')
-            closest_height = weather_df['temperature'].columns[
-                min(range(len(weather_df['temperature'].columns)),
-                    key=lambda i: abs(weather_df['temperature'].columns[i] -
-                                      self.power_plant.hub_height))]
-            temperature_hub = temperature.linear_gradient(
-                weather_df['temperature'][closest_height], closest_height,
-                self.power_plant.hub_height)
+            closest_height, closest_temperature = weather.closest_column(
+                'temperature', self.power_plant.hub_height)
+            temperature_hub = self._module(temperature).linear_gradient(
+                closest_temperature, closest_height,
+                self.power_plant.hub_height,
+                out=self._workspace_array('temperature_hub', weather))
         elif self.temperature_model == 'interpolation_extrapolation':
             logging.debug('Calculating temperature using linear inter- or '
                           'extrapolation.')
-            temperature_hub = tools.linear_interpolation_extrapolation(
-                weather_df['temperature'], self.power_plant.hub_height)
+            temperature_hub = weather.linear_interpolation_extrapolation(
+                'temperature', self.power_plant.hub_height)
         else:
             raise ValueError("'{0}' is an invalid value. ".format(
                 self.temperature_model) + "`temperature_model` must be "
                 "'linear_gradient' or 'interpolation_extrapolation'.")
-        return temperature_hub
+        return self.apply_precision(
+            self._workspace_series(temperature_hub, weather))
 
     def density_hub(self, weather_df):
         r"""
@@ -185,7 +445,7 @@ class ModelChain(object):
 
         Parameters
         ----------
-        weather_df : pandas.DataFrame
+        weather_df : pandas.DataFrame or :class:`~.tools.WeatherData`
             DataFrame with time series for temperature `temperature` in K,
             pressure `pressure` in Pa and/or density `density` in kg/m³,
             depending on the `density_model` used.
@@ -208,41 +468,50 @@ class ModelChain(object):
         If `interpolation_extrapolation` is used to calculate the density at
         hub height, the `weather_df` must contain at least two time series for
         density.
+        """
+        return self._cached_hub_data(
+            weather_df, ('density', self.power_plant.hub_height),
+            self._calculate_density_hub)
+
+    def _calculate_density_hub(self, weather):
+        r"""
+        Calculates the density of air at hub height without cache, see
+        :func:`density_hub`.
+
         """
         if self.density_model != 'interpolation_extrapolation':
-            temperature_hub = self.temperature_hub(weather_df)
+            temperature_hub = self.temperature_hub(weather)
 
         # Calculation of density in kg/m³ at hub height
         if self.density_model == 'barometric':
             logging.debug('Calculating density using barometric height '
                           'equation.')
-            closest_height = weather_df['pressure'].columns[
-                min(range(len(weather_df['pressure'].columns)),
-                    key=lambda i: abs(weather_df['pressure'].columns[i] -
-                                      self.power_plant.hub_height))]
-            density_hub = density.barometric(
-                weather_df['pressure'][closest_height], closest_height,
-                self.power_plant.hub_height, temperature_hub)
+            closest_height, closest_pressure = weather.closest_column(
+                'pressure', self.power_plant.hub_height)
+            density_hub = self._module(density).barometric(
+                closest_pressure, closest_height,
+                self.power_plant.hub_height, temperature_hub,
+                out=self._workspace_array('density_hub', weather))
         elif self.density_model == 'ideal_gas':
             logging.debug('Calculating density using ideal gas equation.')
-            closest_height = weather_df['pressure'].columns[
-                min(range(len(weather_df['pressure'].columns)),
-                    key=lambda i: abs(weather_df['pressure'].columns[i] -
-                                      self.power_plant.hub_height))]
-            density_hub = density.ideal_gas(
-                weather_df['pressure'][closest_height], closest_height,
-                self.power_plant.hub_height, temperature_hub)
+            closest_height, closest_pressure = weather.closest_column(
+                'pressure', self.power_plant.hub_height)
+            density_hub = self._module(density).ideal_gas(
+                closest_pressure, closest_height,
+                self.power_plant.hub_height, temperature_hub,
+                out=self._workspace_array('density_hub', weather))
         elif self.density_model == 'interpolation_extrapolation':
             logging.debug('Calculating density using linear inter- or '
                           'extrapolation.')
-            density_hub = tools.linear_interpolation_extrapolation(
-                weather_df['density'], self.power_plant.hub_height)
+            density_hub = weather.linear_interpolation_extrapolation(
+                'density', self.power_plant.hub_height)
         else:
             raise ValueError("'{0}' is an invalid value. ".format(
                              self.density_model) + "`density_model` " +
                              "must be 'barometric', 'ideal_gas' or " +
                              "'interpolation_extrapolation'.")
-        return density_hub
+        return self.apply_precision(
+            self._workspace_series(density_hub, weather))
 
     def wind_speed_hub(self, weather_df):
         r"""
@@ -252,7 +521,7 @@ class ModelChain(object):
 
         Parameters
         ----------
-        weather_df : pandas.DataFrame
+        weather_df : pandas.DataFrame or :class:`~.tools.WeatherData`
             DataFrame with time series for wind speed `wind_speed` in m/s and
             roughness length `roughness_length` in m.
             The columns of the DataFrame are a MultiIndex where the first level
@@ -273,48 +542,275 @@ class ModelChain(object):
         wind speed(s) closest to the hub height are used.
 
         """
-        if self.power_plant.hub_height in weather_df['wind_speed']:
-            wind_speed_hub = weather_df['wind_speed'][
-                self.power_plant.hub_height]
+        return self._cached_hub_data(
+            weather_df, ('wind_speed', self.power_plant.hub_height),
+            self._calculate_wind_speed_hub)
+
+    def _calculate_wind_speed_hub(self, weather):
+        r"""
+        Calculates the wind speed at hub height without cache, see
+        :func:`wind_speed_hub`.
+
+        """
+        if weather.has_height('wind_speed', self.power_plant.hub_height):
+            wind_speed_hub = weather.column('wind_speed',
+                                            self.power_plant.hub_height)
         elif self.wind_speed_model == 'logarithmic':
             logging.debug('Calculating wind speed using logarithmic wind '
                           'profile.')
-            closest_height = weather_df['wind_speed'].columns[
-                min(range(len(weather_df['wind_speed'].columns)),
-                    key=lambda i: abs(weather_df['wind_speed'].columns[i] -
-                                      self.power_plant.hub_height))]
-            wind_speed_hub = wind_speed.logarithmic_profile(
-                weather_df['wind_speed'][closest_height], closest_height,
+            closest_height, closest_wind_speed = weather.closest_column(
+                'wind_speed', self.power_plant.hub_height)
+            wind_speed_hub = self._module(wind_speed).logarithmic_profile(
+                closest_wind_speed, closest_height,
                 self.power_plant.hub_height,
-                weather_df['roughness_length'].iloc[:, 0],
-                self.obstacle_height)
+                weather['roughness_length'].iloc[:, 0],
+                self.obstacle_height,
+                out=self._workspace_array('wind_speed_hub', weather))
         elif self.wind_speed_model == 'hellman':
             logging.debug('Calculating wind speed using hellman equation.')
-            closest_height = weather_df['wind_speed'].columns[
-                min(range(len(weather_df['wind_speed'].columns)),
-                    key=lambda i: abs(weather_df['wind_speed'].columns[i] -
-                                      self.power_plant.hub_height))]
-            wind_speed_hub = wind_speed.hellman(
-                weather_df['wind_speed'][closest_height], closest_height,
+            closest_height, closest_wind_speed = weather.closest_column(
+                'wind_speed', self.power_plant.hub_height)
+            wind_speed_hub = self._module(wind_speed).hellman(
+                closest_wind_speed, closest_height,
                 self.power_plant.hub_height,
-                weather_df['roughness_length'].iloc[:, 0],
-                self.hellman_exp)
+                weather['roughness_length'].iloc[:, 0],
+                self.hellman_exp,
+                out=self._workspace_array('wind_speed_hub', weather))
         elif self.wind_speed_model == 'interpolation_extrapolation':
             logging.debug('Calculating wind speed using linear inter- or '
                           'extrapolation.')
-            wind_speed_hub = tools.linear_interpolation_extrapolation(
-                weather_df['wind_speed'], self.power_plant.hub_height)
+            wind_speed_hub = weather.linear_interpolation_extrapolation(
+                'wind_speed', self.power_plant.hub_height)
         elif self.wind_speed_model == 'log_interpolation_extrapolation':
             logging.debug('Calculating wind speed using logarithmic inter- or '
                           'extrapolation.')
-            wind_speed_hub = tools.logarithmic_interpolation_extrapolation(
-                weather_df['wind_speed'], self.power_plant.hub_height)
+            wind_speed_hub = weather.logarithmic_interpolation_extrapolation(
+                'wind_speed', self.power_plant.hub_height)
         else:
             raise ValueError("'{0}' is an invalid value. ".format(
                 self.wind_speed_model) + "`wind_speed_model` must be "
                 "'logarithmic', 'hellman', 'interpolation_extrapolation' " +
                 "or 'log_interpolation_extrapolation'.")
-        return wind_speed_hub
+        return self.apply_precision(
+            self._workspace_series(wind_speed_hub, weather))
+
+    def _hub_heights_data(self, weather, variable, hub_heights, function):
+        r"""
+        Applies `function` to the data of the height closest to each of
+        `hub_heights`.
+
+        Parameters
+        ----------
+        weather : :class:`~.tools.WeatherData`
+            Weather data.
+        variable : str
+            Variable of the weather data, e.g. 'wind_speed'.
+        hub_heights : numpy.array
+            Hub heights in m.
+        function : callable
+            Called with the data of one height as column vector, the height
+            and the positions of the hub heights this height is closest to.
+            Returns the values at these hub heights with one column for each
+            hub height.
+
+        Returns
+        -------
+        numpy.array
+            Values with one row for each time step and one column for each hub
+            height. Data given at a hub height is used directly.
+
+        """
+        heights = np.asarray(weather[variable].columns, dtype=float)
+        values = np.empty((len(weather.index), len(hub_heights)),
+                          dtype=np.result_type(*weather[variable].dtypes))
+        # Closest height like in the calculations for a single hub height
+        # (first height for equal distances)
+        closest_heights = weather.closest_columns(variable, hub_heights)
+        for height_index in np.unique(closest_heights):
+            columns = np.flatnonzero(closest_heights == height_index)
+            height_data = np.asarray(weather.column(
+                variable, heights[height_index]))[:, np.newaxis]
+            values[:, columns] = function(height_data, heights[height_index],
+                                          columns)
+            values[:, columns[hub_heights[columns] ==
+                              heights[height_index]]] = height_data
+        return values
+
+    def temperature_hub_heights(self, weather_df, hub_heights):
+        r"""
+        Calculates the temperature of air at several hub heights at once.
+
+        Same as :func:`temperature_hub` for each of `hub_heights`, with the
+        numpy implementation for all backends.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame or :class:`~.tools.WeatherData`
+            Weather data as described in :func:`temperature_hub`.
+        hub_heights : array-like
+            Hub heights in m.
+
+        Returns
+        -------
+        numpy.array
+            Temperature of air in K with one row for each time step and one
+            column for each hub height.
+
+        """
+        hub_heights = np.asarray(hub_heights, dtype=float)
+        return self._cached_hub_data(
+            weather_df, ('temperature', tuple(hub_heights)),
+            self._calculate_temperature_hub_heights, hub_heights)
+
+    def _calculate_temperature_hub_heights(self, weather, hub_heights):
+        r"""
+        Calculates the temperature of air at several hub heights without cache,
+        see :func:`temperature_hub_heights`.
+
+        """
+        hub_heights = np.asarray(hub_heights, dtype=float)
+        if self.temperature_model == 'linear_gradient':
+            temperature_hub = self._hub_heights_data(
+                weather, 'temperature', hub_heights,
+                lambda data, height, columns: temperature.linear_gradient(
+                    data, height, hub_heights[columns]))
+        elif self.temperature_model == 'interpolation_extrapolation':
+            temperature_hub = np.column_stack([
+                weather.column('temperature', hub_height)
+                if weather.has_height('temperature', hub_height) else
+                weather.linear_interpolation_extrapolation(
+                    'temperature', hub_height)
+                for hub_height in hub_heights])
+        else:
+            raise ValueError("'{0}' is an invalid value. ".format(
+                self.temperature_model) + "`temperature_model` must be "
+                "'linear_gradient' or 'interpolation_extrapolation'.")
+        return self.apply_precision(temperature_hub)
+
+    def density_hub_heights(self, weather_df, hub_heights):
+        r"""
+        Calculates the density of air at several hub heights at once.
+
+        Same as :func:`density_hub` for each of `hub_heights`, with the numpy
+        implementation for all backends.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame or :class:`~.tools.WeatherData`
+            Weather data as described in :func:`density_hub`.
+        hub_heights : array-like
+            Hub heights in m.
+
+        Returns
+        -------
+        numpy.array
+            Density of air in kg/m³ with one row for each time step and one
+            column for each hub height.
+
+        """
+        hub_heights = np.asarray(hub_heights, dtype=float)
+        return self._cached_hub_data(
+            weather_df, ('density', tuple(hub_heights)),
+            self._calculate_density_hub_heights, hub_heights)
+
+    def _calculate_density_hub_heights(self, weather, hub_heights):
+        r"""
+        Calculates the density of air at several hub heights without cache,
+        see :func:`density_hub_heights`.
+
+        """
+        hub_heights = np.asarray(hub_heights, dtype=float)
+        if self.density_model in ['barometric', 'ideal_gas']:
+            temperature_hub = self.temperature_hub_heights(weather,
+                                                           hub_heights)
+            density_function = getattr(density, self.density_model)
+            density_hub = self._hub_heights_data(
+                weather, 'pressure', hub_heights,
+                lambda data, height, columns: density_function(
+                    data, height, hub_heights[columns],
+                    temperature_hub[:, columns]))
+        elif self.density_model == 'interpolation_extrapolation':
+            density_hub = np.column_stack([
+                weather.linear_interpolation_extrapolation(
+                    'density', hub_height)
+                for hub_height in hub_heights])
+        else:
+            raise ValueError("'{0}' is an invalid value. ".format(
+                             self.density_model) + "`density_model` " +
+                             "must be 'barometric', 'ideal_gas' or " +
+                             "'interpolation_extrapolation'.")
+        return self.apply_precision(density_hub)
+
+    def wind_speed_hub_heights(self, weather_df, hub_heights):
+        r"""
+        Calculates the wind speed at several hub heights at once.
+
+        Same as :func:`wind_speed_hub` for each of `hub_heights`, with the
+        numpy implementation for all backends. The logarithmic wind profile
+        and the hellman equation are calculated for all hub heights in one
+        pass.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame or :class:`~.tools.WeatherData`
+            Weather data as described in :func:`wind_speed_hub`.
+        hub_heights : array-like
+            Hub heights in m.
+
+        Returns
+        -------
+        numpy.array
+            Wind speed in m/s with one row for each time step and one column
+            for each hub height.
+
+        """
+        hub_heights = np.asarray(hub_heights, dtype=float)
+        return self._cached_hub_data(
+            weather_df, ('wind_speed', tuple(hub_heights)),
+            self._calculate_wind_speed_hub_heights, hub_heights)
+
+    def _calculate_wind_speed_hub_heights(self, weather, hub_heights):
+        r"""
+        Calculates the wind speed at several hub heights without cache,
+        see :func:`wind_speed_hub_heights`.
+
+        """
+        hub_heights = np.asarray(hub_heights, dtype=float)
+        if self.wind_speed_model in ['logarithmic', 'hellman']:
+            roughness_length = np.asarray(
+                weather['roughness_length'].iloc[:, 0])[:, np.newaxis]
+            if self.wind_speed_model == 'logarithmic':
+                def wind_speed_function(data, height, columns):
+                    return wind_speed.logarithmic_profile(
+                        data, height, hub_heights[columns], roughness_length,
+                        self.obstacle_height)
+            else:
+                def wind_speed_function(data, height, columns):
+                    return wind_speed.hellman(
+                        data, height, hub_heights[columns], roughness_length,
+                        self.hellman_exp)
+            wind_speed_hub = self._hub_heights_data(
+                weather, 'wind_speed', hub_heights, wind_speed_function)
+        elif self.wind_speed_model == 'interpolation_extrapolation':
+            wind_speed_hub = np.column_stack([
+                weather.column('wind_speed', hub_height)
+                if weather.has_height('wind_speed', hub_height) else
+                weather.linear_interpolation_extrapolation(
+                    'wind_speed', hub_height)
+                for hub_height in hub_heights])
+        elif self.wind_speed_model == 'log_interpolation_extrapolation':
+            wind_speed_hub = np.column_stack([
+                weather.column('wind_speed', hub_height)
+                if weather.has_height('wind_speed', hub_height) else
+                weather.logarithmic_interpolation_extrapolation(
+                    'wind_speed', hub_height)
+                for hub_height in hub_heights])
+        else:
+            raise ValueError("'{0}' is an invalid value. ".format(
+                self.wind_speed_model) + "`wind_speed_model` must be "
+                "'logarithmic', 'hellman', 'interpolation_extrapolation' " +
+                "or 'log_interpolation_extrapolation'.")
+        return self.apply_precision(wind_speed_hub)
 
     def calculate_power_output(self, wind_speed_hub, density_hub):
         r"""
@@ -341,11 +837,19 @@ class ModelChain(object):
                                 self.power_plant.name +
                                 " are missing.")
             logging.debug('Calculating power output using power curve.')
-            return (power_output.power_curve(
+            return self.apply_precision(
+                self._module(power_output).power_curve(
                         wind_speed_hub,
                         self.power_plant.power_curve['wind_speed'],
                         self.power_plant.power_curve['value'],
-                        density_hub, self.density_correction))
+                        density_hub, self.density_correction,
+                        density_grid=self.density_grid,
+                        compiled_curve=(
+                            self.power_plant.compiled_power_curve),
+                        lookup_table=(
+                            self.density_lookup_table(
+                                self.power_plant.power_curve)
+                            if self.density_correction is True else None)))
         elif self.power_output_model == 'power_coefficient_curve':
             if self.power_plant.power_coefficient_curve is None:
                 raise TypeError("Power coefficient curve values of " +
@@ -353,13 +857,16 @@ class ModelChain(object):
                                 " are missing.")
             logging.debug('Calculating power output using power coefficient '
                           'curve.')
-            return (power_output.power_coefficient_curve(
+            return self.apply_precision(
+                self._module(power_output).power_coefficient_curve(
                         wind_speed_hub,
                         self.power_plant.power_coefficient_curve[
                             'wind_speed'],
                         self.power_plant.power_coefficient_curve[
                             'value'],
-                        self.power_plant.rotor_diameter, density_hub))
+                        self.power_plant.rotor_diameter, density_hub,
+                        compiled_curve=(self.power_plant.
+                                        compiled_power_coefficient_curve)))
         else:
             raise ValueError("'{0}' is an invalid value. ".format(
                              self.power_output_model) +
@@ -415,10 +922,175 @@ class ModelChain(object):
         'wind_speed'
 
         """
-        wind_speed_hub = self.wind_speed_hub(weather_df)
+        weather = self._weather_data(weather_df)
+        self.power_output = self._threaded_power_output(weather)
+        return self
+
+    def run_model_cube(self, weather_cube):
+        r"""
+        Runs the model for the weather data of many locations at once.
+
+        Wind speed, temperature and density at hub height and the power
+        output are calculated for all time steps and locations of
+        `weather_cube` in one pass over its flattened weather data (see
+        :py:attr:`~.weather_cube.WeatherCube.weather_df`), with the
+        roughness length and all other variables of each location and time
+        step. The results are the same as with :func:`run_model` for each
+        location.
+
+        Parameters
+        ----------
+        weather_cube : :class:`~.weather_cube.WeatherCube`
+            Weather data of the locations with the variables described in
+            :func:`run_model`.
+
+        Returns
+        -------
+        self
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> import pandas as pd
+        >>> from windpowerlib import modelchain, weather_cube, wind_turbine
+        >>> turbine = wind_turbine.WindTurbine(
+        ...     hub_height=100, nominal_power=2e6,
+        ...     power_curve=pd.DataFrame({'wind_speed': [3.0, 12.0, 25.0],
+        ...                               'value': [0.0, 2e6, 2e6]}))
+        >>> cube = weather_cube.WeatherCube(
+        ...     np.array([[[7.5, 0.15], [12.0, 0.1]],
+        ...               [[30.0, 0.15], [3.0, 0.1]]]),
+        ...     columns=[['wind_speed', 'roughness_length'], [100, 0]],
+        ...     locations=['cell 1', 'cell 2'])
+        >>> modelchain.ModelChain(turbine).run_model_cube(cube).power_output
+              cell 1     cell 2
+        0  1000000.0  2000000.0
+        1        0.0        0.0
+
+        """
+        weather = self._weather_data(weather_cube.weather_df)
+        self.power_output = weather_cube.unstack(
+            self._threaded_power_output(weather))
+        return self
+
+    def _prepare_power_output(self):
+        r"""
+        Builds the compiled power (coefficient) curve and the density lookup
+        table of :py:attr:`~power_plant` used by :func:`_power_output`.
+
+        """
+        if self.power_output_model == 'power_curve':
+            if self.power_plant.power_curve is not None:
+                self.power_plant.compiled_power_curve
+                if self.density_correction is True:
+                    self.density_lookup_table(self.power_plant.power_curve)
+        elif self.power_output_model == 'power_coefficient_curve':
+            if self.power_plant.power_coefficient_curve is not None:
+                self.power_plant.compiled_power_coefficient_curve
+
+    def _threaded_power_output(self, weather):
+        r"""
+        Calculates the power output for `weather` in chunks of time steps on
+        a thread pool with `threads` threads.
+
+        The chunks of the weather data are views on `weather` and the power
+        output of each chunk is written to its part of the power output
+        array, so that the chunks are neither copied nor concatenated.
+
+        """
+        length = len(weather.index)
+        if self.threads <= 1 or length < self.threads:
+            return self._power_output(weather)
+        bounds = np.linspace(0, length, self.threads + 1).astype(int)
+        values = np.empty(length, dtype=(
+            np.float32 if self.precision == 'float32' else np.float64))
+        # Compiled curves and lookup tables are built once, so that the
+        # chunks only read them
+        self._prepare_power_output()
+        if self.hub_height_cache is not None:
+            logging.debug('The hub height cache is not used for the chunks '
+                          'of time steps.')
+
+        def calculate_chunk(start, end):
+            # Each chunk has its own model, so that workspace arrays, the
+            # hub height cache and the cached lookup tables are not shared
+            # between threads
+            chunk_model = copy.copy(self)
+            chunk_model.workspace = None
+            chunk_model.hub_height_cache = None
+            chunk_model._density_lookup_tables = dict(
+                self._density_lookup_tables)
+            chunk_power_output = chunk_model._power_output(tools.WeatherData(
+                weather.weather_df.iloc[start:end]))
+            values[start:end] = chunk_power_output
+            return chunk_power_output.name
+
+        logging.debug('Calculating power output in {} chunks.'.format(
+            self.threads))
+        with ThreadPoolExecutor(self.threads) as executor:
+            names = list(executor.map(calculate_chunk, bounds[:-1],
+                                      bounds[1:]))
+        return pd.Series(values, index=weather.index, name=names[0],
+                         copy=False)
+
+    def _power_output(self, weather):
+        r"""
+        Calculates the power output for `weather`.
+
+        """
+        wind_speed_hub = self.wind_speed_hub(weather)
         density_hub = (None if (self.power_output_model == 'power_curve' and
                                 self.density_correction is False)
-                       else self.density_hub(weather_df))
-        self.power_output = self.calculate_power_output(wind_speed_hub,
-                                                        density_hub)
+                       else self.density_hub(weather))
+        return self.calculate_power_output(wind_speed_hub, density_hub)
+
+    def append(self, weather_df):
+        r"""
+        Runs the model for new time steps of the weather data.
+
+        Only the power output of the new time steps is calculated, e.g. for
+        a live feed of observations that adds a few time steps at a time. The
+        heights of the weather data selected for the hub height are reused
+        from the previous call if the columns of the weather data did not
+        change. The power output of the new time steps is appended to
+        `power_output_buffer`, which keeps the power output of the latest
+        `buffer_size` time steps.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame
+            New time steps of the weather data as described in
+            :py:func:`~.run_model`.
+
+        Returns
+        -------
+        self
+
+        Examples
+        --------
+        >>> import pandas as pd
+        >>> from windpowerlib import modelchain, wind_turbine
+        >>> turbine = wind_turbine.WindTurbine(
+        ...     hub_height=100, nominal_power=2e6,
+        ...     power_curve=pd.DataFrame({'wind_speed': [3.0, 12.0, 25.0],
+        ...                               'value': [0.0, 2e6, 2e6]}))
+        >>> weather_df = pd.DataFrame(
+        ...     [[7.5, 0.15], [12.0, 0.15], [30.0, 0.15]],
+        ...     columns=[['wind_speed', 'roughness_length'], [100, 0]])
+        >>> turbine_mc = modelchain.ModelChain(turbine, buffer_size=2)
+        >>> turbine_mc.append(weather_df.iloc[:2]).power_output.tolist()
+        [1000000.0, 2000000.0]
+        >>> turbine_mc.append(weather_df.iloc[2:]).power_output.tolist()
+        [0.0]
+        >>> turbine_mc.power_output_buffer.to_series().tolist()
+        [2000000.0, 0.0]
+
+        """
+        weather_df = self.apply_precision(weather_df)
+        weather = (tools.WeatherData(weather_df)
+                   if self._append_weather is None
+                   else self._append_weather.with_data(weather_df))
+        self._append_weather = weather
+        self.power_output = self._power_output(weather)
+        self.power_output_buffer.append(self.power_output)
         return self
@@ -0,0 +1,468 @@
+"""
+The ``numba_kernels`` module contains versions of the time series
+calculations of the windpowerlib that are compiled with numba. Each function
+calculates its result in a single loop over the time steps without temporary
+arrays. The functions have the same parameters and results as their
+counterparts in the modules :py:mod:`~.wind_speed`, :py:mod:`~.temperature`,
+:py:mod:`~.density` and :py:mod:`~.power_output`, which remain the reference
+implementation.
+
+The module can only be used if numba is installed. It is used by the
+:class:`~.modelchain.ModelChain` if its parameter `backend` is 'numba'.
+
+"""
+
+__copyright__ = "Copyright oemof developer group"
+__license__ = "GPLv3"
+
+import math
+import numpy as np
+import pandas as pd
+from windpowerlib import power_output
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+#: True if numba is installed and the kernels can be used.
+NUMBA_AVAILABLE = numba is not None
+
+
+def _jit(function):
+    r"""
+    Compiles `function` with numba if numba is installed.
+
+    """
+    if numba is None:
+        return function
+    return numba.njit(cache=True, nogil=True)(function)
+
+
+def _check_numba():
+    r"""
+    Raises an ImportError if numba is not installed.
+
+    """
+    if not NUMBA_AVAILABLE:
+        raise ImportError("numba is needed for the calculation with the "
+                          "numba backend. Install numba or use the numpy "
+                          "backend.")
+
+
+def _prepare(data, out):
+    r"""
+    Returns `data` and `out` as one-dimensional floating point arrays.
+
+    If `out` is None a new array with the shape and data type of `data` is
+    created.
+
+    """
+    data = np.asarray(data)
+    if not np.issubdtype(data.dtype, np.floating):
+        data = data.astype(float)
+    if out is None:
+        out = np.empty(data.shape, dtype=data.dtype)
+    return data.reshape(-1), out
+
+
+def _broadcast(data, shape):
+    r"""
+    Returns `data` (float or array) as one-dimensional array of length
+    `shape`.
+
+    """
+    data = np.asarray(data)
+    if not np.issubdtype(data.dtype, np.floating):
+        data = data.astype(float)
+    return np.broadcast_to(data, shape).reshape(-1)
+
+
+def _result(out, given_out, name=None, *args):
+    r"""
+    Returns `out` as pandas.Series if `out` was not given and one of `args`
+    is a pandas.Series (index of the first pandas.Series is used).
+
+    """
+    if given_out is None:
+        for arg in args:
+            if isinstance(arg, pd.Series):
+                return pd.Series(data=out, index=arg.index, name=name)
+    return out
+
+
+def _curve_arrays(curve_wind_speeds, curve_values, compiled_curve):
+    r"""
+    Returns wind speeds, values, slopes and wind speed step of a curve for
+    :py:func:`_curve_value`.
+
+    Curves that are not compiled to a table with equally spaced wind speeds
+    get a step of zero and are evaluated by a binary search.
+
+    """
+    if compiled_curve is not None:
+        return (compiled_curve.wind_speeds, compiled_curve.values,
+                compiled_curve.slopes,
+                (0.0 if compiled_curve.wind_speed_step is None
+                 else compiled_curve.wind_speed_step))
+    curve_wind_speeds = np.asarray(curve_wind_speeds, dtype=float)
+    curve_values = np.asarray(curve_values, dtype=float)
+    return (curve_wind_speeds, curve_values, np.zeros(len(curve_values)),
+            0.0)
+
+
+@_jit
+def _search(x, xp):
+    r"""
+    Index of the interval of the increasing `xp` that contains `x`.
+
+    """
+    low = 0
+    high = len(xp) - 1
+    while high - low > 1:
+        middle = (low + high) // 2
+        if xp[middle] <= x:
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+@_jit
+def _curve_value(x, wind_speeds, values, slopes, step):
+    r"""
+    Linear interpolation of a curve at `x` with zero outside of the curve.
+
+    Curves with a `step` are evaluated like
+    :py:func:`~.tools.CompiledCurve.interp`, other curves like
+    `numpy.interp`.
+
+    """
+    if math.isnan(x):
+        return x
+    if x < wind_speeds[0] or x > wind_speeds[-1]:
+        return 0.0
+    if x == wind_speeds[-1]:
+        return values[-1]
+    if step > 0.0:
+        position = (x - wind_speeds[0]) / step
+        index = min(int(position), len(wind_speeds) - 2)
+        return (position - index) * slopes[index] + values[index]
+    index = _search(x, wind_speeds)
+    slope = ((values[index + 1] - values[index]) /
+             (wind_speeds[index + 1] - wind_speeds[index]))
+    return slope * (x - wind_speeds[index]) + values[index]
+
+
+@_jit
+def _logarithmic_profile_kernel(wind_speed, wind_speed_height, hub_height,
+                                roughness_length, obstacle_height, out):
+    for i in range(len(wind_speed)):
+        out[i] = (wind_speed[i] *
+                  math.log((hub_height - 0.7 * obstacle_height) /
+                           roughness_length[i]) /
+                  math.log((wind_speed_height - 0.7 * obstacle_height) /
+                           roughness_length[i]))
+
+
+@_jit
+def _hellman_kernel(wind_speed, wind_speed_height, hub_height,
+                    roughness_length, hellman_exponent, out):
+    for i in range(len(wind_speed)):
+        # Exponent is calculated from the roughness length if it is nan
+        exponent = hellman_exponent[i]
+        if math.isnan(exponent):
+            exponent = 1 / math.log(hub_height / roughness_length[i])
+        out[i] = wind_speed[i] * (hub_height / wind_speed_height) ** exponent
+
+
+@_jit
+def _linear_gradient_kernel(temperature, temperature_height, hub_height,
+                            out):
+    for i in range(len(temperature)):
+        out[i] = temperature[i] - 0.0065 * (hub_height - temperature_height)
+
+
+@_jit
+def _density_kernel(pressure, pressure_height, hub_height,
+                    temperature_hub_height, factor, out):
+    # Both density models only differ by a constant factor
+    for i in range(len(pressure)):
+        out[i] = ((pressure[i] / 100 - (hub_height - pressure_height) * 1 / 8)
+                  * factor / temperature_hub_height[i])
+
+
+@_jit
+def _power_curve_kernel(wind_speed, wind_speeds, values, slopes, step, out):
+    for i in range(len(wind_speed)):
+        out[i] = _curve_value(wind_speed[i], wind_speeds, values, slopes,
+                              step)
+
+
+@_jit
+def _power_coefficient_curve_kernel(wind_speed, wind_speeds, values, slopes,
+                                    step, rotor_diameter, density, out):
+    for i in range(len(wind_speed)):
+        out[i] = (1 / 8 * density[i] * rotor_diameter ** 2 * np.pi *
+                  wind_speed[i] ** 3 *
+                  _curve_value(wind_speed[i], wind_speeds, values, slopes,
+                               step))
+
+
+@_jit
+def _density_correction_kernel(wind_speed, density, power_curve_wind_speeds,
+                               power_curve_values, exponents, out):
+    last = len(power_curve_wind_speeds) - 1
+    for i in range(len(wind_speed)):
+        x = wind_speed[i]
+        if math.isnan(x):
+            out[i] = x
+            continue
+        ratio = 1.225 / density[i]
+        # Site specific power curve wind speeds are calculated on the fly
+        if (x < power_curve_wind_speeds[0] * ratio ** exponents[0] or
+                x > power_curve_wind_speeds[last] * ratio ** exponents[last]):
+            out[i] = 0.0
+            continue
+        low = 0
+        high = last
+        while high - low > 1:
+            middle = (low + high) // 2
+            if (power_curve_wind_speeds[middle] *
+                    ratio ** exponents[middle] <= x):
+                low = middle
+            else:
+                high = middle
+        lower = power_curve_wind_speeds[low] * ratio ** exponents[low]
+        upper = power_curve_wind_speeds[low + 1] * ratio ** exponents[low + 1]
+        out[i] = power_curve_values[low] + (x - lower) * (
+            (power_curve_values[low + 1] - power_curve_values[low]) /
+            (upper - lower))
+
+
+@_jit
+def _smoothing_kernel(power_curve_wind_speeds, power_curve_values,
+                      block_offsets, block_width, standard_deviations,
+                      mean_gauss, truncate, out):
+    slopes = np.zeros(len(power_curve_values))
+    for i in range(len(power_curve_wind_speeds)):
+        standard_deviation = standard_deviations[i]
+        if standard_deviation == 0.0:
+            # The gaussian distribution is not defined for a standard
+            # deviation of zero
+            out[i] = 0.0
+            continue
+        smoothed_value = 0.0
+        for offset in block_offsets:
+            wind_speed = offset + power_curve_wind_speeds[i]
+            distance = power_curve_wind_speeds[i] - wind_speed - mean_gauss
+            if abs(distance) > truncate * standard_deviation:
+                continue
+            smoothed_value += (
+                block_width * _curve_value(
+                    wind_speed, power_curve_wind_speeds, power_curve_values,
+                    slopes, 0.0) *
+                (1 / (standard_deviation * np.sqrt(2 * np.pi)) *
+                 np.exp(-distance ** 2 / (2 * standard_deviation ** 2))))
+        out[i] = smoothed_value
+
+
+def logarithmic_profile(wind_speed, wind_speed_height, hub_height,
+                        roughness_length, obstacle_height=0.0, out=None):
+    r"""
+    Numba compiled version of :py:func:`~.wind_speed.logarithmic_profile`.
+
+    """
+    _check_numba()
+    if 0.7 * obstacle_height > wind_speed_height:
+        raise ValueError("To take an obstacle height of {0} m ".format(
+                         obstacle_height) + "into consideration, wind " +
+                         "speed data of a greater height is needed.")
+    values, result = _prepare(wind_speed, out)
+    _logarithmic_profile_kernel(
+        values, wind_speed_height, hub_height,
+        _broadcast(roughness_length, result.shape), obstacle_height,
+        result.reshape(-1))
+    return _result(result, out, None, wind_speed)
+
+
+def hellman(wind_speed, wind_speed_height, hub_height,
+            roughness_length=None, hellman_exponent=None, out=None):
+    r"""
+    Numba compiled version of :py:func:`~.wind_speed.hellman`.
+
+    """
+    _check_numba()
+    values, result = _prepare(wind_speed, out)
+    if hellman_exponent is None:
+        hellman_exponent = np.nan if roughness_length is not None else 1/7
+    if roughness_length is None:
+        roughness_length = np.nan
+    _hellman_kernel(values, wind_speed_height, hub_height,
+                    _broadcast(roughness_length, result.shape),
+                    _broadcast(hellman_exponent, result.shape),
+                    result.reshape(-1))
+    return _result(result, out, None, wind_speed)
+
+
+def linear_gradient(temperature, temperature_height, hub_height, out=None):
+    r"""
+    Numba compiled version of :py:func:`~.temperature.linear_gradient`.
+
+    """
+    _check_numba()
+    values, result = _prepare(temperature, out)
+    _linear_gradient_kernel(values, temperature_height, hub_height,
+                            result.reshape(-1))
+    return _result(result, out, None, temperature)
+
+
+def barometric(pressure, pressure_height, hub_height, temperature_hub_height,
+               out=None):
+    r"""
+    Numba compiled version of :py:func:`~.density.barometric`.
+
+    """
+    _check_numba()
+    values, result = _prepare(pressure, out)
+    _density_kernel(values, pressure_height, hub_height,
+                    _broadcast(temperature_hub_height, result.shape),
+                    1.225 * 288.15 * 100 / 101330, result.reshape(-1))
+    return _result(result, out, None, pressure, temperature_hub_height)
+
+
+def ideal_gas(pressure, pressure_height, hub_height, temperature_hub_height,
+              out=None):
+    r"""
+    Numba compiled version of :py:func:`~.density.ideal_gas`.
+
+    """
+    _check_numba()
+    values, result = _prepare(pressure, out)
+    _density_kernel(values, pressure_height, hub_height,
+                    _broadcast(temperature_hub_height, result.shape),
+                    100 / 287.058, result.reshape(-1))
+    return _result(result, out, None, pressure, temperature_hub_height)
+
+
+def power_curve(wind_speed, power_curve_wind_speeds, power_curve_values,
+                density=None, density_correction=False, density_grid=None,
+                compiled_curve=None, out=None, lookup_table=None):
+    r"""
+    Numba compiled version of :py:func:`~.power_output.power_curve`.
+
+    The lookup in precalculated density corrected power curves (parameters
+    `density_grid` and `lookup_table`) is not compiled and done by
+    :py:func:`~.power_output.power_curve`.
+
+    """
+    _check_numba()
+    if density_correction is True and (density_grid is not None or
+                                       lookup_table is not None):
+        return power_output.power_curve(
+            wind_speed, power_curve_wind_speeds, power_curve_values, density,
+            density_correction, density_grid=density_grid, out=out,
+            lookup_table=lookup_table)
+    if density_correction is True:
+        return power_curve_density_correction(
+            wind_speed, power_curve_wind_speeds, power_curve_values, density,
+            out=out)
+    if density_correction is not False:
+        raise TypeError("'{0}' is an invalid type. ".format(type(
+                        density_correction)) + "`density_correction` must " +
+                        "be Boolean (True or False).")
+    values, result = _prepare(wind_speed, out)
+    _power_curve_kernel(values, *_curve_arrays(
+        power_curve_wind_speeds, power_curve_values, compiled_curve),
+        out=result.reshape(-1))
+    return _result(result, out, 'feedin_power_plant', wind_speed)
+
+
+def power_curve_density_correction(wind_speed, power_curve_wind_speeds,
+                                   power_curve_values, density, out=None):
+    r"""
+    Numba compiled version of
+    :py:func:`~.power_output.power_curve_density_correction`.
+
+    The site specific power curve wind speeds are calculated on the fly, so
+    that no array with one power curve per time step is needed.
+
+    """
+    _check_numba()
+    if density is None:
+        raise TypeError("`density` is None. For the calculation with a " +
+                        "density corrected power curve density at hub " +
+                        "height is needed.")
+    power_curve_wind_speeds = np.asarray(power_curve_wind_speeds,
+                                         dtype=float)
+    values, result = _prepare(wind_speed, out)
+    _density_correction_kernel(
+        values, _broadcast(density, result.shape), power_curve_wind_speeds,
+        np.asarray(power_curve_values, dtype=float),
+        np.interp(power_curve_wind_speeds, [7.5, 12.5], [1/3, 2/3]),
+        result.reshape(-1))
+    return _result(result, out, 'feedin_power_plant', wind_speed)
+
+
+def power_coefficient_curve(wind_speed, power_coefficient_curve_wind_speeds,
+                            power_coefficient_curve_values, rotor_diameter,
+                            density, compiled_curve=None, out=None):
+    r"""
+    Numba compiled version of
+    :py:func:`~.power_output.power_coefficient_curve`.
+
+    """
+    _check_numba()
+    values, result = _prepare(wind_speed, out)
+    _power_coefficient_curve_kernel(
+        values, *_curve_arrays(power_coefficient_curve_wind_speeds,
+                               power_coefficient_curve_values,
+                               compiled_curve),
+        rotor_diameter=rotor_diameter,
+        density=_broadcast(density, result.shape), out=result.reshape(-1))
+    return _result(result, out, 'feedin_power_plant', wind_speed)
+
+
+def smoothed_power_curve_values(power_curve_wind_speeds, power_curve_values,
+                                block_offsets, block_width,
+                                standard_deviations, mean_gauss=0,
+                                truncate=None):
+    r"""
+    Numba compiled sum of :py:func:`~.power_curves.smooth_power_curve`.
+
+    Parameters
+    ----------
+    power_curve_wind_speeds : numpy.array
+        Wind speeds in m/s of the power curve to be smoothed.
+    power_curve_values : numpy.array
+        Power curve values corresponding to `power_curve_wind_speeds`.
+    block_offsets : numpy.array
+        Offsets of the wind speeds in the sum to the power curve wind speed.
+    block_width : float
+        Width between the wind speeds in the sum.
+    standard_deviations : numpy.array
+        Standard deviation of the Gauss distribution for each power curve
+        wind speed.
+    mean_gauss : float
+        Mean of the Gauss distribution. Default: 0.
+    truncate : None or float
+        Number of standard deviations at which the Gauss distribution is
+        truncated. Default: None.
+
+    Returns
+    -------
+    numpy.array
+        Smoothed power curve values.
+
+    """
+    _check_numba()
+    power_curve_wind_speeds = np.asarray(power_curve_wind_speeds,
+                                         dtype=float)
+    out = np.empty(len(power_curve_wind_speeds))
+    _smoothing_kernel(power_curve_wind_speeds,
+                      np.asarray(power_curve_values, dtype=float),
+                      np.asarray(block_offsets, dtype=float), block_width,
+                      np.asarray(standard_deviations, dtype=float),
+                      mean_gauss, np.inf if truncate is None else truncate,
+                      out)
+    return out
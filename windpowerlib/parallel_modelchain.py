@@ -0,0 +1,185 @@
+"""
+The ``parallel_modelchain`` module contains a model chain for calculating the
+power output of many power plants with the same weather data on a pool of
+processes.
+
+"""
+
+__copyright__ = "Copyright oemof developer group"
+__license__ = "GPLv3"
+
+import copy
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Weather data, power output and model chains of a worker process
+_worker = {}
+
+
+def _shared_memory():
+    r"""
+    Returns the module multiprocessing.shared_memory.
+
+    The module is imported when it is used, as it is only available in
+    Python 3.8 or later and importing the windpowerlib must not fail in older
+    versions.
+
+    """
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        raise ImportError("The ParallelModelChain needs "
+                          "multiprocessing.shared_memory, which is available "
+                          "in Python 3.8 or later.")
+    return shared_memory
+
+
+def _initialize_worker(weather_name, weather_shape, columns, output_name,
+                       output_shape, model_chains):
+    r"""
+    Attaches a worker process to the shared weather data and power output.
+
+    """
+    shared_memory = _shared_memory()
+    _worker['weather_memory'] = shared_memory.SharedMemory(name=weather_name)
+    _worker['output_memory'] = shared_memory.SharedMemory(name=output_name)
+    _worker['weather_df'] = pd.DataFrame(
+        np.ndarray(weather_shape, dtype=np.float64,
+                   buffer=_worker['weather_memory'].buf),
+        columns=columns, copy=False)
+    _worker['power_output'] = np.ndarray(
+        output_shape, dtype=np.float64, buffer=_worker['output_memory'].buf)
+    _worker['model_chains'] = model_chains
+
+
+def _run_model_chains(positions):
+    r"""
+    Runs the model chains at `positions` in a worker process and writes their
+    power output to the shared power output.
+
+    """
+    for position in positions:
+        _worker['power_output'][:, position] = _worker['model_chains'][
+            position].run_model(_worker['weather_df']).power_output
+
+
+class ParallelModelChain(object):
+    r"""
+    Model to determine the output of many power plants with the same weather
+    data on a pool of processes.
+
+    The weather data is copied once to shared memory (see
+    multiprocessing.shared_memory), which the worker processes use without
+    copying instead of receiving the pickled weather data with each task. The
+    model chains are sent once to each worker process, which runs the model
+    chains of the chunks assigned to it and writes their power output to a
+    shared power output matrix.
+
+    Parameters
+    ----------
+    model_chains : list
+        :class:`~.modelchain.ModelChain` or
+        :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain`
+        objects. The names of their power plants must be unique.
+    workers : int or None
+        Number of worker processes. Default: None (number of processors).
+    chunksize : int
+        Number of model chains of a task of a worker process. Default: 1.
+
+    Attributes
+    ----------
+    model_chains : list
+        Model chains of the power plants.
+    workers : int or None
+        Number of worker processes.
+    chunksize : int
+        Number of model chains of a task of a worker process.
+    power_output : pandas.DataFrame
+        Electrical power output in W with time steps as index and the names of
+        the power plants as columns.
+
+    Notes
+    -----
+    The ParallelModelChain needs Python 3.8 or later (see
+    multiprocessing.shared_memory).
+
+    `workspace` and `hub_height_cache` of the model chains are not used in
+    the worker processes. The model chains are copied to the worker
+    processes, so that their attribute `power_output` is not set.
+
+    """
+    def __init__(self, model_chains, workers=None, chunksize=1):
+        self.model_chains = model_chains
+        self.workers = workers
+        self.chunksize = chunksize
+        self.power_output = None
+
+    def run_model(self, weather_df):
+        r"""
+        Runs the model for all power plants.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame
+            Weather data as described in
+            :py:func:`~.modelchain.ModelChain.run_model`, which is used for
+            all power plants.
+
+        Returns
+        -------
+        self
+
+        """
+        names = [model_chain.power_plant.name
+                 for model_chain in self.model_chains]
+        if len(set(names)) != len(names):
+            raise ValueError("The names of the power plants must be unique.")
+        shared_memory = _shared_memory()
+        # Workspace arrays and caches are not sent to the worker processes
+        model_chains = []
+        for model_chain in self.model_chains:
+            model_chain = copy.copy(model_chain)
+            model_chain.workspace = None
+            model_chain.hub_height_cache = None
+            model_chains.append(model_chain)
+        weather_values = np.asarray(weather_df.values, dtype=np.float64)
+        output_shape = (len(weather_df.index), len(model_chains))
+        weather_memory = shared_memory.SharedMemory(
+            create=True, size=max(weather_values.nbytes, 1))
+        output_memory = shared_memory.SharedMemory(
+            create=True, size=max(8 * output_shape[0] * output_shape[1], 1))
+        power_output = None
+        try:
+            np.ndarray(weather_values.shape, dtype=np.float64,
+                       buffer=weather_memory.buf)[:] = weather_values
+            power_output = np.ndarray(output_shape, dtype=np.float64,
+                                      buffer=output_memory.buf)
+            chunks = [list(range(start, min(start + self.chunksize,
+                                            len(model_chains))))
+                      for start in range(0, len(model_chains),
+                                         self.chunksize)]
+            workers = min(self.workers or os.cpu_count() or 1,
+                          max(len(chunks), 1))
+            logging.debug('Calculating {} power plants in {} chunks on {} '
+                          'processes.'.format(len(model_chains), len(chunks),
+                                              workers))
+            with ProcessPoolExecutor(
+                    max_workers=workers, initializer=_initialize_worker,
+                    initargs=(weather_memory.name, weather_values.shape,
+                              weather_df.columns, output_memory.name,
+                              output_shape, model_chains)) as executor:
+                # Raises errors of the worker processes
+                list(executor.map(_run_model_chains, chunks))
+            self.power_output = pd.DataFrame(
+                power_output.copy(), index=weather_df.index, columns=names)
+        finally:
+            # Views must be released before the shared memory is closed
+            power_output = None
+            weather_memory.close()
+            weather_memory.unlink()
+            output_memory.close()
+            output_memory.unlink()
+        return self
@@ -0,0 +1,338 @@
+"""
+The ``power_curve_cache`` module contains a cache for the aggregated power
+curves of wind farms and wind turbine clusters, which can be shared by
+:class:`~.turbine_cluster_modelchain.TurbineClusterModelChain` objects.
+
+"""
+
+__copyright__ = "Copyright oemof developer group"
+__license__ = "GPLv3"
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from windpowerlib.wind_farm import WindFarm
+from windpowerlib.wind_turbine_cluster import WindTurbineCluster
+
+
+class PowerCurveCache(object):
+    r"""
+    Bounded cache of aggregated power curves.
+
+    The aggregation of the power curves of a wind farm or wind turbine
+    cluster including smoothing and wake losses only depends on the fleet
+    and on a few parameters. A cache stores the results of
+    :py:func:`~.turbine_cluster_modelchain.TurbineClusterModelChain.assign_power_curve`
+    with a key made of the fleet composition (turbine types, power curves,
+    hub heights, numbers of turbines and wind farm efficiencies) and of these
+    parameters, so that repeated runs of the same power plant, e.g. with every
+    new weather forecast, skip the aggregation. If the cache is full, the least
+    recently used power curves are discarded.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of power curves kept in memory. Default: 128.
+    directory : None or str
+        Directory of an optional on-disk tier. Power curves are additionally
+        stored in this directory and loaded from it if they are not in memory,
+        so that they are reused by other processes and later sessions. They
+        are stored as arrays in .npz files, which are loaded without
+        unpickling any objects. Default: None.
+    significant_digits : int
+        Number of significant digits the mean roughness length and turbulence
+        intensity are rounded to before the aggregation, so that runs with
+        nearly identical weather data share the same power curve. Default: 3.
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximum number of power curves kept in memory.
+    directory : None or str
+        Directory of the on-disk tier.
+    significant_digits : int
+        Number of significant digits of the mean roughness length and
+        turbulence intensity.
+    hits : int
+        Number of power curves found in memory.
+    disk_hits : int
+        Number of power curves loaded from the on-disk tier.
+    misses : int
+        Number of power curves that were not in the cache.
+
+    Examples
+    --------
+    >>> from windpowerlib import power_curve_cache
+    >>> cache = power_curve_cache.PowerCurveCache(maxsize=2)
+    >>> cache.quantize(0.15049)
+    0.15
+    >>> cache.get('key') is None
+    True
+    >>> cache.set('key', {'power_curve': None})
+    >>> cache.get('key')
+    {'power_curve': None}
+    >>> cache.hits, cache.misses
+    (1, 1)
+
+    """
+
+    def __init__(self, maxsize=128, directory=None, significant_digits=3):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.significant_digits = significant_digits
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._power_curves = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self._power_curves)
+
+    def quantize(self, value):
+        r"""
+        Rounds `value` to :py:attr:`~significant_digits` significant digits.
+
+        Parameters
+        ----------
+        value : float or None
+            Value to round, e.g. the mean roughness length.
+
+        Returns
+        -------
+        float or None
+            Rounded value. None if `value` is None.
+
+        """
+        if value is None:
+            return None
+        return float('{:.{}g}'.format(value, self.significant_digits))
+
+    def key(self, power_plant, **parameters):
+        r"""
+        Returns the key of the aggregated power curve of `power_plant`.
+
+        Parameters
+        ----------
+        power_plant : :class:`~.wind_farm.WindFarm` or :class:`~.wind_turbine_cluster.WindTurbineCluster`
+            Wind farm or wind turbine cluster the power curve is aggregated
+            for.
+
+        Other Parameters
+        ----------------
+        parameters :
+            Parameters of the aggregation, e.g. `smoothing` or
+            `roughness_length`.
+
+        Returns
+        -------
+        str
+            Key of the power curve, which is the same in every session.
+
+        """
+        description = repr((_power_plant_description(power_plant),
+                            sorted(parameters.items())))
+        return hashlib.sha1(description.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        r"""
+        Returns the power curves stored with `key`.
+
+        Parameters
+        ----------
+        key : str
+            Key as returned by :py:func:`~.key`.
+
+        Returns
+        -------
+        dict or None
+            Power curves stored with `key`. None if `key` is not in the cache.
+
+        """
+        if key in self._power_curves:
+            self._power_curves.move_to_end(key)
+            self.hits += 1
+            return self._power_curves[key]
+        if self.directory is not None:
+            filename = self._filename(key)
+            if os.path.isfile(filename):
+                with np.load(filename, allow_pickle=False) as arrays:
+                    power_curves = _from_arrays(arrays)
+                self._store(key, power_curves)
+                self.disk_hits += 1
+                return power_curves
+        self.misses += 1
+        return None
+
+    def set(self, key, power_curves):
+        r"""
+        Stores `power_curves` with `key`.
+
+        Parameters
+        ----------
+        key : str
+            Key as returned by :py:func:`~.key`.
+        power_curves : dict
+            Power curves to store, e.g. the power curve of the power plant
+            and of its wind farms. With an on-disk tier the values must be
+            DataFrames, lists of DataFrames or None.
+
+        """
+        if self.directory is not None:
+            arrays = _to_arrays(power_curves)
+            filename = self._filename(key)
+            # Write to a temporary file first, so that other processes never
+            # read incomplete files
+            temporary_filename = '{}.{}.tmp'.format(filename, os.getpid())
+            with open(temporary_filename, 'wb') as file:
+                np.savez(file, **arrays)
+            os.replace(temporary_filename, filename)
+        self._store(key, power_curves)
+
+    def clear(self, disk=False):
+        r"""
+        Removes all power curves from memory.
+
+        Parameters
+        ----------
+        disk : bool
+            If True the power curves of the on-disk tier are removed as well.
+            Default: False.
+
+        """
+        self._power_curves = OrderedDict()
+        if disk and self.directory is not None:
+            for filename in os.listdir(self.directory):
+                if filename.endswith('.npz'):
+                    os.remove(os.path.join(self.directory, filename))
+
+    def _store(self, key, power_curves):
+        self._power_curves[key] = power_curves
+        self._power_curves.move_to_end(key)
+        while len(self._power_curves) > self.maxsize:
+            self._power_curves.popitem(last=False)
+
+    def _filename(self, key):
+        return os.path.join(self.directory, '{}.npz'.format(key))
+
+
+def _frame_to_arrays(prefix, frame, arrays):
+    r"""
+    Adds the values, index, columns and their names of `frame` to `arrays`.
+
+    """
+    arrays[prefix + '.values'] = frame.values
+    for name, labels in [('index', frame.index), ('columns', frame.columns)]:
+        labels = np.asarray(labels)
+        if labels.dtype == object:
+            labels = labels.astype(str)
+        arrays['{}.{}'.format(prefix, name)] = labels
+    arrays[prefix + '.names'] = np.array(json.dumps(
+        [frame.index.name, frame.columns.name]))
+
+
+def _frame_from_arrays(prefix, arrays):
+    r"""
+    Returns the DataFrame stored with :py:func:`_frame_to_arrays`.
+
+    """
+    index_name, columns_name = json.loads(str(arrays[prefix + '.names']))
+    return pd.DataFrame(
+        arrays[prefix + '.values'],
+        index=pd.Index(arrays[prefix + '.index'], name=index_name),
+        columns=pd.Index(arrays[prefix + '.columns'], name=columns_name))
+
+
+def _to_arrays(power_curves):
+    r"""
+    Converts the power curves of a cache entry to arrays for an .npz file.
+
+    """
+    arrays = {}
+    kinds = {}
+    for name, value in power_curves.items():
+        if value is None:
+            kinds[name] = 'none'
+        elif isinstance(value, pd.DataFrame):
+            kinds[name] = 'frame'
+            _frame_to_arrays(name, value, arrays)
+        elif (isinstance(value, list) and
+              all(isinstance(frame, pd.DataFrame) for frame in value)):
+            kinds[name] = len(value)
+            for position, frame in enumerate(value):
+                _frame_to_arrays('{}.{}'.format(name, position), frame,
+                                 arrays)
+        else:
+            raise TypeError("The on-disk tier only stores DataFrames, lists "
+                            "of DataFrames and None but {} is {}.".format(
+                                name, type(value)))
+    arrays['kinds'] = np.array(json.dumps(kinds))
+    return arrays
+
+
+def _from_arrays(arrays):
+    r"""
+    Returns the power curves of a cache entry stored with
+    :py:func:`_to_arrays`.
+
+    """
+    power_curves = {}
+    for name, kind in json.loads(str(arrays['kinds'])).items():
+        if kind == 'none':
+            power_curves[name] = None
+        elif kind == 'frame':
+            power_curves[name] = _frame_from_arrays(name, arrays)
+        else:
+            power_curves[name] = [
+                _frame_from_arrays('{}.{}'.format(name, position), arrays)
+                for position in range(kind)]
+    return power_curves
+
+
+def _array_digest(values):
+    r"""
+    Returns a digest of the values of an array-like object.
+
+    """
+    return hashlib.sha1(
+        np.ascontiguousarray(values, dtype=float).tobytes()).hexdigest()
+
+
+def _curve_digest(curve, column='value'):
+    r"""
+    Returns a digest of a power curve or efficiency curve.
+
+    """
+    if curve is None:
+        return None
+    return (_array_digest(curve['wind_speed']), _array_digest(curve[column]))
+
+
+def _power_plant_description(power_plant):
+    r"""
+    Describes everything the aggregated power curve of a wind farm or wind
+    turbine cluster depends on.
+
+    """
+    if isinstance(power_plant, WindTurbineCluster):
+        return ('wind_turbine_cluster', tuple(
+            _power_plant_description(wind_farm)
+            for wind_farm in power_plant.wind_farms))
+    if isinstance(power_plant, WindFarm):
+        efficiency = power_plant.efficiency
+        if isinstance(efficiency, pd.DataFrame):
+            efficiency = _curve_digest(efficiency, column='efficiency')
+        return ('wind_farm', efficiency, tuple(
+            ((wind_dict['wind_turbine'].name,
+              wind_dict['wind_turbine'].hub_height,
+              _curve_digest(wind_dict['wind_turbine'].power_curve)),
+             wind_dict['number_of_turbines'])
+            for wind_dict in power_plant.wind_turbine_fleet))
+    raise TypeError("`power_plant` must be a WindFarm or WindTurbineCluster "
+                    "but is {}.".format(type(power_plant)))
@@ -10,14 +10,15 @@ __license__ = "GPLv3"
 
 import numpy as np
 import pandas as pd
-from windpowerlib import tools
+from windpowerlib import tools, numba_kernels
 import warnings
 
 
 def smooth_power_curve(power_curve_wind_speeds, power_curve_values,
                        block_width=0.5, wind_speed_range=15.0,
                        standard_deviation_method='turbulence_intensity',
-                       mean_gauss=0, **kwargs):
+                       mean_gauss=0, truncate=None, backend='numpy',
+                       **kwargs):
     r"""
     Smooths the input power curve values by using a Gauss distribution.
 
@@ -45,6 +46,18 @@ def smooth_power_curve(power_curve_wind_speeds, power_curve_values,
     mean_gauss : float
         Mean of the Gauss distribution in
         :py:func:`~.tools.gauss_distribution`. Default: 0.
+    truncate : None or float
+        If given, the Gauss distribution is truncated at `truncate` standard
+        deviations from its mean, i.e. wind speeds further away do not
+        contribute to the sum in equation :eq:`power`, which reduces the
+        number of wind speeds in the sum. Beyond four standard deviations
+        the Gauss distribution is below 0.04 % of its maximum.
+        Default: None.
+    backend : string
+        Implementation of the sum in equation :eq:`power`. Valid options are
+        'numpy' and 'numba' (see
+        :py:func:`~.numba_kernels.smoothed_power_curve_values`).
+        Default: 'numpy'.
 
     Other Parameters
     ----------------
@@ -111,6 +124,37 @@ def smooth_power_curve(power_curve_wind_speeds, power_curve_values,
     .. [4]  Staffell, I. and Pfenninger, S.: "Using Bias-Corrected Reanalysis
               to Simulate Current and Future Wind Power Output". 2005, p. 11
 
+    """
+    power_curve_wind_speeds, smoothed_power_curve_values = (
+        _smooth_power_curve(
+            power_curve_wind_speeds, power_curve_values,
+            block_width=block_width, wind_speed_range=wind_speed_range,
+            standard_deviation_method=standard_deviation_method,
+            mean_gauss=mean_gauss, truncate=truncate, backend=backend,
+            **kwargs))
+    # Create smoothed power curve data frame
+    smoothed_power_curve_df = pd.DataFrame(
+        data={'wind_speed': power_curve_wind_speeds,
+              'value': smoothed_power_curve_values},
+        columns=['wind_speed', 'value'])
+    return smoothed_power_curve_df
+
+
+def _smooth_power_curve(power_curve_wind_speeds, power_curve_values,
+                        block_width=0.5, wind_speed_range=15.0,
+                        standard_deviation_method='turbulence_intensity',
+                        mean_gauss=0, truncate=None, backend='numpy',
+                        **kwargs):
+    r"""
+    Smooths a power curve like :py:func:`~.smooth_power_curve` but returns
+    arrays.
+
+    Returns
+    -------
+    tuple(numpy.array)
+        Wind speeds in m/s and the corresponding smoothed power curve values
+        in W.
+
     """
     # Specify normalized standard deviation
     if standard_deviation_method == 'turbulence_intensity':
@@ -128,49 +172,181 @@ def smooth_power_curve(power_curve_wind_speeds, power_curve_values,
                          + "options are 'turbulence_intensity', or "
                          + "'Staffell_Pfenninger'".format(
                                  standard_deviation_method))
-    # Initialize list for power curve values
-    smoothed_power_curve_values = []
-    # Append wind speeds to `power_curve_wind_speeds`
-    maximum_value = power_curve_wind_speeds.values[-1] + wind_speed_range
-    while power_curve_wind_speeds.values[-1] < maximum_value:
-        power_curve_wind_speeds = power_curve_wind_speeds.append(
-            pd.Series(power_curve_wind_speeds.iloc[-1] + 0.5,
-                      index=[power_curve_wind_speeds.index[-1] + 1]))
-        power_curve_values = power_curve_values.append(
-            pd.Series(0.0, index=[power_curve_values.index[-1] + 1]))
-    for power_curve_wind_speed in power_curve_wind_speeds:
-        # Create array of wind speeds for the sum
-        wind_speeds_block = (np.arange(
-            -wind_speed_range, wind_speed_range + block_width, block_width) +
-            power_curve_wind_speed)
-        # Get standard deviation for Gauss function
-        standard_deviation = (
-            (power_curve_wind_speed * normalized_standard_deviation + 0.6)
-            if standard_deviation_method is 'Staffell_Pfenninger'
-            else power_curve_wind_speed * normalized_standard_deviation)
-        # Get the smoothed value of the power output
-        if standard_deviation == 0.0:
-            # The gaussian distribution is not defined for a standard deviation
-            # of zero. Smoothed power curve value is set to zero.
-            smoothed_value = 0.0
-        else:
-            smoothed_value = sum(
-                block_width * np.interp(wind_speed, power_curve_wind_speeds,
-                                        power_curve_values, left=0, right=0) *
-                tools.gauss_distribution(
-                    power_curve_wind_speed - wind_speed,
-                    standard_deviation, mean_gauss)
-                for wind_speed in wind_speeds_block)
-        # Add value to list - add zero if `smoothed_value` is nan as Gauss
-        # distribution for a standard deviation of zero.
-        smoothed_power_curve_values.append(smoothed_value)
-    # Create smoothed power curve data frame
-    smoothed_power_curve_df = pd.DataFrame(
-        data=[list(power_curve_wind_speeds.values),
-              smoothed_power_curve_values]).transpose()
-    # Rename columns of the data frame
-    smoothed_power_curve_df.columns = ['wind_speed', 'value']
-    return smoothed_power_curve_df
+    power_curve_wind_speeds = np.asarray(power_curve_wind_speeds,
+                                         dtype=float)
+    power_curve_values = np.asarray(power_curve_values, dtype=float)
+    # Append wind speeds with a power curve value of zero to
+    # `power_curve_wind_speeds` up to `wind_speed_range` above the last wind
+    # speed of the power curve
+    maximum_value = power_curve_wind_speeds[-1] + wind_speed_range
+    appended_wind_speeds = [power_curve_wind_speeds[-1]]
+    while appended_wind_speeds[-1] < maximum_value:
+        appended_wind_speeds.append(appended_wind_speeds[-1] + 0.5)
+    power_curve_wind_speeds = np.append(power_curve_wind_speeds,
+                                        appended_wind_speeds[1:])
+    power_curve_values = np.append(
+        power_curve_values, np.zeros(len(appended_wind_speeds) - 1))
+    # Get standard deviations for Gauss function
+    standard_deviations = (
+        (power_curve_wind_speeds * normalized_standard_deviation + 0.6)
+        if standard_deviation_method == 'Staffell_Pfenninger'
+        else power_curve_wind_speeds * normalized_standard_deviation)
+    # Offsets of the wind speeds for the sum to the power curve wind speeds
+    block_offsets = np.arange(-wind_speed_range,
+                              wind_speed_range + block_width, block_width)
+    if truncate is not None:
+        # Offsets outside of the widest truncated Gauss distribution are not
+        # needed for any power curve wind speed
+        block_offsets = block_offsets[
+            np.abs(-block_offsets - mean_gauss) <=
+            truncate * standard_deviations.max()]
+    if backend == 'numpy' and truncate is not None:
+        smoothed_power_curve_values = _smoothed_values_banded(
+            power_curve_wind_speeds, power_curve_values, block_offsets,
+            block_width, standard_deviations, mean_gauss, truncate)
+    elif backend == 'numpy':
+        # Wind speeds of the sum with one row per power curve wind speed
+        wind_speeds_block = (block_offsets[np.newaxis, :] +
+                             power_curve_wind_speeds[:, np.newaxis])
+        # The gaussian distribution is not defined for a standard deviation
+        # of zero. Smoothed power curve values are set to zero in this case.
+        valid = standard_deviations != 0.0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weights = block_width * tools.gauss_distribution(
+                power_curve_wind_speeds[:, np.newaxis] - wind_speeds_block,
+                standard_deviations[:, np.newaxis], mean_gauss)
+        weights[~valid] = 0.0
+        smoothed_power_curve_values = (np.interp(
+            wind_speeds_block, power_curve_wind_speeds, power_curve_values,
+            left=0, right=0) * weights).sum(axis=1)
+    elif backend == 'numba':
+        smoothed_power_curve_values = (
+            numba_kernels.smoothed_power_curve_values(
+                power_curve_wind_speeds, power_curve_values, block_offsets,
+                block_width, standard_deviations, mean_gauss, truncate))
+    else:
+        raise ValueError("'{0}' is an invalid value. ".format(backend) +
+                         "`backend` must be 'numpy' or 'numba'.")
+    return power_curve_wind_speeds, smoothed_power_curve_values
+
+
+def _smoothed_values_banded(power_curve_wind_speeds, power_curve_values,
+                            block_offsets, block_width, standard_deviations,
+                            mean_gauss, truncate):
+    r"""
+    Calculates the smoothed power curve values with a Gauss distribution
+    truncated at `truncate` standard deviations.
+
+    Only the offsets of `block_offsets` within the truncated Gauss
+    distribution of each power curve wind speed are evaluated. Their windows
+    are found by a binary search on the sorted offsets and the terms of all
+    windows are calculated in one flat array, so that the work and memory
+    are proportional to the sum of the window sizes instead of the number of
+    power curve wind speeds times the number of offsets.
+
+    Returns
+    -------
+    numpy.array
+        Smoothed power curve values in W.
+
+    """
+    limits = truncate * standard_deviations
+    # Windows of the offsets, extended by one offset on both sides, so that
+    # rounding of the limits cannot exclude an offset within the limits
+    lower = np.maximum(np.searchsorted(
+        block_offsets, -mean_gauss - limits, side='left') - 1, 0)
+    upper = np.minimum(np.searchsorted(
+        block_offsets, -mean_gauss + limits, side='right') + 1,
+        len(block_offsets))
+    # The gaussian distribution is not defined for a standard deviation of
+    # zero. Smoothed power curve values are set to zero in this case.
+    counts = np.where(standard_deviations != 0.0,
+                      np.maximum(upper - lower, 0), 0)
+    rows = np.repeat(np.arange(len(power_curve_wind_speeds)), counts)
+    window_starts = np.cumsum(counts) - counts
+    columns = (np.arange(counts.sum()) - np.repeat(window_starts, counts) +
+               np.repeat(lower, counts))
+    wind_speeds_block = (power_curve_wind_speeds[rows] +
+                         block_offsets[columns])
+    distances = power_curve_wind_speeds[rows] - wind_speeds_block
+    terms = block_width * tools.gauss_distribution(
+        distances, standard_deviations[rows], mean_gauss) * np.interp(
+        wind_speeds_block, power_curve_wind_speeds, power_curve_values,
+        left=0, right=0)
+    terms[np.abs(distances - mean_gauss) > limits[rows]] = 0.0
+    return np.bincount(rows, weights=terms,
+                       minlength=len(power_curve_wind_speeds))
+
+
+def turbulence_intensity_lookup_table(power_curves, turbulence_intensity_grid,
+                                      wind_speed_step=0.05):
+    r"""
+    Combines power curves smoothed for a grid of turbulence intensities.
+
+    The table is used by
+    :py:func:`~.power_output.power_curve_turbulence_intensity_lookup` to look
+    up the power output with the turbulence intensity of each time step
+    instead of smoothing the power curve for each time step.
+
+    Parameters
+    ----------
+    power_curves : list(pandas.DataFrame)
+        Power curves smoothed with the turbulence intensities of
+        `turbulence_intensity_grid` (one per turbulence intensity, same
+        order), e.g. as returned by :py:func:`~.smooth_power_curve`.
+        DataFrames have 'wind_speed' and 'value' columns with wind speeds in
+        m/s and the corresponding power curve value in W.
+    turbulence_intensity_grid : array-like
+        At least two equally spaced, increasing turbulence intensities the
+        power curves in `power_curves` were smoothed with, e.g.
+        `numpy.arange(0.05, 0.31, 0.01)`.
+    wind_speed_step : float
+        Step in m/s between the wind speeds of the table. Default: 0.05.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Smoothed power curves with the equally spaced wind speeds in m/s as
+        index and the turbulence intensities of `turbulence_intensity_grid`
+        as columns. The values are the power curve values in W.
+
+    """
+    turbulence_intensity_grid = np.asarray(turbulence_intensity_grid,
+                                           dtype=float)
+    if (turbulence_intensity_grid.ndim != 1 or
+            len(turbulence_intensity_grid) < 2 or
+            not np.allclose(np.diff(turbulence_intensity_grid),
+                            turbulence_intensity_grid[1] -
+                            turbulence_intensity_grid[0]) or
+            turbulence_intensity_grid[1] <= turbulence_intensity_grid[0]):
+        raise ValueError("`turbulence_intensity_grid` must contain at least "
+                         "two equally spaced, increasing turbulence "
+                         "intensities but is {}.".format(
+                             turbulence_intensity_grid))
+    if len(power_curves) != len(turbulence_intensity_grid):
+        raise ValueError("One power curve per turbulence intensity of "
+                         "`turbulence_intensity_grid` is needed but {} power "
+                         "curves are given for {} turbulence "
+                         "intensities.".format(len(power_curves),
+                                               len(turbulence_intensity_grid)))
+    minimum_wind_speed = min(power_curve['wind_speed'].min()
+                             for power_curve in power_curves)
+    maximum_wind_speed = max(power_curve['wind_speed'].max()
+                             for power_curve in power_curves)
+    number_of_steps = int(np.ceil(
+        (maximum_wind_speed - minimum_wind_speed) / wind_speed_step))
+    wind_speeds = (minimum_wind_speed +
+                   np.arange(number_of_steps + 1) * wind_speed_step)
+    table = np.column_stack([
+        np.interp(wind_speeds, np.asarray(power_curve['wind_speed'],
+                                          dtype=float),
+                  np.asarray(power_curve['value'], dtype=float),
+                  left=0, right=0)
+        for power_curve in power_curves])
+    return pd.DataFrame(
+        table, index=pd.Index(wind_speeds, name='wind_speed'),
+        columns=pd.Index(turbulence_intensity_grid,
+                         name='turbulence_intensity'))
 
 
 def wake_losses_to_power_curve(power_curve_wind_speeds, power_curve_values,
@@ -209,18 +385,40 @@ def wake_losses_to_power_curve(power_curve_wind_speeds, power_curve_values,
         'wake_losses_model is deprecated, will be defined by the type of '
         'wind_farm_efficiency.',
         FutureWarning)
-    # Create power curve DataFrame
+    power_curve_wind_speeds, power_curve_values = _wake_losses_to_power_curve(
+        power_curve_wind_speeds, power_curve_values, wind_farm_efficiency,
+        wake_losses_model=wake_losses_model)
     power_curve_df = pd.DataFrame(
-        data=[list(power_curve_wind_speeds),
-              list(power_curve_values)]).transpose()
-    # Rename columns of DataFrame
-    power_curve_df.columns = ['wind_speed', 'value']
+        data={'wind_speed': power_curve_wind_speeds,
+              'value': power_curve_values},
+        columns=['wind_speed', 'value'])
+    return power_curve_df
+
+
+def _wake_losses_to_power_curve(power_curve_wind_speeds, power_curve_values,
+                                wind_farm_efficiency,
+                                wake_losses_model='power_efficiency_curve'):
+    r"""
+    Reduces the power values of a power curve like
+    :py:func:`~.wake_losses_to_power_curve` but returns arrays.
+
+    Returns
+    -------
+    tuple(numpy.array)
+        Wind speeds in m/s and the corresponding reduced power curve values
+        in W.
+
+    """
+    power_curve_wind_speeds = np.asarray(power_curve_wind_speeds,
+                                         dtype=float)
+    power_curve_values = np.asarray(power_curve_values, dtype=float)
     if wake_losses_model == 'constant_efficiency':
         if not isinstance(wind_farm_efficiency, float):
             raise TypeError("'wind_farm_efficiency' must be float if " +
                             "`wake_losses_model´ is '{}' but is {}".format(
                                 wake_losses_model, wind_farm_efficiency))
-        power_curve_df['value'] = power_curve_values * wind_farm_efficiency
+        return (power_curve_wind_speeds,
+                power_curve_values * wind_farm_efficiency)
     elif wake_losses_model == 'power_efficiency_curve':
         if (not isinstance(wind_farm_efficiency, dict) and
                 not isinstance(wind_farm_efficiency, pd.DataFrame)):
@@ -228,19 +426,61 @@ def wake_losses_to_power_curve(power_curve_wind_speeds, power_curve_values,
                 "'wind_farm_efficiency' must be pd.DataFrame if " +
                 "`wake_losses_model´ is '{}' but is {}".format(
                     wake_losses_model, wind_farm_efficiency))
-        df = pd.concat([power_curve_df.set_index('wind_speed'),
-                        wind_farm_efficiency.set_index('wind_speed')], axis=1)
-        # Add column with reduced power (nan values of efficiency are
-        # interpolated)
-        df['reduced_power'] = df['value'] * df['efficiency'].interpolate(
-            method='index')
-        reduced_power = df['reduced_power'].dropna()
-        power_curve_df = pd.DataFrame([reduced_power.index,
-                                       reduced_power.values]).transpose()
-        power_curve_df.columns = ['wind_speed', 'value']
+        efficiency_wind_speeds = np.asarray(
+            wind_farm_efficiency['wind_speed'], dtype=float)
+        order = np.argsort(efficiency_wind_speeds, kind='stable')
+        efficiency_wind_speeds = efficiency_wind_speeds[order]
+        efficiencies = np.asarray(wind_farm_efficiency['efficiency'],
+                                  dtype=float)[order]
+        order = np.argsort(power_curve_wind_speeds, kind='stable')
+        power_curve_wind_speeds = power_curve_wind_speeds[order]
+        power_curve_values = power_curve_values[order]
+        # Efficiencies are interpolated, power curve wind speeds below the
+        # efficiency curve are dropped and the last efficiency is kept for
+        # wind speeds above it
+        available = power_curve_wind_speeds >= efficiency_wind_speeds[0]
+        return (power_curve_wind_speeds[available],
+                power_curve_values[available] * np.interp(
+                    power_curve_wind_speeds[available],
+                    efficiency_wind_speeds, efficiencies))
     else:
         raise ValueError(
             "`wake_losses_model` is {} but should be ".format(
                 wake_losses_model) +
             "'constant_efficiency' or 'power_efficiency_curve'")
-    return power_curve_df
+
+
+def _aggregate_power_curves(power_curve_wind_speeds, power_curve_values):
+    r"""
+    Sums up power curves with different wind speeds.
+
+    The power curves are linearly interpolated to the union of their wind
+    speeds. Below its first wind speed a power curve is zero, above its last
+    wind speed its last value is kept.
+
+    Parameters
+    ----------
+    power_curve_wind_speeds : list(numpy.array)
+        Wind speeds in m/s of each power curve.
+    power_curve_values : list(numpy.array)
+        Power curve values of each power curve corresponding to the wind
+        speeds in `power_curve_wind_speeds`.
+
+    Returns
+    -------
+    tuple(numpy.array)
+        Union of the wind speeds in m/s and the corresponding sum of the
+        power curve values in W.
+
+    """
+    wind_speeds = np.unique(np.concatenate(power_curve_wind_speeds))
+    values = np.zeros(len(wind_speeds))
+    for curve_wind_speeds, curve_values in zip(power_curve_wind_speeds,
+                                               power_curve_values):
+        if np.any(np.diff(curve_wind_speeds) < 0):
+            order = np.argsort(curve_wind_speeds, kind='stable')
+            curve_wind_speeds = curve_wind_speeds[order]
+            curve_values = curve_values[order]
+        values += np.interp(wind_speeds, curve_wind_speeds, curve_values,
+                            left=0)
+    return wind_speeds, values
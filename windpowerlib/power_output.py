@@ -9,11 +9,16 @@ __license__ = "GPLv3"
 
 import numpy as np
 import pandas as pd
+from windpowerlib import tools
+
+# Number of time steps of a chunk in the calculation with density corrected
+# power curves, which limits the size of the site specific power curves
+_ROWS_PER_CHUNK = 10000
 
 
 def power_coefficient_curve(wind_speed, power_coefficient_curve_wind_speeds,
                             power_coefficient_curve_values, rotor_diameter,
-                            density):
+                            density, compiled_curve=None, out=None):
     r"""
     Calculates the turbine power output using a power coefficient curve.
 
@@ -35,12 +40,24 @@ def power_coefficient_curve(wind_speed, power_coefficient_curve_wind_speeds,
         Rotor diameter in m.
     density : pandas.Series or numpy.array
         Density of air at hub height in kg/m³.
+    compiled_curve : None or :class:`~.tools.CompiledCurve`
+        Power coefficient curve compiled to a table with equally spaced wind
+        speeds. If given it is used instead of
+        `power_coefficient_curve_wind_speeds` and
+        `power_coefficient_curve_values` to obtain the power coefficients.
+        Default: None.
+    out : None or numpy.array
+        Preallocated array with the shape of `wind_speed` in which the power
+        output is stored, e.g. a buffer of a :class:`~.tools.Workspace`. The
+        power output is then calculated in place. Default: None.
 
     Returns
     -------
     pandas.Series or numpy.array
         Electrical power output of the wind turbine in W.
-        Data type depends on type of `wind_speed`.
+        Data type depends on type of `wind_speed`. If `out` is given, `out`
+        is returned. If `wind_speed` is in single precision (float32), the
+        power output is calculated and returned in single precision.
 
     Notes
     -----
@@ -66,9 +83,26 @@ def power_coefficient_curve(wind_speed, power_coefficient_curve_wind_speeds,
             Wirtschaftlichkeit". 4. Auflage, Springer-Verlag, 2008, p. 542
 
     """
-    power_coefficient_time_series = np.interp(
-        wind_speed, power_coefficient_curve_wind_speeds,
-        power_coefficient_curve_values, left=0, right=0)
+    if out is not None:
+        # Power coefficients are multiplied in place with the other factors
+        if compiled_curve is not None:
+            compiled_curve.interp(wind_speed, out=out)
+        else:
+            out[...] = tools._interp(
+                wind_speed, power_coefficient_curve_wind_speeds,
+                power_coefficient_curve_values)
+        wind_speed = np.asarray(wind_speed)
+        out *= np.asarray(density)
+        out *= 1 / 8 * rotor_diameter ** 2 * np.pi
+        for _ in range(3):
+            out *= wind_speed
+        return out
+    if compiled_curve is not None:
+        power_coefficient_time_series = compiled_curve.interp(wind_speed)
+    else:
+        power_coefficient_time_series = tools._interp(
+            wind_speed, power_coefficient_curve_wind_speeds,
+            power_coefficient_curve_values)
     power_output = (1 / 8 * density * rotor_diameter ** 2 * np.pi *
                     np.power(wind_speed, 3) *
                     power_coefficient_time_series)
@@ -82,14 +116,18 @@ def power_coefficient_curve(wind_speed, power_coefficient_curve_wind_speeds,
 
 
 def power_curve(wind_speed, power_curve_wind_speeds, power_curve_values,
-                density=None, density_correction=False):
+                density=None, density_correction=False, density_grid=None,
+                compiled_curve=None, out=None, lookup_table=None):
     r"""
     Calculates the turbine power output using a power curve.
 
     This function is carried out when the parameter `power_output_model` of an
     instance of the :class:`~.modelchain.ModelChain` class is 'power_curve'. If
     the parameter `density_correction` is True the density corrected power
-    curve (See :py:func:`~.power_curve_density_correction`) is used.
+    curve (See :py:func:`~.power_curve_density_correction`) is used. If
+    additionally a `density_grid` is given, the density corrected power curve
+    is looked up in a table of precalculated density corrected power curves
+    (See :py:func:`~.power_curve_density_correction_lookup`).
 
     Parameters
     ----------
@@ -108,12 +146,35 @@ def power_curve(wind_speed, power_curve_wind_speeds, power_curve_values,
         If the parameter is True the density corrected power curve is used for
         the calculation of the turbine power output. In this case `density`
         cannot be None. Default: False.
+    density_grid : None or array-like
+        Equally spaced densities in kg/m³ for which density corrected power
+        curves are precalculated if `density_correction` is True. If None the
+        density corrected power curve is calculated exactly for each time
+        step. See :py:func:`~.density_correction_lookup_table`.
+        Default: None.
+    compiled_curve : None or :class:`~.tools.CompiledCurve`
+        Power curve compiled to a table with equally spaced wind speeds. If
+        given it is used instead of `power_curve_wind_speeds` and
+        `power_curve_values` if `density_correction` is False.
+        Default: None.
+    out : None or numpy.array
+        Preallocated array with the shape of `wind_speed` in which the power
+        output is stored, e.g. a buffer of a :class:`~.tools.Workspace`. With
+        a `compiled_curve` and without density correction the power output is
+        calculated in place. Default: None.
+    lookup_table : None or pandas.DataFrame
+        Density corrected power curves of the power curve precalculated for
+        `density_grid` with :py:func:`~.density_correction_lookup_table`. If
+        given it is used instead of calculating the table from `density_grid`.
+        Default: None.
 
     Returns
     -------
     pandas.Series or numpy.array
         Electrical power output of the wind turbine in W.
-        Data type depends on type of `wind_speed`.
+        Data type depends on type of `wind_speed`. If `out` is given, `out`
+        is returned. If `wind_speed` is in single precision (float32), the
+        power output is calculated and returned in single precision.
 
     Notes
     -------
@@ -122,14 +183,24 @@ def power_curve(wind_speed, power_curve_wind_speeds, power_curve_values,
 
     """
     if density_correction is False:
-        power_output = np.interp(wind_speed, power_curve_wind_speeds,
-                                 power_curve_values, left=0, right=0)
+        if compiled_curve is not None:
+            power_output = compiled_curve.interp(wind_speed, out=out)
+        else:
+            power_output = tools._interp(wind_speed, power_curve_wind_speeds,
+                                         power_curve_values)
         # Power_output as pd.Series if wind_speed is pd.Series (else: np.array)
-        if isinstance(wind_speed, pd.Series):
+        if isinstance(wind_speed, pd.Series) and out is None:
             power_output = pd.Series(data=power_output, index=wind_speed.index,
                                      name='feedin_power_plant')
-        else:
+        elif out is None:
             power_output = np.array(power_output)
+    elif density_correction is True and (density_grid is not None or
+                                         lookup_table is not None):
+        if lookup_table is None:
+            lookup_table = density_correction_lookup_table(
+                power_curve_wind_speeds, power_curve_values, density_grid)
+        power_output = power_curve_density_correction_lookup(
+            wind_speed, lookup_table, density)
     elif density_correction is True:
         power_output = power_curve_density_correction(
             wind_speed, power_curve_wind_speeds, power_curve_values, density)
@@ -137,6 +208,10 @@ def power_curve(wind_speed, power_curve_wind_speeds, power_curve_values,
         raise TypeError("'{0}' is an invalid type. ".format(type(
                         density_correction)) + "`density_correction` must " +
                         "be Boolean (True or False).")
+    if out is not None:
+        if power_output is not out:
+            out[...] = power_output
+        return out
     return power_output
 
 
@@ -212,10 +287,33 @@ def power_curve_density_correction(wind_speed, power_curve_wind_speeds,
         raise TypeError("`density` is None. For the calculation with a " +
                         "density corrected power curve density at hub " +
                         "height is needed.")
-    power_output = [(np.interp(
-        wind_speed[i], power_curve_wind_speeds * (1.225 / density[i]) ** (
-            np.interp(power_curve_wind_speeds, [7.5, 12.5], [1/3, 2/3])),
-        power_curve_values, left=0, right=0)) for i in range(len(wind_speed))]
+    # Single precision wind speeds are calculated in single precision
+    dtype = _float_dtype(wind_speed)
+    power_curve_wind_speeds = np.asarray(power_curve_wind_speeds,
+                                         dtype=float)
+    # The exponent p(v) only depends on the power curve and is therefore
+    # calculated once for all time steps
+    density_correction_exponent = np.interp(
+        power_curve_wind_speeds, [7.5, 12.5], [1/3, 2/3]).astype(dtype)
+    power_curve_wind_speeds = power_curve_wind_speeds.astype(dtype)
+    power_curve_values = np.asarray(power_curve_values, dtype=dtype)
+    wind_speed_values = np.asarray(wind_speed, dtype=dtype).reshape(-1)
+    density_values = np.broadcast_to(np.asarray(density).reshape(-1),
+                                     wind_speed_values.shape)
+    if density_values.dtype != dtype and np.issubdtype(
+            density_values.dtype, np.floating):
+        density_values = density_values.astype(dtype)
+    power_output = np.empty(len(wind_speed_values), dtype=dtype)
+    # Site specific power curve wind speeds with one row per time step are
+    # set up for chunks of time steps to limit the size of the matrix
+    for start in range(0, len(wind_speed_values), _ROWS_PER_CHUNK):
+        end = start + _ROWS_PER_CHUNK
+        site_power_curve_wind_speeds = power_curve_wind_speeds * (
+            dtype(1.225) / density_values[start:end, np.newaxis]) ** (
+            density_correction_exponent)
+        power_output[start:end] = _interpolate_rows(
+            wind_speed_values[start:end], site_power_curve_wind_speeds,
+            power_curve_values)
 
     # Power_output as pd.Series if wind_speed is pd.Series (else: np.array)
     if isinstance(wind_speed, pd.Series):
@@ -224,3 +322,601 @@ def power_curve_density_correction(wind_speed, power_curve_wind_speeds,
     else:
         power_output = np.array(power_output)
     return power_output
+
+
+def power_curve_matrix(wind_speed, power_curve_wind_speeds,
+                       power_curve_values):
+    r"""
+    Calculates the power output of several power curves in a single pass.
+
+    All power curves are evaluated together, which avoids the overhead of
+    calling :py:func:`~.power_curve` for each power curve, e.g. when many
+    turbine types are evaluated against the same wind speed time series.
+
+    Parameters
+    ----------
+    wind_speed : pandas.Series or numpy.array
+        Wind speed at hub height in m/s. Either one wind speed time series
+        used for all power curves (shape (t,)) or one time series for each
+        power curve (shape (n, t)).
+    power_curve_wind_speeds : list(pandas.Series or numpy.array)
+        Wind speeds in m/s for which the power curve values are provided in
+        `power_curve_values`. One entry for each of the n power curves. The
+        power curves can have a different number of wind speeds.
+    power_curve_values : list(pandas.Series or numpy.array)
+        Power curve values corresponding to wind speeds in
+        `power_curve_wind_speeds`.
+
+    Returns
+    -------
+    numpy.array
+        Electrical power output in W with one row for each power curve and
+        one column for each time step (shape (n, t)).
+
+    Notes
+    -----
+    It is assumed that the power output for wind speeds above the maximum
+    and below the minimum wind speed given in the power curve is zero.
+
+    Examples
+    --------
+    >>> from windpowerlib import power_output
+    >>> power_output.power_curve_matrix(
+    ...     [4.5, 6.0], [[4.0, 5.0, 6.0], [3.0, 5.0]],
+    ...     [[300.0, 400.0, 500.0], [0.0, 1000.0]])
+    array([[350., 500.],
+           [750.,   0.]])
+
+    """
+    curves_wind_speeds = [np.asarray(curve_wind_speeds, dtype=float)
+                          for curve_wind_speeds in power_curve_wind_speeds]
+    curves_values = [np.asarray(curve_values, dtype=float)
+                     for curve_values in power_curve_values]
+    wind_speed = np.asarray(wind_speed, dtype=float)
+    # Wind speeds of all power curves form the common grid
+    grid = np.unique(np.concatenate(curves_wind_speeds))
+    if wind_speed.shape[-1] <= len(grid):
+        # Short time series are interpolated directly as the set up of the
+        # common grid would be more expensive
+        return _interpolate_curves(
+            np.broadcast_to(wind_speed, (len(curves_wind_speeds),
+                                         wind_speed.shape[-1])),
+            curves_wind_speeds, curves_values)
+    node_values = _interpolate_curves(
+        np.broadcast_to(grid, (len(curves_wind_speeds), len(grid))),
+        curves_wind_speeds, curves_values)
+    # Interval j + 1 starts at grid[j]; interval 0 lies below the grid and
+    # the last interval above. Within an interval each power curve is either
+    # linear or zero as the grid contains all wind speeds of all curves.
+    minimum_wind_speeds = np.array([
+        curve_wind_speeds[0] for curve_wind_speeds in curves_wind_speeds])
+    maximum_wind_speeds = np.array([
+        curve_wind_speeds[-1] for curve_wind_speeds in curves_wind_speeds])
+    inside = ((grid[:-1] >= minimum_wind_speeds[:, np.newaxis]) &
+              (grid[1:] <= maximum_wind_speeds[:, np.newaxis]))
+    intercepts = np.zeros((len(curves_wind_speeds), len(grid) + 1))
+    slopes = np.zeros((len(curves_wind_speeds), len(grid) + 1))
+    intercepts[:, 1:-1] = np.where(inside, node_values[:, :-1], 0.0)
+    slopes[:, 1:-1] = np.where(
+        inside, np.diff(node_values, axis=1) / np.diff(grid), 0.0)
+
+    index = np.searchsorted(grid, wind_speed, side='right')
+    distance = wind_speed - grid[np.maximum(index - 1, 0)]
+    if wind_speed.ndim == 1:
+        power_output = intercepts[:, index] + slopes[:, index] * distance
+    else:
+        rows = np.arange(len(curves_wind_speeds))[:, np.newaxis]
+        power_output = (intercepts[rows, index] +
+                        slopes[rows, index] * distance)
+    # Wind speeds equal to a wind speed of the grid take the value of the
+    # grid point (relevant for the last wind speed of a power curve)
+    on_grid = (index > 0) & (wind_speed == grid[np.maximum(index - 1, 0)])
+    if wind_speed.ndim == 1:
+        power_output[:, on_grid] = node_values[:, index[on_grid] - 1]
+    else:
+        power_output[on_grid] = node_values[
+            np.nonzero(on_grid)[0], index[on_grid] - 1]
+    return power_output
+
+
+def power_curve_catalog(wind_speed, power_curves):
+    r"""
+    Calculates the power output of many power curves, e.g. of a turbine
+    catalog, for one wind speed time series.
+
+    The power curves are resampled to a common grid of wind speeds (see
+    :class:`~.tools.CurveGrid`), so that the interval of each wind speed is
+    only determined once for all power curves.
+
+    Parameters
+    ----------
+    wind_speed : pandas.Series or numpy.array
+        Wind speed at hub height in m/s.
+    power_curves : dict or :class:`~.tools.CurveGrid`
+        Power curves with their names (e.g. the turbine types) as keys and
+        DataFrames with 'wind_speed' and 'value' columns as values. Pass a
+        :class:`~.tools.CurveGrid` with `names` instead to reuse the common
+        grid for several wind speed time series.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Electrical power output in W with the names of the power curves as
+        columns. The index is the index of `wind_speed` if it is a
+        pandas.Series.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from windpowerlib import power_output
+    >>> power_output.power_curve_catalog(
+    ...     [4.5, 6.0],
+    ...     {'A': pd.DataFrame({'wind_speed': [4.0, 5.0, 6.0],
+    ...                         'value': [300.0, 400.0, 500.0]}),
+    ...      'B': pd.DataFrame({'wind_speed': [3.0, 5.0],
+    ...                         'value': [0.0, 1000.0]})})
+           A      B
+    0  350.0  750.0
+    1  500.0    0.0
+
+    """
+    if isinstance(power_curves, tools.CurveGrid):
+        curve_grid = power_curves
+    else:
+        curve_grid = tools.CurveGrid(
+            [power_curve['wind_speed'] for power_curve in
+             power_curves.values()],
+            [power_curve['value'] for power_curve in power_curves.values()],
+            names=list(power_curves.keys()))
+    return pd.DataFrame(
+        curve_grid.interp(wind_speed).T, columns=curve_grid.names,
+        index=(wind_speed.index if isinstance(wind_speed, pd.Series)
+               else None))
+
+
+def power_curve_columns(wind_speed, power_curves, columns):
+    r"""
+    Calculates the power output of many power curves, each with its own wind
+    speed time series.
+
+    The power curves are resampled to a common grid of wind speeds (see
+    :class:`~.tools.CurveGrid`) and the interval of each wind speed is only
+    determined once, even if several power curves use the same column of
+    `wind_speed`, e.g. wind turbines with the same hub height.
+
+    Parameters
+    ----------
+    wind_speed : numpy.array
+        Wind speeds in m/s with one row for each time step and one column for
+        each wind speed time series, e.g. for each hub height.
+    power_curves : list(pandas.DataFrame)
+        Power curves with 'wind_speed' and 'value' columns.
+    columns : array-like
+        Column of `wind_speed` of each power curve.
+
+    Returns
+    -------
+    numpy.array
+        Electrical power output in W with one row for each time step and one
+        column for each power curve.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import pandas as pd
+    >>> from windpowerlib import power_output
+    >>> power_output.power_curve_columns(
+    ...     np.array([[4.5, 6.0], [6.0, 4.0]]),
+    ...     [pd.DataFrame({'wind_speed': [4.0, 5.0, 6.0],
+    ...                    'value': [300.0, 400.0, 500.0]}),
+    ...      pd.DataFrame({'wind_speed': [3.0, 5.0],
+    ...                    'value': [0.0, 1000.0]})], [0, 1])
+    array([[350.,   0.],
+           [500., 500.]])
+
+    """
+    curve_grid = tools.CurveGrid(
+        [power_curve['wind_speed'] for power_curve in power_curves],
+        [power_curve['value'] for power_curve in power_curves])
+    index, weight = curve_grid.brackets(wind_speed)
+    columns = np.asarray(columns, dtype=np.intp)
+    return curve_grid.interp_columns(
+        np.arange(len(power_curves)),
+        brackets=(index[:, columns], weight[:, columns]))
+
+
+def density_correction_lookup_table(power_curve_wind_speeds,
+                                    power_curve_values, density_grid,
+                                    wind_speed_step=0.05):
+    r"""
+    Calculates density corrected power curves for a grid of densities.
+
+    The table is used by :py:func:`~.power_curve_density_correction_lookup`
+    to look up the density corrected power output of each time step instead of
+    correcting the power curve for each time step.
+
+    Parameters
+    ----------
+    power_curve_wind_speeds : pandas.Series or numpy.array
+        Wind speeds in m/s for which the power curve values are provided in
+        `power_curve_values`.
+    power_curve_values : pandas.Series or numpy.array
+        Power curve values corresponding to wind speeds in
+        `power_curve_wind_speeds`.
+    density_grid : array-like
+        At least two equally spaced, increasing densities in kg/m³ for which
+        the density corrected power curves are calculated, e.g.
+        `numpy.arange(1.0, 1.36, 0.01)`.
+    wind_speed_step : float
+        Step in m/s between the wind speeds of the table. Default: 0.05.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Density corrected power curves with the equally spaced wind speeds in
+        m/s as index and the densities in kg/m³ of `density_grid` as columns.
+        The values are the power curve values in W.
+
+    """
+    density_grid = np.asarray(density_grid, dtype=float)
+    if (density_grid.ndim != 1 or len(density_grid) < 2 or
+            not np.allclose(np.diff(density_grid),
+                            density_grid[1] - density_grid[0]) or
+            density_grid[1] <= density_grid[0]):
+        raise ValueError("`density_grid` must contain at least two equally "
+                         "spaced, increasing densities but is {}.".format(
+                             density_grid))
+    power_curve_wind_speeds = np.asarray(power_curve_wind_speeds,
+                                         dtype=float)
+    power_curve_values = np.asarray(power_curve_values, dtype=float)
+    density_correction_exponent = np.interp(
+        power_curve_wind_speeds, [7.5, 12.5], [1/3, 2/3])
+    site_power_curve_wind_speeds = power_curve_wind_speeds * (
+        1.225 / density_grid.reshape(-1, 1)) ** density_correction_exponent
+    number_of_steps = int(np.ceil(
+        (site_power_curve_wind_speeds[:, -1].max() -
+         site_power_curve_wind_speeds[:, 0].min()) / wind_speed_step))
+    wind_speeds = (site_power_curve_wind_speeds[:, 0].min() +
+                   np.arange(number_of_steps + 1) * wind_speed_step)
+    table = np.column_stack([
+        np.interp(wind_speeds, site_wind_speeds, power_curve_values,
+                  left=0, right=0)
+        for site_wind_speeds in site_power_curve_wind_speeds])
+    return pd.DataFrame(table, index=pd.Index(wind_speeds, name='wind_speed'),
+                        columns=pd.Index(density_grid, name='density'))
+
+
+def power_curve_density_correction_lookup(wind_speed, lookup_table, density):
+    r"""
+    Calculates the turbine power output using precalculated density corrected
+    power curves.
+
+    The power output of each time step is determined by bilinear
+    interpolation in wind speed and density between the density corrected
+    power curves of `lookup_table`. The costs per time step are therefore
+    independent of the size of the power curve. Use
+    :py:func:`~.density_correction_lookup_error` to estimate the deviation
+    from :py:func:`~.power_curve_density_correction`.
+
+    Parameters
+    ----------
+    wind_speed : pandas.Series or numpy.array
+        Wind speed at hub height in m/s.
+    lookup_table : pandas.DataFrame
+        Density corrected power curves as returned by
+        :py:func:`~.density_correction_lookup_table`.
+    density : pandas.Series or numpy.array
+        Density of air at hub height in kg/m³.
+
+    Returns
+    -------
+    pandas.Series or numpy.array
+        Electrical power output of the wind turbine in W.
+        Data type depends on type of `wind_speed`.
+
+    Notes
+    -----
+    Densities outside of the densities of `lookup_table` are set to the
+    closest density of the table. It is assumed that the power output for
+    wind speeds outside of the wind speeds of `lookup_table` is zero.
+    The largest deviations from the exact method occur within one wind speed
+    step of the table around steps of the power curve, e.g. at the cut-out
+    wind speed.
+
+    """
+    if density is None:
+        raise TypeError("`density` is None. For the calculation with a " +
+                        "density corrected power curve density at hub " +
+                        "height is needed.")
+    # Single precision wind speeds are looked up in single precision
+    dtype = _float_dtype(wind_speed)
+    power_output = _bilinear_lookup(
+        np.asarray(wind_speed, dtype=dtype), np.asarray(density, dtype=dtype),
+        lookup_table.index.values.astype(dtype, copy=False),
+        lookup_table.columns.values.astype(dtype, copy=False),
+        lookup_table.values.astype(dtype, copy=False))
+    # Power_output as pd.Series if wind_speed is pd.Series (else: np.array)
+    if isinstance(wind_speed, pd.Series):
+        power_output = pd.Series(data=power_output, index=wind_speed.index,
+                                 name='feedin_power_plant')
+    return power_output
+
+
+def power_curve_turbulence_intensity_lookup(wind_speed, lookup_table,
+                                            turbulence_intensity):
+    r"""
+    Calculates the power output using power curves precalculated for a grid
+    of turbulence intensities.
+
+    The power output of each time step is determined by bilinear
+    interpolation in wind speed and turbulence intensity between the smoothed
+    power curves of `lookup_table`. This way the time series of the
+    turbulence intensity is taken into account in the power curve smoothing
+    at the costs of an unsmoothed power curve evaluation.
+
+    Parameters
+    ----------
+    wind_speed : pandas.Series or numpy.array
+        Wind speed at hub height in m/s.
+    lookup_table : pandas.DataFrame
+        Smoothed power curves as returned by
+        :py:func:`~.power_curves.turbulence_intensity_lookup_table`.
+    turbulence_intensity : pandas.Series or numpy.array
+        Turbulence intensity at hub height.
+
+    Returns
+    -------
+    pandas.Series or numpy.array
+        Electrical power output of the wind turbine in W.
+        Data type depends on type of `wind_speed`.
+
+    Notes
+    -----
+    Turbulence intensities outside of the turbulence intensities of
+    `lookup_table` are set to the closest turbulence intensity of the table.
+    It is assumed that the power output for wind speeds outside of the wind
+    speeds of `lookup_table` is zero.
+
+    """
+    power_output = _bilinear_lookup(
+        np.asarray(wind_speed, dtype=float),
+        np.asarray(turbulence_intensity, dtype=float),
+        lookup_table.index.values, lookup_table.columns.values,
+        lookup_table.values)
+    # Power_output as pd.Series if wind_speed is pd.Series (else: np.array)
+    if isinstance(wind_speed, pd.Series):
+        power_output = pd.Series(data=power_output, index=wind_speed.index,
+                                 name='feedin_power_plant')
+    return power_output
+
+
+def density_correction_lookup_error(power_curve_wind_speeds,
+                                    power_curve_values, density_grid,
+                                    wind_speed_step=0.05, wind_speed=None,
+                                    density=None):
+    r"""
+    Compares the density correction by lookup table with the exact method.
+
+    The power output calculated with
+    :py:func:`~.power_curve_density_correction_lookup` is compared to the
+    power output calculated with :py:func:`~.power_curve_density_correction`.
+    If `wind_speed` and `density` are not given, the comparison is done for
+    wind speeds with a quarter of `wind_speed_step` in between and for the
+    densities of `density_grid` as well as the densities in the middle
+    between them, where the interpolation error is largest.
+
+    Parameters
+    ----------
+    power_curve_wind_speeds : pandas.Series or numpy.array
+        Wind speeds in m/s for which the power curve values are provided in
+        `power_curve_values`.
+    power_curve_values : pandas.Series or numpy.array
+        Power curve values corresponding to wind speeds in
+        `power_curve_wind_speeds`.
+    density_grid : array-like
+        Equally spaced densities in kg/m³ of the lookup table. See
+        :py:func:`~.density_correction_lookup_table`.
+    wind_speed_step : float
+        Step in m/s between the wind speeds of the lookup table.
+        Default: 0.05.
+    wind_speed : None or pandas.Series or numpy.array
+        Wind speed at hub height in m/s the comparison is done for.
+        Default: None.
+    density : None or pandas.Series or numpy.array
+        Density of air at hub height in kg/m³ the comparison is done for.
+        Must be given if `wind_speed` is given. Default: None.
+
+    Returns
+    -------
+    pandas.Series
+        Maximum absolute error in W ('max_absolute_error'), mean absolute
+        error in W ('mean_absolute_error') and maximum absolute error relative
+        to the maximum power curve value ('max_relative_error').
+
+    """
+    lookup_table = density_correction_lookup_table(
+        power_curve_wind_speeds, power_curve_values, density_grid,
+        wind_speed_step=wind_speed_step)
+    if wind_speed is None:
+        densities = lookup_table.columns.values
+        densities = np.sort(np.concatenate(
+            [densities, densities[:-1] + np.diff(densities) / 2]))
+        wind_speeds = np.arange(
+            lookup_table.index[0] - wind_speed_step,
+            lookup_table.index[-1] + wind_speed_step, wind_speed_step / 4)
+        wind_speed = np.tile(wind_speeds, len(densities))
+        density = np.repeat(densities, len(wind_speeds))
+    else:
+        wind_speed = np.asarray(wind_speed, dtype=float)
+        density = np.asarray(density, dtype=float)
+    absolute_error = np.abs(
+        power_curve_density_correction_lookup(
+            wind_speed, lookup_table, density) -
+        power_curve_density_correction(
+            wind_speed, power_curve_wind_speeds, power_curve_values,
+            density))
+    return pd.Series({
+        'max_absolute_error': np.nanmax(absolute_error),
+        'mean_absolute_error': np.nanmean(absolute_error),
+        'max_relative_error': (np.nanmax(absolute_error) /
+                               np.max(power_curve_values))})
+
+
+def _float_dtype(values):
+    r"""
+    Returns numpy.float32 for single precision `values`, else numpy.float64.
+
+    """
+    return (np.float32 if getattr(values, 'dtype', None) == np.float32
+            else np.float64)
+
+
+def _interpolate_rows(x, xp, fp):
+    r"""
+    Linear interpolation with individual x-coordinates for every data point.
+
+    Vectorized equivalent of calling `numpy.interp` with
+    `left=0` and `right=0` for each element of `x` and the corresponding row
+    of `xp`. The interval of each element of `x` is found by a binary search
+    on its row of `xp` that is carried out for all rows at once, so that the
+    work is proportional to n * log(m) and no temporary arrays of shape (n, m)
+    are created.
+
+    Parameters
+    ----------
+    x : numpy.array
+        The x-coordinates at which to evaluate the interpolated values. Shape
+        (n,).
+    xp : numpy.array
+        Increasing x-coordinates of the data points. One row for each element
+        of `x`. Shape (n, m).
+    fp : numpy.array
+        The y-coordinates of the data points shared by all rows of `xp`.
+        Shape (m,).
+
+    Returns
+    -------
+    numpy.array
+        The interpolated values. Shape (n,).
+
+    """
+    rows = np.arange(len(x))
+    # Index of the last data point that is smaller or equal to x, limited to
+    # the intervals of the data points
+    index = np.zeros(len(x), dtype=np.intp)
+    upper_index = np.full(len(x), xp.shape[1] - 1, dtype=np.intp)
+    while np.any(upper_index - index > 1):
+        middle_index = (index + upper_index) // 2
+        below = xp[rows, middle_index] <= x
+        index = np.where(below, middle_index, index)
+        upper_index = np.where(below, upper_index, middle_index)
+    lower_xp = xp[rows, index]
+    upper_xp = xp[rows, index + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = fp[index] + (x - lower_xp) * (
+            (fp[index + 1] - fp[index]) / (upper_xp - lower_xp))
+    # Like numpy.interp the last value is returned at the last data point,
+    # also if the last interval has a width of zero
+    values[x == xp[:, -1]] = fp[-1]
+    # Values outside of the data points are zero
+    values[(x < xp[:, 0]) | (x > xp[:, -1])] = 0.0
+    return values
+
+
+def _bilinear_lookup(x, y, x_grid, y_grid, table):
+    r"""
+    Bilinear interpolation in a table with equally spaced grids.
+
+    Parameters
+    ----------
+    x : numpy.array
+        First coordinate of the points to evaluate. Values outside of `x_grid`
+        result in zero.
+    y : numpy.array
+        Second coordinate of the points to evaluate. Values outside of
+        `y_grid` are set to the closest value of `y_grid`.
+    x_grid : numpy.array
+        Equally spaced, increasing grid of the first coordinate.
+    y_grid : numpy.array
+        Equally spaced, increasing grid of the second coordinate.
+    table : numpy.array
+        Values for all combinations of `x_grid` (rows) and `y_grid`
+        (columns).
+
+    Returns
+    -------
+    numpy.array
+        The interpolated values.
+
+    """
+    x_position = (x - x_grid[0]) / (x_grid[1] - x_grid[0])
+    # nan values are excluded from the index calculation and result in nan
+    x_index = np.clip(np.floor(np.nan_to_num(x_position)),
+                      0, len(x_grid) - 2)
+    x_weight = x_position - x_index
+    x_index = x_index.astype(int)
+    y_position = np.clip((y - y_grid[0]) / (y_grid[1] - y_grid[0]),
+                         0, len(y_grid) - 1)
+    y_index = np.clip(np.floor(np.nan_to_num(y_position)),
+                      0, len(y_grid) - 2)
+    y_weight = y_position - y_index
+    y_index = y_index.astype(int)
+    values = (
+        (1 - x_weight) * (1 - y_weight) * table[x_index, y_index] +
+        x_weight * (1 - y_weight) * table[x_index + 1, y_index] +
+        (1 - x_weight) * y_weight * table[x_index, y_index + 1] +
+        x_weight * y_weight * table[x_index + 1, y_index + 1])
+    # Values outside of the first grid are zero
+    values[(x < x_grid[0]) | (x > x_grid[-1])] = 0.0
+    return values
+
+
+def _interpolate_curves(x, curves_x, curves_y):
+    r"""
+    Linear interpolation of several curves with individual data points.
+
+    Vectorized equivalent of calling `numpy.interp` with `left=0` and
+    `right=0` for each row of `x` and the corresponding curve. All curves are
+    shifted to consecutive, non-overlapping ranges and searched in one sorted
+    array.
+
+    Parameters
+    ----------
+    x : numpy.array
+        The x-coordinates at which to evaluate the interpolated values. One
+        row for each curve. Shape (n, t).
+    curves_x : list(numpy.array)
+        Increasing x-coordinates of the data points of the n curves.
+    curves_y : list(numpy.array)
+        The y-coordinates of the data points of the n curves.
+
+    Returns
+    -------
+    numpy.array
+        The interpolated values. Shape (n, t).
+
+    """
+    lengths = np.array([len(curve_x) for curve_x in curves_x])
+    # Start and end index of each curve in the concatenated arrays
+    starts = np.append(0, np.cumsum(lengths)[:-1])[:, np.newaxis]
+    ends = starts + lengths[:, np.newaxis] - 1
+    all_x = np.concatenate(curves_x)
+    all_y = np.concatenate(curves_y)
+    minimum_x = all_x[starts]
+    maximum_x = all_x[ends]
+    shifts = (np.arange(len(lengths))[:, np.newaxis] *
+              (maximum_x.max() - minimum_x.min() + 1.0) - minimum_x.min())
+    index = np.searchsorted(
+        all_x + np.repeat(shifts[:, 0], lengths),
+        np.clip(x, minimum_x, maximum_x) + shifts, side='right') - 1
+    index = np.clip(index, starts, np.maximum(ends - 1, starts))
+    upper_index = np.minimum(index + 1, ends)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = all_y[index] + (x - all_x[index]) * (
+            (all_y[upper_index] - all_y[index]) /
+            (all_x[upper_index] - all_x[index]))
+    # Values at the last data point and outside of the data points
+    values[x == maximum_x] = np.broadcast_to(
+        all_y[ends], values.shape)[x == maximum_x]
+    values[(x < minimum_x) | (x > maximum_x)] = 0.0
+    return values
@@ -0,0 +1,291 @@
+"""
+The ``streaming`` module contains functions for running a model chain over
+weather data in chunks, so that long time series are calculated with bounded
+memory, and sinks the power output of each chunk is written to.
+
+"""
+
+__copyright__ = "Copyright oemof developer group"
+__license__ = "GPLv3"
+
+import numpy as np
+import pandas as pd
+
+
+def run_model_chunks(model_chain, weather_chunks, sinks=None):
+    r"""
+    Runs `model_chain` for each chunk of weather data and yields the power
+    output of each chunk.
+
+    Only one chunk of weather data and power output is kept in memory at a
+    time: after each chunk the attribute `power_output` of `model_chain` is
+    the power output of this chunk. The chunks are calculated with
+    :py:func:`~.modelchain.ModelChain.run_model` (or the method `run_model`
+    of the other model chains). The :class:`~.modelchain.ModelChain` and
+    :class:`~.batch_modelchain.BatchModelChain` calculate each time step
+    only from its weather data, so that the concatenated chunks are the same
+    as the power output of a single run with the whole weather data.
+
+    Parameters
+    ----------
+    model_chain : :class:`~.modelchain.ModelChain`
+        Model chain that is run, e.g. a :class:`~.modelchain.ModelChain`,
+        :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain`,
+        :class:`~.fleet_modelchain.FleetModelChain` or
+        :class:`~.batch_modelchain.BatchModelChain`.
+    weather_chunks : iterable(pandas.DataFrame)
+        Consecutive chunks of weather data as described in
+        :py:func:`~.modelchain.ModelChain.run_model`, e.g. from
+        :py:func:`~.read_weather_csv`.
+    sinks : None or list
+        Sinks with a method `write`, e.g. :class:`~.CSVSink` or
+        :class:`~.BinarySink`, the power output of each chunk is written to
+        before it is yielded. Default: None.
+
+    Yields
+    ------
+    pandas.Series or pandas.DataFrame
+        Power output of each chunk of weather data.
+
+    Notes
+    -----
+    The :class:`~.turbine_cluster_modelchain.TurbineClusterModelChain`
+    aggregates the power curve with the mean roughness length and turbulence
+    intensity of the weather data, which are the means of each chunk in a
+    streaming run. Its results are the same as the results of a single run if
+    these means do not differ between the chunks.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from windpowerlib import modelchain, streaming, wind_turbine
+    >>> turbine = wind_turbine.WindTurbine(
+    ...     hub_height=100, nominal_power=2e6,
+    ...     power_curve=pd.DataFrame({'wind_speed': [3.0, 12.0, 25.0],
+    ...                               'value': [0.0, 2e6, 2e6]}))
+    >>> weather_df = pd.DataFrame(
+    ...     [[7.5, 0.15], [12.0, 0.15], [30.0, 0.15]],
+    ...     columns=[['wind_speed', 'roughness_length'], [100, 0]])
+    >>> chunks = (weather_df.iloc[start:start + 2] for start in [0, 2])
+    >>> for power_output in streaming.run_model_chunks(
+    ...         modelchain.ModelChain(turbine), chunks):
+    ...     print(power_output.tolist())
+    [1000000.0, 2000000.0]
+    [0.0]
+
+    """
+    for weather_df in weather_chunks:
+        power_output = model_chain.run_model(weather_df).power_output
+        for sink in (sinks or []):
+            sink.write(power_output)
+        yield power_output
+
+
+def read_weather_csv(filename, chunksize, **kwargs):
+    r"""
+    Reads weather data from a csv file in chunks.
+
+    The csv file has the variables in the first and the heights in the
+    second header row and the time steps in the first column, like the
+    weather data of the examples.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the csv file including the path.
+    chunksize : int
+        Number of time steps of each chunk.
+
+    Other Parameters
+    ----------------
+    kwargs :
+        Further parameters of pandas.read_csv, e.g. `parse_dates`.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Chunk of weather data with the variables and heights as MultiIndex
+        columns.
+
+    """
+    kwargs.setdefault('index_col', 0)
+    kwargs.setdefault('header', [0, 1])
+    for weather_df in pd.read_csv(filename, chunksize=chunksize, **kwargs):
+        weather_df.columns = pd.MultiIndex.from_arrays([
+            weather_df.columns.get_level_values(0),
+            pd.to_numeric(weather_df.columns.get_level_values(1))])
+        yield weather_df
+
+
+def _power_output_frame(power_output):
+    r"""
+    Returns `power_output` as DataFrame.
+
+    """
+    if isinstance(power_output, pd.Series):
+        return power_output.to_frame(
+            'power_output' if power_output.name is None else
+            power_output.name)
+    return power_output
+
+
+class CSVSink(object):
+    r"""
+    Sink writing the power output of each chunk to a csv file.
+
+    The header is written with the first chunk, the following chunks are
+    appended.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the csv file including the path. An existing file is
+        overwritten.
+
+    Other Parameters
+    ----------------
+    kwargs :
+        Further parameters of pandas.DataFrame.to_csv, e.g. `float_format`.
+
+    Attributes
+    ----------
+    filename : str
+        Name of the csv file including the path.
+
+    """
+
+    def __init__(self, filename, **kwargs):
+        self.filename = filename
+        self._kwargs = kwargs
+        self._file = open(filename, 'w', newline='')
+        self._header = True
+
+    def write(self, power_output):
+        r"""
+        Appends the power output of a chunk to the csv file.
+
+        Parameters
+        ----------
+        power_output : pandas.Series or pandas.DataFrame
+            Power output of a chunk.
+
+        """
+        _power_output_frame(power_output).to_csv(
+            self._file, header=self._header, **self._kwargs)
+        self._header = False
+
+    def close(self):
+        r"""
+        Closes the csv file.
+
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class BinarySink(object):
+    r"""
+    Sink writing the power output of each chunk to a binary file.
+
+    The power output of each chunk is appended to the file as numpy array in
+    the ``.npy`` format (see numpy.save) with one field for the time steps
+    and one for each column, so that the file can be read without knowing
+    the chunks with :py:func:`~.read`. Time zones of the time steps are not
+    stored, they are written in UTC.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the binary file including the path. An existing file is
+        overwritten.
+
+    Attributes
+    ----------
+    filename : str
+        Name of the binary file including the path.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> import pandas as pd
+    >>> from windpowerlib import streaming
+    >>> filename = os.path.join(tempfile.mkdtemp(), 'power_output.npy')
+    >>> with streaming.BinarySink(filename) as sink:
+    ...     sink.write(pd.Series([1.0, 2.0], name='power_output'))
+    ...     sink.write(pd.Series([3.0], index=[2], name='power_output'))
+    >>> streaming.BinarySink.read(filename)['power_output'].tolist()
+    [1.0, 2.0, 3.0]
+
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, 'wb')
+
+    def write(self, power_output):
+        r"""
+        Appends the power output of a chunk to the binary file.
+
+        Parameters
+        ----------
+        power_output : pandas.Series or pandas.DataFrame
+            Power output of a chunk.
+
+        """
+        power_output = _power_output_frame(power_output)
+        index = power_output.index
+        if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        records = np.empty(len(index), dtype=[('index', index.dtype)] + [
+            (str(column), power_output[column].dtype)
+            for column in power_output.columns])
+        records['index'] = index.values
+        for column in power_output.columns:
+            records[str(column)] = power_output[column].values
+        np.save(self._file, records, allow_pickle=False)
+
+    def close(self):
+        r"""
+        Closes the binary file.
+
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @staticmethod
+    def read(filename):
+        r"""
+        Reads the power output written by a BinarySink.
+
+        Parameters
+        ----------
+        filename : str
+            Name of the binary file including the path.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Power output of all chunks with the time steps as index.
+
+        """
+        chunks = []
+        with open(filename, 'rb') as file:
+            while file.peek(1):
+                chunks.append(np.load(file, allow_pickle=False))
+        if not chunks:
+            return pd.DataFrame()
+        records = np.concatenate(chunks)
+        return pd.DataFrame(
+            {name: records[name] for name in records.dtype.names[1:]},
+            index=pd.Index(records['index']))
@@ -7,8 +7,10 @@ hub height of a wind turbine.
 __copyright__ = "Copyright oemof developer group"
 __license__ = "GPLv3"
 
+import numpy as np
 
-def linear_gradient(temperature, temperature_height, hub_height):
+
+def linear_gradient(temperature, temperature_height, hub_height, out=None):
     r"""
     Calculates the temperature at hub height using a linear gradient.
 
@@ -25,11 +27,15 @@ def linear_gradient(temperature, temperature_height, hub_height):
         Height in m for which the parameter `temperature` applies.
     hub_height : float
         Hub height of wind turbine in m.
+    out : None or numpy.array
+        Preallocated array with the shape of `temperature` in which the result
+        is stored, e.g. a buffer of a :class:`~.tools.Workspace`.
+        Default: None.
 
     Returns
     -------
     pandas.Series or numpy.array
-        Temperature at hub height in K.
+        Temperature at hub height in K. If `out` is given, `out` is returned.
 
     Notes
     -----
@@ -55,4 +61,7 @@ def linear_gradient(temperature, temperature_height, hub_height):
         http://www.dwd.de/DE/service/lexikon/begriffe/S/Standardatmosphaere_pdf.pdf?__blob=publicationFile&v=3
 
     """
+    if out is not None:
+        return np.subtract(np.asarray(temperature),
+                           0.0065 * (hub_height - temperature_height), out=out)
     return temperature - 0.0065 * (hub_height - temperature_height)
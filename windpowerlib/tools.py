@@ -8,7 +8,9 @@ windpowerlib.
 __copyright__ = "Copyright oemof developer group"
 __license__ = "GPLv3"
 
+import numbers
 import numpy as np
+import pandas as pd
 
 
 def linear_interpolation_extrapolation(df, target_height):
@@ -65,12 +67,22 @@ def linear_interpolation_extrapolation(df, target_height):
 
     """
     # find closest heights
-    heights_sorted = df.columns[
-        sorted(range(len(df.columns)),
-               key=lambda i: abs(df.columns[i] - target_height))]
-    return ((df[heights_sorted[1]] - df[heights_sorted[0]]) /
-            (heights_sorted[1] - heights_sorted[0]) *
-            (target_height - heights_sorted[0]) + df[heights_sorted[0]])
+    heights_sorted = df.columns[_closest_positions(
+        np.asarray(df.columns, dtype=float), target_height)]
+    return _linear_interpolation_extrapolation(
+        df[heights_sorted[0]], df[heights_sorted[1]], heights_sorted[0],
+        heights_sorted[1], target_height)
+
+
+def _linear_interpolation_extrapolation(values_1, values_2, height_1,
+                                        height_2, target_height):
+    r"""
+    Linear inter- or extrapolation between the values at two heights, see
+    :py:func:`~.linear_interpolation_extrapolation`.
+
+    """
+    return ((values_2 - values_1) / (height_2 - height_1) *
+            (target_height - height_1) + values_1)
 
 
 def logarithmic_interpolation_extrapolation(df, target_height):
@@ -118,14 +130,34 @@ def logarithmic_interpolation_extrapolation(df, target_height):
 
     """
     # find closest heights
-    heights_sorted = df.columns[
-        sorted(range(len(df.columns)),
-               key=lambda i: abs(df.columns[i] - target_height))]
-    return ((np.log(target_height) *
-             (df[heights_sorted[1]] - df[heights_sorted[0]]) -
-             df[heights_sorted[1]] * np.log(heights_sorted[0]) +
-             df[heights_sorted[0]] * np.log(heights_sorted[1])) /
-            (np.log(heights_sorted[1]) - np.log(heights_sorted[0])))
+    heights_sorted = df.columns[_closest_positions(
+        np.asarray(df.columns, dtype=float), target_height)]
+    return _logarithmic_interpolation_extrapolation(
+        df[heights_sorted[0]], df[heights_sorted[1]], heights_sorted[0],
+        heights_sorted[1], target_height)
+
+
+def _logarithmic_interpolation_extrapolation(values_1, values_2, height_1,
+                                             height_2, target_height):
+    r"""
+    Logarithmic inter- or extrapolation between the values at two heights,
+    see :py:func:`~.logarithmic_interpolation_extrapolation`.
+
+    """
+    return ((np.log(target_height) * (values_2 - values_1) -
+             values_2 * np.log(height_1) + values_1 * np.log(height_2)) /
+            (np.log(height_2) - np.log(height_1)))
+
+
+def _closest_positions(heights, target_height, number=2):
+    r"""
+    Returns the positions of the `number` heights closest to `target_height`
+    ordered by their distance; heights with equal distance in the order of
+    `heights`.
+
+    """
+    return np.argsort(np.abs(heights - target_height),
+                      kind='stable')[:number]
 
 
 def gauss_distribution(function_variable, standard_deviation, mean=0):
@@ -201,3 +233,1146 @@ def estimate_turbulence_intensity(height, roughness_length):
 
     """
     return 1 / (np.log(height / roughness_length))
+
+
+def same_state(state, cached_state):
+    r"""
+    Checks whether the state of a cached result is unchanged.
+
+    States describe the inputs of a cached result, e.g. the parameters of
+    the power curve of a wind farm. They are compared
+    element by element: tuples recursively, numbers and strings by value and
+    all other objects, e.g. wind turbines and power curves, by identity. Thus
+    objects that are modified in place, e.g. a power curve DataFrame, are not
+    detected as a change.
+
+    Parameters
+    ----------
+    state : tuple
+        Current state.
+    cached_state : tuple or None
+        State the cached result was calculated with. None if there is no
+        cached result.
+
+    Returns
+    -------
+    bool
+        True if the states are equal.
+
+    Examples
+    --------
+    >>> from windpowerlib import tools
+    >>> power_curve = object()
+    >>> tools.same_state((power_curve, 100.0, ('a', 2)),
+    ...                  (power_curve, 100, ('a', 2)))
+    True
+    >>> tools.same_state((power_curve, 100.0), (object(), 100.0))
+    False
+
+    """
+    if state is cached_state:
+        return True
+    if isinstance(state, tuple):
+        return (isinstance(cached_state, tuple) and
+                len(state) == len(cached_state) and
+                all(same_state(value, cached_value) for value, cached_value
+                    in zip(state, cached_state)))
+    return (isinstance(state, (numbers.Number, str)) and
+            isinstance(cached_state, (numbers.Number, str)) and
+            state == cached_state)
+
+
+def _observed(method):
+    r"""
+    Returns `method` of a container, which calls the function of the
+    observed container after the modification.
+
+    """
+    def observed_method(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self.on_change is not None:
+            self.on_change()
+        return result
+
+    observed_method.__name__ = method.__name__
+    observed_method.__doc__ = method.__doc__
+    return observed_method
+
+
+class ObservedList(list):
+    r"""
+    List that calls a function after every modification.
+
+    Used for the wind turbine fleet of a :class:`~.wind_farm.WindFarm` and
+    the wind farms of a :class:`~.wind_turbine_cluster.WindTurbineCluster`,
+    so that their cached values are only invalidated if they change instead
+    of comparing them with the state of the cached values in every call.
+    Modifications of the items themselves are not observed.
+
+    Parameters
+    ----------
+    iterable : iterable
+        Items of the list. Default: ().
+    on_change : callable or None
+        Function called without arguments after every modification of the
+        list. Default: None.
+
+    Attributes
+    ----------
+    on_change : callable or None
+        Function called without arguments after every modification of the
+        list.
+
+    Examples
+    --------
+    >>> from windpowerlib import tools
+    >>> changes = []
+    >>> observed_list = tools.ObservedList(
+    ...     [1, 2], on_change=lambda: changes.append(1))
+    >>> observed_list.append(3)
+    >>> observed_list[0] = 0
+    >>> observed_list, len(changes)
+    ([0, 2, 3], 2)
+
+    """
+
+    def __init__(self, iterable=(), on_change=None):
+        super(ObservedList, self).__init__(iterable)
+        self.on_change = on_change
+
+    def __reduce__(self):
+        # The items are passed to the constructor, as adding them
+        # afterwards would call `on_change` for an incomplete copy
+        return self.__class__, (list(self), self.on_change)
+
+    __setitem__ = _observed(list.__setitem__)
+    __delitem__ = _observed(list.__delitem__)
+    __iadd__ = _observed(list.__iadd__)
+    __imul__ = _observed(list.__imul__)
+    append = _observed(list.append)
+    extend = _observed(list.extend)
+    insert = _observed(list.insert)
+    pop = _observed(list.pop)
+    remove = _observed(list.remove)
+    clear = _observed(list.clear)
+    sort = _observed(list.sort)
+    reverse = _observed(list.reverse)
+
+
+class ObservedDict(dict):
+    r"""
+    Dictionary that calls a function after every modification.
+
+    Used for the entries of the wind turbine fleet of a
+    :class:`~.wind_farm.WindFarm`. See :class:`~.ObservedList`.
+
+    Parameters
+    ----------
+    mapping : dict or iterable
+        Items of the dictionary. Default: ().
+    on_change : callable or None
+        Function called without arguments after every modification of the
+        dictionary. Default: None.
+
+    Attributes
+    ----------
+    on_change : callable or None
+        Function called without arguments after every modification of the
+        dictionary.
+
+    """
+
+    def __init__(self, mapping=(), on_change=None):
+        super(ObservedDict, self).__init__(mapping)
+        self.on_change = on_change
+
+    def __reduce__(self):
+        return self.__class__, (dict(self), self.on_change)
+
+    __setitem__ = _observed(dict.__setitem__)
+    __delitem__ = _observed(dict.__delitem__)
+    clear = _observed(dict.clear)
+    pop = _observed(dict.pop)
+    popitem = _observed(dict.popitem)
+    setdefault = _observed(dict.setdefault)
+    update = _observed(dict.update)
+    if hasattr(dict, '__ior__'):
+        __ior__ = _observed(dict.__ior__)
+
+
+def _interp(x, xp, fp):
+    r"""
+    Like `numpy.interp` with `left=0` and `right=0`, but in the floating point
+    precision of `x`.
+
+    `numpy.interp` always calculates in double precision. For single
+    precision `x` the interval of each element is found by a binary search
+    and the values are interpolated in single precision.
+
+    Parameters
+    ----------
+    x : pandas.Series or numpy.array
+        The x-coordinates at which to evaluate the interpolated values.
+    xp : pandas.Series or numpy.array
+        Increasing x-coordinates of the data points.
+    fp : pandas.Series or numpy.array
+        The y-coordinates of the data points.
+
+    Returns
+    -------
+    numpy.array
+        The interpolated values with the floating point precision of `x`.
+
+    """
+    x = np.asarray(x)
+    if x.dtype != np.float32:
+        return np.interp(x, xp, fp, left=0, right=0)
+    xp = np.asarray(xp, dtype=np.float32)
+    fp = np.asarray(fp, dtype=np.float32)
+    if len(xp) < 2:
+        return np.where(x == xp[0], fp[0], np.float32(0.0))
+    index = np.clip(np.searchsorted(xp, x, side='right') - 1, 0,
+                    len(xp) - 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = fp[index] + (x - xp[index]) * (
+            (fp[index + 1] - fp[index]) / (xp[index + 1] - xp[index]))
+    # Like numpy.interp the last value is returned at the last data point
+    values[x == xp[-1]] = fp[-1]
+    # Values outside of the data points are zero
+    values[(x < xp[0]) | (x > xp[-1])] = 0.0
+    return values
+
+
+class CompiledCurve(object):
+    r"""
+    Power (coefficient) curve compiled to a table with equally spaced wind
+    speeds.
+
+    A curve is compiled once and can then be evaluated for any number of wind
+    speeds without a binary search: the position of a wind speed in the table
+    is found by an index computation and the value is obtained from the
+    precomputed slope of the respective interval. The step of the table is
+    chosen so that all wind speeds of the original curve are part of the
+    table, therefore the results are equal to a linear interpolation of the
+    original curve. If no such step exists (e.g. irregular wind speeds) the
+    original curve is kept and evaluated by linear interpolation.
+
+    Parameters
+    ----------
+    curve_wind_speeds : pandas.Series or numpy.array
+        Increasing wind speeds in m/s for which the curve values are provided
+        in `curve_values`.
+    curve_values : pandas.Series or numpy.array
+        Power curve values or power coefficients corresponding to wind speeds
+        in `curve_wind_speeds`.
+    max_table_size : int
+        Maximum number of wind speeds of the table. Default: 10000.
+
+    Attributes
+    ----------
+    wind_speeds : numpy.array
+        Wind speeds in m/s of the table.
+    values : numpy.array
+        Curve values corresponding to `wind_speeds`.
+    wind_speed_step : float or None
+        Step in m/s between the wind speeds of the table. None if the curve
+        could not be compiled to a table with equally spaced wind speeds.
+
+    Examples
+    --------
+    >>> from windpowerlib import tools
+    >>> compiled_curve = tools.CompiledCurve([3.0, 4.0, 5.5],
+    ...                                      [0.0, 100.0, 400.0])
+    >>> compiled_curve.wind_speed_step
+    0.5
+    >>> compiled_curve.interp([2.0, 4.75, 5.0])
+    array([  0., 250., 300.])
+
+    """
+
+    def __init__(self, curve_wind_speeds, curve_values,
+                 max_table_size=10000):
+        curve_wind_speeds = np.asarray(curve_wind_speeds, dtype=float)
+        curve_values = np.asarray(curve_values, dtype=float)
+        self.wind_speed_step = self._find_wind_speed_step(
+            curve_wind_speeds, max_table_size)
+        if self.wind_speed_step is None:
+            self.wind_speeds = curve_wind_speeds
+            self.values = curve_values
+        else:
+            number_of_steps = int(round(
+                (curve_wind_speeds[-1] - curve_wind_speeds[0]) /
+                self.wind_speed_step))
+            self.wind_speeds = (curve_wind_speeds[0] + self.wind_speed_step *
+                                np.arange(number_of_steps + 1))
+            # The wind speeds of the curve are kept exactly, so that rounding
+            # errors of the step do not move the ends of the curve
+            self.wind_speeds[np.rint(
+                (curve_wind_speeds - curve_wind_speeds[0]) /
+                self.wind_speed_step).astype(np.intp)] = curve_wind_speeds
+            self.values = np.interp(self.wind_speeds, curve_wind_speeds,
+                                    curve_values)
+        # Value increase from one wind speed of the table to the next
+        self.slopes = np.append(np.diff(self.values), 0.0)
+
+    @staticmethod
+    def _find_wind_speed_step(curve_wind_speeds, max_table_size):
+        r"""
+        Returns the largest step that contains all wind speeds of the curve.
+
+        """
+        if len(curve_wind_speeds) < 2:
+            return None
+        differences = np.diff(curve_wind_speeds)
+        if not np.all(differences > 0):
+            return None
+        curve_range = curve_wind_speeds[-1] - curve_wind_speeds[0]
+        divisor = 1
+        while curve_range / (differences.min() / divisor) < max_table_size:
+            step = differences.min() / divisor
+            positions = (curve_wind_speeds - curve_wind_speeds[0]) / step
+            if np.allclose(positions, np.round(positions), rtol=0,
+                           atol=1e-6):
+                return step
+            divisor += 1
+        return None
+
+    def interp(self, wind_speed, out=None):
+        r"""
+        Evaluates the curve at the given wind speeds.
+
+        Parameters
+        ----------
+        wind_speed : pandas.Series or numpy.array
+            Wind speed in m/s.
+        out : None or numpy.array
+            Preallocated floating point array with the shape of `wind_speed`
+            in which the curve values are stored. Default: None.
+
+        Returns
+        -------
+        numpy.array
+            Curve values at `wind_speed`. Values for wind speeds outside of
+            the wind speeds of the curve are zero. The values have the
+            floating point precision of `wind_speed` or of `out` if given.
+
+        """
+        wind_speed = np.asarray(wind_speed)
+        if not np.issubdtype(wind_speed.dtype, np.floating):
+            wind_speed = wind_speed.astype(float)
+        if self.wind_speed_step is None:
+            values = _interp(wind_speed, self.wind_speeds, self.values)
+            if out is not None:
+                out[...] = values
+                return out
+            return values.astype(wind_speed.dtype, copy=False)
+        # Wind speeds outside of the curve and at its last wind speed are
+        # compared with the wind speeds of the curve, so that they do not
+        # depend on rounding errors of the position (nan values are excluded
+        # from the index calculation and result in nan)
+        outside = ((wind_speed < self.wind_speeds[0]) |
+                   (wind_speed > self.wind_speeds[-1]))
+        last = wind_speed == self.wind_speeds[-1]
+        if out is None:
+            position = ((wind_speed - self.wind_speeds[0]) /
+                        self.wind_speed_step)
+        else:
+            position = np.subtract(wind_speed, self.wind_speeds[0], out=out)
+            position /= self.wind_speed_step
+        with np.errstate(invalid='ignore'):
+            index = position.astype(np.intp)
+        np.clip(index, 0, len(self.wind_speeds) - 2, out=index)
+        position -= index
+        position *= self.slopes.astype(position.dtype, copy=False)[index]
+        position += self.values.astype(position.dtype, copy=False)[index]
+        position[outside] = 0.0
+        position[last] = self.values[-1]
+        return position
+
+
+class CurveGrid(object):
+    r"""
+    Several power curves resampled to one grid of wind speeds.
+
+    If many power curves are evaluated for the same wind speed time series,
+    e.g. the turbine types of a wind farm or a whole turbine catalog, the
+    interval of the grid and the interpolation weight of each wind speed are
+    determined once by :py:func:`~.brackets`. Each power curve is then
+    evaluated by gathering its values at both ends of the interval and
+    blending them, without repeating the search for every power curve. The
+    grid contains all wind speeds of all power curves, either as a table with
+    equally spaced wind speeds (see :class:`~.CompiledCurve`) or as the union
+    of the wind speeds, therefore the results are equal to a linear
+    interpolation of each power curve.
+
+    Parameters
+    ----------
+    curves_wind_speeds : list(pandas.Series or numpy.array)
+        Increasing wind speeds in m/s of each power curve.
+    curves_values : list(pandas.Series or numpy.array)
+        Power curve values of each power curve corresponding to the wind
+        speeds in `curves_wind_speeds`.
+    names : None or list
+        Names of the power curves, e.g. the turbine types. Default: None.
+    max_table_size : int
+        Maximum number of wind speeds of a grid with equally spaced wind
+        speeds. Default: 10000.
+
+    Attributes
+    ----------
+    wind_speeds : numpy.array
+        Wind speeds in m/s of the grid.
+    values : numpy.array
+        Values of the power curves at `wind_speeds` with one row for each
+        power curve.
+    wind_speed_step : float or None
+        Step in m/s between the wind speeds of the grid. None if the grid is
+        the union of the wind speeds of the power curves.
+    minimum_wind_speeds : numpy.array
+        First wind speed of each power curve.
+    maximum_wind_speeds : numpy.array
+        Last wind speed of each power curve.
+    names : None or list
+        Names of the power curves.
+
+    Examples
+    --------
+    >>> from windpowerlib import tools
+    >>> curve_grid = tools.CurveGrid([[4.0, 5.0, 6.0], [3.0, 5.0]],
+    ...                              [[300.0, 400.0, 500.0], [0.0, 1000.0]])
+    >>> curve_grid.wind_speed_step
+    1.0
+    >>> brackets = curve_grid.brackets([4.5, 6.0])
+    >>> curve_grid.interp(brackets=brackets)
+    array([[350., 500.],
+           [750.,   0.]])
+
+    """
+
+    def __init__(self, curves_wind_speeds, curves_values, names=None,
+                 max_table_size=10000):
+        curves_wind_speeds = [np.asarray(curve_wind_speeds, dtype=float)
+                              for curve_wind_speeds in curves_wind_speeds]
+        curves_values = [np.asarray(curve_values, dtype=float)
+                         for curve_values in curves_values]
+        wind_speeds = np.unique(np.concatenate(curves_wind_speeds))
+        self.wind_speed_step = CompiledCurve._find_wind_speed_step(
+            wind_speeds, max_table_size)
+        if self.wind_speed_step is not None:
+            number_of_steps = int(round(
+                (wind_speeds[-1] - wind_speeds[0]) / self.wind_speed_step))
+            grid = (wind_speeds[0] + self.wind_speed_step *
+                    np.arange(number_of_steps + 1))
+            # The wind speeds of the power curves are kept exactly, so that
+            # rounding errors of the step do not move the ends of the curves
+            grid[np.rint((wind_speeds - wind_speeds[0]) /
+                         self.wind_speed_step).astype(np.intp)] = wind_speeds
+            wind_speeds = grid
+        if len(wind_speeds) < 2:
+            raise ValueError("The power curves of a CurveGrid must contain "
+                             "at least two different wind speeds.")
+        self.wind_speeds = wind_speeds
+        self.values = np.array([
+            np.interp(wind_speeds, curve_wind_speeds, curve_values, left=0,
+                      right=0)
+            for curve_wind_speeds, curve_values in zip(curves_wind_speeds,
+                                                       curves_values)])
+        self.minimum_wind_speeds = np.array([
+            curve_wind_speeds[0] for curve_wind_speeds in curves_wind_speeds])
+        self.maximum_wind_speeds = np.array([
+            curve_wind_speeds[-1] for curve_wind_speeds in curves_wind_speeds])
+        self.names = names
+        # Values at both ends of each interval (one row per interval, one
+        # column per power curve), zero for intervals outside of a power
+        # curve, so that no range check is needed in the evaluation. The
+        # first and last row are zero for wind speeds outside of the grid.
+        inside = (
+            (wind_speeds[:-1] >= self.minimum_wind_speeds[:, np.newaxis]) &
+            (wind_speeds[1:] <= self.maximum_wind_speeds[:, np.newaxis]))
+        self._lower_values = np.zeros((len(wind_speeds) + 1,
+                                       len(curves_values)))
+        self._lower_values[1:-1] = np.where(inside, self.values[:, :-1],
+                                            0.0).T
+        self._upper_values = np.zeros((len(wind_speeds) + 1,
+                                       len(curves_values)))
+        self._upper_values[1:-1] = np.where(inside, self.values[:, 1:],
+                                            0.0).T
+
+    def brackets(self, wind_speed):
+        r"""
+        Determines the interval of the grid of each wind speed.
+
+        Parameters
+        ----------
+        wind_speed : pandas.Series or numpy.array
+            Wind speed time series in m/s or a matrix of wind speeds.
+
+        Returns
+        -------
+        tuple(numpy.array)
+            Index of the interval and interpolation weight of the last wind
+            speed of the interval for each wind speed. Can be passed to
+            :py:func:`~.interp` for any number of evaluations.
+
+        """
+        wind_speed = np.asarray(wind_speed, dtype=float)
+        if self.wind_speed_step is not None:
+            position = ((wind_speed - self.wind_speeds[0]) /
+                        self.wind_speed_step)
+            # Wind speeds on the grid up to rounding errors are moved onto it
+            rounded_position = np.rint(position)
+            on_grid = np.abs(position - rounded_position) < 1e-9
+            position[on_grid] = rounded_position[on_grid]
+            # nan values are excluded from the index calculation and result
+            # in nan
+            index = np.clip(np.floor(np.nan_to_num(position)), 0,
+                            len(self.wind_speeds) - 2).astype(np.intp)
+            weight = position - index
+        else:
+            index = np.clip(
+                np.searchsorted(self.wind_speeds, wind_speed, side='right') -
+                1, 0, len(self.wind_speeds) - 2)
+            weight = ((wind_speed - self.wind_speeds[index]) /
+                      (self.wind_speeds[index + 1] - self.wind_speeds[index]))
+        # Intervals are shifted by one, wind speeds outside of the grid are
+        # assigned to the first or last (zero) row of the tables
+        index += 1
+        below = wind_speed < self.wind_speeds[0]
+        above = wind_speed > self.wind_speeds[-1]
+        index[below] = 0
+        index[above] = len(self.wind_speeds)
+        weight[below | above] = 0.5
+        return index, weight
+
+    def interp(self, wind_speed=None, brackets=None):
+        r"""
+        Evaluates all power curves at the given wind speeds.
+
+        Parameters
+        ----------
+        wind_speed : None or pandas.Series or numpy.array
+            Wind speed in m/s. Only needed if `brackets` is None.
+            Default: None.
+        brackets : None or tuple(numpy.array)
+            Intervals of the wind speeds as returned by :py:func:`~.brackets`.
+            Default: None.
+
+        Returns
+        -------
+        numpy.array
+            Values of the power curves with one row for each power curve and
+            one column for each wind speed. Values for wind speeds outside of
+            the wind speeds of a power curve are zero.
+
+        """
+        if brackets is None:
+            brackets = self.brackets(wind_speed)
+        index, weight = brackets
+        lower_values = self._lower_values[index]
+        values = self._upper_values[index]
+        values -= lower_values
+        values *= weight[:, np.newaxis]
+        values += lower_values
+        # Wind speeds on a wind speed of the grid take the value of the grid
+        # point (relevant for the first and last wind speed of a power curve)
+        on_grid = weight == 0.0
+        if on_grid.any():
+            values[on_grid] = self.values[:, index[on_grid] - 1].T
+        return values.T
+
+    def interp_columns(self, curves, wind_speed=None, brackets=None):
+        r"""
+        Evaluates one power curve for each column of a wind speed matrix.
+
+        Parameters
+        ----------
+        curves : array-like
+            Position of the power curve of each column.
+        wind_speed : None or numpy.array
+            Wind speeds in m/s with one row for each time step and one column
+            for each entry of `curves`. Only needed if `brackets` is None.
+            Default: None.
+        brackets : None or tuple(numpy.array)
+            Intervals of the wind speeds as returned by :py:func:`~.brackets`
+            for a matrix of the same shape. Default: None.
+
+        Returns
+        -------
+        numpy.array
+            Values of the power curves with the shape of the wind speed
+            matrix. Values for wind speeds outside of the wind speeds of a
+            power curve are zero.
+
+        """
+        if brackets is None:
+            brackets = self.brackets(wind_speed)
+        index, weight = brackets
+        curves = np.broadcast_to(np.asarray(curves, dtype=np.intp),
+                                 index.shape)
+        lower_values = self._lower_values[index, curves]
+        values = self._upper_values[index, curves]
+        values -= lower_values
+        values *= weight
+        values += lower_values
+        on_grid = weight == 0.0
+        if on_grid.any():
+            values[on_grid] = self.values[curves[on_grid],
+                                          index[on_grid] - 1]
+        return values
+
+
+class Workspace(object):
+    r"""
+    Reusable arrays for the calculations of the windpowerlib.
+
+    A workspace hands out named arrays that are kept between calls. An array
+    is only allocated if it is requested for the first time or with a
+    different shape or data type, so that a long-running process that repeats
+    the same calculations does not allocate new arrays in every run. The
+    arrays can be passed as `out` parameter to the functions of the modules
+    :py:mod:`~.wind_speed`, :py:mod:`~.temperature`, :py:mod:`~.density` and
+    :py:mod:`~.power_output` or to a :class:`~.modelchain.ModelChain`.
+
+    Attributes
+    ----------
+    arrays : dict
+        Arrays of the workspace with their names as keys.
+    allocations : int
+        Number of arrays allocated by the workspace.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from windpowerlib import tools, wind_speed
+    >>> workspace = tools.Workspace()
+    >>> out = workspace.get('wind_speed_hub', 3)
+    >>> wind_speed.hellman(np.array([4.0, 5.0, 6.0]), 10, 100,
+    ...                    hellman_exponent=0.2, out=out) is out
+    True
+    >>> workspace.get('wind_speed_hub', 3) is out
+    True
+    >>> workspace.allocations
+    1
+
+    """
+
+    def __init__(self):
+        self.arrays = {}
+        self.allocations = 0
+
+    def get(self, name, shape, dtype=np.float64):
+        r"""
+        Returns the array `name` of the workspace.
+
+        The content of the array is undefined.
+
+        Parameters
+        ----------
+        name : str
+            Name of the array, e.g. the name of the parameter it is used for.
+        shape : int or tuple(int)
+            Shape of the array.
+        dtype : numpy.dtype or str
+            Data type of the array. Default: numpy.float64.
+
+        Returns
+        -------
+        numpy.array
+            Array with the requested shape and data type. The same array is
+            returned as long as `shape` and `dtype` are not changed.
+
+        """
+        shape = tuple(np.atleast_1d(shape))
+        dtype = np.dtype(dtype)
+        array = self.arrays.get(name)
+        if array is None or array.shape != shape or array.dtype != dtype:
+            array = np.empty(shape, dtype=dtype)
+            self.arrays[name] = array
+            self.allocations += 1
+        return array
+
+    @property
+    def nbytes(self):
+        r"""
+        Memory in bytes used by the arrays of the workspace.
+
+        """
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def clear(self):
+        r"""
+        Releases all arrays of the workspace.
+
+        """
+        self.arrays = {}
+
+
+class RingBuffer(object):
+    r"""
+    Bounded buffer of the latest values of a time series.
+
+    The values and time steps are stored in arrays of fixed size, which are
+    allocated with the first values. Appending overwrites the oldest values
+    if the buffer is full, so that appending new time steps takes the same
+    time and memory however long the time series gets.
+
+    Parameters
+    ----------
+    size : int
+        Maximum number of time steps kept in the buffer.
+
+    Attributes
+    ----------
+    size : int
+        Maximum number of time steps kept in the buffer.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from windpowerlib import tools
+    >>> buffer = tools.RingBuffer(3)
+    >>> buffer.append(pd.Series([1.0, 2.0]))
+    >>> buffer.append(pd.Series([3.0, 4.0], index=[2, 3]))
+    >>> buffer.to_series().to_dict()
+    {1: 2.0, 2: 3.0, 3: 4.0}
+
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._values = None
+        self._index = None
+        self._name = None
+        # Position of the next value and number of values in the buffer
+        self._position = 0
+        self._length = 0
+
+    def __len__(self):
+        return self._length
+
+    def append(self, series):
+        r"""
+        Appends the time steps of `series` to the buffer.
+
+        Parameters
+        ----------
+        series : pandas.Series
+            Values with the time steps as index. If `series` is longer than
+            the buffer, only its last values are kept.
+
+        """
+        values = np.asarray(series)[-self.size:]
+        index = np.asarray(series.index)[-self.size:]
+        if self._values is None:
+            self._values = np.empty(self.size, dtype=values.dtype)
+            self._index = np.empty(self.size, dtype=index.dtype)
+        self._name = series.name
+        positions = (self._position + np.arange(len(values))) % self.size
+        self._values[positions] = values
+        self._index[positions] = index
+        self._position = (self._position + len(values)) % self.size
+        self._length = min(self._length + len(values), self.size)
+
+    def to_series(self):
+        r"""
+        Returns the time steps in the buffer in the order they were appended.
+
+        Returns
+        -------
+        pandas.Series
+            Latest values of the time series.
+
+        """
+        if self._values is None:
+            return pd.Series(dtype=float)
+        positions = (self._position - self._length +
+                     np.arange(self._length)) % self.size
+        return pd.Series(self._values[positions],
+                         index=pd.Index(self._index[positions]),
+                         name=self._name)
+
+    def clear(self):
+        r"""
+        Removes all time steps from the buffer.
+
+        """
+        self._position = 0
+        self._length = 0
+
+
+class WeatherData(object):
+    r"""
+    Weather data with an index of its variables and heights.
+
+    The weather data DataFrame with a MultiIndex of variables and heights as
+    columns (see :py:func:`~.modelchain.ModelChain.run_model`) is indexed once:
+    the data of each variable is selected on first access and its heights are
+    kept as sorted array, so that the data at the height closest to a hub
+    height is found by a binary search and returned as view on the column
+    without slicing the MultiIndex again. The methods of the
+    :class:`~.modelchain.ModelChain` accept a WeatherData object instead of a
+    DataFrame.
+
+    Parameters
+    ----------
+    weather_df : pandas.DataFrame
+        Weather data with the variables as first and the heights as second
+        level of the columns.
+
+    Attributes
+    ----------
+    weather_df : pandas.DataFrame
+        Weather data.
+    index : pandas.Index
+        Time steps of the weather data.
+    cache_key : tuple or None
+        Fingerprint of the weather data for a
+        :class:`~.hub_height_cache.HubHeightCache`, which is set by the
+        model chains on first use, so that it is calculated once for all
+        variables at hub height. None if it was not set.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from windpowerlib import tools
+    >>> weather_df = pd.DataFrame(
+    ...     [[4.0, 5.0, 6.0], [5.0, 6.5, 8.0]],
+    ...     columns=[['wind_speed'] * 3, [80, 10, 120]])
+    >>> weather = tools.WeatherData(weather_df)
+    >>> weather.heights('wind_speed')
+    array([ 10.,  80., 120.])
+    >>> weather.closest_heights('wind_speed', 100)
+    array([ 80., 120.])
+    >>> weather.column('wind_speed', 80).tolist()
+    [4.0, 5.0]
+    >>> weather.linear_interpolation_extrapolation('wind_speed', 100).tolist()
+    [5.0, 6.5]
+
+    """
+
+    def __init__(self, weather_df):
+        self.weather_df = weather_df
+        self.index = weather_df.index
+        self.cache_key = None
+        # Heights of the variables, which only depend on the columns
+        self._variables = {}
+        self._data = {}
+
+    @classmethod
+    def wrap(cls, weather):
+        r"""
+        Returns `weather` as WeatherData.
+
+        Parameters
+        ----------
+        weather : pandas.DataFrame or :class:`~.tools.WeatherData`
+            Weather data.
+
+        Returns
+        -------
+        :class:`~.tools.WeatherData`
+            `weather` if it already is a WeatherData object.
+
+        """
+        if isinstance(weather, cls):
+            return weather
+        return cls(weather)
+
+    def with_data(self, weather_df):
+        r"""
+        Returns weather data `weather_df` with the same columns.
+
+        The heights of the variables and the heights selected for hub heights
+        are taken over instead of indexing them again, e.g. for new time
+        steps of the same weather data source.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame
+            Weather data with the same columns as this weather data.
+
+        Returns
+        -------
+        :class:`~.tools.WeatherData`
+            Weather data of `weather_df`. Its heights are indexed again if
+            the columns differ.
+
+        """
+        weather = WeatherData(weather_df)
+        if weather_df.columns.equals(self.weather_df.columns):
+            weather._variables = self._variables
+        return weather
+
+    def __getitem__(self, variable):
+        return self._variable_data(variable)['data']
+
+    def __contains__(self, variable):
+        return variable in self.weather_df.columns.get_level_values(0)
+
+    def _variable(self, variable):
+        r"""
+        Returns the index of the heights of `variable`, which is set up on
+        first access.
+
+        """
+        if variable not in self._variables:
+            variables = self.weather_df.columns.get_level_values(0)
+            heights = np.asarray(
+                self.weather_df.columns.get_level_values(1)[
+                    variables == variable], dtype=float)
+            if not len(heights):
+                raise KeyError(variable)
+            # Stable sort keeps the order of the columns for equal heights
+            order = np.argsort(heights, kind='stable')
+            sorted_heights = heights[order]
+            self._variables[variable] = {
+                'heights': heights, 'order': order,
+                'sorted_heights': sorted_heights,
+                # First column of the height at each sorted position
+                'first_order': order[np.searchsorted(sorted_heights,
+                                                     sorted_heights)],
+                'positions': {height: position for position, height in
+                              reversed(list(enumerate(heights)))},
+                # Selected positions for hub heights
+                'selections': {}}
+        return self._variables[variable]
+
+    def _variable_data(self, variable):
+        r"""
+        Returns the data of `variable` and its columns selected so far.
+
+        """
+        if variable not in self._data:
+            self._data[variable] = {'data': self.weather_df[variable],
+                                    'columns': {}}
+        return self._data[variable]
+
+    def heights(self, variable):
+        r"""
+        Returns the heights of `variable` in ascending order.
+
+        Parameters
+        ----------
+        variable : str
+            Name of the variable, e.g. 'wind_speed'.
+
+        Returns
+        -------
+        numpy.array
+            Heights in m.
+
+        """
+        return self._variable(variable)['sorted_heights']
+
+    def has_height(self, variable, height):
+        r"""
+        Checks whether `variable` is given at `height`.
+
+        Parameters
+        ----------
+        variable : str
+            Name of the variable, e.g. 'wind_speed'.
+        height : float
+            Height in m.
+
+        Returns
+        -------
+        bool
+
+        """
+        return float(height) in self._variable(variable)['positions']
+
+    def column(self, variable, height):
+        r"""
+        Returns the time series of `variable` at `height`.
+
+        Parameters
+        ----------
+        variable : str
+            Name of the variable, e.g. 'wind_speed'.
+        height : float
+            Height in m at which `variable` is given.
+
+        Returns
+        -------
+        pandas.Series
+            Time series of `variable` at `height`. The same object is
+            returned for every call.
+
+        """
+        return self._column(variable, self._variable(variable)['positions'][
+            float(height)])
+
+    def _column(self, variable, position):
+        variable_data = self._variable_data(variable)
+        columns = variable_data['columns']
+        if position not in columns:
+            columns[position] = variable_data['data'].iloc[:, position]
+        return columns[position]
+
+    def closest_heights(self, variable, height, number=2):
+        r"""
+        Returns the heights of `variable` closest to `height`.
+
+        Parameters
+        ----------
+        variable : str
+            Name of the variable, e.g. 'wind_speed'.
+        height : float
+            Height in m, e.g. the hub height.
+        number : int
+            Number of heights. Default: 2.
+
+        Returns
+        -------
+        numpy.array
+            The `number` heights closest to `height` ordered by their
+            distance to `height`. Heights with equal distance are ordered
+            like the columns of the weather data.
+
+        """
+        variable_index = self._variable(variable)
+        return variable_index['heights'][self._closest_positions(
+            variable_index, height, number)]
+
+    @staticmethod
+    def _closest_positions(variable_index, height, number):
+        r"""
+        Returns the column positions of the `number` heights closest to
+        `height`. Only the heights next to `height` in the sorted heights
+        are compared.
+
+        """
+        key = ('closest_positions', float(height), number)
+        if key not in variable_index['selections']:
+            position = np.searchsorted(variable_index['sorted_heights'],
+                                       height)
+            candidates = variable_index['order'][
+                max(position - number, 0):position + number]
+            variable_index['selections'][key] = candidates[np.lexsort((
+                candidates, np.abs(variable_index['heights'][candidates] -
+                                   height)))][:number]
+        return variable_index['selections'][key]
+
+    def closest_columns(self, variable, heights):
+        r"""
+        Returns the column positions of the heights of `variable` closest to
+        each of `heights`.
+
+        Parameters
+        ----------
+        variable : str
+            Name of the variable, e.g. 'wind_speed'.
+        heights : array-like
+            Heights in m, e.g. hub heights.
+
+        Returns
+        -------
+        numpy.array
+            Position of the closest height in the columns of `variable` for
+            each of `heights`. The first column is used for equal distances.
+
+        """
+        variable_index = self._variable(variable)
+        heights = np.asarray(heights, dtype=float)
+        key = ('closest_columns', heights.tobytes())
+        if key not in variable_index['selections']:
+            variable_index['selections'][key] = self._closest_columns(
+                variable_index, heights)
+        return variable_index['selections'][key]
+
+    @staticmethod
+    def _closest_columns(variable_index, heights):
+        r"""
+        Returns the column positions of the heights closest to `heights`.
+
+        """
+        order = variable_index['first_order']
+        positions = np.searchsorted(variable_index['sorted_heights'], heights)
+        lower = order[np.clip(positions - 1, 0, len(order) - 1)]
+        upper = order[np.clip(positions, 0, len(order) - 1)]
+        lower_distance = np.abs(variable_index['heights'][lower] - heights)
+        upper_distance = np.abs(variable_index['heights'][upper] - heights)
+        return np.where(
+            (lower_distance < upper_distance) |
+            ((lower_distance == upper_distance) & (lower < upper)),
+            lower, upper)
+
+    def closest_column(self, variable, height):
+        r"""
+        Returns the height of `variable` closest to `height` and its time
+        series.
+
+        Parameters
+        ----------
+        variable : str
+            Name of the variable, e.g. 'wind_speed'.
+        height : float
+            Height in m, e.g. the hub height.
+
+        Returns
+        -------
+        tuple(float, pandas.Series)
+            Closest height and time series of `variable` at this height. The
+            first column is used for equal distances.
+
+        """
+        position = self.closest_columns(variable, [height])[0]
+        return (self._variable(variable)['heights'][position],
+                self._column(variable, position))
+
+    def linear_interpolation_extrapolation(self, variable, height):
+        r"""
+        Linear inter- or extrapolates `variable` to `height` from the two
+        closest heights.
+
+        Same as :py:func:`~.linear_interpolation_extrapolation`.
+
+        Parameters
+        ----------
+        variable : str
+            Name of the variable, e.g. 'wind_speed'.
+        height : float
+            Height in m, e.g. the hub height.
+
+        Returns
+        -------
+        pandas.Series
+            Time series of `variable` at `height`.
+
+        """
+        variable_index = self._variable(variable)
+        positions = self._closest_positions(variable_index, height, 2)
+        return _linear_interpolation_extrapolation(
+            self._column(variable, positions[0]),
+            self._column(variable, positions[1]),
+            variable_index['heights'][positions[0]],
+            variable_index['heights'][positions[1]], height)
+
+    def logarithmic_interpolation_extrapolation(self, variable, height):
+        r"""
+        Logarithmic inter- or extrapolates `variable` to `height` from the
+        two closest heights.
+
+        Same as :py:func:`~.logarithmic_interpolation_extrapolation`.
+
+        Parameters
+        ----------
+        variable : str
+            Name of the variable, e.g. 'wind_speed'.
+        height : float
+            Height in m, e.g. the hub height.
+
+        Returns
+        -------
+        pandas.Series
+            Time series of `variable` at `height`.
+
+        """
+        variable_index = self._variable(variable)
+        positions = self._closest_positions(variable_index, height, 2)
+        return _logarithmic_interpolation_extrapolation(
+            self._column(variable, positions[0]),
+            self._column(variable, positions[1]),
+            variable_index['heights'][positions[0]],
+            variable_index['heights'][positions[1]], height)
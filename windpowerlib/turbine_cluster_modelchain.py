@@ -10,8 +10,11 @@ __copyright__ = "Copyright oemof developer group"
 __license__ = "GPLv3"
 
 import logging
-from windpowerlib import wake_losses
+import numpy as np
+import pandas as pd
+from windpowerlib import wake_losses, power_curves, power_output, tools
 from windpowerlib.modelchain import ModelChain
+from windpowerlib.wind_farm import WindFarm
 
 
 class TurbineClusterModelChain(ModelChain):
@@ -46,6 +49,28 @@ class TurbineClusterModelChain(ModelChain):
         Defines when the smoothing takes place if `smoothing` is True. Options:
         'turbine_power_curves' (to the single turbine power curves),
         'wind_farm_power_curves'. Default: 'wind_farm_power_curves'.
+    turbulence_intensity_grid : None or array-like
+        Equally spaced turbulence intensities for which smoothed power curves
+        are precalculated if `smoothing` is True, `standard_deviation_method`
+        is 'turbulence_intensity' and the weather data contains turbulence
+        intensity. The power output of each time step is then interpolated
+        between these power curves with the turbulence intensity of the time
+        step instead of smoothing with the mean turbulence intensity, see
+        :py:func:`~.power_output.power_curve_turbulence_intensity_lookup`.
+        Default: None.
+    power_curve_cache : None or :class:`~.power_curve_cache.PowerCurveCache`
+        Cache of aggregated power curves. If given, the mean roughness length
+        and turbulence intensity are rounded and the aggregated power curve is
+        taken from the cache if the power plant and the parameters of the
+        aggregation did not change. Default: None.
+    hub_height_model : str
+        Defines the hub height the power output is calculated for. Options:
+        'mean_hub_height' (aggregated power curve at the mean hub height of
+        the power plant, see :py:func:`~.wind_farm.WindFarm.mean_hub_height`)
+        or 'turbine_hub_heights' (power curve of each wind turbine type at
+        its own hub height, see
+        :py:func:`~.turbine_hub_heights_power_output`).
+        Default: 'mean_hub_height'.
 
     Other Parameters
     ----------------
@@ -75,6 +100,25 @@ class TurbineClusterModelChain(ModelChain):
         The Hellman exponent, which combines the increase in wind speed due
         to stability of atmospheric conditions and surface roughness into
         one constant.
+    density_grid : None or array-like
+        Equally spaced densities in kg/m³ for which density corrected power
+        curves are precalculated if `density_correction` is True.
+    precision : str
+        Floating point precision of the calculations. Valid options are
+        'float64' and 'float32'.
+    workspace : None or :class:`~.tools.Workspace`
+        Workspace for the calculation of temperature, density and wind speed
+        at hub height.
+    backend : str
+        Implementation used for the time series calculations and the
+        smoothing of power curves. Valid options are 'numpy' and 'numba'.
+    hub_height_cache : None or :class:`~.hub_height_cache.HubHeightCache`
+        Cache of wind speed, temperature and density at hub height.
+    buffer_size : int
+        Maximum number of time steps of the power output kept in
+        `power_output_buffer` by :func:`append`.
+    threads : int
+        Number of threads :func:`run_model` uses for chunks of time steps.
 
     Attributes
     ----------
@@ -104,6 +148,21 @@ class TurbineClusterModelChain(ModelChain):
         Defines when the smoothing takes place if `smoothing` is True. Options:
         'turbine_power_curves' (to the single turbine power curves),
         'wind_farm_power_curves'. Default: 'wind_farm_power_curves'.
+    turbulence_intensity_grid : None or array-like
+        Equally spaced turbulence intensities for which smoothed power curves
+        are precalculated if `smoothing` is True, `standard_deviation_method`
+        is 'turbulence_intensity' and the weather data contains turbulence
+        intensity. Default: None.
+    turbulence_intensity_lookup_table : pandas.DataFrame or None
+        Power curves of the wind farm or wind turbine cluster smoothed with
+        the turbulence intensities of `turbulence_intensity_grid`. None if the
+        power curve is smoothed with the mean turbulence intensity.
+    power_curve_cache : None or :class:`~.power_curve_cache.PowerCurveCache`
+        Cache of aggregated power curves.
+    hub_height_model : str
+        Defines the hub height the power output is calculated for. Options:
+        'mean_hub_height' or 'turbine_hub_heights'.
+        Default: 'mean_hub_height'.
     power_output : :pandas:`pandas.Series<series>`
         Electrical power output of the wind turbine in W.
     power_curve : :pandas:`pandas.Dataframe<frame>` or None
@@ -134,12 +193,31 @@ class TurbineClusterModelChain(ModelChain):
         The Hellman exponent, which combines the increase in wind speed due
         to stability of atmospheric conditions and surface roughness into
         one constant.
+    density_grid : None or array-like
+        Equally spaced densities in kg/m³ for which density corrected power
+        curves are precalculated if `density_correction` is True.
+    precision : str
+        Floating point precision of the calculations. Valid options are
+        'float64' and 'float32'.
+    workspace : None or :class:`~.tools.Workspace`
+        Workspace for the calculation of temperature, density and wind speed
+        at hub height.
+    backend : str
+        Implementation used for the time series calculations and the
+        smoothing of power curves. Valid options are 'numpy' and 'numba'.
+    hub_height_cache : None or :class:`~.hub_height_cache.HubHeightCache`
+        Cache of wind speed, temperature and density at hub height.
+    power_output_buffer : :class:`~.tools.RingBuffer`
+        Power output of the latest time steps calculated with
+        :func:`append`.
 
     """
     def __init__(self, power_plant, wake_losses_model='dena_mean',
                  smoothing=False, block_width=0.5,
                  standard_deviation_method='turbulence_intensity',
-                 smoothing_order='wind_farm_power_curves', **kwargs):
+                 smoothing_order='wind_farm_power_curves',
+                 turbulence_intensity_grid=None, power_curve_cache=None,
+                 hub_height_model='mean_hub_height', **kwargs):
         super(TurbineClusterModelChain, self).__init__(power_plant, **kwargs)
 
         self.power_plant = power_plant
@@ -148,9 +226,15 @@ class TurbineClusterModelChain(ModelChain):
         self.block_width = block_width
         self.standard_deviation_method = standard_deviation_method
         self.smoothing_order = smoothing_order
+        self.turbulence_intensity_grid = turbulence_intensity_grid
+        self.power_curve_cache = power_curve_cache
+        self.hub_height_model = hub_height_model
 
         self.power_curve = None
         self.power_output = None
+        self.turbulence_intensity_lookup_table = None
+        self._power_curve_parameters = None
+        self._turbine_type_farms_state = None
 
     def assign_power_curve(self, weather_df):
         r"""
@@ -201,13 +285,69 @@ class TurbineClusterModelChain(ModelChain):
             logging.debug('Wake losses considered by {} wind '.format(
                 self.wake_losses_model) + 'efficiency curve.')
             wake_losses_model_to_power_curve = None
-        self.power_plant.assign_power_curve(
+        parameters = dict(
             wake_losses_model=wake_losses_model_to_power_curve,
             smoothing=self.smoothing, block_width=self.block_width,
             standard_deviation_method=self.standard_deviation_method,
             smoothing_order=self.smoothing_order,
             roughness_length=weather_df['roughness_length'][0].mean(),
-            turbulence_intensity=turbulence_intensity)
+            backend=self.backend)
+        turbulence_intensity_grid = None
+        if (self.smoothing and self.turbulence_intensity_grid is not None and
+                self.standard_deviation_method == 'turbulence_intensity'):
+            if turbulence_intensity is None:
+                logging.debug('Turbulence intensity is not part of the '
+                              'weather data. Power curve is smoothed with '
+                              'the turbulence intensity calculated from the '
+                              'mean roughness length.')
+            elif (self.power_output_model != 'power_curve' or
+                    self.density_correction):
+                raise ValueError(
+                    "`turbulence_intensity_grid` can only be used with "
+                    "'power_curve' as `power_output_model` and without "
+                    "density correction.")
+            else:
+                turbulence_intensity_grid = np.asarray(
+                    self.turbulence_intensity_grid, dtype=float)
+        cache_key = None
+        if self.power_curve_cache is not None:
+            # Rounded parameters, so that nearly identical weather data
+            # results in the same power curve
+            parameters['roughness_length'] = self.power_curve_cache.quantize(
+                parameters['roughness_length'])
+            turbulence_intensity = self.power_curve_cache.quantize(
+                turbulence_intensity)
+            cache_key = self.power_curve_cache.key(
+                self.power_plant, turbulence_intensity=turbulence_intensity,
+                turbulence_intensity_grid=(
+                    None if turbulence_intensity_grid is None else
+                    tuple(turbulence_intensity_grid)), **parameters)
+        # Parameters for the power curves of the wind turbine types
+        self._power_curve_parameters = dict(
+            parameters, turbulence_intensity=turbulence_intensity)
+        if cache_key is not None:
+            cached_power_curves = self.power_curve_cache.get(cache_key)
+            if cached_power_curves is not None:
+                logging.debug('Aggregated power curve taken from cache.')
+                self._assign_cached_power_curves(cached_power_curves)
+                return self
+        self.turbulence_intensity_lookup_table = None
+        if turbulence_intensity_grid is not None:
+            # Smoothed power curves for all turbulence intensities of the
+            # grid for a lookup of the power output of each time step
+            self.turbulence_intensity_lookup_table = (
+                power_curves.turbulence_intensity_lookup_table(
+                    [self.power_plant.assign_power_curve(
+                        turbulence_intensity=grid_turbulence_intensity,
+                        **parameters).power_curve
+                     for grid_turbulence_intensity in
+                     turbulence_intensity_grid],
+                    turbulence_intensity_grid))
+        self.power_plant.assign_power_curve(
+            turbulence_intensity=turbulence_intensity, **parameters)
+        if cache_key is not None:
+            self.power_curve_cache.set(cache_key,
+                                       self._cached_power_curves())
         # Further logging messages
         if self.smoothing is None:
             logging.debug('Aggregated power curve not smoothed.')
@@ -217,6 +357,147 @@ class TurbineClusterModelChain(ModelChain):
 
         return self
 
+    def _cached_power_curves(self):
+        r"""
+        Returns the power curves assigned by :py:func:`~.assign_power_curve`
+        for storing them in :py:attr:`~power_curve_cache`.
+
+        """
+        return {
+            'power_curve': self.power_plant.power_curve,
+            'wind_farm_power_curves': (
+                [wind_farm.power_curve
+                 for wind_farm in self.power_plant.wind_farms]
+                if hasattr(self.power_plant, 'wind_farms') else None),
+            'turbulence_intensity_lookup_table': (
+                self.turbulence_intensity_lookup_table)}
+
+    def _assign_cached_power_curves(self, cached_power_curves):
+        r"""
+        Assigns power curves taken from :py:attr:`~power_curve_cache` like
+        :py:func:`~.assign_power_curve` does.
+
+        """
+        if cached_power_curves['wind_farm_power_curves'] is not None:
+            for wind_farm, power_curve in zip(
+                    self.power_plant.wind_farms,
+                    cached_power_curves['wind_farm_power_curves']):
+                wind_farm.mean_hub_height()
+                wind_farm.power_curve = power_curve
+        self.power_plant.power_curve = cached_power_curves['power_curve']
+        self.turbulence_intensity_lookup_table = cached_power_curves[
+            'turbulence_intensity_lookup_table']
+
+    def _turbine_type_farms(self):
+        r"""
+        Returns one wind farm with its power curve for each wind turbine type
+        of each wind farm of the power plant. The wind farms are reused as
+        long as the values of the power curve parameters do not change and
+        the wind farms are not modified (see :class:`~.wind_farm.WindFarm`).
+
+        """
+        wind_farms = (self.power_plant.wind_farms
+                      if hasattr(self.power_plant, 'wind_farms')
+                      else [self.power_plant])
+        parameters = dict(self._power_curve_parameters)
+        if not parameters['smoothing']:
+            # Only used for smoothing the power curves
+            parameters.pop('roughness_length')
+            parameters.pop('turbulence_intensity')
+        state = (tuple(sorted(parameters.items())),
+                 tuple((wind_farm, wind_farm._version)
+                       for wind_farm in wind_farms))
+        if (self._turbine_type_farms_state is None or
+                not tools.same_state(state,
+                                     self._turbine_type_farms_state[0])):
+            turbine_type_farms = [
+                WindFarm(name=wind_farm.name, wind_turbine_fleet=[wind_dict],
+                         efficiency=wind_farm.efficiency).mean_hub_height()
+                for wind_farm in wind_farms
+                for wind_dict in wind_farm.wind_turbine_fleet]
+            for wind_farm in turbine_type_farms:
+                wind_farm.assign_power_curve(**self._power_curve_parameters)
+            self._turbine_type_farms_state = (state, turbine_type_farms)
+        return self._turbine_type_farms_state[1]
+
+    def turbine_hub_heights_power_output(self, weather_df):
+        r"""
+        Calculates the power output with each wind turbine type at its own
+        hub height.
+
+        Wind speed (and density) is calculated once for each distinct hub
+        height of the power plant in a single pass (see
+        :py:func:`~.modelchain.ModelChain.wind_speed_hub_heights`). The power
+        curve of each entry of the wind turbine fleets is aggregated like the
+        power curve of a wind farm with only this entry, including smoothing
+        and wake losses (see
+        :py:func:`~.wind_farm.WindFarm.assign_power_curve`), and evaluated
+        with the wind speed at its hub height. The power output of the power
+        plant is the sum of these power outputs.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame or :class:`~.tools.WeatherData`
+            Weather data as described in :py:func:`~.run_model`.
+
+        Returns
+        -------
+        pandas.Series
+            Electrical power output of the wind farm or wind turbine cluster
+            in W.
+
+        Notes
+        -----
+        Needs the parameters of the power curves set by
+        :py:func:`~.assign_power_curve`. Only available with 'power_curve' as
+        `power_output_model` and without `turbulence_intensity_grid`.
+
+        """
+        if (self.power_output_model != 'power_curve' or
+                self.turbulence_intensity_lookup_table is not None):
+            raise ValueError(
+                "'turbine_hub_heights' as `hub_height_model` can only be "
+                "used with 'power_curve' as `power_output_model` and without "
+                "`turbulence_intensity_grid`.")
+        if self._power_curve_parameters is None:
+            raise ValueError("Use `assign_power_curve` before calculating "
+                             "the power output.")
+        turbine_type_farms = self._turbine_type_farms()
+        hub_heights, hub_height_columns = np.unique(
+            [wind_farm.hub_height for wind_farm in turbine_type_farms],
+            return_inverse=True)
+        weather = tools.WeatherData.wrap(weather_df)
+        wind_speed_hub = self.wind_speed_hub_heights(weather, hub_heights)
+        if (self.wake_losses_model != 'power_efficiency_curve' and
+                self.wake_losses_model != 'constant_efficiency' and
+                self.wake_losses_model is not None):
+            # Reduce wind speed with wind efficiency curve
+            wind_speed_hub = wake_losses.reduce_wind_speed(
+                wind_speed_hub,
+                wind_efficiency_curve_name=self.wake_losses_model)
+        logging.debug('Calculating power output at {} hub heights.'.format(
+            len(hub_heights)))
+        if self.density_correction is False:
+            turbine_type_power_output = power_output.power_curve_columns(
+                wind_speed_hub,
+                [wind_farm.power_curve for wind_farm in turbine_type_farms],
+                hub_height_columns)
+        else:
+            density_hub = self.density_hub_heights(weather, hub_heights)
+            turbine_type_power_output = np.column_stack([
+                power_output.power_curve(
+                    wind_speed_hub[:, column],
+                    wind_farm.power_curve['wind_speed'],
+                    wind_farm.power_curve['value'], density_hub[:, column],
+                    self.density_correction, density_grid=self.density_grid,
+                    lookup_table=(
+                        self.density_lookup_table(wind_farm.power_curve)
+                        if self.density_correction is True else None))
+                for wind_farm, column in zip(turbine_type_farms,
+                                             hub_height_columns)])
+        return self.apply_precision(pd.Series(
+            turbine_type_power_output.sum(axis=1), index=weather.index))
+
     def run_model(self, weather_df):
         r"""
         Runs the model.
@@ -261,12 +542,44 @@ class TurbineClusterModelChain(ModelChain):
 
         """
 
-        self.assign_power_curve(weather_df)
+        weather = self._weather_data(weather_df)
+        self.assign_power_curve(weather.weather_df)
         self.power_plant.mean_hub_height()
-        wind_speed_hub = self.wind_speed_hub(weather_df)
+        self.power_output = self._threaded_power_output(weather)
+        return self
+
+    def _prepare_power_output(self):
+        r"""
+        Builds the compiled power curve, the wind farms of the wind turbine
+        types and the density lookup tables used by :func:`_power_output`.
+
+        """
+        if self.hub_height_model != 'turbine_hub_heights':
+            return super(TurbineClusterModelChain,
+                         self)._prepare_power_output()
+        if (self.power_output_model == 'power_curve' and
+                self.turbulence_intensity_lookup_table is None and
+                self._power_curve_parameters is not None):
+            for wind_farm in self._turbine_type_farms():
+                if self.density_correction is True:
+                    self.density_lookup_table(wind_farm.power_curve)
+
+    def _power_output(self, weather):
+        r"""
+        Calculates the power output for `weather` with the assigned power
+        curve.
+
+        """
+        if self.hub_height_model == 'turbine_hub_heights':
+            return self.turbine_hub_heights_power_output(weather)
+        elif self.hub_height_model != 'mean_hub_height':
+            raise ValueError("'{0}' is an invalid value. ".format(
+                self.hub_height_model) + "`hub_height_model` must be "
+                "'mean_hub_height' or 'turbine_hub_heights'.")
+        wind_speed_hub = self.wind_speed_hub(weather)
         density_hub = (None if (self.power_output_model == 'power_curve' and
                                 self.density_correction is False)
-                       else self.density_hub(weather_df))
+                       else self.density_hub(weather))
         if (self.wake_losses_model != 'power_efficiency_curve' and
                 self.wake_losses_model != 'constant_efficiency' and
                 self.wake_losses_model is not None):
@@ -274,6 +587,38 @@ class TurbineClusterModelChain(ModelChain):
             wind_speed_hub = wake_losses.reduce_wind_speed(
                 wind_speed_hub,
                 wind_efficiency_curve_name=self.wake_losses_model)
-        self.power_output = self.calculate_power_output(wind_speed_hub,
-                                                        density_hub)
-        return self
+        if self.turbulence_intensity_lookup_table is not None:
+            logging.debug('Calculating power output using power curves '
+                          'smoothed with the turbulence intensity of each '
+                          'time step.')
+            return self.apply_precision(
+                power_output.power_curve_turbulence_intensity_lookup(
+                    wind_speed_hub, self.turbulence_intensity_lookup_table,
+                    weather['turbulence_intensity'].mean(axis=1)))
+        return self.calculate_power_output(wind_speed_hub, density_hub)
+
+    def append(self, weather_df):
+        r"""
+        Runs the model for new time steps of the weather data.
+
+        Like :py:func:`~.modelchain.ModelChain.append`, but the power curve
+        of the wind farm or wind turbine cluster is reused: it is only
+        assigned with `weather_df` (see :py:func:`~.assign_power_curve`) if
+        it was not assigned before, e.g. by :py:func:`~.run_model` with the
+        weather data of the previous time steps.
+
+        Parameters
+        ----------
+        weather_df : pandas.DataFrame
+            New time steps of the weather data as described in
+            :py:func:`~.run_model`.
+
+        Returns
+        -------
+        self
+
+        """
+        if self._power_curve_parameters is None:
+            self.assign_power_curve(self.apply_precision(weather_df))
+            self.power_plant.mean_hub_height()
+        return super(TurbineClusterModelChain, self).append(weather_df)
@@ -49,10 +49,13 @@ def reduce_wind_speed(wind_speed, wind_efficiency_curve_name='dena_mean'):
     # Get wind efficiency curve
     wind_efficiency_curve = get_wind_efficiency_curve(
         curve_name=wind_efficiency_curve_name)
-    # Reduce wind speed by wind efficiency
+    # Reduce wind speed by wind efficiency (in single precision for single
+    # precision wind speeds)
     reduced_wind_speed = wind_speed * np.interp(
         wind_speed, wind_efficiency_curve['wind_speed'],
-        wind_efficiency_curve['efficiency'])
+        wind_efficiency_curve['efficiency']).astype(
+            np.result_type(np.asarray(wind_speed).dtype, np.float32),
+            copy=False)
     return reduced_wind_speed
 
 
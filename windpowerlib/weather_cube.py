@@ -0,0 +1,187 @@
+"""
+The ``weather_cube`` module contains a container for weather data of many
+locations, e.g. the cells of a weather model grid, which is calculated at once
+by the :class:`~.modelchain.ModelChain`.
+
+"""
+
+__copyright__ = "Copyright oemof developer group"
+__license__ = "GPLv3"
+
+import numpy as np
+import pandas as pd
+
+
+class WeatherCube(object):
+    r"""
+    Weather data of many locations with time steps, locations and heights as
+    axes.
+
+    The weather data of all locations is stored in one array with one row for
+    each time step, one column for each location and one layer for each
+    variable and height, like the columns of the weather data DataFrame of a
+    single location (see :py:func:`~.modelchain.ModelChain.run_model`). The
+    time steps and locations are flattened to the rows of one weather data
+    DataFrame without copying the array (see :py:attr:`~.weather_df`), so
+    that wind speed, temperature and density at hub height and the power
+    output are calculated for all locations at once with
+    :py:func:`~.modelchain.ModelChain.run_model_cube`. All variables,
+    including the roughness length, may differ between locations and time
+    steps.
+
+    Parameters
+    ----------
+    data : numpy.array
+        Weather data with the shape (time steps, locations, columns).
+    columns : pandas.MultiIndex or list
+        Variables and heights of the last axis of `data`, as MultiIndex or as
+        list of an array of the variable names and an array of the heights.
+    index : pandas.Index or None
+        Time steps. Default: None (range of the number of time steps).
+    locations : pandas.Index or list or None
+        Names of the locations, e.g. the ids of the grid cells. Default: None
+        (range of the number of locations).
+
+    Attributes
+    ----------
+    data : numpy.array
+        Weather data with the shape (time steps, locations, columns).
+    columns : pandas.MultiIndex
+        Variables and heights of the last axis of `data`.
+    index : pandas.Index
+        Time steps.
+    locations : pandas.Index
+        Names of the locations.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from windpowerlib import weather_cube
+    >>> wind_speed = np.array([[5.0, 8.0], [6.0, 9.0], [7.0, 10.0]])
+    >>> roughness_length = np.full((3, 2), 0.15)
+    >>> cube = weather_cube.WeatherCube(
+    ...     np.stack([wind_speed, roughness_length], axis=2),
+    ...     columns=[['wind_speed', 'roughness_length'], [10, 0]],
+    ...     locations=['cell 1', 'cell 2'])
+    >>> cube.shape
+    (3, 2, 2)
+    >>> cube.location('cell 2')['wind_speed'][10].tolist()
+    [8.0, 9.0, 10.0]
+
+    """
+
+    def __init__(self, data, columns, index=None, locations=None):
+        data = np.asarray(data)
+        if data.ndim != 3:
+            raise ValueError("`data` must have the shape (time steps, "
+                             "locations, columns).")
+        self.data = data
+        self.columns = (columns if isinstance(columns, pd.MultiIndex)
+                        else pd.MultiIndex.from_arrays(columns))
+        self.index = (pd.RangeIndex(data.shape[0]) if index is None
+                      else pd.Index(index))
+        self.locations = (pd.RangeIndex(data.shape[1]) if locations is None
+                          else pd.Index(locations))
+        if (len(self.index), len(self.locations), len(self.columns)) != (
+                data.shape):
+            raise ValueError("The shape of `data` does not match the time "
+                             "steps, locations and columns.")
+        self._weather_df = None
+
+    @classmethod
+    def from_dataframes(cls, weather_dfs):
+        r"""
+        Creates a weather cube from the weather data of each location.
+
+        Parameters
+        ----------
+        weather_dfs : dict(pandas.DataFrame)
+            Weather data as described in
+            :py:func:`~.modelchain.ModelChain.run_model` with the names of
+            the locations as keys. All DataFrames must have the same time
+            steps and columns.
+
+        Returns
+        -------
+        :class:`~.weather_cube.WeatherCube`
+
+        """
+        weather_dfs = list(weather_dfs.items())
+        first_weather_df = weather_dfs[0][1]
+        for location, weather_df in weather_dfs:
+            if not (weather_df.columns.equals(first_weather_df.columns) and
+                    weather_df.index.equals(first_weather_df.index)):
+                raise ValueError(
+                    "Weather data of location {} does not have the same "
+                    "time steps and columns.".format(location))
+        return cls(np.stack([weather_df.values for _, weather_df in
+                             weather_dfs], axis=1),
+                   first_weather_df.columns, index=first_weather_df.index,
+                   locations=[location for location, _ in weather_dfs])
+
+    @property
+    def shape(self):
+        r"""
+        Number of time steps, locations and columns.
+
+        """
+        return self.data.shape
+
+    @property
+    def weather_df(self):
+        r"""
+        Weather data of all locations as one DataFrame.
+
+        The rows are the locations of the first time step, followed by the
+        locations of the second time step and so on, i.e. the time steps and
+        locations are flattened in the order of :py:attr:`~.data`. The
+        DataFrame is created once and shares the memory of :py:attr:`~.data`
+        if it is contiguous.
+
+        """
+        if self._weather_df is None:
+            self._weather_df = pd.DataFrame(
+                self.data.reshape(-1, self.data.shape[2]),
+                columns=self.columns, copy=False)
+        return self._weather_df
+
+    def location(self, location):
+        r"""
+        Returns the weather data of one location.
+
+        Parameters
+        ----------
+        location :
+            Name of the location.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Weather data of `location` as described in
+            :py:func:`~.modelchain.ModelChain.run_model`.
+
+        """
+        return pd.DataFrame(self.data[:, self.locations.get_loc(location)],
+                            index=self.index, columns=self.columns)
+
+    def unstack(self, values):
+        r"""
+        Returns results calculated with :py:attr:`~.weather_df` with time
+        steps as index and locations as columns.
+
+        Parameters
+        ----------
+        values : pandas.Series or numpy.array
+            Results with one value for each row of :py:attr:`~.weather_df`,
+            e.g. the power output.
+
+        Returns
+        -------
+        pandas.DataFrame
+            `values` with the time steps as index and the locations as
+            columns.
+
+        """
+        return pd.DataFrame(
+            np.asarray(values).reshape(len(self.index), len(self.locations)),
+            index=self.index, columns=self.locations)
@@ -8,10 +8,11 @@ wind farm.
 __copyright__ = "Copyright oemof developer group"
 __license__ = "GPLv3"
 
-from windpowerlib import tools, power_curves
+from windpowerlib import tools, power_curves, power_output
 import numpy as np
 import pandas as pd
 import warnings
+import weakref
 
 
 class WindFarm(object):
@@ -39,11 +40,12 @@ class WindFarm(object):
     ----------
     name : str or None
         Name of the wind farm.
-    wind_turbine_fleet : list(dict)
+    wind_turbine_fleet : :class:`~.tools.ObservedList` (dict)
         Wind turbines of wind farm. Dictionaries must have 'wind_turbine'
         (contains a :class:`~.wind_turbine.WindTurbine` object) and
         'number_of_turbines' (number of wind turbines of the same turbine type
-        in the wind farm) as keys.
+        in the wind farm) as keys. Copy of the fleet the wind farm was
+        created with, see Notes.
     coordinates : list(float) or None
         List with coordinates [lat, lon] of location. Default: None.
     efficiency : float or :pandas:`pandas.DataFrame<frame>` or None
@@ -66,6 +68,24 @@ class WindFarm(object):
     power_output : :pandas:`pandas.Series<series>`
         The calculated power output of the wind farm.
 
+    Notes
+    -----
+    The nominal power, mean hub height and power curve are cached until the
+    wind farm changes, so that calling :py:func:`get_installed_power`,
+    :py:func:`mean_hub_height` or :py:func:`assign_power_curve` again does
+    not go through the wind turbine fleet. Changes are tracked when they are
+    made: the fleet and its entries are copied to a
+    :class:`~.tools.ObservedList` of :class:`~.tools.ObservedDict`, which
+    invalidate the cached values if they are modified, as do setting the
+    fleet, the efficiency or the hub height, nominal power or power curve of
+    a wind turbine of the fleet. The cached values of the
+    :class:`~.wind_turbine_cluster.WindTurbineCluster` objects of the wind
+    farm are invalidated as well.
+    Thus the fleet has to be modified through :py:attr:`~wind_turbine_fleet`,
+    as the list passed to the wind farm is not observed. Objects modified in
+    place, e.g. the DataFrame of a power curve or efficiency, are not
+    detected either.
+
     Examples
     --------
     >>> from windpowerlib import wind_farm
@@ -90,16 +110,146 @@ class WindFarm(object):
     def __init__(self, name, wind_turbine_fleet, coordinates=None,
                  efficiency=None, **kwargs):
 
+        # Wind turbine clusters of the wind farm and cached values, which
+        # are invalidated by _changed()
+        self._observers = None
+        self._version = 0
+        self._cached_installed_power = None
+        self._cached_hub_height = None
+        self._hub_height = None
+        self._power_curve = None
+
         self.name = name
+        self.efficiency = efficiency
         self.wind_turbine_fleet = wind_turbine_fleet
         self.coordinates = coordinates
-        self.efficiency = efficiency
 
-        self.hub_height = None
         self._nominal_power = None
         self._installed_power = None
-        self.power_curve = None
         self.power_output = None
+        self._compiled_power_curve = None
+        self._curve_grid = None
+        self._cached_power_curve = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Copies are not observed by the wind turbine clusters
+        state['_observers'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._fleet_changed()
+
+    @property
+    def wind_turbine_fleet(self):
+        r"""
+        The wind turbines of the wind farm.
+
+        Setting the fleet copies it to a :class:`~.tools.ObservedList`,
+        whose modifications invalidate the cached values of the wind farm.
+
+        """
+        return self._wind_turbine_fleet
+
+    @wind_turbine_fleet.setter
+    def wind_turbine_fleet(self, wind_turbine_fleet):
+        self._wind_turbine_fleet = tools.ObservedList(
+            wind_turbine_fleet, on_change=self._fleet_changed)
+        self._fleet_changed()
+
+    @property
+    def efficiency(self):
+        r"""
+        The efficiency of the wind farm.
+
+        """
+        return self._efficiency
+
+    @efficiency.setter
+    def efficiency(self, efficiency):
+        self._efficiency = efficiency
+        self._changed()
+
+    @property
+    def hub_height(self):
+        r"""
+        The mean hub height of the wind farm.
+
+        """
+        return self._hub_height
+
+    @hub_height.setter
+    def hub_height(self, hub_height):
+        if not tools.same_state(hub_height, self._hub_height):
+            self._hub_height = hub_height
+            self._notify_observers()
+
+    @property
+    def power_curve(self):
+        r"""
+        The power curve of the wind farm.
+
+        """
+        return self._power_curve
+
+    @power_curve.setter
+    def power_curve(self, power_curve):
+        if power_curve is not self._power_curve:
+            self._power_curve = power_curve
+            self._notify_observers()
+
+    def _fleet_changed(self):
+        r"""
+        Observes the entries and wind turbines of the wind turbine fleet
+        after it changed and invalidates the cached values.
+
+        """
+        fleet = self._wind_turbine_fleet
+        for position, wind_dict in enumerate(fleet):
+            if not isinstance(wind_dict, dict):
+                continue
+            if (not isinstance(wind_dict, tools.ObservedDict) or
+                    wind_dict.on_change != self._fleet_changed):
+                # Entries of other wind farms are copied as well
+                wind_dict = tools.ObservedDict(
+                    wind_dict, on_change=self._fleet_changed)
+                list.__setitem__(fleet, position, wind_dict)
+            wind_turbine = wind_dict.get('wind_turbine')
+            if hasattr(wind_turbine, '_add_observer'):
+                wind_turbine._add_observer(self)
+        self._changed()
+
+    def _changed(self):
+        r"""
+        Invalidates the cached values of the wind farm and of its wind
+        turbine clusters.
+
+        """
+        self._version += 1
+        self._cached_installed_power = None
+        self._cached_hub_height = None
+        self._notify_observers()
+
+    def _notify_observers(self):
+        r"""
+        Invalidates the cached values of the wind turbine clusters of the
+        wind farm.
+
+        """
+        if self._observers:
+            for observer in list(self._observers):
+                observer._changed()
+
+    def _add_observer(self, observer):
+        r"""
+        Adds a wind turbine cluster whose cached values are invalidated if
+        the wind farm changes.
+
+        """
+        if self._observers is None:
+            self._observers = weakref.WeakSet()
+        self._observers.add(observer)
 
     @property
     def installed_power(self):
@@ -131,17 +281,107 @@ class WindFarm(object):
         Returns
         -------
         float
-            Nominal power of the wind farm in W.
+            Nominal power of the wind farm in W. If no nominal power was set,
+            it is calculated from the wind turbines with
+            :py:func:`~.get_installed_power`.
 
         """
         if not self._nominal_power:
-            self.nominal_power = self.get_installed_power()
+            return self.get_installed_power()
         return self._nominal_power
 
     @nominal_power.setter
     def nominal_power(self, nominal_power):
         self._nominal_power = nominal_power
 
+    @property
+    def compiled_power_curve(self):
+        r"""
+        The power curve of the wind farm compiled to a table with equally
+        spaced wind speeds.
+
+        The table is compiled on first access and reused as long as
+        :py:attr:`~power_curve` is not replaced. See
+        :class:`~.tools.CompiledCurve` for more information.
+
+        Returns
+        -------
+        :class:`~.tools.CompiledCurve` or None
+            None if :py:attr:`~power_curve` is None.
+
+        """
+        if self.power_curve is None:
+            return None
+        if (self._compiled_power_curve is None or
+                self._compiled_power_curve[0] is not self.power_curve):
+            self._compiled_power_curve = (
+                self.power_curve, tools.CompiledCurve(
+                    self.power_curve['wind_speed'],
+                    self.power_curve['value']))
+        return self._compiled_power_curve[1]
+
+    @property
+    def curve_grid(self):
+        r"""
+        The power curves of the wind turbine types of the wind farm resampled
+        to a common grid of wind speeds.
+
+        The grid is set up on first access and reused as long as the power
+        curves of the wind turbines are not replaced. See
+        :class:`~.tools.CurveGrid` for more information.
+
+        Returns
+        -------
+        :class:`~.tools.CurveGrid`
+            Power curves of the entries of :py:attr:`~wind_turbine_fleet`
+            with the names of the wind turbines as names.
+
+        """
+        turbine_power_curves = tuple(
+            wind_dict['wind_turbine'].power_curve
+            for wind_dict in self.wind_turbine_fleet)
+        if (self._curve_grid is None or
+                len(self._curve_grid[0]) != len(turbine_power_curves) or
+                any(power_curve is not cached_power_curve
+                    for power_curve, cached_power_curve in zip(
+                        turbine_power_curves, self._curve_grid[0]))):
+            self._curve_grid = (turbine_power_curves, tools.CurveGrid(
+                [power_curve['wind_speed']
+                 for power_curve in turbine_power_curves],
+                [power_curve['value'] for power_curve in turbine_power_curves],
+                names=[wind_dict['wind_turbine'].name
+                       for wind_dict in self.wind_turbine_fleet]))
+        return self._curve_grid[1]
+
+    def turbine_power_output(self, wind_speed):
+        r"""
+        Calculates the power output of the wind turbine types of the wind
+        farm.
+
+        All power curves are evaluated together with :py:attr:`~curve_grid`,
+        so that the interval of each wind speed is only determined once.
+
+        Parameters
+        ----------
+        wind_speed : pandas.Series or numpy.array
+            Wind speed at hub height in m/s, which is used for all wind
+            turbine types.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Electrical power output in W of all wind turbines of each entry of
+            :py:attr:`~wind_turbine_fleet` (power output of one wind turbine
+            multiplied by the number of turbines) with the names of the wind
+            turbines as columns.
+
+        """
+        turbine_power_output = power_output.power_curve_catalog(
+            wind_speed, self.curve_grid)
+        turbine_power_output *= [wind_dict['number_of_turbines']
+                                 for wind_dict in self.wind_turbine_fleet]
+        return turbine_power_output
+
     def mean_hub_height(self):
         r"""
         Calculates the mean hub height of the wind farm.
@@ -178,12 +418,14 @@ class WindFarm(object):
                  p. 35
 
         """
-        self.hub_height = np.exp(
-            sum(np.log(wind_dict['wind_turbine'].hub_height) *
-                wind_dict['wind_turbine'].nominal_power *
-                wind_dict['number_of_turbines']
-                for wind_dict in self.wind_turbine_fleet) /
-            self.get_installed_power())
+        if self._cached_hub_height is None:
+            self._cached_hub_height = np.exp(
+                sum(np.log(wind_dict['wind_turbine'].hub_height) *
+                    wind_dict['wind_turbine'].nominal_power *
+                    wind_dict['number_of_turbines']
+                    for wind_dict in self.wind_turbine_fleet) /
+                self.get_installed_power())
+        self.hub_height = self._cached_hub_height
         return self
 
     def get_installed_power(self):
@@ -197,10 +439,40 @@ class WindFarm(object):
             for further information.
 
         """
-        return sum(
-            wind_dict['wind_turbine'].nominal_power *
-            wind_dict['number_of_turbines']
-            for wind_dict in self.wind_turbine_fleet)
+        if self._cached_installed_power is None:
+            self._cached_installed_power = sum(
+                wind_dict['wind_turbine'].nominal_power *
+                wind_dict['number_of_turbines']
+                for wind_dict in self.wind_turbine_fleet)
+        return self._cached_installed_power
+
+    def _power_curve_state(self, wake_losses_model='power_efficiency_curve',
+                           smoothing=False, block_width=0.5,
+                           standard_deviation_method='turbulence_intensity',
+                           smoothing_order='wind_farm_power_curves',
+                           turbulence_intensity=None, **kwargs):
+        r"""
+        Returns the state the power curve of the wind farm is calculated from
+        with the parameters of :py:func:`~assign_power_curve`, which consists
+        of the version of the wind farm, changed by every modification of the
+        wind farm, and the parameters.
+
+        """
+        return (self._version,
+                (wake_losses_model, smoothing, block_width,
+                 standard_deviation_method, smoothing_order,
+                 turbulence_intensity),
+                tuple(sorted(kwargs.items())))
+
+    def _has_power_curve(self, state):
+        r"""
+        Checks if :py:attr:`~power_curve` was calculated from `state` (see
+        :py:func:`~_power_curve_state`) and not replaced since.
+
+        """
+        return (self._cached_power_curve is not None and
+                self._cached_power_curve[1] is self.power_curve and
+                tools.same_state(state, self._cached_power_curve[0]))
 
     def assign_power_curve(self, wake_losses_model='power_efficiency_curve',
                            smoothing=False, block_width=0.5,
@@ -248,13 +520,35 @@ class WindFarm(object):
             Roughness length. If `standard_deviation_method` is
             'turbulence_intensity' and `turbulence_intensity` is not given
             the turbulence intensity is calculated via the roughness length.
+        backend : str (optional)
+            Implementation of the power curve smoothing. Options: 'numpy',
+            'numba'. See :py:func:`~.power_curves.smooth_power_curve`.
 
         Returns
         -------
         :class:`~.wind_farm.WindFarm`
             self
 
+        Notes
+        -----
+        The power curve is only recalculated if the wind turbine fleet, the
+        efficiency or the parameters changed since the last call and
+        :py:attr:`~power_curve` was not replaced.
+
         """
+        if (wake_losses_model == 'constant_efficiency' or
+                wake_losses_model == 'power_efficiency_curve'):
+            warnings.warn(
+                'wake_losses_model is deprecated, will be defined by the '
+                'type of wind_farm_efficiency.', FutureWarning)
+        state = self._power_curve_state(
+            wake_losses_model=wake_losses_model, smoothing=smoothing,
+            block_width=block_width,
+            standard_deviation_method=standard_deviation_method,
+            smoothing_order=smoothing_order,
+            turbulence_intensity=turbulence_intensity, **kwargs)
+        if self._has_power_curve(state):
+            return self
         # Check if all wind turbines have a power curve as attribute
         for item in self.wind_turbine_fleet:
             if item['wind_turbine'].power_curve is None:
@@ -265,8 +559,8 @@ class WindFarm(object):
                                      item['wind_turbine'].name if
                                      item['wind_turbine'].name else '',
                                      item['wind_turbine'].power_curve))
-        # Initialize data frame for power curve values
-        df = pd.DataFrame()
+        power_curve_wind_speeds = []
+        power_curve_values = []
         for turbine_type_dict in self.wind_turbine_fleet:
             # Check if all needed parameters are available and/or assign them
             if smoothing:
@@ -285,6 +579,8 @@ class WindFarm(object):
                             "'turbulence_intensity' as " +
                             "`standard_deviation_method` if " +
                             "`turbulence_intensity` is not given")
+                elif turbulence_intensity is not None:
+                    kwargs['turbulence_intensity'] = turbulence_intensity
             if wake_losses_model is not None:
                 if self.efficiency is None:
                     raise KeyError(
@@ -294,54 +590,53 @@ class WindFarm(object):
                         "`efficiency` of wind farm {0} is {1}.".format(
                             self.name if self.name else '', self.efficiency))
             # Get original power curve
-            power_curve = pd.DataFrame(
-                turbine_type_dict['wind_turbine'].power_curve)
+            wind_speeds = np.asarray(
+                turbine_type_dict['wind_turbine'].power_curve['wind_speed'],
+                dtype=float)
+            values = np.asarray(
+                turbine_type_dict['wind_turbine'].power_curve['value'],
+                dtype=float)
+            # Power curves are aggregated in the order of their wind speeds
+            if np.any(np.diff(wind_speeds) < 0):
+                order = np.argsort(wind_speeds, kind='stable')
+                wind_speeds = wind_speeds[order]
+                values = values[order]
             # Editions to the power curves before the summation
             if smoothing and smoothing_order == 'turbine_power_curves':
-                power_curve = power_curves.smooth_power_curve(
-                    power_curve['wind_speed'], power_curve['value'],
+                wind_speeds, values = power_curves._smooth_power_curve(
+                    wind_speeds, values,
                     standard_deviation_method=standard_deviation_method,
                     block_width=block_width, **kwargs)
             else:
                 # Add value zero to start and end of curve as otherwise
                 # problems can occur during the aggregation
-                if power_curve.iloc[0]['wind_speed'] != 0.0:
-                    power_curve = pd.concat(
-                        [pd.DataFrame(data={
-                            'value': [0.0], 'wind_speed': [0.0]}),
-                         power_curve], sort=True)
-                if power_curve.iloc[-1]['value'] != 0.0:
-                    power_curve = pd.concat(
-                        [power_curve, pd.DataFrame(data={
-                            'value': [0.0], 'wind_speed': [
-                                power_curve['wind_speed'].loc[
-                                    power_curve.index[-1]] + 0.5]})],
-                        sort=True)
-            # Add power curves of all turbine types to data frame
-            # (multiplied by turbine amount)
-            df = pd.concat(
-                [df, pd.DataFrame(power_curve.set_index(['wind_speed']) *
-                 turbine_type_dict['number_of_turbines'])], axis=1)
+                if wind_speeds[0] != 0.0:
+                    wind_speeds = np.append(0.0, wind_speeds)
+                    values = np.append(0.0, values)
+                if values[-1] != 0.0:
+                    wind_speeds = np.append(wind_speeds, wind_speeds[-1] + 0.5)
+                    values = np.append(values, 0.0)
+            # Power curves of all turbine types (multiplied by turbine amount)
+            power_curve_wind_speeds.append(wind_speeds)
+            power_curve_values.append(
+                values * turbine_type_dict['number_of_turbines'])
         # Aggregate all power curves
-        wind_farm_power_curve = pd.DataFrame(
-            df.interpolate(method='index').sum(axis=1))
-        wind_farm_power_curve.columns = ['value']
-        wind_farm_power_curve.reset_index('wind_speed', inplace=True)
+        wind_speeds, values = power_curves._aggregate_power_curves(
+            power_curve_wind_speeds, power_curve_values)
         # Apply power curve smoothing and consideration of wake losses
         # after the summation
         if smoothing and smoothing_order == 'wind_farm_power_curves':
-            wind_farm_power_curve = power_curves.smooth_power_curve(
-                wind_farm_power_curve['wind_speed'],
-                wind_farm_power_curve['value'],
+            wind_speeds, values = power_curves._smooth_power_curve(
+                wind_speeds, values,
                 standard_deviation_method=standard_deviation_method,
                 block_width=block_width, **kwargs)
         if (wake_losses_model == 'constant_efficiency' or
                 wake_losses_model == 'power_efficiency_curve'):
-            wind_farm_power_curve = (
-                power_curves.wake_losses_to_power_curve(
-                    wind_farm_power_curve['wind_speed'].values,
-                    wind_farm_power_curve['value'].values,
-                    wake_losses_model=wake_losses_model,
-                    wind_farm_efficiency=self.efficiency))
-        self.power_curve = wind_farm_power_curve
+            wind_speeds, values = power_curves._wake_losses_to_power_curve(
+                wind_speeds, values, wake_losses_model=wake_losses_model,
+                wind_farm_efficiency=self.efficiency)
+        self.power_curve = pd.DataFrame(
+            np.column_stack([wind_speeds, values]),
+            columns=['wind_speed', 'value'])
+        self._cached_power_curve = (state, self.power_curve)
         return self
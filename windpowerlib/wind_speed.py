@@ -12,7 +12,7 @@ import pandas as pd
 
 
 def logarithmic_profile(wind_speed, wind_speed_height, hub_height,
-                        roughness_length, obstacle_height=0.0):
+                        roughness_length, obstacle_height=0.0, out=None):
     r"""
     Calculates the wind speed at hub height using a logarithmic wind profile.
 
@@ -34,11 +34,17 @@ def logarithmic_profile(wind_speed, wind_speed_height, hub_height,
     obstacle_height : float
         Height of obstacles in the surrounding area of the wind turbine. Set
         `obstacle_height` to zero for wide spread obstacles. Default: 0.
+    out : None or numpy.array
+        Preallocated array with the shape of `wind_speed` in which the result
+        is stored, e.g. a buffer of a :class:`~.tools.Workspace`. The
+        calculation is then done in place without temporary arrays.
+        Default: None.
 
     Returns
     -------
     pandas.Series or numpy.array
         Wind speed at hub height. Data type depends on type of `wind_speed`.
+        If `out` is given, `out` is returned.
 
     Notes
     -----
@@ -78,6 +84,20 @@ def logarithmic_profile(wind_speed, wind_speed_height, hub_height,
         raise ValueError("To take an obstacle height of {0} m ".format(
                          obstacle_height) + "into consideration, wind " +
                          "speed data of a greater height is needed.")
+    if out is not None:
+        # In place calculation of the equivalent equation
+        # v_hub = v_data * (1 + ln((h_hub - d) / (h_data - d)) /
+        #                   ln((h_data - d) / z_0)),
+        # which only needs one array
+        np.divide(wind_speed_height - 0.7 * obstacle_height,
+                  np.asarray(roughness_length), out=out)
+        np.log(out, out=out)
+        np.divide(np.log((hub_height - 0.7 * obstacle_height) /
+                         (wind_speed_height - 0.7 * obstacle_height)),
+                  out, out=out)
+        out += 1
+        out *= np.asarray(wind_speed)
+        return out
     # Return np.array if wind_speed is np.array
     if (isinstance(wind_speed, np.ndarray) and
             isinstance(roughness_length, pd.Series)):
@@ -90,7 +110,7 @@ def logarithmic_profile(wind_speed, wind_speed_height, hub_height,
 
 
 def hellman(wind_speed, wind_speed_height, hub_height,
-            roughness_length=None, hellman_exponent=None):
+            roughness_length=None, hellman_exponent=None, out=None):
     r"""
     Calculates the wind speed at hub height using the hellman equation.
 
@@ -116,11 +136,16 @@ def hellman(wind_speed, wind_speed_height, hub_height,
         constant. If None and roughness length is given
         `hellman_exponent` = 1 / ln(hub_height/roughness_length),
         otherwise `hellman_exponent` = 1/7. Default: None.
+    out : None or numpy.array
+        Preallocated array with the shape of `wind_speed` in which the result
+        is stored, e.g. a buffer of a :class:`~.tools.Workspace`.
+        Default: None.
 
     Returns
     -------
     pandas.Series or numpy.array
         Wind speed at hub height. Data type depends on type of `wind_speed`.
+        If `out` is given, `out` is returned.
 
     Notes
     -----
@@ -159,6 +184,18 @@ def hellman(wind_speed, wind_speed_height, hub_height,
             Verlag, 2011, p. 279
 
     """
+    if out is not None:
+        if hellman_exponent is None and roughness_length is not None:
+            # Hellman exponent and wind speed factor are calculated in place
+            np.divide(hub_height, np.asarray(roughness_length), out=out)
+            np.log(out, out=out)
+            np.divide(1, out, out=out)
+            np.power(hub_height / wind_speed_height, out, out=out)
+        else:
+            out[...] = (hub_height / wind_speed_height) ** (
+                1/7 if hellman_exponent is None else hellman_exponent)
+        out *= np.asarray(wind_speed)
+        return out
     if hellman_exponent is None:
         if roughness_length is not None:
             # Return np.array if wind_speed is np.array
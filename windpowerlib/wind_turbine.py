@@ -8,12 +8,15 @@ wind turbine.
 __copyright__ = "Copyright oemof developer group"
 __license__ = "GPLv3"
 
+import numpy as np
 import pandas as pd
 import logging
 import sys
 import requests
 import os
 import warnings
+import weakref
+from windpowerlib import tools
 
 
 class WindTurbine(object):
@@ -54,6 +57,12 @@ class WindTurbine(object):
         See `example_power_curves.csv' and
         `example_power_coefficient_curves.csv` in example/data for the required
         form of a csv file (more columns can be added).
+    turbine_type : None or :class:`~.wind_turbine.TurbineType`
+        Wind turbine type with the power (coefficient) curve, nominal power
+        and rotor diameter shared by all wind turbines of this type. These
+        are taken from `turbine_type` unless they are given explicitly, no
+        data is fetched and `name` defaults to the name of the type. See
+        :class:`~.wind_turbine.TurbineTypeRegistry`. Default: None.
 
     Attributes
     ----------
@@ -78,6 +87,8 @@ class WindTurbine(object):
     coordinates : list or None
         List of coordinates [lat, lon] of location for loading data.
         Default: None.
+    turbine_type : None or :class:`~.wind_turbine.TurbineType`
+        Wind turbine type the wind turbine references. Default: None.
     power_output : pandas.Series
         The calculated power output of the wind turbine. Default: None.
 
@@ -91,6 +102,16 @@ class WindTurbine(object):
     in example/data for the required form of such a csv file (more columns can
     be added).
 
+    Wind turbines store the attributes above in `__slots__` and only
+    references to their data, so no further attributes can be set. Setting
+    the hub height, nominal power or power curve invalidates the cached
+    values of the wind farms of the wind turbine (see
+    :class:`~.wind_farm.WindFarm`). Use
+    :class:`~.wind_turbine.ExtensibleWindTurbine` if you need further
+    attributes. Use a :class:`~.wind_turbine.TurbineTypeRegistry` to create
+    many wind turbines of the same types, which then share the data of their
+    type instead of fetching a copy of it for every wind turbine.
+
     Examples
     --------
     >>> from windpowerlib import wind_turbine
@@ -105,11 +126,46 @@ class WindTurbine(object):
     4200000.0
 
     """
+    __slots__ = ('name', 'hub_height', 'rotor_diameter',
+                 'power_coefficient_curve', 'power_curve', 'nominal_power',
+                 'coordinates', 'turbine_type', 'power_output',
+                 '_compiled_power_curve', '_compiled_power_coefficient_curve',
+                 '_observers', '__weakref__')
 
-    def __init__(self, name, hub_height, rotor_diameter=None,
+    def __init__(self, name=None, hub_height=None, rotor_diameter=None,
                  power_coefficient_curve=None, power_curve=None,
                  nominal_power=None, fetch_curve=None, coordinates=None,
-                 data_source='oedb', **kwargs):
+                 data_source='oedb', turbine_type=None, **kwargs):
+
+        self._observers = None
+        if turbine_type is None and name is None:
+            raise ValueError("`name` must be given if `turbine_type` is " +
+                             "None.")
+        if hub_height is None:
+            raise ValueError("`hub_height` of the wind turbine must be " +
+                             "given.")
+        self.turbine_type = turbine_type
+        self.hub_height = hub_height
+        self.coordinates = coordinates
+        self.power_output = None
+        self._compiled_power_curve = None
+        self._compiled_power_coefficient_curve = None
+
+        if turbine_type is not None:
+            # Data is referenced from the wind turbine type
+            self.name = turbine_type.name if name is None else name
+            self.rotor_diameter = (turbine_type.rotor_diameter
+                                   if rotor_diameter is None
+                                   else rotor_diameter)
+            self.power_coefficient_curve = (
+                turbine_type.power_coefficient_curve
+                if power_coefficient_curve is None
+                else power_coefficient_curve)
+            self.power_curve = (turbine_type.power_curve
+                                if power_curve is None else power_curve)
+            self.nominal_power = (turbine_type.nominal_power
+                                  if nominal_power is None else nominal_power)
+            return
 
         warnings.warn(
             "parameters data_source and fetch_curve are deprecated, data "
@@ -120,18 +176,107 @@ class WindTurbine(object):
             "(None, data_source='oedb').", FutureWarning)
 
         self.name = name
-        self.hub_height = hub_height
         self.rotor_diameter = rotor_diameter
         self.power_coefficient_curve = power_coefficient_curve
         self.power_curve = power_curve
         self.nominal_power = nominal_power
-        self.coordinates = coordinates
-
-        self.power_output = None
 
         if self.power_coefficient_curve is None and self.power_curve is None:
             self.fetch_turbine_data(fetch_curve, data_source)
 
+    def __setattr__(self, name, value):
+        super(WindTurbine, self).__setattr__(name, value)
+        if name in ('hub_height', 'nominal_power', 'power_curve'):
+            # Wind farms of the wind turbine invalidate their cached values
+            observers = getattr(self, '_observers', None)
+            if observers:
+                for observer in list(observers):
+                    observer._changed()
+
+    def __getstate__(self):
+        state = dict(getattr(self, '__dict__', {}))
+        for name in WindTurbine.__slots__:
+            if (name not in ('_observers', '__weakref__') and
+                    hasattr(self, name)):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        # Copies are not observed by the wind farms of the wind turbine
+        self._observers = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _add_observer(self, observer):
+        r"""
+        Adds a wind farm whose cached values are invalidated if the hub
+        height, nominal power or power curve of the wind turbine is set.
+
+        """
+        if self._observers is None:
+            self._observers = weakref.WeakSet()
+        self._observers.add(observer)
+
+    @property
+    def compiled_power_curve(self):
+        r"""
+        The power curve of the wind turbine compiled to a table with equally
+        spaced wind speeds.
+
+        The table is compiled on first access and reused as long as
+        :py:attr:`~power_curve` is not replaced. See
+        :class:`~.tools.CompiledCurve` for more information.
+
+        Returns
+        -------
+        :class:`~.tools.CompiledCurve` or None
+            None if :py:attr:`~power_curve` is None.
+
+        """
+        if self.power_curve is None:
+            return None
+        if (self.turbine_type is not None and
+                self.power_curve is self.turbine_type.power_curve):
+            return self.turbine_type.compiled_power_curve
+        if (self._compiled_power_curve is None or
+                self._compiled_power_curve[0] is not self.power_curve):
+            self._compiled_power_curve = (
+                self.power_curve, tools.CompiledCurve(
+                    self.power_curve['wind_speed'],
+                    self.power_curve['value']))
+        return self._compiled_power_curve[1]
+
+    @property
+    def compiled_power_coefficient_curve(self):
+        r"""
+        The power coefficient curve of the wind turbine compiled to a table
+        with equally spaced wind speeds.
+
+        The table is compiled on first access and reused as long as
+        :py:attr:`~power_coefficient_curve` is not replaced. See
+        :class:`~.tools.CompiledCurve` for more information.
+
+        Returns
+        -------
+        :class:`~.tools.CompiledCurve` or None
+            None if :py:attr:`~power_coefficient_curve` is None.
+
+        """
+        if self.power_coefficient_curve is None:
+            return None
+        if (self.turbine_type is not None and
+                self.power_coefficient_curve is
+                self.turbine_type.power_coefficient_curve):
+            return self.turbine_type.compiled_power_coefficient_curve
+        if (self._compiled_power_coefficient_curve is None or
+                self._compiled_power_coefficient_curve[0] is not
+                self.power_coefficient_curve):
+            self._compiled_power_coefficient_curve = (
+                self.power_coefficient_curve, tools.CompiledCurve(
+                    self.power_coefficient_curve['wind_speed'],
+                    self.power_coefficient_curve['value']))
+        return self._compiled_power_coefficient_curve[1]
+
     def fetch_turbine_data(self, fetch_curve, data_source):
         r"""
         Fetches data of the requested wind turbine.
@@ -199,6 +344,316 @@ class WindTurbine(object):
         return self
 
 
+class ExtensibleWindTurbine(WindTurbine):
+    r"""
+    Wind turbine on which further attributes can be set.
+
+    :class:`~.wind_turbine.WindTurbine` stores its attributes in `__slots__`
+    only. This subclass additionally has a `__dict__` for further attributes,
+    e.g. an operator or commissioning date, at the cost of the memory of a
+    dictionary for each wind turbine. See
+    :class:`~.wind_turbine.WindTurbine` for the parameters.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from windpowerlib import wind_turbine
+    >>> turbine = wind_turbine.ExtensibleWindTurbine(
+    ...    name='dummy', hub_height=100, nominal_power=1000.0,
+    ...    power_curve=pd.DataFrame({'wind_speed': [0.0, 10.0],
+    ...                              'value': [0.0, 1000.0]}))
+    >>> turbine.operator = 'operator'
+    >>> print(turbine.operator)
+    operator
+
+    """
+
+
+def _read_only_curve(curve):
+    r"""
+    Returns a power (coefficient) curve as DataFrame on a read-only array.
+
+    """
+    if curve is None:
+        return None
+    if isinstance(curve, dict):
+        curve = pd.DataFrame(curve)
+    values = np.column_stack([np.asarray(curve['wind_speed'], dtype=float),
+                              np.asarray(curve['value'], dtype=float)])
+    values.flags.writeable = False
+    return pd.DataFrame(values, columns=['wind_speed', 'value'], copy=False)
+
+
+class TurbineType(object):
+    r"""
+    Immutable data of a wind turbine type shared by wind turbines.
+
+    The power (coefficient) curve is stored once as DataFrame on a read-only
+    array, which is referenced by all :class:`~.wind_turbine.WindTurbine`
+    objects of the type. Use :class:`~.wind_turbine.TurbineTypeRegistry` to
+    obtain turbine types from the turbine data.
+
+    Parameters
+    ----------
+    name : str
+        Name of the wind turbine type.
+    power_curve : None, pandas.DataFrame or dictionary
+        Power curve with 'wind_speed' and 'value' columns/keys. Default: None.
+    power_coefficient_curve : None, pandas.DataFrame or dictionary
+        Power coefficient curve with 'wind_speed' and 'value' columns/keys.
+        Default: None.
+    nominal_power : None or float
+        The nominal output of the wind turbine type in W. Default: None.
+    rotor_diameter : None or float
+        Diameter of the rotor in m. Default: None.
+
+    Attributes
+    ----------
+    name : str
+        Name of the wind turbine type.
+    power_curve : None or pandas.DataFrame
+        Read-only power curve.
+    power_coefficient_curve : None or pandas.DataFrame
+        Read-only power coefficient curve.
+    nominal_power : None or float
+        The nominal output of the wind turbine type in W.
+    rotor_diameter : None or float
+        Diameter of the rotor in m.
+
+    Examples
+    --------
+    >>> from windpowerlib import wind_turbine
+    >>> turbine_type = wind_turbine.TurbineType(
+    ...     'example type', nominal_power=2e6,
+    ...     power_curve={'wind_speed': [3.0, 12.0], 'value': [0.0, 2e6]})
+    >>> turbine = wind_turbine.WindTurbine(turbine_type=turbine_type,
+    ...                                    hub_height=100)
+    >>> turbine.name, turbine.nominal_power
+    ('example type', 2000000.0)
+    >>> turbine.power_curve is turbine_type.power_curve
+    True
+
+    """
+    __slots__ = ('name', 'power_curve', 'power_coefficient_curve',
+                 'nominal_power', 'rotor_diameter', '_compiled_power_curve',
+                 '_compiled_power_coefficient_curve')
+
+    def __init__(self, name, power_curve=None, power_coefficient_curve=None,
+                 nominal_power=None, rotor_diameter=None):
+        for attribute, value in [
+                ('name', name), ('power_curve', _read_only_curve(power_curve)),
+                ('power_coefficient_curve',
+                 _read_only_curve(power_coefficient_curve)),
+                ('nominal_power', nominal_power),
+                ('rotor_diameter', rotor_diameter),
+                ('_compiled_power_curve', None),
+                ('_compiled_power_coefficient_curve', None)]:
+            object.__setattr__(self, attribute, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TurbineType objects are immutable.")
+
+    def __repr__(self):
+        return 'TurbineType({!r})'.format(self.name)
+
+    def __reduce__(self):
+        return (TurbineType, (self.name, self.power_curve,
+                              self.power_coefficient_curve,
+                              self.nominal_power, self.rotor_diameter))
+
+    @property
+    def compiled_power_curve(self):
+        r"""
+        The power curve compiled to a table with equally spaced wind speeds,
+        compiled on first access and shared by all wind turbines of the type.
+
+        Returns
+        -------
+        :class:`~.tools.CompiledCurve` or None
+            None if :py:attr:`~power_curve` is None.
+
+        """
+        if (self._compiled_power_curve is None and
+                self.power_curve is not None):
+            object.__setattr__(self, '_compiled_power_curve',
+                               tools.CompiledCurve(
+                                   self.power_curve['wind_speed'],
+                                   self.power_curve['value']))
+        return self._compiled_power_curve
+
+    @property
+    def compiled_power_coefficient_curve(self):
+        r"""
+        The power coefficient curve compiled to a table with equally spaced
+        wind speeds, compiled on first access and shared by all wind turbines
+        of the type.
+
+        Returns
+        -------
+        :class:`~.tools.CompiledCurve` or None
+            None if :py:attr:`~power_coefficient_curve` is None.
+
+        """
+        if (self._compiled_power_coefficient_curve is None and
+                self.power_coefficient_curve is not None):
+            object.__setattr__(self, '_compiled_power_coefficient_curve',
+                               tools.CompiledCurve(
+                                   self.power_coefficient_curve['wind_speed'],
+                                   self.power_coefficient_curve['value']))
+        return self._compiled_power_coefficient_curve
+
+
+class TurbineTypeRegistry(object):
+    r"""
+    Registry of interned wind turbine types.
+
+    Each wind turbine type is loaded from the turbine data once and then
+    returned for every request, so that all wind turbines of a type share one
+    :class:`~.wind_turbine.TurbineType`. The turbine data file is read once.
+
+    Parameters
+    ----------
+    data_source : str
+        Source of the turbine data: 'oedb' (see
+        :py:func:`~.get_turbine_data_from_oedb`) or the path of a csv file
+        (see :py:func:`~.get_turbine_data_from_file`). Default: 'oedb'.
+    fetch_curve : str
+        Curve fetched from the turbine data. Valid options are 'power_curve'
+        and 'power_coefficient_curve'. Default: 'power_curve'.
+
+    Attributes
+    ----------
+    data_source : str
+        Source of the turbine data.
+    fetch_curve : str
+        Curve fetched from the turbine data.
+
+    Examples
+    --------
+    >>> import os
+    >>> from windpowerlib import wind_turbine
+    >>> registry = wind_turbine.TurbineTypeRegistry(
+    ...     data_source=os.path.join(os.path.dirname(__file__),
+    ...                              '../example/data',
+    ...                              'example_power_curves.csv'))
+    >>> turbines = [registry.wind_turbine('DUMMY 3', hub_height=hub_height)
+    ...             for hub_height in [80, 100, 120]]
+    >>> turbines[0].power_curve is turbines[2].power_curve
+    True
+    >>> print(turbines[1].nominal_power)
+    150000
+    >>> len(registry)
+    1
+
+    """
+    def __init__(self, data_source='oedb', fetch_curve='power_curve'):
+        if fetch_curve not in ['power_curve', 'power_coefficient_curve']:
+            raise ValueError("'{0}' is an invalid value for ".format(
+                fetch_curve) + "`fetch_curve`. Must be " +
+                             "'power_curve' or 'power_coefficient_curve'.")
+        self.data_source = data_source
+        self.fetch_curve = fetch_curve
+        self._turbine_types = {}
+        self._turbine_data = None
+
+    def __len__(self):
+        return len(self._turbine_types)
+
+    def __contains__(self, name):
+        return name in self._turbine_types
+
+    def register(self, turbine_type):
+        r"""
+        Adds a wind turbine type that is not part of the turbine data.
+
+        Parameters
+        ----------
+        turbine_type : :class:`~.wind_turbine.TurbineType`
+            Wind turbine type, registered with its name.
+
+        Returns
+        -------
+        :class:`~.wind_turbine.TurbineType`
+            The registered wind turbine type.
+
+        """
+        if turbine_type.name in self._turbine_types:
+            raise ValueError("Turbine type '{}' is already registered.".format(
+                turbine_type.name))
+        self._turbine_types[turbine_type.name] = turbine_type
+        return turbine_type
+
+    def get(self, name):
+        r"""
+        Returns the wind turbine type `name`.
+
+        The type is loaded from the turbine data on the first request.
+
+        Parameters
+        ----------
+        name : str
+            Name of the wind turbine type.
+
+        Returns
+        -------
+        :class:`~.wind_turbine.TurbineType`
+
+        """
+        if name not in self._turbine_types:
+            if self._turbine_data is None:
+                self._turbine_data = self._read_turbine_data()
+            curve, nominal_power = _select_turbine_data(self._turbine_data,
+                                                        name)
+            if self.data_source == 'oedb':
+                # nominal power and power curve values in W
+                nominal_power = nominal_power * 1000
+                if self.fetch_curve == 'power_curve':
+                    curve['value'] = curve['value'] * 1000
+            self._turbine_types[name] = TurbineType(
+                name, nominal_power=nominal_power,
+                **{self.fetch_curve: curve})
+        return self._turbine_types[name]
+
+    def wind_turbine(self, name, hub_height, **kwargs):
+        r"""
+        Creates a wind turbine of the wind turbine type `name`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the wind turbine type.
+        hub_height : float
+            Hub height of the wind turbine in m.
+
+        Other Parameters
+        ----------------
+        kwargs :
+            Further parameters of :class:`~.wind_turbine.WindTurbine`, e.g.
+            `coordinates`.
+
+        Returns
+        -------
+        :class:`~.wind_turbine.WindTurbine`
+
+        """
+        return WindTurbine(turbine_type=self.get(name), hub_height=hub_height,
+                           **kwargs)
+
+    def _read_turbine_data(self):
+        if self.data_source == 'oedb':
+            filename = os.path.join(os.path.dirname(__file__), 'data',
+                                    'oedb_{}s.csv'.format(self.fetch_curve))
+            if not os.path.isfile(filename):
+                load_turbine_data_from_oedb()
+        else:
+            filename = self.data_source
+        try:
+            return pd.read_csv(filename, index_col=0)
+        except FileNotFoundError:
+            raise FileNotFoundError("The file '{}' was not found.".format(
+                filename))
+
+
 def get_turbine_data_from_file(turbine_type, file_):
     r"""
     Fetches power (coefficient) curve data from a csv file.
@@ -243,6 +698,21 @@ def get_turbine_data_from_file(turbine_type, file_):
     >>> print(e_t_1.nominal_power)
     150000
 
+    """
+    try:
+        df = pd.read_csv(file_, index_col=0)
+    except FileNotFoundError:
+        raise FileNotFoundError("The file '{}' was not found.".format(file_))
+    return _select_turbine_data(df, turbine_type)
+
+
+def _select_turbine_data(df, turbine_type):
+    r"""
+    Selects the power (coefficient) curve and nominal power of `turbine_type`
+    from the content of a turbine data file.
+
+    See :py:func:`~.get_turbine_data_from_file` for the returned data.
+
     """
     def isfloat(x):
         try:
@@ -251,10 +721,6 @@ def get_turbine_data_from_file(turbine_type, file_):
         except ValueError:
             return False
 
-    try:
-        df = pd.read_csv(file_, index_col=0)
-    except FileNotFoundError:
-        raise FileNotFoundError("The file '{}' was not found.".format(file_))
     # note: this try except statement will be removed in 0.2.0 and only
     # the exception will stay. The example power (coefficient) curve files
     # will then be adapted
@@ -11,11 +11,39 @@ __copyright__ = "Copyright oemof developer group"
 __license__ = "GPLv3"
 
 
+from windpowerlib import tools, power_curves, power_output
+import concurrent.futures
 import numpy as np
 import pandas as pd
 import warnings
 
 
+class PowerCurveAssignmentError(Exception):
+    r"""
+    Raised if the power curve of one or more wind farms of a wind turbine
+    cluster could not be assigned.
+
+    Parameters
+    ----------
+    errors : list(tuple)
+        Name of the wind farm and the raised exception for each wind farm
+        that failed, in the order of the wind farms of the cluster.
+
+    Attributes
+    ----------
+    errors : list(tuple)
+        Name of the wind farm and the raised exception for each wind farm
+        that failed, in the order of the wind farms of the cluster.
+
+    """
+    def __init__(self, errors):
+        self.errors = errors
+        super(PowerCurveAssignmentError, self).__init__(
+            'Power curve of {} wind farm(s) could not be assigned: {}'.format(
+                len(errors), '; '.join(
+                    '{}: {!r}'.format(name, error) for name, error in errors)))
+
+
 class WindTurbineCluster(object):
     r"""
     Defines a standard set of wind turbine cluster attributes.
@@ -33,8 +61,9 @@ class WindTurbineCluster(object):
     ----------
     name : str or None
         Name of the wind turbine cluster.
-    wind_farms : list (:class:`~.wind_farm.WindFarm`)
-        List of wind farms in cluster.
+    wind_farms : :class:`~.tools.ObservedList` (:class:`~.wind_farm.WindFarm`)
+        List of wind farms in cluster. Copy of the list the wind turbine
+        cluster was created with, see Notes.
     coordinates : list(float) or None
         List with coordinates [lat, lon] of location. Default: None.
     hub_height : float
@@ -52,9 +81,25 @@ class WindTurbineCluster(object):
     power_output : :pandas:`pandas.Series<series>`
         The calculated power output of the wind turbine cluster.
 
+    Notes
+    -----
+    The nominal power, mean hub height and power curve are cached until the
+    wind turbine cluster changes, like the values of a
+    :class:`~.wind_farm.WindFarm`. They are invalidated if
+    :py:attr:`~wind_farms`, which is copied to a
+    :class:`~.tools.ObservedList`, is set or modified or if one of the wind
+    farms changes. If a wind turbine of one wind farm changes, only the power
+    curve of this wind farm and the aggregated power curve of the cluster are
+    recalculated.
+
     """
     def __init__(self, name, wind_farms, coordinates=None, **kwargs):
 
+        # Cached values, which are invalidated by _changed()
+        self._version = 0
+        self._cached_installed_power = None
+        self._cached_hub_height = None
+
         self.name = name
         self.wind_farms = wind_farms
         self.coordinates = coordinates
@@ -64,6 +109,51 @@ class WindTurbineCluster(object):
         self._installed_power = None
         self.power_curve = None
         self.power_output = None
+        self._compiled_power_curve = None
+        self._curve_grid = None
+        self._cached_power_curve = None
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Copies of the wind farms are not observed yet
+        self._wind_farms_changed()
+
+    @property
+    def wind_farms(self):
+        r"""
+        The wind farms of the wind turbine cluster.
+
+        Setting the wind farms copies them to a :class:`~.tools.ObservedList`,
+        whose modifications invalidate the cached values of the cluster.
+
+        """
+        return self._wind_farms
+
+    @wind_farms.setter
+    def wind_farms(self, wind_farms):
+        self._wind_farms = tools.ObservedList(
+            wind_farms, on_change=self._wind_farms_changed)
+        self._wind_farms_changed()
+
+    def _wind_farms_changed(self):
+        r"""
+        Observes the wind farms after :py:attr:`~wind_farms` changed and
+        invalidates the cached values.
+
+        """
+        for wind_farm in self._wind_farms:
+            if hasattr(wind_farm, '_add_observer'):
+                wind_farm._add_observer(self)
+        self._changed()
+
+    def _changed(self):
+        r"""
+        Invalidates the cached values of the wind turbine cluster.
+
+        """
+        self._version += 1
+        self._cached_installed_power = None
+        self._cached_hub_height = None
 
     @property
     def installed_power(self):
@@ -96,17 +186,103 @@ class WindTurbineCluster(object):
         Returns
         -------
         float
-            Nominal power of the wind turbine cluster in w.
+            Nominal power of the wind turbine cluster in w. If no nominal
+            power was set, it is calculated from the wind farms with
+            :py:func:`~.get_installed_power`.
 
         """
         if not self._nominal_power:
-            self.nominal_power = self.get_installed_power()
+            return self.get_installed_power()
         return self._nominal_power
 
     @nominal_power.setter
     def nominal_power(self, nominal_power):
         self._nominal_power = nominal_power
 
+    @property
+    def compiled_power_curve(self):
+        r"""
+        The power curve of the wind turbine cluster compiled to a table with
+        equally spaced wind speeds.
+
+        The table is compiled on first access and reused as long as
+        :py:attr:`~power_curve` is not replaced. See
+        :class:`~.tools.CompiledCurve` for more information.
+
+        Returns
+        -------
+        :class:`~.tools.CompiledCurve` or None
+            None if :py:attr:`~power_curve` is None.
+
+        """
+        if self.power_curve is None:
+            return None
+        if (self._compiled_power_curve is None or
+                self._compiled_power_curve[0] is not self.power_curve):
+            self._compiled_power_curve = (
+                self.power_curve, tools.CompiledCurve(
+                    self.power_curve['wind_speed'],
+                    self.power_curve['value']))
+        return self._compiled_power_curve[1]
+
+    @property
+    def curve_grid(self):
+        r"""
+        The power curves of the wind farms of the wind turbine cluster
+        resampled to a common grid of wind speeds.
+
+        The grid is set up on first access and reused as long as the power
+        curves of the wind farms are not replaced. See
+        :class:`~.tools.CurveGrid` for more information.
+
+        Returns
+        -------
+        :class:`~.tools.CurveGrid`
+            Power curves of the wind farms with the names of the wind farms as
+            names.
+
+        """
+        farm_power_curves = tuple(
+            wind_farm.power_curve
+            for wind_farm in self.wind_farms)
+        if any(power_curve is None for power_curve in farm_power_curves):
+            raise ValueError("All wind farms need a power curve. Use "
+                             "`assign_power_curve` to calculate them.")
+        if (self._curve_grid is None or
+                len(self._curve_grid[0]) != len(farm_power_curves) or
+                any(power_curve is not cached_power_curve
+                    for power_curve, cached_power_curve in zip(
+                        farm_power_curves, self._curve_grid[0]))):
+            self._curve_grid = (farm_power_curves, tools.CurveGrid(
+                [power_curve['wind_speed']
+                 for power_curve in farm_power_curves],
+                [power_curve['value'] for power_curve in farm_power_curves],
+                names=[wind_farm.name for wind_farm in self.wind_farms]))
+        return self._curve_grid[1]
+
+    def wind_farm_power_output(self, wind_speed):
+        r"""
+        Calculates the power output of the wind farms of the wind turbine
+        cluster.
+
+        The power curves of the wind farms are evaluated together with
+        :py:attr:`~curve_grid`, so that the interval of each wind speed is
+        only determined once.
+
+        Parameters
+        ----------
+        wind_speed : pandas.Series or numpy.array
+            Wind speed at hub height in m/s, which is used for all wind farms.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Electrical power output in W of each wind farm with the names of
+            the wind farms as columns.
+
+        """
+        return power_output.power_curve_catalog(wind_speed, self.curve_grid)
+
     def mean_hub_height(self):
         r"""
         Calculates the mean hub height of the wind turbine cluster.
@@ -143,9 +319,12 @@ class WindTurbineCluster(object):
                  p. 35
 
         """
-        self.hub_height = np.exp(sum(
-            np.log(wind_farm.hub_height) * wind_farm.get_installed_power() for
-            wind_farm in self.wind_farms) / self.get_installed_power())
+        if self._cached_hub_height is None:
+            self._cached_hub_height = np.exp(sum(
+                np.log(wind_farm.hub_height) *
+                wind_farm.get_installed_power() for
+                wind_farm in self.wind_farms) / self.get_installed_power())
+        self.hub_height = self._cached_hub_height
         return self
 
     def get_installed_power(self):
@@ -159,15 +338,18 @@ class WindTurbineCluster(object):
             for further information.
 
         """
-        for wind_farm in self.wind_farms:
-            wind_farm.nominal_power = wind_farm.get_installed_power()
-        return sum(wind_farm.nominal_power for wind_farm in self.wind_farms)
+        if self._cached_installed_power is None:
+            self._cached_installed_power = sum(
+                wind_farm.get_installed_power()
+                for wind_farm in self.wind_farms)
+        return self._cached_installed_power
 
     def assign_power_curve(self, wake_losses_model='power_efficiency_curve',
                            smoothing=False, block_width=0.5,
                            standard_deviation_method='turbulence_intensity',
                            smoothing_order='wind_farm_power_curves',
-                           turbulence_intensity=None, **kwargs):
+                           turbulence_intensity=None, executor=None,
+                           max_workers=None, **kwargs):
         r"""
         Calculates the power curve of a wind turbine cluster.
 
@@ -206,38 +388,172 @@ class WindTurbineCluster(object):
             wind turbine cluster for power curve smoothing with
             'turbulence_intensity' method. Can be calculated from
             `roughness_length` instead. Default: None.
+        executor : None or str or :class:`concurrent.futures.Executor`
+            Executor the power curves of the wind farms are assigned with.
+            Options: None (one after another), 'thread' (thread pool),
+            'process' (process pool) or an executor object, which is not
+            shut down afterwards. The resulting power curve does not depend
+            on the executor. Default: None.
+        max_workers : None or int
+            Maximum number of workers if `executor` is 'thread' or 'process'.
+            Default: None (default of the executor).
         roughness_length : float (optional)
             Roughness length. If `standard_deviation_method` is
             'turbulence_intensity' and `turbulence_intensity` is not given
             the turbulence intensity is calculated via the roughness length.
+        backend : str (optional)
+            Implementation of the power curve smoothing. Options: 'numpy',
+            'numba'. See :py:func:`~.power_curves.smooth_power_curve`.
 
         Returns
         -------
         :class:`~.wind_turbine_cluster.WindTurbineCluster`
             self
 
+        Notes
+        -----
+        If neither the wind turbine cluster nor the parameters changed since
+        the last call, the power curve is kept without going through the wind
+        farms. Otherwise power curves of wind farms that did not change since
+        the last call are reused (see
+        :py:func:`~.wind_farm.WindFarm.assign_power_curve`)
+        and only the changed wind farms are sent to `executor`. The power
+        curves of the wind farms are only aggregated again if any of them
+        changed.
+        If `executor` is 'process' (or a process pool), copies of the changed
+        wind farms are calculated in the worker processes, which bypasses the
+        caches of the wind farms and wind turbines there, e.g. the compiled
+        power curves. The resulting power curves are assigned to the
+        original wind farms and cached there for the next call.
+
+        Raises
+        ------
+        PowerCurveAssignmentError
+            If `executor` is given and the power curve of any wind farm could
+            not be assigned. The exceptions of all failed wind farms are
+            collected in its attribute `errors`. Without executor the
+            exception of the first failed wind farm is raised.
+
         """
+        if (wake_losses_model == 'constant_efficiency' or
+                wake_losses_model == 'power_efficiency_curve'):
+            warnings.warn(
+                'wake_losses_model is deprecated, will be defined by the '
+                'type of wind_farm_efficiency.', FutureWarning)
+        parameters = dict(
+            wake_losses_model=wake_losses_model,
+            smoothing=smoothing, block_width=block_width,
+            standard_deviation_method=standard_deviation_method,
+            smoothing_order=smoothing_order,
+            turbulence_intensity=turbulence_intensity, **kwargs)
+        if (executor is not None and executor not in ('thread', 'process')
+                and not isinstance(executor, concurrent.futures.Executor)):
+            raise ValueError(
+                "`executor` must be None, 'thread', 'process' or an executor "
+                "object but is {}.".format(executor))
+        state = (self._version, tuple(sorted(parameters.items())))
+        if (self._cached_power_curve is not None and
+                self._cached_power_curve[2] is self.power_curve and
+                tools.same_state(state, self._cached_power_curve[0])):
+            return self
+        # Only wind farms that changed since the last call are assigned. The
+        # states are taken here, as wind farms copied to other processes do
+        # not update the caches of the original wind farms.
+        states = [farm._power_curve_state(**parameters)
+                  for farm in self.wind_farms]
+        unchanged = [farm._has_power_curve(state)
+                     for farm, state in zip(self.wind_farms, states)]
+        changed = [(farm, state) for farm, state, cached in zip(
+            self.wind_farms, states, unchanged) if not cached]
+        changed_farms = [farm for farm, _ in changed]
         # Assign wind farm power curves to wind farms of wind turbine cluster
-        for farm in self.wind_farms:
-            # Assign hub heights (needed for power curve and later for
-            # hub height of turbine cluster)
-            farm.mean_hub_height()
-            # Assign wind farm power curve
-            farm.assign_power_curve(
-                wake_losses_model=wake_losses_model,
-                smoothing=smoothing, block_width=block_width,
-                standard_deviation_method=standard_deviation_method,
-                smoothing_order=smoothing_order,
-                turbulence_intensity=turbulence_intensity, **kwargs)
-        # Create data frame from power curves of all wind farms
-        df = pd.concat([farm.power_curve.set_index(['wind_speed']).rename(
-            columns={'value': farm.name}) for
-            farm in self.wind_farms], axis=1)
-        # Sum up power curves
-        cluster_power_curve = pd.DataFrame(
-            df.interpolate(method='index').sum(axis=1))
-        cluster_power_curve.columns = ['value']
-        # Return wind speed (index) to a column of the data frame
-        cluster_power_curve.reset_index('wind_speed', inplace=True)
-        self.power_curve = cluster_power_curve
+        if not changed_farms:
+            results = []
+        elif executor is None:
+            results = [_assign_wind_farm_power_curve(farm, parameters)
+                       for farm in changed_farms]
+        elif isinstance(executor, concurrent.futures.Executor):
+            results = _map_wind_farms(executor, changed_farms, parameters)
+        else:
+            executor_class = (concurrent.futures.ThreadPoolExecutor
+                              if executor == 'thread' else
+                              concurrent.futures.ProcessPoolExecutor)
+            with executor_class(max_workers=max_workers) as pool:
+                results = _map_wind_farms(pool, changed_farms, parameters)
+        errors = [(farm.name, result)
+                  for farm, result in zip(changed_farms, results)
+                  if isinstance(result, BaseException)]
+        if errors:
+            raise PowerCurveAssignmentError(errors)
+        # Results of other processes are assigned to the original wind farms
+        for (farm, state), (hub_height, power_curve) in zip(changed, results):
+            farm.hub_height = hub_height
+            farm.power_curve = power_curve
+            farm._cached_power_curve = (state, power_curve)
+        # Hub heights of unchanged wind farms
+        for farm, cached in zip(self.wind_farms, unchanged):
+            if cached:
+                farm.mean_hub_height()
+        # Assigned power curves of the wind farms changed the version
+        state = (self._version, tuple(sorted(parameters.items())))
+        farm_power_curves = tuple(farm.power_curve for farm in self.wind_farms)
+        if (self._cached_power_curve is not None and
+                self._cached_power_curve[2] is self.power_curve and
+                tools.same_state(farm_power_curves,
+                                 self._cached_power_curve[1])):
+            self._cached_power_curve = (state, farm_power_curves,
+                                        self.power_curve)
+            return self
+        # Sum up power curves of all wind farms
+        wind_speeds, values = power_curves._aggregate_power_curves(
+            [np.asarray(power_curve['wind_speed'], dtype=float)
+             for power_curve in farm_power_curves],
+            [np.asarray(power_curve['value'], dtype=float)
+             for power_curve in farm_power_curves])
+        self.power_curve = pd.DataFrame(
+            np.column_stack([wind_speeds, values]),
+            columns=['wind_speed', 'value'])
+        self._cached_power_curve = (state, farm_power_curves,
+                                    self.power_curve)
         return self
+
+
+def _assign_wind_farm_power_curve(farm, parameters):
+    r"""
+    Assigns hub height and power curve of a wind farm.
+
+    Module level function, so that it can be sent to other processes.
+
+    Returns
+    -------
+    tuple
+        Hub height and power curve of the wind farm.
+
+    """
+    # Assign hub heights (needed for power curve and later for hub height of
+    # turbine cluster)
+    farm.mean_hub_height()
+    farm.assign_power_curve(**parameters)
+    return farm.hub_height, farm.power_curve
+
+
+def _map_wind_farms(executor, wind_farms, parameters):
+    r"""
+    Runs :py:func:`~._assign_wind_farm_power_curve` for all wind farms with
+    `executor`.
+
+    Returns
+    -------
+    list
+        Result or raised exception for each wind farm in the order of
+        `wind_farms`.
+
+    """
+    futures = [executor.submit(_assign_wind_farm_power_curve, farm,
+                               parameters)
+               for farm in wind_farms]
+    results = []
+    for future in futures:
+        error = future.exception()
+        results.append(future.result() if error is None else error)
+    return results